@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark the strip-decorative-classes classifier.
+Compares the original per-pattern re.match loop against the compiled,
+cached classifier, per token and over a synthetic whole-tree corpus.
+
+Usage: python benchmarks/bench_classifier.py [--files 10000]
+"""
+
+import argparse
+import re
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from common import load_script
+from corpus import generate_corpus, harvest_vocabulary
+
+strip = load_script("strip-decorative-classes.py")
+
+def legacy_clean_classname(classname: str) -> str:
+    """The original classifier: one re.match per pattern per token."""
+    kept_classes = []
+    for cls in classname.split():
+        if not any(re.match(pattern, cls) for pattern in strip.REMOVE_PATTERNS):
+            kept_classes.append(cls)
+    return ' '.join(kept_classes)
+
+def bench_tokens(tokens: list[str]) -> None:
+    start = time.perf_counter()
+    legacy = [legacy_clean_classname(cls) == '' for cls in tokens]
+    legacy_time = time.perf_counter() - start
+
+    strip.DEFAULT_RULES.clear_cache()
+    start = time.perf_counter()
+    cold = strip.classify_tokens(tokens)
+    cold_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    strip.classify_tokens(tokens)
+    warm_time = time.perf_counter() - start
+
+    assert legacy == cold, "compiled classifier disagrees with the legacy loop"
+
+    print(f"Per-token ({len(tokens)} tokens, {len(set(tokens))} unique)")
+    for label, elapsed in (("legacy", legacy_time), ("compiled", cold_time), ("compiled+warm", warm_time)):
+        print(f"  {label:<14} {len(tokens) / elapsed:>14,.0f} tokens/sec")
+
+def run_tree(files: list[Path]) -> tuple[float, int]:
+    start = time.perf_counter()
+    total_changes = 0
+    for filepath in files:
+        _, changes = strip.process_file(filepath)
+        total_changes += changes
+    return time.perf_counter() - start, total_changes
+
+def bench_tree(num_files: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = Path(tmp) / "corpus"
+        generate_corpus(corpus, num_files)
+        size = sum(p.stat().st_size for p in corpus.rglob("*.tsx"))
+
+        results = {}
+        for label, classifier in (("legacy", legacy_clean_classname), ("compiled", strip.clean_classname)):
+            tree = Path(tmp) / label
+            shutil.copytree(corpus, tree)
+            files = sorted(tree.rglob("*.tsx"))
+            original = strip.clean_classname
+            strip.clean_classname = classifier
+            strip.DEFAULT_RULES.clear_cache()
+            try:
+                results[label] = run_tree(files)
+            finally:
+                strip.clean_classname = original
+
+        print(f"\nWhole tree ({num_files} files, {size / 1e6:.1f} MB)")
+        for label, (elapsed, changes) in results.items():
+            print(f"  {label:<14} {elapsed:>8.2f}s  {num_files / elapsed:>10,.0f} files/sec  ({changes} changes)")
+        print(f"  speedup        {results['legacy'][0] / results['compiled'][0]:>8.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=10000, help="synthetic corpus size")
+    parser.add_argument("--tokens", type=int, default=200000, help="tokens for the per-token run")
+    args = parser.parse_args()
+
+    vocabulary = harvest_vocabulary()
+    tokens = [vocabulary[i % len(vocabulary)] for i in range(args.tokens)]
+    bench_tokens(tokens)
+    bench_tree(args.files)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Stress benchmark for fix-conditionals.py on pathological inputs.
+Compares the original re.sub passes with the linear scanner and records
+wall time and peak memory (tracemalloc) for each input.
+
+Usage: python benchmarks/bench_fix_conditionals.py [--lines 100000] [--json out.json]
+"""
+
+import argparse
+import json
+import re
+import time
+import tracemalloc
+
+from common import load_script
+
+fix = load_script("fix-conditionals.py")
+
+def legacy_fix_conditionals(content: str) -> str:
+    """The original regex implementation of fix_conditionals."""
+    content = re.sub(r'(\w+)\s+&&\s+\n\s*\)', '', content)
+    content = re.sub(r'(\w+|\))\s+\?\s+\n\s*:\s+\n', r'', content)
+    content = re.sub(r':\s+\n\s*\)', ')', content)
+    content = re.sub(r'^\s*,\s*$', '', content, flags=re.MULTILINE)
+    return content
+
+def realistic_file(lines: int) -> str:
+    """A long component full of the broken fragments the fixer targets."""
+    block = [
+        '      className={cn(',
+        '        "flex items-center",',
+        '        isActive && ',
+        '        )}',
+        '      data-state={open ? ',
+        '        : ',
+        '        "closed"}',
+        '      style={x ? y : ',
+        '      )}',
+        '        ,',
+    ]
+    return '\n'.join(block[i % len(block)] for i in range(lines)) + '\n'
+
+def inputs(lines: int, run: int) -> dict[str, str]:
+    return {
+        f"realistic {lines} lines": realistic_file(lines),
+        f"{lines} blank lines": '\n' * lines,
+        f"{lines} whitespace-only lines": '   \t  \n' * lines,
+        f"word + {run} spaces": 'active' + ' ' * run + '&&',
+        f"{run}-char word + spaces": 'a' * run + ' ' * 16,
+        f"{run}-char word before &&": 'a' * run + ' &&\n  )',
+        f"{run} newlines after &&": 'active &&' + '\n' * run,
+    }
+
+def measure(func, content: str) -> tuple[float, int, str]:
+    # Timed and traced separately: tracemalloc slows down pure-Python code
+    start = time.perf_counter()
+    result = func(content)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100000, help="line count for line-based inputs")
+    parser.add_argument("--run", type=int, default=1000000, help="length of whitespace/word runs")
+    parser.add_argument("--legacy-max-bytes", type=int, default=20000,
+                        help="skip the regex version above this input size (it is quadratic)")
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'input':<32} {'size':>10} {'impl':<8} {'time':>10} {'peak mem':>12}")
+    for name, content in inputs(args.lines, args.run).items():
+        runs = [("scanner", fix.fix_conditionals)]
+        if len(content) <= args.legacy_max_bytes:
+            runs.insert(0, ("regex", legacy_fix_conditionals))
+
+        outputs = []
+        for impl, func in runs:
+            elapsed, peak, output = measure(func, content)
+            outputs.append(output)
+            results.append({"input": name, "bytes": len(content), "impl": impl,
+                            "seconds": elapsed, "peak_bytes": peak})
+            print(f"{name:<32} {len(content):>10} {impl:<8} {elapsed:>9.3f}s {peak / 1e6:>10.1f}MB")
+        if len(runs) == 1:
+            print(f"{name:<32} {len(content):>10} {'regex':<8} {'skipped':>10}")
+        assert all(o == outputs[0] for o in outputs), f"outputs differ for {name}"
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Codemod benchmark suite.
+
+Generates synthetic TSX corpora at several scales, runs every codemod mode
+over a fresh copy of each one in its own subprocess, and reports files/sec,
+MB/sec, per-file p50/p99 time and peak RSS as JSON. Pass --baseline to fail
+when throughput drops by more than --tolerance against an earlier run.
+
+Usage:
+  python benchmarks/codemod_suite.py --files 1000,10000 --lines 100 --out results.json
+  python benchmarks/codemod_suite.py --baseline results.json --tolerance 0.2
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from common import load_script
+from corpus import generate_corpus, load_vocabulary
+from codemod_utils import CodemodCache, default_jobs, find_tsx_files, map_files
+
+MODES = ("strip", "fix", "fused", "strip-parallel", "strip-cached")
+
+def _timed(func, filepath: Path):
+    start = time.perf_counter()
+    result = func(filepath)
+    return time.perf_counter() - start, result
+
+def _timed_strip(filepath: Path):
+    return _timed(load_script("strip-decorative-classes.py").process_file, filepath)
+
+def _timed_fix(filepath: Path):
+    return _timed(load_script("fix-conditionals.py").fix_file, filepath)
+
+def _timed_fused(filepath: Path):
+    strip = load_script("strip-decorative-classes.py")
+    return _timed(lambda f: strip.process_file_with_digest(f, fix_conditionals=True, fingerprint=False), filepath)
+
+def run_mode(mode: str, src_root: Path, jobs: int) -> list[float]:
+    """
+    Run one codemod mode over src_root the way its main() does.
+    Returns per-file seconds for the measured pass.
+    """
+    strip = load_script("strip-decorative-classes.py")
+    files = find_tsx_files(src_root)
+
+    if mode == "strip-cached":
+        # Prime the manifest, then time the warm run that the cache makes cheap
+        manifest = src_root / ".codemod-cache.json"
+        cache = CodemodCache(manifest, "strip-decorative-classes", strip.ruleset_hash(), src_root)
+        for filepath in files:
+            cache.record(filepath, strip.process_file_with_digest(filepath)[2])
+        cache.save()
+
+        timings = []
+        cache = CodemodCache(manifest, "strip-decorative-classes", strip.ruleset_hash(), src_root)
+        for filepath in files:
+            elapsed, fresh = _timed(cache.is_fresh, filepath)
+            if not fresh:
+                extra, (_, _, digest) = _timed(strip.process_file_with_digest, filepath)
+                elapsed += extra
+                cache.record(filepath, digest)
+            timings.append(elapsed)
+        cache.save()
+        return timings
+
+    worker = {"strip": _timed_strip, "strip-parallel": _timed_strip,
+              "fix": _timed_fix, "fused": _timed_fused}[mode]
+    results = map_files(worker, files, jobs=jobs if mode == "strip-parallel" else 1)
+    return [elapsed for elapsed, _ in results]
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def peak_rss_bytes(rusage) -> int:
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return rusage.ru_maxrss if sys.platform == "darwin" else rusage.ru_maxrss * 1024
+
+def measure(mode: str, corpus: Path, work_root: Path, jobs: int) -> dict:
+    """Copy the corpus, run the mode in a child process and collect its numbers."""
+    tree = work_root / mode
+    shutil.rmtree(tree, ignore_errors=True)
+    shutil.copytree(corpus, tree)
+    size = sum(p.stat().st_size for p in find_tsx_files(tree))
+    timings_path = work_root / f"{mode}.timings.json"
+
+    start = time.perf_counter()
+    proc = subprocess.Popen([
+        sys.executable, __file__, "--worker", mode,
+        "--src", str(tree), "--jobs", str(jobs), "--timings", str(timings_path),
+    ])
+    _, status, rusage = os.wait4(proc.pid, 0)
+    process_seconds = time.perf_counter() - start
+    if status != 0:
+        raise RuntimeError(f"{mode} worker exited with status {status}")
+
+    report = json.loads(timings_path.read_text())
+    timings = report["timings"]
+    # Throughput excludes interpreter start-up, which process_seconds includes
+    elapsed = max(report["seconds"], 1e-9)
+    shutil.rmtree(tree, ignore_errors=True)
+    return {
+        "mode": mode,
+        "files": len(timings),
+        "bytes": size,
+        "seconds": elapsed,
+        "process_seconds": process_seconds,
+        "files_per_sec": len(timings) / elapsed,
+        "mb_per_sec": size / 1e6 / elapsed,
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+        "peak_rss_mb": peak_rss_bytes(rusage) / 1e6,
+    }
+
+def compare(results: list[dict], baseline_path: Path, tolerance: float) -> list[str]:
+    """Regressions in files/sec against a baseline run, as printable lines."""
+    baseline = {
+        (r["scenario"], r["mode"]): r
+        for r in json.loads(baseline_path.read_text())
+    }
+    regressions = []
+    for result in results:
+        before = baseline.get((result["scenario"], result["mode"]))
+        if before is None:
+            continue
+        floor = before["files_per_sec"] * (1 - tolerance)
+        if result["files_per_sec"] < floor:
+            regressions.append(
+                f"{result['scenario']} {result['mode']}: {result['files_per_sec']:,.0f} files/sec "
+                f"(baseline {before['files_per_sec']:,.0f}, tolerance {tolerance:.0%})"
+            )
+    return regressions
+
+def parse_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the codemods on synthetic corpora.")
+    parser.add_argument("--files", type=parse_list, default=[1000, 10000, 100000],
+                        help="comma-separated corpus sizes (default: 1000,10000,100000)")
+    parser.add_argument("--lines", type=parse_list, default=[100, 20000],
+                        help="comma-separated lines per file (default: 100,20000)")
+    parser.add_argument("--modes", default=",".join(MODES),
+                        help=f"comma-separated modes (default: {','.join(MODES)})")
+    parser.add_argument("--jobs", "-j", type=int, default=default_jobs(),
+                        help="workers for strip-parallel (default: CPU count)")
+    parser.add_argument("--max-corpus-mb", type=float, default=2000,
+                        help="skip scenarios whose corpus would exceed this size")
+    parser.add_argument("--out", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed files/sec drop against --baseline (default: 0.2)")
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--src", help=argparse.SUPPRESS)
+    parser.add_argument("--timings", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        start = time.perf_counter()
+        timings = run_mode(args.worker, Path(args.src), args.jobs)
+        elapsed = time.perf_counter() - start
+        if args.worker == "strip-cached":
+            # Only the warm pass counts; the priming pass is not timed per file
+            elapsed = sum(timings)
+        Path(args.timings).write_text(json.dumps({"seconds": elapsed, "timings": timings}))
+        return
+
+    modes = [m for m in args.modes.split(",") if m]
+    for mode in modes:
+        if mode not in MODES:
+            parser.error(f"unknown mode {mode!r}")
+
+    vocabulary = load_vocabulary()
+    results = []
+    with tempfile.TemporaryDirectory(prefix="codemod-bench-") as tmp:
+        for lines in args.lines:
+            for files in args.files:
+                scenario = f"{files}x{lines}"
+                # ~55 bytes per generated line
+                estimate_mb = files * lines * 55 / 1e6
+                if estimate_mb > args.max_corpus_mb:
+                    print(f"{scenario}: skipped (~{estimate_mb:,.0f} MB > --max-corpus-mb)", file=sys.stderr)
+                    continue
+
+                corpus = Path(tmp) / scenario
+                print(f"{scenario}: generating corpus", file=sys.stderr)
+                generate_corpus(corpus, files, lines, vocabulary=vocabulary)
+                for mode in modes:
+                    result = {"scenario": scenario, **measure(mode, corpus, Path(tmp), args.jobs)}
+                    results.append(result)
+                    print(
+                        f"{scenario:<14} {mode:<15} {result['files_per_sec']:>10,.0f} files/s "
+                        f"{result['mb_per_sec']:>8.1f} MB/s  p50 {result['p50_ms']:.2f}ms  "
+                        f"p99 {result['p99_ms']:.2f}ms  rss {result['peak_rss_mb']:.0f}MB",
+                        file=sys.stderr,
+                    )
+                shutil.rmtree(corpus)
+
+    output = json.dumps(results, indent=2)
+    if args.out:
+        Path(args.out).write_text(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        regressions = compare(results, Path(args.baseline), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
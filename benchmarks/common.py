@@ -0,0 +1,15 @@
+"""
+Shared helpers for the codemod benchmarks.
+The codemod scripts have hyphenated names, so they are loaded by path.
+"""
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# The scripts import codemod_utils from the repo root
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from codemod_utils import load_script  # noqa: E402
@@ -0,0 +1,136 @@
+"""
+Synthetic TSX corpus generator for the codemod benchmarks.
+Class vocabulary is harvested from the real components and from the theme in
+design-assets/tailwind.config.js, so the token mix (and therefore the
+classifier cache hit rate) looks like production.
+"""
+
+import random
+import re
+from pathlib import Path
+
+from common import REPO_ROOT
+from jsx_classnames import iter_class_strings
+
+TAILWIND_CONFIG = REPO_ROOT / "design-assets" / "tailwind.config.js"
+
+# Used when the Next.js tree is not available (e.g. a sparse checkout)
+FALLBACK_VOCABULARY = [
+    'flex', 'items-center', 'justify-between', 'grid', 'grid-cols-2', 'w-full',
+    'h-full', 'relative', 'absolute', 'hidden', 'block', 'min-w-0', 'truncate',
+    'bg-white', 'bg-primary', 'text-sm', 'text-muted-foreground', 'text-lg',
+    'border', 'border-2', 'border-black', 'rounded-lg', 'shadow-retro',
+    'font-bold', 'font-mono', 'p-4', 'px-2', 'py-1', 'gap-2', 'mt-4',
+    'hover:bg-secondary', 'transition-all', 'duration-200', 'dark:bg-surface-dark',
+]
+
+# Theme section in tailwind.config.js -> utility prefixes that use its keys
+THEME_PREFIXES = {
+    'colors': ('bg', 'text', 'border', 'ring', 'hover:bg', 'dark:bg', 'dark:text'),
+    'fontFamily': ('font',),
+    'borderRadius': ('rounded',),
+    'boxShadow': ('shadow', 'hover:shadow'),
+}
+
+def harvest_vocabulary(src_root: Path = REPO_ROOT / "nextjs" / "src") -> list[str]:
+    """Collect every class token used in className attributes, with repeats."""
+    tokens = []
+    for filepath in src_root.rglob("*.tsx"):
+        for _, value in iter_class_strings(filepath.read_text()):
+            tokens.extend(t for t in value.split() if '$' not in t and '{' not in t)
+    return tokens
+
+def tailwind_vocabulary(config_path: Path = TAILWIND_CONFIG) -> list[str]:
+    """Utility classes generated from the custom theme keys in tailwind.config.js."""
+    try:
+        config = config_path.read_text()
+    except OSError:
+        return []
+
+    tokens = []
+    for section, prefixes in THEME_PREFIXES.items():
+        block = re.search(section + r'\s*:\s*\{(.*?)\}', config, re.DOTALL)
+        if not block:
+            continue
+        keys = re.findall(r'''^\s*['"]?([\w-]+)['"]?\s*:''', block.group(1), re.MULTILINE)
+        for key in keys:
+            for prefix in prefixes:
+                tokens.append(prefix if key == 'DEFAULT' else f'{prefix}-{key}')
+    return tokens
+
+def load_vocabulary() -> list[str]:
+    """Real class usage weighted by frequency, plus every theme utility once."""
+    return (harvest_vocabulary() + tailwind_vocabulary()) or list(FALLBACK_VOCABULARY)
+
+def _classes(rng: random.Random, vocabulary: list[str], low: int = 2, high: int = 8) -> str:
+    return ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(low, high)))
+
+def _element(rng: random.Random, vocabulary: list[str], i: int) -> list[str]:
+    """One JSX element using one of the className shapes found in the tree."""
+    shape = rng.random()
+    if shape < 0.5:
+        return [f'      <span className="{_classes(rng, vocabulary)}">item {i}</span>']
+    if shape < 0.8:
+        return [
+            '      <div',
+            '        className={cn(',
+            f'          "{_classes(rng, vocabulary)}",',
+            f'          active && "{_classes(rng, vocabulary, 1, 4)}",',
+            f'          variant === "primary" ? "{_classes(rng, vocabulary, 1, 4)}" : "{_classes(rng, vocabulary, 1, 4)}",',
+            '          className',
+            '        )}',
+            f'      >item {i}</div>',
+        ]
+    if shape < 0.95:
+        return [
+            f'      <p className={{`{_classes(rng, vocabulary)} ${{active ? "{_classes(rng, vocabulary, 1, 3)}" : ""}}`}}>',
+            f'        item {i}',
+            '      </p>',
+        ]
+    # Fragments left behind by older strip runs, for fix-conditionals to repair
+    return [
+        '      <div className={cn(',
+        '        active && ',
+        '      )}>',
+        f'        item {i}',
+        '      </div>',
+    ]
+
+def generate_file(rng: random.Random, vocabulary: list[str], lines: int = 100) -> str:
+    """Render one synthetic component of roughly `lines` lines."""
+    out = [
+        "import { cn } from '@/lib/utils';",
+        "",
+        "export function Synthetic({ active, variant, className }: Props) {",
+        "  return (",
+        "    <div>",
+    ]
+    i = 0
+    while len(out) < lines - 4:
+        out.extend(_element(rng, vocabulary, i))
+        i += 1
+    out += [
+        "    </div>",
+        "  );",
+        "}",
+        "",
+    ]
+    return '\n'.join(out)
+
+def generate_corpus(root: Path, files: int, lines: int = 100, seed: int = 0,
+                    vocabulary: list[str] | None = None) -> list[Path]:
+    """
+    Write `files` synthetic .tsx files of about `lines` lines each under
+    root/components and root/app (the layout the codemods walk) and return
+    their paths.
+    """
+    rng = random.Random(seed)
+    vocabulary = vocabulary or load_vocabulary()
+    paths = []
+    for i in range(files):
+        tree = "components" if i % 3 else "app"
+        filepath = root / tree / f"dir{i % 100:02d}" / f"component_{i}.tsx"
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        filepath.write_text(generate_file(rng, vocabulary, lines))
+        paths.append(filepath)
+    return paths
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Persistent inverted index of the Tailwind classes used in className attributes.
+
+The index (.codemod-class-index.json) maps every class to the files and
+line:column positions that use it, using the same className scanner as
+strip-decorative-classes.py. Every command refreshes it first: files whose
+mtime and size are unchanged are not read, and files that were touched but
+hash the same are not re-parsed.
+
+Usage:
+  python class-index.py update
+  python class-index.py files 'shadow-*' 'rounded-*'   # files using matching classes
+  python class-index.py where bg-white                # every position of a class
+  python class-index.py top -n 30                     # most used classes
+  python class-index.py removed --rules codemod-rules/keep-spacing.toml
+"""
+
+import argparse
+import json
+from bisect import bisect_right
+from collections import Counter
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+from jsx_classnames import iter_class_tokens
+from codemod_rules import RuleError
+from codemod_utils import REPO_ROOT, content_digest, find_tsx_files, load_script
+
+INDEX_PATH = REPO_ROOT / ".codemod-class-index.json"
+
+# Bump when the stored layout or the extraction changes
+INDEX_VERSION = 1
+
+def line_starts(content: str) -> list[int]:
+    starts = [0]
+    pos = content.find('\n')
+    while pos >= 0:
+        starts.append(pos + 1)
+        pos = content.find('\n', pos + 1)
+    return starts
+
+def extract_classes(content: str) -> dict[str, str]:
+    """
+    Class -> positions for one file, as "line:column line:column ..." (1-based).
+    Strings decode several times faster than nested JSON lists, and the
+    occurrence count is just the number of spaces plus one.
+    """
+    starts = line_starts(content)
+    positions = {}
+    for offset, cls in iter_class_tokens(content):
+        line = bisect_right(starts, offset)
+        positions.setdefault(cls, []).append(f"{line}:{offset - starts[line - 1] + 1}")
+    return {cls: ' '.join(where) for cls, where in positions.items()}
+
+class ClassIndex:
+    """
+    class -> file -> positions, plus the stat and content hash each file was
+    indexed at. Stored as JSON so queries load it instead of rescanning.
+    """
+
+    def __init__(self, path: Path = INDEX_PATH, repo_root: Path = REPO_ROOT):
+        self.path = path
+        self.repo_root = repo_root
+        self.files = {}
+        self.postings = {}
+        self.dirty = False
+
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == INDEX_VERSION:
+            self.files = data["files"]
+            self.postings = data["classes"]
+
+    def _key(self, filepath: Path) -> str:
+        try:
+            return filepath.relative_to(self.repo_root).as_posix()
+        except ValueError:
+            return filepath.as_posix()
+
+    def _remove(self, key: str) -> None:
+        for cls in self.files.pop(key)["classes"]:
+            files = self.postings[cls]
+            del files[key]
+            if not files:
+                del self.postings[cls]
+
+    def _add(self, key: str, content: str, stat) -> None:
+        positions = extract_classes(content)
+        self.files[key] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "hash": content_digest(content),
+            "classes": sorted(positions),
+        }
+        for cls, where in positions.items():
+            self.postings.setdefault(cls, {})[key] = where
+
+    def refresh(self, files: list[Path]) -> tuple[int, int]:
+        """Bring the index up to date with files. Returns (reindexed, removed)."""
+        reindexed = 0
+        seen = set()
+        for filepath in files:
+            key = self._key(filepath)
+            try:
+                stat = filepath.stat()
+            except OSError:
+                continue
+            seen.add(key)
+            entry = self.files.get(key)
+            if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                continue
+
+            content = filepath.read_text()
+            self.dirty = True
+            if entry and entry["hash"] == content_digest(content):
+                entry["mtime_ns"] = stat.st_mtime_ns
+                continue
+            if entry:
+                self._remove(key)
+            self._add(key, content, stat)
+            reindexed += 1
+
+        removed = [key for key in self.files if key not in seen]
+        for key in removed:
+            self._remove(key)
+        self.dirty = self.dirty or bool(removed)
+        return reindexed, len(removed)
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({
+            "version": INDEX_VERSION,
+            "files": self.files,
+            "classes": self.postings,
+        }, separators=(',', ':')))
+        tmp_path.replace(self.path)
+        self.dirty = False
+
+    def count(self, cls: str) -> int:
+        return sum(where.count(' ') + 1 for where in self.postings.get(cls, {}).values())
+
+    def matching(self, patterns: list[str]) -> list[str]:
+        """Indexed classes matching any of the shell-style patterns (e.g. shadow-*)."""
+        return sorted(cls for cls in self.postings if any(fnmatchcase(cls, p) for p in patterns))
+
+def print_files(index: ClassIndex, patterns: list[str]) -> None:
+    per_file = {}
+    for cls in index.matching(patterns):
+        for key, where in index.postings[cls].items():
+            per_file.setdefault(key, Counter())[cls] += where.count(' ') + 1
+    for key, counts in sorted(per_file.items(), key=lambda item: -sum(item[1].values())):
+        detail = ", ".join(f"{cls} ×{n}" for cls, n in counts.most_common())
+        print(f"{sum(counts.values()):>5}  {key}  ({detail})")
+    print(f"\n{len(per_file)} files")
+
+def print_where(index: ClassIndex, classes: list[str]) -> None:
+    for cls in index.matching(classes):
+        for key, where in sorted(index.postings[cls].items()):
+            for position in where.split():
+                print(f"{key}:{position}: {cls}")
+
+def print_top(index: ClassIndex, limit: int) -> None:
+    counts = Counter({cls: index.count(cls) for cls in index.postings})
+    for cls, n in counts.most_common(limit):
+        print(f"{n:>6}  {len(index.postings[cls]):>4} files  {cls}")
+
+def print_removed(index: ClassIndex, rules) -> None:
+    removed = [cls for cls in index.postings if rules.is_decorative(cls)]
+    removed.sort(key=lambda cls: (-index.count(cls), cls))
+    for cls in removed:
+        print(f"{index.count(cls):>6}  {len(index.postings[cls]):>4} files  {cls}")
+    total = sum(index.count(cls) for cls in removed)
+    print(f"\n{len(removed)} of {len(index.postings)} classes would be removed ({total} occurrences)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the Tailwind class index of the Next.js source.")
+    parser.add_argument("--no-update", action="store_true",
+                        help="query the stored index without checking files for changes")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("update", help="refresh the index")
+    files = commands.add_parser("files", help="files using classes matching the patterns")
+    files.add_argument("patterns", nargs="+", help="class names or shell patterns, e.g. 'shadow-*'")
+    where = commands.add_parser("where", help="every position of the matching classes")
+    where.add_argument("patterns", nargs="+")
+    top = commands.add_parser("top", help="most used classes")
+    top.add_argument("-n", type=int, default=20)
+    removed = commands.add_parser("removed", help="classes strip-decorative-classes.py would remove")
+    removed.add_argument("--rules", type=Path, help="TOML or JSON rule file")
+    removed.add_argument("--include", help="comma-separated rule groups to apply")
+    removed.add_argument("--exclude", help="comma-separated rule groups to skip")
+    args = parser.parse_args()
+
+    index = ClassIndex()
+    if not args.no_update:
+        reindexed, dropped = index.refresh(find_tsx_files())
+        index.save()
+        if args.command == "update":
+            print(f"Indexed {len(index.files)} files ({reindexed} re-parsed, {dropped} removed), "
+                  f"{len(index.postings)} distinct classes")
+
+    if args.command == "files":
+        print_files(index, args.patterns)
+    elif args.command == "where":
+        print_where(index, args.patterns)
+    elif args.command == "top":
+        print_top(index, args.n)
+    elif args.command == "removed":
+        strip = load_script("strip-decorative-classes.py")
+        include = strip.parse_groups(args.include) if args.include else None
+        exclude = strip.parse_groups(args.exclude) if args.exclude else None
+        try:
+            rules = strip.get_rules(args.rules, include, exclude)
+        except RuleError as e:
+            parser.error(str(e))
+        print_removed(index, rules)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+--profile support for the codemods.
+
+Records per-rule evaluations, hits and match time, and per-file processing
+time and bytes read/written, then reports them as JSON plus sorted tables.
+Rules are attributed by trying each one separately (see
+codemod_rules.ProfiledRuleSet), so profiled runs are slower than normal runs
+and times are for comparing rules with each other, not absolute costs.
+"""
+
+import json
+from pathlib import Path
+
+from codemod_utils import REPO_ROOT, display_path
+
+PROFILE_PATH = REPO_ROOT / ".codemod-profile.json"
+
+class RuleStats:
+    __slots__ = ("group", "name", "evaluations", "hits", "seconds")
+
+    def __init__(self, group: str, name: str):
+        self.group = group
+        self.name = name
+        self.evaluations = 0
+        self.hits = 0
+        self.seconds = 0.0
+
+    def add(self, seconds: float, hits: int) -> None:
+        self.evaluations += 1
+        self.hits += hits
+        self.seconds += seconds
+
+    def as_dict(self) -> dict:
+        return {
+            "group": self.group,
+            "rule": self.name,
+            "evaluations": self.evaluations,
+            "hits": self.hits,
+            "seconds": self.seconds,
+        }
+
+class Profile:
+    def __init__(self):
+        self.rules = {}
+        self.files = []
+
+    def rule(self, group: str, name: str) -> RuleStats:
+        """Stats for one rule, created on first use. Rules report in creation order."""
+        key = (group, name)
+        stats = self.rules.get(key)
+        if stats is None:
+            stats = self.rules[key] = RuleStats(group, name)
+        return stats
+
+    def record_file(self, filepath: Path, seconds: float, bytes_read: int, bytes_written: int) -> None:
+        self.files.append({
+            "path": display_path(filepath),
+            "seconds": seconds,
+            "bytes_read": bytes_read,
+            "bytes_written": bytes_written,
+        })
+
+    def report(self) -> dict:
+        """Everything recorded, slowest first."""
+        rules = sorted((stats.as_dict() for stats in self.rules.values()), key=lambda r: -r["seconds"])
+        files = sorted(self.files, key=lambda f: -f["seconds"])
+        return {
+            "totals": {
+                "files": len(files),
+                "seconds": sum(f["seconds"] for f in files),
+                "bytes_read": sum(f["bytes_read"] for f in files),
+                "bytes_written": sum(f["bytes_written"] for f in files),
+                "rule_seconds": sum(r["seconds"] for r in rules),
+            },
+            "rules": rules,
+            "dead_rules": [r for r in rules if r["hits"] == 0],
+            "files": files,
+        }
+
+    def write(self, path: Path) -> dict:
+        report = self.report()
+        path.write_text(json.dumps(report, indent=2) + "\n")
+        return report
+
+def print_report(report: dict, top: int = 15) -> None:
+    """The top-N rules and files by time, plus every rule that never fired."""
+    totals = report["totals"]
+    print(f"\nProfile: {totals['files']} files in {totals['seconds'] * 1000:.0f}ms, "
+          f"{totals['bytes_read'] / 1e6:.2f} MB read, {totals['bytes_written'] / 1e6:.2f} MB written")
+
+    if report["rules"]:
+        rule_seconds = totals["rule_seconds"] or 1e-9
+        print(f"\nTop {min(top, len(report['rules']))} rules by match time:")
+        print(f"  {'ms':>8} {'share':>6} {'hits':>7} {'evals':>9}  rule")
+        for rule in report["rules"][:top]:
+            print(f"  {rule['seconds'] * 1000:>8.1f} {rule['seconds'] / rule_seconds:>6.1%} "
+                  f"{rule['hits']:>7} {rule['evaluations']:>9}  [{rule['group']}] {rule['rule']}")
+
+    if report["dead_rules"]:
+        print(f"\n{len(report['dead_rules'])} rules never matched:")
+        for rule in report["dead_rules"]:
+            print(f"  [{rule['group']}] {rule['rule']}")
+
+    print(f"\nTop {min(top, len(report['files']))} files by time:")
+    print(f"  {'ms':>8} {'read':>9} {'written':>9}  file")
+    for f in report["files"][:top]:
+        print(f"  {f['seconds'] * 1000:>8.2f} {f['bytes_read']:>9,} {f['bytes_written']:>9,}  {f['path']}")
+
+def add_profile_arguments(parser) -> None:
+    parser.add_argument("--profile", nargs="?", type=Path, const=PROFILE_PATH, metavar="PATH",
+                        help=f"record per-rule and per-file timings to PATH (default: {PROFILE_PATH.name}); "
+                             "runs serially and ignores the cache")
+    parser.add_argument("--top", type=int, default=15, metavar="N",
+                        help="rows per table in the --profile summary (default: 15)")
+
+def finish_profile(profile: Profile, path: Path, top: int) -> None:
+    """Write the JSON report and print the summary tables."""
+    print_report(profile.write(path), top)
+    print(f"\nProfile written to {display_path(path)}")
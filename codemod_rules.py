@@ -0,0 +1,218 @@
+"""
+Rule sets for strip-decorative-classes.py.
+
+A rule set is an ordered collection of named groups of regexes. A class token
+is removed if any pattern in an active group matches at its start. Rule files
+(TOML or JSON) add or replace groups and choose which ones are active:
+
+    # rules.toml
+    exclude = ["spacing"]
+
+    [groups]
+    decoration = ['\\bunderline\\b', '\\bitalic\\b']
+
+Keys:
+- groups:  table of group name -> list of patterns, merged over the built-in groups
+- inherit: set to false to start from no built-in groups (default true)
+- include: only these groups are active (default: all)
+- exclude: these groups are never active
+
+Resolved rule sets are cached in .codemod-rules-cache/, keyed by a hash of the
+rule file, the group selection and the built-in groups. A warm start reads one
+small JSON file instead of parsing TOML and validating every pattern, and the
+combined matcher is compiled once, lazily, on the first token it has to decide.
+"""
+
+import json
+import re
+import time
+from pathlib import Path
+
+from codemod_utils import REPO_ROOT, content_digest
+
+RULES_CACHE_DIR = REPO_ROOT / ".codemod-rules-cache"
+
+# Bounded per-token decision cache. The same few hundred tokens (flex, bg-white,
+# text-sm, ...) make up almost every className in the tree.
+DECISION_CACHE_SIZE = 8192
+
+RULE_FILE_KEYS = {"groups", "inherit", "include", "exclude"}
+
+class RuleError(ValueError):
+    """A rule file or group selection is invalid."""
+
+class RuleSet:
+    """The active rule groups plus a lazily compiled matcher for them."""
+
+    def __init__(self, groups: dict[str, list[str]], digest: str):
+        self.groups = groups
+        self.patterns = [pattern for patterns in groups.values() for pattern in patterns]
+        self.digest = digest
+        self._matcher = None
+        self._decisions = {}
+
+    # Workers receive the rule set pickled; they recompile on first use
+    def __getstate__(self):
+        return {"groups": self.groups, "digest": self.digest}
+
+    def __setstate__(self, state):
+        self.__init__(state["groups"], state["digest"])
+
+    @property
+    def matcher(self) -> re.Pattern:
+        """
+        All patterns compiled into one alternation. A token is decorative if any
+        rule matches at its start, which is exactly what the alternation's match() tests.
+        """
+        if self._matcher is None:
+            if self.patterns:
+                self._matcher = re.compile('|'.join(f'(?:{pattern})' for pattern in self.patterns))
+            else:
+                self._matcher = re.compile(r'(?!)')
+        return self._matcher
+
+    def is_decorative(self, cls: str) -> bool:
+        """Return True if a single class token matches a remove pattern."""
+        decision = self._decisions.get(cls)
+        if decision is None:
+            if len(self._decisions) >= DECISION_CACHE_SIZE:
+                self._decisions.clear()
+            decision = self._decisions[cls] = self.matcher.match(cls) is not None
+        return decision
+
+    def clear_cache(self) -> None:
+        self._decisions.clear()
+
+class ProfiledRuleSet(RuleSet):
+    """
+    A RuleSet that tries each pattern on its own, in order, and records
+    evaluations, hits and match time per rule in a codemod_profile.Profile.
+    Decisions are the same as the combined matcher's. Only the first matching
+    rule gets the hit, so a rule with no hits can be dropped without changing
+    the output on the files profiled. Every token is evaluated, with no decision
+    cache, so counts are occurrences.
+    """
+
+    def __init__(self, rules: RuleSet, profile):
+        super().__init__(rules.groups, rules.digest)
+        self.profile = profile
+        self._rules = [
+            (re.compile(pattern).match, profile.rule(group, pattern))
+            for group, patterns in rules.groups.items()
+            for pattern in patterns
+        ]
+
+    def __getstate__(self):
+        raise TypeError("ProfiledRuleSet records into this process; profile with --jobs 1")
+
+    def is_decorative(self, cls: str) -> bool:
+        clock = time.perf_counter
+        for match, stats in self._rules:
+            start = clock()
+            hit = match(cls) is not None
+            stats.seconds += clock() - start
+            stats.evaluations += 1
+            if hit:
+                stats.hits += 1
+                return True
+        return False
+
+def parse_rules_file(path: Path) -> dict:
+    """Read a TOML or JSON rule file and check its shape."""
+    try:
+        if path.suffix == ".toml":
+            import tomllib  # only needed on a cold cache
+            with path.open("rb") as f:
+                data = tomllib.load(f)
+        elif path.suffix == ".json":
+            data = json.loads(path.read_text())
+        else:
+            raise RuleError(f"{path}: rule files must be .toml or .json")
+    except (OSError, ValueError) as e:
+        if isinstance(e, RuleError):
+            raise
+        raise RuleError(f"{path}: {e}") from e
+
+    if not isinstance(data, dict):
+        raise RuleError(f"{path}: expected a table at the top level")
+    unknown = set(data) - RULE_FILE_KEYS
+    if unknown:
+        raise RuleError(f"{path}: unknown keys {sorted(unknown)}")
+
+    groups = data.get("groups", {})
+    if not isinstance(groups, dict) or not all(
+        isinstance(patterns, list) and all(isinstance(p, str) for p in patterns)
+        for patterns in groups.values()
+    ):
+        raise RuleError(f"{path}: groups must map names to lists of pattern strings")
+    for key in ("include", "exclude"):
+        if key in data and not (isinstance(data[key], list) and all(isinstance(g, str) for g in data[key])):
+            raise RuleError(f"{path}: {key} must be a list of group names")
+    return data
+
+def resolve_groups(builtin: dict[str, list[str]], data: dict,
+                   include: list[str] | None, exclude: list[str] | None) -> dict[str, list[str]]:
+    """Merge file groups over the built-in ones and apply include/exclude."""
+    groups = dict(builtin) if data.get("inherit", True) else {}
+    groups.update(data.get("groups", {}))
+
+    include = include if include is not None else data.get("include")
+    exclude = exclude if exclude is not None else data.get("exclude", [])
+    for name in (include or []) + exclude:
+        if name not in groups:
+            raise RuleError(f"unknown rule group {name!r} (available: {', '.join(groups)})")
+
+    return {
+        name: patterns
+        for name, patterns in groups.items()
+        if (include is None or name in include) and name not in exclude
+    }
+
+def validate_groups(groups: dict[str, list[str]]) -> None:
+    """Compile every pattern on its own so errors name the offending rule."""
+    for name, patterns in groups.items():
+        for pattern in patterns:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise RuleError(f"group {name!r}: invalid pattern {pattern!r}: {e}") from e
+
+def load_rule_set(builtin: dict[str, list[str]], rules_file: Path | None = None,
+                  include: list[str] | None = None, exclude: list[str] | None = None,
+                  cache_dir: Path | None = RULES_CACHE_DIR) -> RuleSet:
+    """
+    Resolve the active rule set, using the on-disk cache when the rule file,
+    selection and built-in groups are unchanged. cache_dir=None disables it.
+    """
+    try:
+        source = rules_file.read_text() if rules_file else ""
+    except OSError as e:
+        raise RuleError(f"{rules_file}: {e}") from e
+    digest = content_digest(json.dumps({
+        "builtin": builtin,
+        "file": source,
+        "format": rules_file.suffix if rules_file else None,
+        "include": include,
+        "exclude": exclude,
+    }, sort_keys=True))
+
+    cache_path = cache_dir / f"{digest}.json" if cache_dir else None
+    if cache_path:
+        try:
+            return RuleSet(json.loads(cache_path.read_text())["groups"], digest)
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    data = parse_rules_file(rules_file) if rules_file else {}
+    groups = resolve_groups(builtin, data, include, exclude)
+    validate_groups(groups)
+
+    if cache_path:
+        try:
+            cache_dir.mkdir(exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps({"groups": groups}))
+            tmp_path.replace(cache_path)
+        except OSError:
+            pass
+    return RuleSet(groups, digest)
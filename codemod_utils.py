@@ -0,0 +1,316 @@
+"""
+Shared helpers for the codemod scripts (strip-decorative-classes.py,
+fix-conditionals.py).
+"""
+
+import argparse
+import difflib
+import hashlib
+import importlib.util
+import json
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Iterable, TypeVar
+
+T = TypeVar('T')
+
+REPO_ROOT = Path(__file__).parent
+NEXTJS_SRC = REPO_ROOT / "nextjs" / "src"
+
+# Persistent manifest of files already known to be a fixed point
+CACHE_PATH = REPO_ROOT / ".codemod-cache.json"
+
+# Directories the codemods walk, relative to nextjs/src
+SOURCE_DIRS = ("components", "app")
+
+# Below this many files a process pool costs more to start than it saves
+PARALLEL_MIN_FILES = 32
+
+# --watch: how often the tree is polled, and how long it must stay quiet
+# after a save before the changed files are processed
+WATCH_INTERVAL = 0.2
+WATCH_DEBOUNCE = 0.3
+
+class GitError(RuntimeError):
+    """git could not list changed files (bad ref, not a repository, ...)."""
+
+def find_tsx_files(src_root: Path = NEXTJS_SRC) -> list[Path]:
+    """Find all TSX files in components and app."""
+    all_files = []
+    for name in SOURCE_DIRS:
+        all_files.extend((src_root / name).rglob("*.tsx"))
+    return all_files
+
+def _git_paths(src_root: Path, *args: str) -> list[str]:
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(src_root), *args, "--", *SOURCE_DIRS],
+            capture_output=True, text=True, check=True,
+        )
+    except FileNotFoundError as e:
+        raise GitError("git is not installed") from e
+    except subprocess.CalledProcessError as e:
+        raise GitError(e.stderr.strip() or f"git {args[0]} failed") from e
+    return [path for path in result.stdout.split('\0') if path]
+
+def changed_tsx_files(since: str | None = None, staged: bool = False,
+                      src_root: Path = NEXTJS_SRC) -> list[Path]:
+    """
+    TSX files in components and app that git reports as changed: staged in the
+    index (staged=True) or different from `since` in the working tree, including
+    untracked files. Deleted files are left out.
+    """
+    if staged:
+        paths = _git_paths(src_root, "diff", "--cached", "--name-only", "--relative",
+                           "--diff-filter=ACMR", "-z")
+    else:
+        paths = _git_paths(src_root, "diff", since or "HEAD", "--name-only", "--relative",
+                           "--diff-filter=ACMR", "-z")
+        paths += _git_paths(src_root, "ls-files", "--others", "--exclude-standard", "-z")
+
+    files = []
+    for path in dict.fromkeys(paths):
+        filepath = src_root / path
+        if filepath.suffix == ".tsx" and filepath.is_file():
+            files.append(filepath)
+    return files
+
+def add_scope_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add --since/--staged, which limit a codemod to files git reports as changed."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--since", metavar="REF",
+                       help="only files changed since REF, including uncommitted and untracked ones")
+    group.add_argument("--staged", action="store_true",
+                       help="only files staged in the git index (for pre-commit hooks)")
+
+def scoped_tsx_files(args: argparse.Namespace, parser: argparse.ArgumentParser) -> list[Path]:
+    """The files selected by add_scope_arguments' flags; every TSX file if neither is given."""
+    if args.since is None and not args.staged:
+        return find_tsx_files()
+    try:
+        return changed_tsx_files(args.since, args.staged)
+    except GitError as e:
+        parser.error(str(e))
+
+def file_signature(filepath: Path) -> tuple[int, int] | None:
+    """(mtime_ns, size) of a file, or None if it is gone."""
+    try:
+        stat = filepath.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def snapshot_tsx_files(src_root: Path = NEXTJS_SRC) -> dict[Path, tuple[int, int]]:
+    """(mtime_ns, size) of every TSX file the codemods walk."""
+    snapshot = {}
+    for filepath in find_tsx_files(src_root):
+        signature = file_signature(filepath)
+        if signature is not None:
+            snapshot[filepath] = signature
+    return snapshot
+
+def watch_tsx_files(on_change: Callable[[list[Path]], None], src_root: Path = NEXTJS_SRC,
+                    interval: float = WATCH_INTERVAL, debounce: float = WATCH_DEBOUNCE) -> None:
+    """
+    Poll components and app and call on_change with the files that were added
+    or modified, once a burst of saves has been quiet for `debounce` seconds.
+    Polling needs no extra dependencies and stats ~400 files in a few
+    milliseconds. Runs until interrupted with Ctrl+C.
+    """
+    previous = snapshot_tsx_files(src_root)
+    pending = set()
+    last_change = 0.0
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot_tsx_files(src_root)
+            changed = [f for f, signature in current.items() if previous.get(f) != signature]
+            previous = current
+            if changed:
+                pending.update(changed)
+                last_change = time.monotonic()
+                continue
+            if pending and time.monotonic() - last_change >= debounce:
+                batch = sorted(f for f in pending if f in current)
+                pending.clear()
+                on_change(batch)
+                # Don't treat the codemod's own writes as new saves. Only the
+                # batch is refreshed: other files saved meanwhile still differ
+                # from `previous` and are picked up on the next poll
+                for filepath in batch:
+                    signature = file_signature(filepath)
+                    if signature is None:
+                        previous.pop(filepath, None)
+                    else:
+                        previous[filepath] = signature
+    except KeyboardInterrupt:
+        pass
+
+def load_script(filename: str, repo_root: Path = REPO_ROOT) -> ModuleType:
+    """Import a hyphenated codemod script (e.g. fix-conditionals.py) as a module."""
+    path = repo_root / filename
+    name = path.stem.replace('-', '_')
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def default_jobs() -> int:
+    """Default worker count for --jobs."""
+    return os.cpu_count() or 1
+
+def map_files(func: Callable[[Path], T], files: Iterable[Path], jobs: int = 1) -> list[T]:
+    """
+    Apply func to every file and return the results in input order.
+    With jobs > 1 the file list is sharded across a process pool.
+    """
+    files = list(files)
+    if jobs <= 1 or len(files) < PARALLEL_MIN_FILES:
+        return [func(filepath) for filepath in files]
+
+    from concurrent.futures import ProcessPoolExecutor  # ~20ms to import; not needed for small runs
+
+    jobs = min(jobs, len(files))
+    # A few shards per worker keeps the pool busy when file sizes are uneven
+    chunksize = max(1, len(files) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(func, files, chunksize=chunksize))
+
+def display_path(filepath: Path, repo_root: Path = REPO_ROOT) -> str:
+    """Repo-relative path, truncated to 60 characters for progress output."""
+    try:
+        rel_path = str(filepath.relative_to(repo_root))
+    except ValueError:
+        rel_path = str(filepath)
+    if len(rel_path) > 60:
+        rel_path = "..." + rel_path[-57:]
+    return rel_path
+
+def repo_path(filepath: Path, repo_root: Path = REPO_ROOT) -> str:
+    """Repo-relative posix path, as used in diffs and reports."""
+    try:
+        return filepath.resolve().relative_to(repo_root.resolve()).as_posix()
+    except ValueError:
+        return filepath.as_posix()
+
+def write_atomic(filepath: Path, content: str) -> None:
+    """
+    Replace filepath's content through a temp file in the same directory and a
+    rename, so readers (the Next.js dev server, a crashed run) never see a
+    half-written file. The file's permissions are kept.
+    """
+    mode = stat.S_IMODE(filepath.stat().st_mode)
+    fd, tmp_name = tempfile.mkstemp(dir=filepath.parent, prefix=f".{filepath.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+def unified_diff(filepath: Path, before: str, after: str, repo_root: Path = REPO_ROOT) -> str:
+    """A git-style unified diff (a/ and b/ prefixes) that `git apply` accepts."""
+    path = repo_path(filepath, repo_root)
+    lines = []
+    for line in difflib.unified_diff(before.splitlines(keepends=True), after.splitlines(keepends=True),
+                                     f"a/{path}", f"b/{path}"):
+        if not line.endswith("\n"):
+            line += "\n\\ No newline at end of file\n"
+        lines.append(line)
+    return ''.join(lines)
+
+def add_dry_run_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--dry-run", action="store_true",
+                        help="print the changes to stdout instead of writing files")
+    parser.add_argument("--format", choices=("diff", "ndjson"), default="diff",
+                        help="--dry-run output: a unified diff, or one JSON object per file (default: diff)")
+
+def emit_patch(filepath: Path, diff: str, fmt: str, **fields) -> None:
+    """Print one file's --dry-run result in the chosen format."""
+    if fmt == "ndjson":
+        print(json.dumps({"path": repo_path(filepath), **fields, "diff": diff}))
+    else:
+        sys.stdout.write(diff)
+
+def content_digest(content: str) -> str:
+    """Content hash used by the incremental cache."""
+    return hashlib.sha256(content.encode()).hexdigest()
+
+class CodemodCache:
+    """
+    Content-hash manifest for incremental codemod runs.
+
+    Entries map a repo-relative path to the hash of its content and the hash of
+    the rule set that produced it. A file is skipped only if both still match,
+    so editing the file or the rules invalidates it automatically. Each codemod
+    keeps its entries under its own namespace in the shared manifest file.
+    """
+
+    def __init__(self, path: Path, namespace: str, ruleset_hash: str, repo_root: Path = REPO_ROOT):
+        self.path = path
+        self.namespace = namespace
+        self.ruleset_hash = ruleset_hash
+        self.repo_root = repo_root
+        self.entries = {
+            key: entry
+            for key, entry in self._load().get(namespace, {}).items()
+            if entry.get("rules") == ruleset_hash
+        }
+
+    def _load(self) -> dict:
+        try:
+            manifest = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return manifest if isinstance(manifest, dict) else {}
+
+    def _key(self, filepath: Path) -> str:
+        try:
+            return filepath.resolve().relative_to(self.repo_root.resolve()).as_posix()
+        except ValueError:
+            return filepath.resolve().as_posix()
+
+    def is_fresh(self, filepath: Path) -> bool:
+        """True if the file is unchanged since it was last recorded as a fixed point."""
+        entry = self.entries.get(self._key(filepath))
+        if entry is None:
+            return False
+        try:
+            return entry["hash"] == content_digest(filepath.read_text())
+        except OSError:
+            return False
+
+    def record(self, filepath: Path, digest: str | None) -> None:
+        """Remember the file's output hash, or forget it if digest is None."""
+        key = self._key(filepath)
+        if digest is None:
+            self.entries.pop(key, None)
+        else:
+            self.entries[key] = {"hash": digest, "rules": self.ruleset_hash}
+
+    def save(self) -> None:
+        """Write the manifest, dropping entries for files that no longer exist."""
+        manifest = self._load()
+        manifest[self.namespace] = {
+            key: entry
+            for key, entry in sorted(self.entries.items())
+            if (self.repo_root / key).exists()
+        }
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(manifest, indent=2) + "\n")
+        tmp_path.replace(self.path)
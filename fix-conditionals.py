@@ -5,52 +5,255 @@ Patterns to fix:
 - `condition && ` followed by closing paren
 - `condition ? ` followed by `:`
 - `condition : ` followed by closing paren
+
+strip-decorative-classes.py now removes empty branches itself; this pass is
+kept for trees stripped by the old regex-based version.
 """
 
+import argparse
 import re
+import sys
+import time
+from functools import partial
 from pathlib import Path
 
-def fix_file(filepath: Path) -> bool:
-    """Fix broken conditionals. Returns True if modified."""
-    content = filepath.read_text()
-    original = content
+from codemod_profile import Profile, add_profile_arguments, finish_profile
+from codemod_utils import (
+    SOURCE_DIRS,
+    add_dry_run_arguments,
+    add_scope_arguments,
+    default_jobs,
+    display_path,
+    emit_patch,
+    map_files,
+    scoped_tsx_files,
+    unified_diff,
+    watch_tsx_files,
+    write_atomic,
+)
+
+# The rewrites below used to be four re.sub calls over the whole file. Those
+# backtrack quadratically on long whitespace or word runs, so each one is now a
+# left-to-right scan between anchor characters (&&, ?, :, ,) that reproduces
+# the regex's leftmost, non-overlapping matches exactly. Every whitespace and
+# word run is visited a bounded number of times, so each pass is O(n).
+
+WHITESPACE_RUN = re.compile(r'\s*')
+WORD_RUN = re.compile(r'\w*')
+
+# Runs are walked backwards in reversed chunks so that long runs stay in C
+BACKWARD_CHUNK = 256
+
+def _ws_end(content: str, pos: int) -> int:
+    """End of the whitespace run starting at pos."""
+    return WHITESPACE_RUN.match(content, pos).end()
+
+def _run_start(content: str, pos: int, floor: int, run: re.Pattern) -> int:
+    """Start of the run (whitespace or word) ending at pos, not going below floor."""
+    while pos > floor:
+        lo = max(floor, pos - BACKWARD_CHUNK)
+        length = run.match(content[lo:pos][::-1]).end()
+        if length < pos - lo:
+            return pos - length
+        pos = lo
+    return pos
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+def _token_before(content: str, anchor: int, floor: int, allow_paren: bool) -> int | None:
+    """
+    Start of the word (or ')' if allowed) and whitespace just before anchor, or None.
+    The whitespace must be non-empty and the token must not start before floor.
+    """
+    ws = _run_start(content, anchor, floor, WHITESPACE_RUN)
+    if ws == anchor or ws == floor:
+        return None
+    char = content[ws - 1]
+    if allow_paren and char == ')':
+        return ws - 1
+    if _is_word(char):
+        return _run_start(content, ws - 1, floor, WORD_RUN)
+    return None
+
+def _scan(content: str, anchor: str, match) -> tuple[str, int]:
+    """
+    Rewrite content by trying match(content, index, floor) at every anchor.
+    match returns (start, end, replacement) or None; floor is the end of the
+    previous rewrite, which a new match must not overlap.
+    Returns (new_content, number_of_rewrites).
+    """
+    out = []
+    last = 0
+    i = content.find(anchor)
+    while i >= 0:
+        found = match(content, i, last)
+        if found is None:
+            i = content.find(anchor, i + 1)
+            continue
+        start, end, replacement = found
+        out.append(content[last:start])
+        out.append(replacement)
+        last = end
+        i = content.find(anchor, end)
+    out.append(content[last:])
+    return ''.join(out), len(out) // 2
+
+def _match_dangling_and(content: str, i: int, floor: int):
+    # (\w+)\s+&&\s+\n\s*\)  ->  ''
+    start = _token_before(content, i, floor, allow_paren=False)
+    if start is None:
+        return None
+    close = _ws_end(content, i + 2)
+    if close == len(content) or content[close] != ')' or content.find('\n', i + 3, close) < 0:
+        return None
+    return start, close + 1, ''
+
+def _match_empty_true_branch(content: str, i: int, floor: int):
+    # (\w+|\))\s+\?\s+\n\s*:\s+\n  ->  ''
+    start = _token_before(content, i, floor, allow_paren=True)
+    if start is None:
+        return None
+    colon = _ws_end(content, i + 1)
+    if colon == len(content) or content[colon] != ':' or content.find('\n', i + 2, colon) < 0:
+        return None
+    # \s+\n is greedy: the match ends after the last newline of the run
+    newline = content.rfind('\n', colon + 2, _ws_end(content, colon + 1))
+    if newline < 0:
+        return None
+    return start, newline + 1, ''
+
+def _match_empty_false_branch(content: str, i: int, floor: int):
+    # :\s+\n\s*\)  ->  ')'
+    close = _ws_end(content, i + 1)
+    if close == len(content) or content[close] != ')' or content.find('\n', i + 2, close) < 0:
+        return None
+    return i, close + 1, ')'
 
+def _match_comma_line(content: str, i: int, floor: int):
+    # ^\s*,\s*$ (MULTILINE)  ->  ''
+    # \s* may span lines, so the match starts at the first line start in the
+    # whitespace before the comma and ends before the last newline after it.
+    ws = _run_start(content, i, floor, WHITESPACE_RUN)
+    if ws == 0:
+        start = 0
+    else:
+        newline = content.find('\n', ws - 1, i)
+        if newline < 0:
+            return None
+        start = newline + 1
+    end = _ws_end(content, i + 1)
+    if end != len(content):
+        end = content.rfind('\n', i + 1, end)
+        if end < 0:
+            return None
+    return start, end, ''
+
+# (name, anchor, matcher), applied in this order
+PASSES = (
     # Fix: `condition && ` followed by newline and closing paren/bracket
     # Replace with empty string
-    content = re.sub(r'(\w+)\s+&&\s+\n\s*\)', '', content)
+    ("dangling-and", '&&', _match_dangling_and),
 
     # Fix: `condition ? ` followed by newline and `:` (ternary with empty true branch)
-    content = re.sub(r'(\w+|\))\s+\?\s+\n\s*:\s+\n', r'', content)
+    ("empty-true-branch", '?', _match_empty_true_branch),
 
     # Fix: `: ` followed by newline and closing paren (ternary with empty false branch)
-    content = re.sub(r':\s+\n\s*\)', ')', content)
+    ("empty-false-branch", ':', _match_empty_false_branch),
 
     # Fix standalone empty lines with just commas
-    content = re.sub(r'^\s*,\s*$', '', content, flags=re.MULTILINE)
+    ("comma-line", ',', _match_comma_line),
+)
+
+def fix_conditionals(content: str, profile=None) -> str:
+    """
+    Fix broken conditionals in file contents.
+    With a codemod_profile.Profile, each pass's time and rewrites are recorded.
+    """
+    for name, anchor, match in PASSES:
+        if profile is None:
+            content, _ = _scan(content, anchor, match)
+            continue
+        start = time.perf_counter()
+        content, rewrites = _scan(content, anchor, match)
+        profile.rule("fix-conditionals", name).add(time.perf_counter() - start, rewrites)
+    return content
+
+def fix_file(filepath: Path, profile=None) -> bool:
+    """Fix broken conditionals. Returns True if modified."""
+    content = filepath.read_text()
+    original = content
+
+    content = fix_conditionals(content, profile)
 
     if content != original:
-        filepath.write_text(content)
+        write_atomic(filepath, content)
         return True
     return False
 
-def main():
-    repo_root = Path(__file__).parent
-    nextjs_root = repo_root / "nextjs" / "src"
+def profile_fix_file(filepath: Path, profile: Profile) -> bool:
+    """fix_file, recording its time and bytes read/written in profile."""
+    bytes_read = filepath.stat().st_size
+    start = time.perf_counter()
+    was_modified = fix_file(filepath, profile)
+    elapsed = time.perf_counter() - start
+    profile.record_file(filepath, elapsed, bytes_read, filepath.stat().st_size if was_modified else 0)
+    return was_modified
 
-    # Scan all TSX files
-    all_files = list((nextjs_root / "components").rglob("*.tsx"))
-    all_files.extend((nextjs_root / "app").rglob("*.tsx"))
+def preview_fix(filepath: Path) -> str | None:
+    """Fix one file without writing it. Returns the diff, or None if unchanged."""
+    content = filepath.read_text()
+    fixed = fix_conditionals(content)
+    return unified_diff(filepath, content, fixed) if fixed != content else None
 
+def fix_files(files: list[Path], jobs: int, worker=fix_file) -> int:
+    """Fix files, printing each one that changed. Returns the number fixed."""
     fixed = 0
-    for filepath in all_files:
-        if fix_file(filepath):
+    results = map_files(worker, files, jobs=jobs)
+    for filepath, was_modified in zip(files, results):
+        if was_modified:
             fixed += 1
-            rel_path = str(filepath.relative_to(repo_root))
-            if len(rel_path) > 60:
-                rel_path = "..." + rel_path[-57:]
-            print(f"✓ Fixed {rel_path}")
+            print(f"✓ Fixed {display_path(filepath)}")
+    return fixed
+
+def main():
+    parser = argparse.ArgumentParser(description="Fix broken conditional classes after stripping.")
+    parser.add_argument("--jobs", "-j", type=int, default=default_jobs(),
+                        help="worker processes (default: CPU count, 1 = serial)")
+    parser.add_argument("--watch", action="store_true",
+                        help="after the first run, keep fixing files as they are saved")
+    add_scope_arguments(parser)
+    add_profile_arguments(parser)
+    add_dry_run_arguments(parser)
+    args = parser.parse_args()
+    if args.dry_run and (args.watch or args.profile):
+        parser.error("--dry-run cannot be combined with --watch or --profile")
+
+    # Scan all TSX files, or only the ones changed in git
+    all_files = scoped_tsx_files(args, parser)
 
+    if args.dry_run:
+        fixed = 0
+        for filepath, diff in zip(all_files, map_files(preview_fix, all_files, jobs=args.jobs)):
+            if diff is not None:
+                fixed += 1
+                emit_patch(filepath, diff, args.format)
+        print(f"\nDry run: {fixed} files would be fixed", file=sys.stderr)
+        return
+
+    if args.profile:
+        profile = Profile()
+        fixed = fix_files(all_files, 1, partial(profile_fix_file, profile=profile))
+        print(f"\nFixed {fixed} files")
+        finish_profile(profile, args.profile, args.top)
+        return
+
+    fixed = fix_files(all_files, args.jobs)
     print(f"\nFixed {fixed} files")
 
+    if args.watch:
+        print(f"\nWatching {', '.join(SOURCE_DIRS)} for changes (Ctrl+C to stop)")
+        watch_tsx_files(lambda files: print(f"{len(files)} changed, fixed {fix_files(files, args.jobs)}"))
+
 if __name__ == "__main__":
     main()
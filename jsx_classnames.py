@@ -0,0 +1,613 @@
+"""
+Linear-time scanner for class strings in JSX className attributes.
+
+Handles className="...", className={"..."}, template literals, cn()/clsx()
+calls, ternaries, `cond && "..."` and object syntax. Class strings are
+rewritten in place and branches left empty are removed structurally, so the
+output never contains the dangling `cond && ` fragments that
+fix-conditionals.py used to patch up afterwards.
+
+Each className expression is tokenized once, and bracket matches are
+precomputed so every nesting level only walks its own top-level tokens.
+"""
+
+import re
+from typing import Callable, Iterator
+
+# Calls whose arguments are class strings
+CLASS_FUNCTIONS = frozenset({"cn", "clsx", "cx", "classNames", "twMerge"})
+
+ATTRIBUTE_RE = re.compile(r'className=')
+
+# Everything except brackets and template literals, which need a stack.
+# Operators are listed longest first, so `===` wins over `==`.
+TOKEN_RE = re.compile(r'''
+    (?P<ws>\s+|//[^\n]*|/\*.*?\*/)
+  | (?P<str>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (?P<ident>[A-Za-z0-9_$]+)
+  | (?P<op>\.\.\.|===|!==|&&|\|\||\?\?|\?\.|==|!=|=>|<=|>=|[^\s"'`()\[\]{}])
+''', re.VERBOSE | re.DOTALL)
+
+BRACKETS = {'(': ')', '[': ']', '{': '}'}
+
+CLASS_TOKEN_RE = re.compile(r'\S+')
+
+class ParseError(Exception):
+    """The expression is not something the scanner can rewrite safely."""
+
+class Token:
+    __slots__ = ('kind', 'start', 'end', 'parts')
+
+    def __init__(self, kind: str, start: int, end: int, parts: list | None = None):
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.parts = parts
+
+def lex_template(src: str, pos: int) -> tuple[Token, int]:
+    """Tokenize a template literal. Parts are ('text', start, end) or ('expr', start, end, tokens)."""
+    parts = []
+    i = text_start = pos + 1
+    n = len(src)
+    while i < n:
+        c = src[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '`':
+            parts.append(('text', text_start, i))
+            return Token('template', pos, i + 1, parts), i + 1
+        if c == '$' and src.startswith('${', i):
+            parts.append(('text', text_start, i))
+            tokens, close = lex_expression(src, i + 2)
+            parts.append(('expr', i + 2, close, tokens))
+            i = text_start = close + 1
+            continue
+        i += 1
+    raise ParseError(f"unterminated template literal at {pos}")
+
+def lex_expression(src: str, pos: int) -> tuple[list[Token], int]:
+    """Tokenize a JS expression up to its unmatched '}'. Returns (tokens, index of the '}')."""
+    tokens = []
+    stack = []
+    n = len(src)
+    while pos < n:
+        c = src[pos]
+        if c in BRACKETS:
+            stack.append(BRACKETS[c])
+            tokens.append(Token('open', pos, pos + 1))
+            pos += 1
+        elif c in ')]}':
+            if not stack:
+                if c == '}':
+                    return tokens, pos
+                raise ParseError(f"unbalanced {c!r} at {pos}")
+            if stack.pop() != c:
+                raise ParseError(f"mismatched {c!r} at {pos}")
+            tokens.append(Token('close', pos, pos + 1))
+            pos += 1
+        elif c == '`':
+            token, pos = lex_template(src, pos)
+            tokens.append(token)
+        else:
+            match = TOKEN_RE.match(src, pos)
+            if match is None:
+                raise ParseError(f"unexpected {c!r} at {pos}")
+            kind = match.lastgroup
+            if kind != 'ws':
+                tokens.append(Token(kind, pos, match.end()))
+            pos = match.end()
+    raise ParseError("unterminated expression")
+
+# --- Nodes -------------------------------------------------------------------
+#
+# Every node knows its source span, whether it is empty once its class strings
+# have been cleaned, and how to render itself. Anything the scanner does not
+# understand is Opaque and rendered verbatim.
+
+class Node:
+    empty = False
+
+    def __init__(self, start: int, end: int):
+        self.start = start
+        self.end = end
+
+    def render(self, src: str) -> str:
+        return src[self.start:self.end]
+
+    def class_strings(self) -> Iterator['Node']:
+        return iter(())
+
+class Opaque(Node):
+    pass
+
+class Str(Node):
+    """A string literal in class position."""
+
+    def __init__(self, start: int, end: int, src: str, clean: Callable[[str], str]):
+        super().__init__(start, end)
+        self.quote = src[start]
+        self.value = src[start + 1:end - 1]
+        self.cleaned = clean(self.value)
+        self.changed = self.cleaned != self.value
+        self.empty = not self.cleaned.strip()
+
+    def render(self, src: str) -> str:
+        if not self.changed:
+            return src[self.start:self.end]
+        return f'{self.quote}{self.cleaned}{self.quote}'
+
+    def class_strings(self) -> Iterator[Node]:
+        yield self
+
+class TemplateText:
+    """A static chunk of a template literal in class position."""
+
+    def __init__(self, start: int, end: int, value: str, cleaned: str):
+        self.start = start
+        self.end = end
+        self.value = value
+        self.cleaned = cleaned
+        self.changed = cleaned != value
+
+class Template(Node):
+    def __init__(self, token: Token, src: str, clean: Callable[[str], str]):
+        super().__init__(token.start, token.end)
+        self.parts = []
+        parts = token.parts
+        for i, part in enumerate(parts):
+            if part[0] == 'expr':
+                _, start, end, tokens = part
+                node = parse_class_expr(src, tokens, 0, len(tokens), clean) if tokens else Opaque(start, start)
+                self.parts.append((start, end, node))
+                continue
+            _, start, end = part
+            value = src[start:end]
+            if '\\' in value:
+                cleaned = value
+            else:
+                # A word touching ${...} is only a fragment of a class; leave it alone
+                glued_left = i > 0 and value[:1] not in ('', ' ', '\t', '\n')
+                glued_right = i < len(parts) - 1 and value[-1:] not in ('', ' ', '\t', '\n')
+                cleaned = clean_template_text(value, clean, glued_left, glued_right)
+            self.parts.append(TemplateText(start, end, value, cleaned))
+        self.empty = all(
+            part[2].empty if isinstance(part, tuple) else not part.cleaned.strip()
+            for part in self.parts
+        )
+
+    def render(self, src: str) -> str:
+        out = ['`']
+        dropped = False
+        for part in self.parts:
+            if isinstance(part, TemplateText):
+                text = part.cleaned
+                if dropped and out[-1][-1:].isspace():
+                    text = text.lstrip()
+                    if not text and part is self.parts[-1]:
+                        out[-1] = out[-1].rstrip()
+                if text:
+                    out.append(text)
+                dropped = False
+                continue
+            start, end, node = part
+            if node.empty and node.start < node.end:
+                # Drop interpolations that no longer contribute a class
+                dropped = True
+                continue
+            out.append('${' + src[start:node.start] + node.render(src) + src[node.end:end] + '}')
+        out.append('`')
+        return ''.join(out)
+
+    def class_strings(self) -> Iterator:
+        for part in self.parts:
+            if isinstance(part, TemplateText):
+                yield part
+            else:
+                yield from part[2].class_strings()
+
+def clean_template_text(value: str, clean: Callable[[str], str], glued_left: bool, glued_right: bool) -> str:
+    words = value.split()
+    if not words:
+        return value
+    leading = value[:len(value) - len(value.lstrip())]
+    trailing = value[len(value.rstrip()):]
+    kept = [
+        word for i, word in enumerate(words)
+        if (i == 0 and glued_left) or (i == len(words) - 1 and glued_right) or clean(word)
+    ]
+    if not kept:
+        return leading or trailing
+    return leading + ' '.join(kept) + trailing
+
+class Group(Node):
+    def __init__(self, start: int, end: int, inner: Node):
+        super().__init__(start, end)
+        self.inner = inner
+        self.empty = inner.empty
+
+    def render(self, src: str) -> str:
+        inner = self.inner
+        return src[self.start:inner.start] + inner.render(src) + src[inner.end:self.end]
+
+    def class_strings(self) -> Iterator:
+        return self.inner.class_strings()
+
+class And(Node):
+    """`cond && <class expr>`"""
+
+    def __init__(self, start: int, right: Node):
+        super().__init__(start, right.end)
+        self.right = right
+        self.empty = right.empty
+
+    def render(self, src: str) -> str:
+        return src[self.start:self.right.start] + self.right.render(src)
+
+    def class_strings(self) -> Iterator:
+        return self.right.class_strings()
+
+class Cond(Node):
+    """`test ? <class expr> : <class expr>`"""
+
+    def __init__(self, start: int, test_end: int, test_needs_parens: bool, cons: Node, alt: Node):
+        super().__init__(start, alt.end)
+        self.test_end = test_end
+        self.test_needs_parens = test_needs_parens
+        self.cons = cons
+        self.alt = alt
+        self.empty = cons.empty and alt.empty
+        # Set by drops_falsy(): a falsy test can only become `test && ...`
+        # where cn()/clsx() discard it. Anywhere else (a template literal, a
+        # bare className) it would render as "false" or "0".
+        self.falsy_dropped = False
+
+    def render(self, src: str) -> str:
+        cons, alt = self.cons, self.alt
+        if alt.empty and not cons.empty and self.falsy_dropped:
+            test = src[self.start:self.test_end]
+            if self.test_needs_parens:
+                test = f'({test})'
+            return f'{test} && {cons.render(src)}'
+        return (
+            src[self.start:cons.start] + cons.render(src)
+            + src[cons.end:alt.start] + alt.render(src)
+        )
+
+    def class_strings(self) -> Iterator:
+        yield from self.cons.class_strings()
+        yield from self.alt.class_strings()
+
+class Seq(Node):
+    """A bracketed, comma-separated list whose empty items are dropped: cn(...), [...], {...}."""
+
+    def __init__(self, start: int, open_end: int, close_start: int, end: int, items: list[Node]):
+        super().__init__(start, end)
+        self.open_end = open_end
+        self.close_start = close_start
+        self.items = items
+        self.empty = all(item.empty for item in items)
+
+    def render(self, src: str) -> str:
+        items = self.items
+        kept = [i for i, item in enumerate(items) if not item.empty]
+        head = src[self.start:self.open_end]
+        tail = src[self.close_start:self.end]
+        if not kept:
+            return head + tail
+        # Between two items: the comma and any comment on its line go with the
+        # item before it, the lines after (its comments) with the item after
+        trailing, leading = [], [src[self.open_end:items[0].start]]
+        for before, after in zip(items, items[1:]):
+            owned, rest = split_separator(src[before.end:after.start])
+            trailing.append(owned)
+            leading.append(rest)
+        closing = src[items[-1].end:self.close_start]
+
+        # The text after the opening bracket stays unless the new first item
+        # has a comment of its own: a comment there usually heads the list
+        first = kept[0]
+        lead = leading[0]
+        if first > 0 and ('//' in leading[first] or '/*' in leading[first]):
+            lead = leading[first] if '\n' in leading[0] else leading[first].lstrip(' \t')
+        out = [head, lead]
+        for n, i in enumerate(kept):
+            out.append(items[i].render(src))
+            if n + 1 < len(kept):
+                out.append(trailing[i] + leading[kept[n + 1]])
+            elif i < len(items) - 1:
+                # Now the last item: keep its comment, and its comma only if
+                # the list had a trailing comma (in place of that one)
+                owned = trailing[i]
+                trailing_comma = comma_index(closing)
+                if trailing_comma >= 0:
+                    closing = closing[:trailing_comma] + closing[trailing_comma + 1:]
+                else:
+                    comma = comma_index(owned)
+                    owned = (owned[:comma] + owned[comma + 1:]).rstrip(' \t') if comma >= 0 else owned
+                if '//' in owned and '\n' not in closing:
+                    # A line comment would swallow the closing bracket
+                    owned += '\n'
+                out.append(owned)
+        out.append(closing)
+        out.append(tail)
+        return ''.join(out)
+
+    def class_strings(self) -> Iterator:
+        for item in self.items:
+            yield from item.class_strings()
+
+def comma_index(sep: str) -> int:
+    """Index of the comma in the text between two items, skipping comments (-1 if none)."""
+    i = 0
+    while i < len(sep):
+        if sep.startswith('//', i):
+            end = sep.find('\n', i)
+            i = len(sep) if end < 0 else end
+        elif sep.startswith('/*', i):
+            end = sep.find('*/', i + 2)
+            i = len(sep) if end < 0 else end + 2
+        elif sep[i] == ',':
+            return i
+        else:
+            i += 1
+    return -1
+
+def split_separator(sep: str) -> tuple[str, str]:
+    """Split the text between two items into (the first item's comma and same-line comment, the rest)."""
+    comma = comma_index(sep)
+    if comma < 0:
+        return '', sep
+    line_end = sep.find('\n', comma + 1)
+    if line_end >= 0 and sep[comma + 1:line_end].strip():
+        return sep[:line_end], sep[line_end:]
+    return sep[:comma + 1], sep[comma + 1:]
+
+class Prop(Node):
+    """`"classes": cond` inside an object in class position."""
+
+    def __init__(self, key: Str, end: int):
+        super().__init__(key.start, end)
+        self.key = key
+        self.empty = key.empty
+
+    def render(self, src: str) -> str:
+        return self.key.render(src) + src[self.key.end:self.end]
+
+    def class_strings(self) -> Iterator:
+        return self.key.class_strings()
+
+def drops_falsy(node: Node) -> None:
+    """Mark a direct argument of cn()/clsx() (or an item of an array inside one) as a place falsy values vanish."""
+    if isinstance(node, Cond):
+        node.falsy_dropped = True
+    elif isinstance(node, Group):
+        drops_falsy(node.inner)
+    elif isinstance(node, Seq):
+        for item in node.items:
+            drops_falsy(item)
+
+# --- Parser ------------------------------------------------------------------
+
+def match_brackets(tokens: list[Token]) -> list[int]:
+    """For each opening bracket token, the index of its closing token (-1 otherwise)."""
+    matches = [-1] * len(tokens)
+    stack = []
+    for i, token in enumerate(tokens):
+        if token.kind == 'open':
+            stack.append(i)
+        elif token.kind == 'close':
+            matches[stack.pop()] = i
+    return matches
+
+def top_level(tokens: list[Token], matches: list[int], lo: int, hi: int) -> Iterator[int]:
+    """Indices of tokens in [lo, hi) that are not nested inside brackets."""
+    i = lo
+    while i < hi:
+        yield i
+        i = matches[i] + 1 if tokens[i].kind == 'open' else i + 1
+
+def split_commas(src: str, tokens: list[Token], matches: list[int], lo: int, hi: int) -> list[tuple[int, int]]:
+    segments = []
+    start = lo
+    for i in top_level(tokens, matches, lo, hi):
+        if tokens[i].kind == 'op' and src[tokens[i].start] == ',':
+            segments.append((start, i))
+            start = i + 1
+    if start < hi:
+        segments.append((start, hi))
+    return segments
+
+def parse_class_expr(src: str, tokens: list[Token], lo: int, hi: int,
+                     clean: Callable[[str], str], matches: list[int] | None = None) -> Node:
+    """Parse tokens[lo:hi] as an expression in class position."""
+    if matches is None:
+        matches = match_brackets(tokens)
+    if lo >= hi:
+        raise ParseError("empty expression")
+
+    question = None
+    ands = []
+    other_logic = False
+    for i in top_level(tokens, matches, lo, hi):
+        token = tokens[i]
+        if token.kind != 'op':
+            continue
+        op = src[token.start:token.end]
+        if op == '?':
+            question = i
+            break
+        if op == '&&':
+            ands.append(i)
+        elif op in ('||', '??'):
+            other_logic = True
+        elif op in (',', '=', '=>'):
+            return Opaque(tokens[lo].start, tokens[hi - 1].end)
+
+    if question is not None:
+        depth = 1
+        colon = None
+        for i in top_level(tokens, matches, question + 1, hi):
+            if tokens[i].kind != 'op':
+                continue
+            op = src[tokens[i].start:tokens[i].end]
+            if op == '?':
+                depth += 1
+            elif op == ':':
+                depth -= 1
+                if depth == 0:
+                    colon = i
+                    break
+        if colon is None or question == lo:
+            raise ParseError("malformed ternary")
+        cons = parse_class_expr(src, tokens, question + 1, colon, clean, matches)
+        alt = parse_class_expr(src, tokens, colon + 1, hi, clean, matches)
+        return Cond(tokens[lo].start, tokens[question - 1].end, other_logic, cons, alt)
+
+    if other_logic:
+        return Opaque(tokens[lo].start, tokens[hi - 1].end)
+
+    if ands:
+        last = ands[-1]
+        if last == lo:
+            raise ParseError("malformed && expression")
+        right = parse_class_expr(src, tokens, last + 1, hi, clean, matches)
+        return And(tokens[lo].start, right)
+
+    return parse_primary(src, tokens, lo, hi, clean, matches)
+
+def parse_primary(src: str, tokens: list[Token], lo: int, hi: int,
+                  clean: Callable[[str], str], matches: list[int]) -> Node:
+    first = tokens[lo]
+    last = tokens[hi - 1]
+
+    if hi - lo == 1:
+        if first.kind == 'str' and '\\' not in src[first.start:first.end]:
+            return Str(first.start, first.end, src, clean)
+        if first.kind == 'template':
+            return Template(first, src, clean)
+
+    if first.kind == 'open' and matches[lo] == hi - 1:
+        bracket = src[first.start]
+        if bracket == '(':
+            inner = parse_class_expr(src, tokens, lo + 1, hi - 1, clean, matches)
+            return Group(first.start, last.end, inner)
+        segments = split_commas(src, tokens, matches, lo + 1, hi - 1)
+        if bracket == '[':
+            items = [parse_class_expr(src, tokens, a, b, clean, matches) for a, b in segments]
+        else:
+            items = [parse_prop(src, tokens, a, b, clean) for a, b in segments]
+        return Seq(first.start, first.end, last.start, last.end, items)
+
+    if (first.kind == 'ident' and src[first.start:first.end] in CLASS_FUNCTIONS
+            and hi - lo >= 3 and tokens[lo + 1].kind == 'open'
+            and src[tokens[lo + 1].start] == '(' and matches[lo + 1] == hi - 1):
+        paren = tokens[lo + 1]
+        segments = split_commas(src, tokens, matches, lo + 2, hi - 1)
+        items = [parse_class_expr(src, tokens, a, b, clean, matches) for a, b in segments]
+        for item in items:
+            drops_falsy(item)
+        return Seq(first.start, paren.end, last.start, last.end, items)
+
+    return Opaque(first.start, last.end)
+
+def parse_prop(src: str, tokens: list[Token], lo: int, hi: int, clean: Callable[[str], str]) -> Node:
+    first = tokens[lo]
+    if (hi - lo >= 3 and first.kind == 'str' and '\\' not in src[first.start:first.end]
+            and src[tokens[lo + 1].start:tokens[lo + 1].end] == ':'):
+        return Prop(Str(first.start, first.end, src, clean), tokens[hi - 1].end)
+    return Opaque(first.start, tokens[hi - 1].end)
+
+# --- Attributes --------------------------------------------------------------
+
+class Attribute:
+    """One className attribute: its span, value node and whether it is a plain string."""
+
+    def __init__(self, start: int, end: int, node: Node, braced: bool):
+        self.start = start
+        self.end = end
+        self.node = node
+        self.braced = braced
+
+def iter_attributes(src: str, clean: Callable[[str], str]) -> Iterator[Attribute]:
+    """Yield every className attribute the scanner can parse, in source order."""
+    resume = 0
+    for match in ATTRIBUTE_RE.finditer(src):
+        start = match.start()
+        if start < resume:
+            continue
+        value_start = match.end()
+        quote = src[value_start:value_start + 1]
+        if quote == '"' or quote == "'":
+            # JSX attribute strings have no escapes
+            close = src.find(quote, value_start + 1)
+            if close < 0:
+                continue
+            node = Str(value_start, close + 1, src, clean)
+            yield Attribute(start, close + 1, node, braced=False)
+            resume = close + 1
+        elif quote == '{':
+            try:
+                tokens, close = lex_expression(src, value_start + 1)
+                if not tokens:
+                    continue
+                node = parse_class_expr(src, tokens, 0, len(tokens), clean)
+            except ParseError:
+                continue
+            yield Attribute(start, close + 1, node, braced=True)
+            resume = close + 1
+
+def rewrite_classnames(src: str, clean: Callable[[str], str]) -> tuple[str, int]:
+    """
+    Clean every class string in className attributes. Returns (new_src, num_changes),
+    counting one change per rewritten string. Attributes left with no classes are
+    removed together with the whitespace before them.
+    """
+    out = []
+    last = 0
+    changes = 0
+    for attr in iter_attributes(src, clean):
+        node = attr.node
+        changed = sum(1 for s in node.class_strings() if s.changed)
+        changes += changed
+
+        if node.empty:
+            cut = attr.start
+            while cut > last and src[cut - 1].isspace():
+                cut -= 1
+            out.append(src[last:cut])
+        elif changed:
+            out.append(src[last:attr.start])
+            out.append(src[attr.start:node.start] + node.render(src) + src[node.end:attr.end])
+        else:
+            continue
+        last = attr.end
+
+    out.append(src[last:])
+    return ''.join(out), changes
+
+def iter_class_strings(src: str) -> Iterator[tuple[int, str]]:
+    """Yield (offset, value) for every class string inside className attributes."""
+    for attr in iter_attributes(src, _keep_all):
+        for s in attr.node.class_strings():
+            yield s.start, s.value
+
+def iter_class_tokens(src: str) -> Iterator[tuple[int, str]]:
+    """
+    Yield (offset, class) for every whole class token inside className
+    attributes. Template words glued to a ${...} are fragments, not classes,
+    and are skipped.
+    """
+    for attr in iter_attributes(src, _keep_all):
+        for s in attr.node.class_strings():
+            # Str spans its quotes; TemplateText is the bare text
+            base = s.start + 1 if isinstance(s, Str) else s.start
+            for match in CLASS_TOKEN_RE.finditer(s.value):
+                start = base + match.start()
+                end = base + match.end()
+                if src[start - 1] == '}' or src.startswith('${', end):
+                    continue
+                yield start, match.group()
+
+def _keep_all(classname: str) -> str:
+    return classname
@@ -11,8 +11,7 @@ import {
   parseNutritionResponse,
   validateNutritionRanges,
 } from "@/lib/ai/nutrition-extraction-prompt";
-
-const ANTHROPIC_API_URL = "https://api.anthropic.com/v1/messages";
+import { ANTHROPIC_API_URL } from "@/lib/ai/anthropic";
 
 /**
  * Internal function to extract nutrition for a recipe
@@ -6,12 +6,9 @@ import type {
   ShoppingListItem,
   ShoppingListWithItems,
 } from "@/types/shopping-list";
-import {
-  mergeShoppingItems,
-  type MergeableItem,
-} from "@/lib/ingredient-scaler";
+import { mergeShoppingItems } from "@/lib/ingredient-scaler";
 import { getOrCreateShoppingList } from "./read";
-import { parseIngredient } from "./utils";
+import { collectShoppingItems, type RecipeIngredients } from "./utils";
 
 /**
  * Generate shopping list from meal plan
@@ -56,27 +53,9 @@ export async function generateFromMealPlan() {
   }
 
   // Collect all ingredients from all recipes
-  const ingredientsToAdd: MergeableItem[] = [];
-
-  for (const assignment of assignments) {
-    const recipe = assignment.recipe as unknown as {
-      id: string;
-      title: string;
-      ingredients: string[];
-    };
-
-    if (recipe && recipe.ingredients) {
-      for (const ingredient of recipe.ingredients) {
-        // Parse ingredient (basic parsing - could be enhanced)
-        const parsed = parseIngredient(ingredient);
-        ingredientsToAdd.push({
-          ...parsed,
-          recipe_id: recipe.id,
-          recipe_title: recipe.title,
-        });
-      }
-    }
-  }
+  const ingredientsToAdd = collectShoppingItems(
+    assignments.map((assignment) => assignment.recipe as unknown as RecipeIngredients)
+  );
 
   // Merge duplicate ingredients with smart unit conversion
   const mergedItems = mergeShoppingItems(ingredientsToAdd);
@@ -193,26 +172,9 @@ export async function generateMultiWeekShoppingList(
   }
 
   // Collect all ingredients from all recipes
-  const ingredientsToAdd: MergeableItem[] = [];
-
-  for (const assignment of assignments) {
-    const recipe = assignment.recipe as unknown as {
-      id: string;
-      title: string;
-      ingredients: string[];
-    };
-
-    if (recipe && recipe.ingredients) {
-      for (const ingredient of recipe.ingredients) {
-        const parsed = parseIngredient(ingredient);
-        ingredientsToAdd.push({
-          ...parsed,
-          recipe_id: recipe.id,
-          recipe_title: recipe.title,
-        });
-      }
-    }
-  }
+  const ingredientsToAdd = collectShoppingItems(
+    assignments.map((assignment) => assignment.recipe as unknown as RecipeIngredients)
+  );
 
   // Merge duplicate ingredients with smart unit conversion
   const mergedItems = mergeShoppingItems(ingredientsToAdd);
@@ -1,4 +1,41 @@
 import type { NewShoppingListItem } from "@/types/shopping-list";
+import type { MergeableItem } from "@/lib/ingredient-scaler";
+
+export interface RecipeIngredients {
+  id: string;
+  title: string;
+  ingredients: string[];
+}
+
+/**
+ * Collect the ingredient lines of a meal plan's recipes for merging
+ * Staples repeat across recipes, so each distinct line is parsed once
+ */
+export function collectShoppingItems(
+  recipes: Array<RecipeIngredients | null | undefined>
+): MergeableItem[] {
+  const parsedLines = new Map<string, NewShoppingListItem>();
+  const items: MergeableItem[] = [];
+
+  for (const recipe of recipes) {
+    if (!recipe || !recipe.ingredients) continue;
+
+    for (const ingredient of recipe.ingredients) {
+      let parsed = parsedLines.get(ingredient);
+      if (!parsed) {
+        parsed = parseIngredient(ingredient);
+        parsedLines.set(ingredient, parsed);
+      }
+      items.push({
+        ...parsed,
+        recipe_id: recipe.id,
+        recipe_title: recipe.title,
+      });
+    }
+  }
+
+  return items;
+}
 
 /**
  * Simple ingredient parser
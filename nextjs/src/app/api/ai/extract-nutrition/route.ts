@@ -7,11 +7,10 @@ import {
   validateNutritionRanges,
 } from "@/lib/ai/nutrition-extraction-prompt";
 import type { NutritionExtractionRequest } from "@/types/nutrition";
+import { ANTHROPIC_API_URL } from "@/lib/ai/anthropic";
 
 export const dynamic = "force-dynamic";
 
-const ANTHROPIC_API_URL = "https://api.anthropic.com/v1/messages";
-
 /**
  * POST /api/ai/extract-nutrition
  *
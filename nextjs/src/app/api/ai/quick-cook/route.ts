@@ -5,9 +5,9 @@ import { getUserTier } from '@/lib/stripe/subscription';
 import { buildQuickCookPrompt, parseQuickCookResponse } from '@/lib/ai/quick-cook-prompt';
 import { rateLimit } from '@/lib/rate-limit';
 import type { QuickCookRequest, QuickCookResponse, QUICK_COOK_QUOTA } from '@/types/quick-cook';
+import { ANTHROPIC_API_URL } from '@/lib/ai/anthropic';
 
 const ANTHROPIC_API_KEY = process.env.ANTHROPIC_API_KEY;
-const ANTHROPIC_API_URL = 'https://api.anthropic.com/v1/messages';
 
 /**
  * Quick Cook daily quota configuration by tier
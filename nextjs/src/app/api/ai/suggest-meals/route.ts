@@ -5,9 +5,9 @@ import { checkAISuggestionQuota, decrementAISuggestionQuota } from '@/lib/stripe
 import { buildMealSuggestionPrompt, parseAISuggestionResponse } from '@/lib/ai/meal-suggestion-prompt';
 import { rateLimit } from '@/lib/rate-limit';
 import type { AISuggestionRequest, AISuggestionContext } from '@/types/ai-suggestion';
+import { ANTHROPIC_API_URL } from '@/lib/ai/anthropic';
 
 const ANTHROPIC_API_KEY = process.env.ANTHROPIC_API_KEY;
-const ANTHROPIC_API_URL = 'https://api.anthropic.com/v1/messages';
 
 export async function POST(req: Request) {
   try {
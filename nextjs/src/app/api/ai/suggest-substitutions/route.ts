@@ -11,9 +11,9 @@ import {
 import { rateLimit } from '@/lib/rate-limit';
 import type { SubstitutionRequest, SubstitutionResponse, SubstitutionError, SubstitutionContext } from '@/types/substitution';
 import { SUBSTITUTION_QUOTA_BY_TIER } from '@/types/substitution';
+import { ANTHROPIC_API_URL } from '@/lib/ai/anthropic';
 
 const ANTHROPIC_API_KEY = process.env.ANTHROPIC_API_KEY;
-const ANTHROPIC_API_URL = 'https://api.anthropic.com/v1/messages';
 
 export async function POST(req: Request) {
   try {
@@ -5,10 +5,10 @@ import {
   parseNutritionResponse,
   validateNutritionRanges,
 } from "@/lib/ai/nutrition-extraction-prompt";
+import { ANTHROPIC_API_URL } from "@/lib/ai/anthropic";
 
 export const dynamic = "force-dynamic";
 
-const ANTHROPIC_API_URL = "https://api.anthropic.com/v1/messages";
 const BATCH_SIZE = 3; // Process 3 recipes per cron run to stay under rate limits
 const MAX_ATTEMPTS = 3;
 
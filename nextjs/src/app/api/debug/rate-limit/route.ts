@@ -0,0 +1,72 @@
+import { NextRequest, NextResponse } from "next/server";
+import { rateLimit as rateLimitMemory } from "@/lib/rate-limit";
+import { rateLimit as rateLimitRedis } from "@/lib/rate-limit-redis";
+
+export const dynamic = "force-dynamic";
+
+const LIMITERS = ["memory", "redis", "none"];
+
+// Debug endpoint for testsprite_tests/burst_rate_limit.py: runs one check
+// against either limiter so bursts can be fired at it without the cost of a
+// real route. "none" skips the limiter, as a baseline for request overhead.
+// Keys are prefixed so a probe never touches a real user's bucket.
+export async function POST(request: NextRequest) {
+  if (process.env.NODE_ENV === "production") {
+    return NextResponse.json({ error: "Not found" }, { status: 404 });
+  }
+
+  const body = await request.json().catch(() => null);
+  const { limiter, key, limit, windowMs } = body ?? {};
+
+  if (
+    !LIMITERS.includes(limiter) ||
+    typeof key !== "string" ||
+    !key ||
+    !Number.isInteger(limit) ||
+    limit < 1 ||
+    !Number.isInteger(windowMs) ||
+    windowMs < 1
+  ) {
+    return NextResponse.json(
+      { error: 'Expected { limiter: "memory" | "redis" | "none", key, limit, windowMs }' },
+      { status: 400 }
+    );
+  }
+
+  const options = { identifier: `probe:${key}`, limit, windowMs };
+  const start = performance.now();
+  const result =
+    limiter === "memory"
+      ? rateLimitMemory(options)
+      : limiter === "redis"
+        ? await rateLimitRedis(options)
+        : { success: true, limit, remaining: limit, reset: Date.now() + windowMs };
+  const duration = performance.now() - start;
+
+  // rate-limit-redis.ts falls back to memory when Upstash isn't configured
+  const backend =
+    limiter === "redis"
+      ? process.env.UPSTASH_REDIS_REST_URL ? "upstash" : "memory-fallback"
+      : limiter;
+
+  const headers: Record<string, string> = {
+    "X-RateLimit-Limit": result.limit.toString(),
+    "X-RateLimit-Remaining": result.remaining.toString(),
+    "X-RateLimit-Reset": result.reset.toString(),
+    "Server-Timing": `ratelimit;dur=${duration.toFixed(3)}`,
+  };
+
+  if (!result.success) {
+    const retryAfter = Math.ceil((result.reset - Date.now()) / 1000);
+    headers["Retry-After"] = retryAfter.toString();
+    return NextResponse.json(
+      { success: false, backend, retryAfter, reset: result.reset },
+      { status: 429, headers }
+    );
+  }
+
+  return NextResponse.json(
+    { success: true, backend, remaining: result.remaining, reset: result.reset },
+    { headers }
+  );
+}
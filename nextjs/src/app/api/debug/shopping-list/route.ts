@@ -0,0 +1,56 @@
+import { NextRequest, NextResponse } from "next/server";
+import { mergeShoppingItems, mergeWithConfidence } from "@/lib/ingredient-scaler";
+import { collectShoppingItems, type RecipeIngredients } from "@/app/actions/shopping-list/utils";
+
+export const dynamic = "force-dynamic";
+
+const MERGERS = ["basic", "confidence"];
+
+// Debug endpoint for testsprite_tests/bench_shopping_list.py: runs the
+// aggregation step of shopping list generation on a meal plan sent in the
+// body, so it can be timed at sizes no test household has. "basic" is the
+// merge generateFromMealPlan uses, "confidence" is mergeWithConfidence.
+export async function POST(request: NextRequest) {
+  if (process.env.NODE_ENV === "production") {
+    return NextResponse.json({ error: "Not found" }, { status: 404 });
+  }
+
+  const body = await request.json().catch(() => null);
+  const { recipes, merge = "basic" } = body ?? {};
+
+  if (
+    !Array.isArray(recipes) ||
+    !MERGERS.includes(merge) ||
+    !recipes.every(
+      (recipe: RecipeIngredients) =>
+        recipe &&
+        typeof recipe.id === "string" &&
+        typeof recipe.title === "string" &&
+        Array.isArray(recipe.ingredients) &&
+        recipe.ingredients.every((line) => typeof line === "string")
+    )
+  ) {
+    return NextResponse.json(
+      { error: 'Expected { recipes: [{ id, title, ingredients: string[] }], merge?: "basic" | "confidence" }' },
+      { status: 400 }
+    );
+  }
+
+  const collectStart = performance.now();
+  const lines = collectShoppingItems(recipes);
+  const mergeStart = performance.now();
+  const items = merge === "confidence" ? mergeWithConfidence(lines) : mergeShoppingItems(lines);
+  const mergeEnd = performance.now();
+
+  return NextResponse.json(
+    { merge, lines: lines.length, merged: items.length, items },
+    {
+      headers: {
+        "Server-Timing": [
+          `collect;dur=${(mergeStart - collectStart).toFixed(3)}`,
+          `merge;dur=${(mergeEnd - mergeStart).toFixed(3)}`,
+        ].join(", "),
+      },
+    }
+  );
+}
@@ -6,11 +6,10 @@ import {
   schemaToRecipeFormat,
   type NormalizedRecipeSchema,
 } from "@/lib/recipe-schema-extractor";
+import { ANTHROPIC_API_URL } from "@/lib/ai/anthropic";
 
 export const dynamic = "force-dynamic";
 
-const ANTHROPIC_API_URL = "https://api.anthropic.com/v1/messages";
-
 export async function POST(request: NextRequest) {
   try {
     // Check authentication
@@ -3,6 +3,7 @@ import { createClient } from "@/lib/supabase/server";
 import { PEPPER_SYSTEM_PROMPT, buildPepperContextMessage } from "@/lib/ai/pepper-prompt";
 import { searchRecipes, addToMealPlan, addToShoppingList, getRecipeDetails } from "@/app/actions/pepper";
 import type { PepperContext, PepperRecipeSummary, PepperPantryItem, PepperMealHistory, PepperAction } from "@/types/pepper";
+import { ANTHROPIC_API_URL } from "@/lib/ai/anthropic";
 
 // Type for meal assignment from Supabase query with nested recipe relation
 // Note: Supabase returns nested relations as arrays even for single items
@@ -14,7 +15,6 @@ interface MealAssignmentDB {
 }
 
 const ANTHROPIC_API_KEY = process.env.ANTHROPIC_API_KEY;
-const ANTHROPIC_API_URL = "https://api.anthropic.com/v1/messages";
 
 // Tool definitions for Claude
 const PEPPER_TOOLS = [
@@ -1,11 +1,13 @@
 import { NextRequest, NextResponse } from "next/server";
 import { createClient } from "@/lib/supabase/server";
+import { getCachedUser } from "@/lib/supabase/cached-queries";
 import { rateLimit } from "@/lib/rate-limit-redis";
 import { assertValidOrigin } from "@/lib/security/csrf";
 
 export const dynamic = "force-dynamic";
 
-// POST /api/recipes/[id]/rate - Rate a recipe
+// POST /api/recipes/[id]/rate - Rate the last time you cooked a recipe
+// Returns the recipe's average rating and rating count, including this one
 export async function POST(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
@@ -17,9 +19,9 @@ export async function POST(
   try {
     const { id } = await params;
     const supabase = await createClient();
-    const { data: { user } } = await supabase.auth.getUser();
+    const { user, error: authError } = await getCachedUser();
 
-    if (!user) {
+    if (authError || !user) {
       return NextResponse.json(
         { error: "Authentication required" },
         { status: 401 }
@@ -50,10 +52,10 @@ export async function POST(
       );
     }
 
-    // Get current recipe rating
+    // Verify recipe exists
     const { data: recipe, error: recipeError } = await supabase
       .from("recipes")
-      .select("rating, rating_count")
+      .select("id")
       .eq("id", id)
       .single();
 
@@ -64,33 +66,61 @@ export async function POST(
       );
     }
 
-    // Calculate new average rating
-    const currentRating = recipe.rating || 0;
-    const currentCount = recipe.rating_count || 0;
-    const newCount = currentCount + 1;
-    const newAverageRating = ((currentRating * currentCount) + newRating) / newCount;
+    // Ratings live on cooking history entries. Rate the user's latest cook
+    // rather than inserting an entry, which would count as another cook;
+    // rating again replaces that cook's rating. The history trigger keeps the
+    // recipe's running totals (see 20251225_incremental_recipe_ratings.sql)
+    const { data: lastCook, error: historyError } = await supabase
+      .from("cooking_history")
+      .select("id")
+      .eq("recipe_id", id)
+      .eq("user_id", user.id)
+      .order("cooked_at", { ascending: false })
+      .limit(1)
+      .maybeSingle();
 
-    // Update recipe with new rating
-    const { data: updatedRecipe, error: updateError } = await supabase
+    if (historyError) {
+      return NextResponse.json(
+        { error: historyError.message },
+        { status: 500 }
+      );
+    }
+
+    if (!lastCook) {
+      return NextResponse.json(
+        { error: "Cook this recipe before rating it" },
+        { status: 409 }
+      );
+    }
+
+    const { error: updateError } = await supabase
+      .from("cooking_history")
+      .update({ rating: newRating })
+      .eq("id", lastCook.id);
+
+    if (updateError) {
+      return NextResponse.json(
+        { error: updateError.message },
+        { status: 500 }
+      );
+    }
+
+    const { data: totals, error: totalsError } = await supabase
       .from("recipes")
-      .update({
-        rating: Math.round(newAverageRating * 100) / 100, // Round to 2 decimal places
-        rating_count: newCount,
-      })
+      .select("avg_rating, review_count")
       .eq("id", id)
-      .select("rating, rating_count")
       .single();
 
-    if (updateError) {
+    if (totalsError) {
       return NextResponse.json(
-        { error: updateError.message },
+        { error: totalsError.message },
         { status: 500 }
       );
     }
 
     return NextResponse.json({
-      rating: updatedRecipe.rating,
-      rating_count: updatedRecipe.rating_count,
+      rating: totals.avg_rating,
+      rating_count: totals.review_count,
       message: "Rating submitted successfully",
     });
   } catch (error) {
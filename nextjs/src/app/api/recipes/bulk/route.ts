@@ -0,0 +1,184 @@
+import { NextRequest, NextResponse } from "next/server";
+import { createClient } from "@/lib/supabase/server";
+import { recipeRowFromBody } from "@/lib/recipe/api-input";
+import { assertValidOrigin } from "@/lib/security/csrf";
+import { rateLimit } from "@/lib/rate-limit-redis";
+
+export const dynamic = "force-dynamic";
+
+// Rows per request. Each request is a single INSERT or DELETE statement, so
+// it runs in one transaction: every row is written (or removed) or none is.
+const MAX_BULK_RECIPES = 500;
+
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+async function authorize(action: "create" | "delete") {
+  const supabase = await createClient();
+  const { data: { user } } = await supabase.auth.getUser();
+
+  if (!user) {
+    return {
+      error: NextResponse.json(
+        { error: "Authentication required" },
+        { status: 401 }
+      ),
+    };
+  }
+
+  // Rate limiting: 60 bulk requests per hour per user (up to 30,000 rows)
+  const rateLimitResult = await rateLimit({
+    identifier: `recipes-bulk-${action}-${user.id}`,
+    limit: 60,
+    windowMs: 60 * 60 * 1000, // 1 hour
+  });
+
+  if (!rateLimitResult.success) {
+    return {
+      error: NextResponse.json(
+        { error: "Rate limit exceeded. Try again later." },
+        {
+          status: 429,
+          headers: {
+            "X-RateLimit-Limit": rateLimitResult.limit.toString(),
+            "X-RateLimit-Remaining": rateLimitResult.remaining.toString(),
+            "Retry-After": Math.ceil((rateLimitResult.reset - Date.now()) / 1000).toString(),
+          },
+        }
+      ),
+    };
+  }
+
+  return { supabase, user };
+}
+
+// POST /api/recipes/bulk - Create up to 500 recipes in one transaction
+// Body: { recipes: [...] }, each recipe as accepted by POST /api/recipes
+export async function POST(request: NextRequest) {
+  // SECURITY: Validate request origin to prevent CSRF attacks
+  const csrfError = assertValidOrigin(request);
+  if (csrfError) return csrfError;
+
+  try {
+    const auth = await authorize("create");
+    if ("error" in auth) return auth.error;
+    const { supabase, user } = auth;
+
+    const body = await request.json();
+    const recipes = body?.recipes;
+
+    if (!Array.isArray(recipes) || recipes.length === 0) {
+      return NextResponse.json(
+        { error: "recipes must be a non-empty array" },
+        { status: 400 }
+      );
+    }
+
+    if (recipes.length > MAX_BULK_RECIPES) {
+      return NextResponse.json(
+        { error: `At most ${MAX_BULK_RECIPES} recipes per request` },
+        { status: 400 }
+      );
+    }
+
+    // SECURITY: Validate every recipe before writing any of them
+    const rows = [];
+    for (const [index, recipe] of recipes.entries()) {
+      const result = recipeRowFromBody(user.id, recipe ?? {});
+      if (!result.success) {
+        return NextResponse.json(
+          { error: `recipes[${index}]: ${result.error}`, index },
+          { status: 400 }
+        );
+      }
+      rows.push(result.row);
+    }
+
+    const { data, error } = await supabase
+      .from("recipes")
+      .insert(rows)
+      .select("id");
+
+    if (error) {
+      return NextResponse.json(
+        { error: error.message },
+        { status: 500 }
+      );
+    }
+
+    // Rows come back in insert order, so ids[i] belongs to recipes[i]
+    const ids = (data ?? []).map((row) => row.id);
+    return NextResponse.json({ created: ids.length, ids }, { status: 201 });
+  } catch {
+    return NextResponse.json(
+      { error: "Failed to create recipes" },
+      { status: 500 }
+    );
+  }
+}
+
+// DELETE /api/recipes/bulk - Delete up to 500 of the user's recipes in one transaction
+// Body: { ids: [...] }. Ids that don't exist or belong to someone else are skipped.
+export async function DELETE(request: NextRequest) {
+  // SECURITY: Validate request origin to prevent CSRF attacks
+  const csrfError = assertValidOrigin(request);
+  if (csrfError) return csrfError;
+
+  try {
+    const auth = await authorize("delete");
+    if ("error" in auth) return auth.error;
+    const { supabase, user } = auth;
+
+    const body = await request.json();
+    const ids = body?.ids;
+
+    if (!Array.isArray(ids) || ids.length === 0) {
+      return NextResponse.json(
+        { error: "ids must be a non-empty array" },
+        { status: 400 }
+      );
+    }
+
+    if (ids.length > MAX_BULK_RECIPES) {
+      return NextResponse.json(
+        { error: `At most ${MAX_BULK_RECIPES} ids per request` },
+        { status: 400 }
+      );
+    }
+
+    if (!ids.every((id: unknown) => typeof id === "string" && UUID_PATTERN.test(id))) {
+      return NextResponse.json(
+        { error: "ids must be recipe UUIDs" },
+        { status: 400 }
+      );
+    }
+
+    // SECURITY: Only the user's own recipes, as in DELETE /api/recipes/[id]
+    const { data, error } = await supabase
+      .from("recipes")
+      .delete()
+      .in("id", ids)
+      .eq("user_id", user.id)
+      .select("id");
+
+    if (error) {
+      return NextResponse.json(
+        { error: error.message },
+        { status: 500 }
+      );
+    }
+
+    const deleted = (data ?? []).map((row) => row.id);
+    const deletedSet = new Set(deleted);
+    return NextResponse.json({
+      deleted: deleted.length,
+      ids: deleted,
+      skipped: ids.filter((id: string) => !deletedSet.has(id)),
+    });
+  } catch (error) {
+    console.error("Error deleting recipes:", error);
+    return NextResponse.json(
+      { error: "Failed to delete recipes" },
+      { status: 500 }
+    );
+  }
+}
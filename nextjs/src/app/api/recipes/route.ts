@@ -1,6 +1,6 @@
 import { NextRequest, NextResponse } from "next/server";
 import { createClient } from "@/lib/supabase/server";
-import { recipeFormSchema, validateSchema } from "@/lib/validations/schemas";
+import { recipeRowFromBody } from "@/lib/recipe/api-input";
 import { assertValidOrigin } from "@/lib/security/csrf";
 import { rateLimit } from "@/lib/rate-limit-redis";
 
@@ -103,68 +103,17 @@ export async function POST(request: NextRequest) {
     const body = await request.json();
 
     // SECURITY: Validate request body against schema
-    // Normalize field names (handle both camelCase and snake_case)
-    const normalizedBody = {
-      title: body.title,
-      recipe_type: body.recipe_type || body.recipeType || "Dinner",
-      category: body.category || "Other",
-      protein_type: body.protein_type || body.proteinType,
-      prep_time: body.prep_time || body.prepTime,
-      cook_time: body.cook_time || body.cookTime || `${body.cook_time_minutes || body.cookTimeMinutes || 30} minutes`,
-      servings: body.servings?.toString() || "4",
-      base_servings: typeof body.servings === "number" ? body.servings : parseInt(body.servings) || 4,
-      ingredients: Array.isArray(body.ingredients)
-        ? body.ingredients.map((i: unknown) => typeof i === "string" ? i : `${(i as Record<string, string>).quantity || ""} ${(i as Record<string, string>).unit || ""} ${(i as Record<string, string>).name}`.trim())
-        : [],
-      instructions: Array.isArray(body.instructions) ? body.instructions : [],
-      tags: body.tags || [],
-      notes: body.notes,
-      source_url: body.source_url || body.sourceUrl,
-      image_url: body.image_url || body.imageUrl,
-      allergen_tags: body.allergen_tags || body.allergenTags || [],
-      is_shared_with_household: body.is_shared_with_household ?? true,
-      is_public: body.is_public ?? false,
-    };
-
-    const validation = validateSchema(recipeFormSchema, normalizedBody);
-    if (!validation.success) {
+    const result = recipeRowFromBody(user.id, body);
+    if (!result.success) {
       return NextResponse.json(
-        { error: validation.error },
+        { error: result.error },
         { status: 400 }
       );
     }
 
-    const validatedData = validation.data;
-
-    // Map validated fields to database schema
-    const recipeData = {
-      user_id: user.id,
-      title: validatedData.title,
-      description: body.description || null, // Optional, not in schema
-      recipe_type: validatedData.recipe_type,
-      category: validatedData.category || "Other",
-      protein_type: validatedData.protein_type,
-      prep_time: validatedData.prep_time,
-      cook_time: validatedData.cook_time,
-      servings: validatedData.servings || "4",
-      base_servings: validatedData.base_servings || 4,
-      ingredients: validatedData.ingredients,
-      instructions: validatedData.instructions,
-      tags: validatedData.tags,
-      notes: validatedData.notes,
-      source_url: validatedData.source_url,
-      image_url: validatedData.image_url,
-      allergen_tags: validatedData.allergen_tags,
-      is_favorite: body.is_favorite || false,
-      is_shared_with_household: validatedData.is_shared_with_household,
-      is_public: validatedData.is_public,
-      rating: body.rating || null,
-      rating_count: body.rating_count || 0,
-    };
-
     const { data: recipe, error } = await supabase
       .from("recipes")
-      .insert(recipeData)
+      .insert(result.row)
       .select()
       .single();
 
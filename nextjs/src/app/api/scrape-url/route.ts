@@ -7,6 +7,16 @@ export const dynamic = "force-dynamic";
 // Fetch timeout in milliseconds
 const FETCH_TIMEOUT_MS = 10000;
 
+// Hosts exempt from the SSRF checks below, so the local fixture origin in
+// testsprite_tests/fixture_origin.py can be scraped. Ignored in production.
+const SSRF_ALLOWED_HOSTS =
+  process.env.NODE_ENV === "production"
+    ? []
+    : (process.env.SCRAPE_URL_ALLOWED_HOSTS || "")
+        .split(",")
+        .map((host) => host.trim().toLowerCase())
+        .filter(Boolean);
+
 /**
  * SSRF Protection: Comprehensive IP blocking
  * Checks if a hostname/IP is private, local, or reserved
@@ -71,6 +81,10 @@ function isBlockedUrl(url: string): boolean {
       return true;
     }
 
+    if (SSRF_ALLOWED_HOSTS.includes(hostname)) {
+      return false;
+    }
+
     // Check if hostname is a blocked IP/localhost
     if (isBlockedIP(hostname)) {
       return true;
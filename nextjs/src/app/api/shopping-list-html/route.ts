@@ -1,7 +1,62 @@
+import { createHash } from "crypto";
 import { NextRequest, NextResponse } from "next/server";
 
 export const dynamic = "force-dynamic";
 
+// The page is a pure function of the data param, so a URL always renders the
+// same bytes. Browsers may reuse it for an hour, then revalidate with the ETag.
+const CACHE_CONTROL = "public, max-age=3600, must-revalidate";
+
+// Rendered pages keyed by the decoded payload, least recently used first.
+// Shared links get reopened over and over in the store, so most hits skip the
+// render; the byte cap keeps a run of large lists from growing the heap.
+const RENDER_CACHE_MAX_BYTES = 8 * 1024 * 1024;
+
+interface RenderedPage {
+  html: string;
+  etag: string;
+  bytes: number;
+}
+
+const renderCache = new Map<string, RenderedPage>();
+let renderCacheBytes = 0;
+
+function getCachedPage(key: string): RenderedPage | undefined {
+  const page = renderCache.get(key);
+  if (page) {
+    // Re-insert to mark it most recently used
+    renderCache.delete(key);
+    renderCache.set(key, page);
+  }
+  return page;
+}
+
+function cachePage(key: string, page: RenderedPage): void {
+  if (page.bytes > RENDER_CACHE_MAX_BYTES) {
+    return;
+  }
+  renderCache.set(key, page);
+  renderCacheBytes += page.bytes;
+  for (const [oldestKey, oldest] of renderCache) {
+    if (renderCacheBytes <= RENDER_CACHE_MAX_BYTES) {
+      break;
+    }
+    renderCache.delete(oldestKey);
+    renderCacheBytes -= oldest.bytes;
+  }
+}
+
+// If-None-Match is a comma-separated list of (possibly weak) ETags, or "*"
+function etagMatches(ifNoneMatch: string | null, etag: string): boolean {
+  if (!ifNoneMatch) {
+    return false;
+  }
+  return ifNoneMatch
+    .split(",")
+    .map((tag) => tag.trim().replace(/^W\//, ""))
+    .some((tag) => tag === "*" || tag === etag);
+}
+
 // Generate a standalone interactive shopping list HTML page
 export async function GET(request: NextRequest) {
   const searchParams = request.nextUrl.searchParams;
@@ -23,9 +78,14 @@ export async function GET(request: NextRequest) {
   };
 
   // Parse data from URL if provided
-  if (dataParam) {
+  const decoded = dataParam ? Buffer.from(dataParam, "base64").toString("utf-8") : "";
+  const cached = getCachedPage(decoded);
+  if (cached) {
+    return pageResponse(request, cached, "hit");
+  }
+
+  if (decoded) {
     try {
-      const decoded = Buffer.from(dataParam, "base64").toString("utf-8");
       const parsed = JSON.parse(decoded);
       
       // Handle different input formats gracefully
@@ -63,11 +123,31 @@ export async function GET(request: NextRequest) {
   }
 
   const html = generateInteractiveShoppingListHTML(shoppingData);
+  const page: RenderedPage = {
+    html,
+    etag: `"${createHash("sha256").update(html).digest("base64url").substring(0, 27)}"`,
+    bytes: Buffer.byteLength(html),
+  };
+  cachePage(decoded, page);
+
+  return pageResponse(request, page, "miss");
+}
+
+function pageResponse(request: NextRequest, page: RenderedPage, cache: "hit" | "miss"): NextResponse {
+  const headers = {
+    ETag: page.etag,
+    "Cache-Control": CACHE_CONTROL,
+    "X-Render-Cache": cache,
+  };
+
+  if (etagMatches(request.headers.get("if-none-match"), page.etag)) {
+    return new NextResponse(null, { status: 304, headers });
+  }
 
-  return new NextResponse(html, {
+  return new NextResponse(page.html, {
     headers: {
+      ...headers,
       "Content-Type": "text/html; charset=utf-8",
-      "Cache-Control": "no-cache, no-store, must-revalidate",
     },
   });
 }
@@ -0,0 +1,7 @@
+/**
+ * Anthropic Messages API endpoint used by every AI route and action.
+ *
+ * ANTHROPIC_BASE_URL points it somewhere else, e.g. at
+ * testsprite_tests/standin_server.py for load tests.
+ */
+export const ANTHROPIC_API_URL = `${process.env.ANTHROPIC_BASE_URL || "https://api.anthropic.com"}/v1/messages`;
@@ -2,10 +2,29 @@
  * Google Calendar API service for Next.js
  */
 
+import { randomUUID } from "crypto";
+
+// GOOGLE_API_BASE_URL points the token, calendar and userinfo calls at one
+// host instead (the offline stand-in in testsprite_tests/standin_server.py)
+const GOOGLE_API_BASE_URL = process.env.GOOGLE_API_BASE_URL;
+
 const GOOGLE_OAUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth";
-const GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token";
-const GOOGLE_CALENDAR_API = "https://www.googleapis.com/calendar/v3";
-const GOOGLE_USERINFO_API = "https://www.googleapis.com/oauth2/v2/userinfo";
+const GOOGLE_TOKEN_URL = `${GOOGLE_API_BASE_URL || "https://oauth2.googleapis.com"}/token`;
+const GOOGLE_CALENDAR_API = `${GOOGLE_API_BASE_URL || "https://www.googleapis.com"}/calendar/v3`;
+const GOOGLE_CALENDAR_BATCH_API = `${GOOGLE_API_BASE_URL || "https://www.googleapis.com"}/batch/calendar/v3`;
+const GOOGLE_USERINFO_API = `${GOOGLE_API_BASE_URL || "https://www.googleapis.com"}/oauth2/v2/userinfo`;
+
+// Meal plan sync sends events in batch requests of up to 50 (Google's limit
+// for Calendar), a few batches at a time, so a month of meals takes a handful
+// of round trips instead of one request per event
+const CALENDAR_BATCH_SIZE = 50;
+const CALENDAR_BATCH_CONCURRENCY = 4;
+
+// Events that come back rate limited or with a server error are resent, with
+// exponential backoff (full jitter, and never sooner than Retry-After)
+const CALENDAR_MAX_ATTEMPTS = 5;
+const CALENDAR_BACKOFF_BASE_MS = 500;
+const CALENDAR_BACKOFF_MAX_MS = 16000;
 
 export interface CalendarEvent {
   cook: string;
@@ -146,10 +165,10 @@ export async function getUserInfo(
 }
 
 /**
- * Create calendar event
+ * Build the Calendar API event resource for one event
  */
-export async function createCalendarEvent({
-  accessToken,
+function buildEventResource({
+  id,
   summary,
   description,
   startDateTime,
@@ -157,17 +176,17 @@ export async function createCalendarEvent({
   attendeeEmails,
   timeZone,
 }: {
-  accessToken: string;
+  id?: string;
   summary: string;
   description: string;
   startDateTime: string;
   endDateTime: string;
   attendeeEmails?: string[];
   timeZone?: string;
-}): Promise<Record<string, unknown>> {
+}): Record<string, unknown> {
   // Use provided timezone or fall back to server timezone
   const eventTimeZone = timeZone || Intl.DateTimeFormat().resolvedOptions().timeZone;
-  
+
   const event: Record<string, unknown> = {
     summary,
     description,
@@ -181,10 +200,46 @@ export async function createCalendarEvent({
     },
   };
 
+  if (id) {
+    event.id = id;
+  }
+
   if (attendeeEmails && attendeeEmails.length > 0) {
     event.attendees = attendeeEmails.map((email) => ({ email }));
   }
 
+  return event;
+}
+
+/**
+ * Create calendar event
+ */
+export async function createCalendarEvent({
+  accessToken,
+  summary,
+  description,
+  startDateTime,
+  endDateTime,
+  attendeeEmails,
+  timeZone,
+}: {
+  accessToken: string;
+  summary: string;
+  description: string;
+  startDateTime: string;
+  endDateTime: string;
+  attendeeEmails?: string[];
+  timeZone?: string;
+}): Promise<Record<string, unknown>> {
+  const event = buildEventResource({
+    summary,
+    description,
+    startDateTime,
+    endDateTime,
+    attendeeEmails,
+    timeZone,
+  });
+
   const response = await fetch(
     `${GOOGLE_CALENDAR_API}/calendars/primary/events`,
     {
@@ -205,8 +260,160 @@ export async function createCalendarEvent({
   return await response.json();
 }
 
+interface BatchPartResult {
+  status: number;
+  message: string;
+  retryAfterMs: number | null;
+}
+
+function retryAfterMs(value: string | null): number | null {
+  const seconds = Number(value);
+  return value && Number.isFinite(seconds) ? seconds * 1000 : null;
+}
+
+/**
+ * Whether a Calendar API error is worth retrying: 429, 5xx, and the 403s
+ * Calendar uses for its own rate limits
+ */
+function isRetryable(status: number, message: string): boolean {
+  if (status === 429 || status >= 500) return true;
+  return status === 403 && /rate limit/i.test(message);
+}
+
+function errorMessage(body: unknown, fallback: string): string {
+  const error = (body as { error?: { message?: string } } | null)?.error;
+  return error?.message || fallback;
+}
+
+/**
+ * Parse a multipart/mixed batch response into results by request index
+ */
+function parseBatchResponse(body: string, contentType: string): Map<number, BatchPartResult> {
+  const results = new Map<number, BatchPartResult>();
+  const boundary = contentType.match(/boundary="?([^";]+)"?/i)?.[1];
+  if (!boundary) return results;
+
+  for (const rawPart of body.split(`--${boundary}`)) {
+    const part = rawPart.replace(/\r\n/g, "\n");
+    const index = part.match(/^Content-ID:\s*<response-item-(\d+)>/im)?.[1];
+    const statusLine = part.match(/^HTTP\/[\d.]+ (\d{3})/m);
+    if (index === undefined || !statusLine || statusLine.index === undefined) continue;
+
+    // The part's own HTTP response: status line, headers, blank line, body
+    const response = part.slice(statusLine.index);
+    const headerEnd = response.indexOf("\n\n");
+    const headers = headerEnd === -1 ? response : response.slice(0, headerEnd);
+    const text = headerEnd === -1 ? "" : response.slice(headerEnd + 2).trim();
+    let json: unknown = null;
+    try {
+      json = text ? JSON.parse(text) : null;
+    } catch {
+      // Not JSON; the status is enough
+    }
+
+    const status = Number(statusLine[1]);
+    results.set(Number(index), {
+      status,
+      message: errorMessage(json, `Calendar API returned ${status}`),
+      retryAfterMs: retryAfterMs(headers.match(/^Retry-After:\s*(\S+)/im)?.[1] ?? null),
+    });
+  }
+
+  return results;
+}
+
+/**
+ * Create up to CALENDAR_BATCH_SIZE events in one batch request, resending
+ * the ones that fail with a retryable error. Returns an error message per
+ * event, or null for each event that was created.
+ */
+async function createEventBatch(
+  accessToken: string,
+  resources: Record<string, unknown>[]
+): Promise<Array<string | null>> {
+  const errors: Array<string | null> = resources.map(() => "Failed to create calendar event");
+  let pending = resources.map((_, index) => index);
+
+  for (let attempt = 1; pending.length > 0; attempt++) {
+    const retry: number[] = [];
+    let lastError = "Failed to create calendar event";
+    let wait: number | null = null;
+
+    const boundary = `batch_${randomUUID()}`;
+    const body = pending
+      .map((index, position) =>
+        [
+          `--${boundary}`,
+          "Content-Type: application/http",
+          `Content-ID: <item-${position}>`,
+          "",
+          "POST /calendar/v3/calendars/primary/events",
+          "Content-Type: application/json",
+          "",
+          JSON.stringify(resources[index]),
+        ].join("\r\n")
+      )
+      .join("\r\n") + `\r\n--${boundary}--\r\n`;
+
+    try {
+      const response = await fetch(GOOGLE_CALENDAR_BATCH_API, {
+        method: "POST",
+        headers: {
+          Authorization: `Bearer ${accessToken}`,
+          "Content-Type": `multipart/mixed; boundary=${boundary}`,
+        },
+        body,
+      });
+
+      if (!response.ok) {
+        const error = await response.json().catch(() => null);
+        lastError = errorMessage(error, `Calendar API returned ${response.status}`);
+        if (!isRetryable(response.status, lastError)) {
+          for (const index of pending) errors[index] = lastError;
+          break;
+        }
+        retry.push(...pending);
+        wait = retryAfterMs(response.headers.get("Retry-After"));
+      } else {
+        const parts = parseBatchResponse(await response.text(), response.headers.get("Content-Type") || "");
+        pending.forEach((index, position) => {
+          const part = parts.get(position);
+          // 409: the event id already exists, so an earlier attempt created it
+          if (part && (part.status < 300 || part.status === 409)) {
+            errors[index] = null;
+          } else if (!part || isRetryable(part.status, part.message)) {
+            retry.push(index);
+            if (part) lastError = part.message;
+            if (part?.retryAfterMs) wait = Math.max(wait ?? 0, part.retryAfterMs);
+          } else {
+            errors[index] = part.message;
+          }
+        });
+      }
+    } catch (error) {
+      lastError = error instanceof Error ? error.message : "Failed to reach the Calendar API";
+      retry.push(...pending);
+    }
+
+    if (retry.length === 0) break;
+    if (attempt >= CALENDAR_MAX_ATTEMPTS) {
+      for (const index of retry) errors[index] = lastError;
+      break;
+    }
+
+    const backoff = Math.random() * Math.min(CALENDAR_BACKOFF_MAX_MS, CALENDAR_BACKOFF_BASE_MS * 2 ** (attempt - 1));
+    await new Promise((resolve) => setTimeout(resolve, Math.max(backoff, wait ?? 0)));
+    pending = retry;
+  }
+
+  return errors;
+}
+
 /**
  * Create multiple calendar events (for meal plan)
+ * Events go out in batches of CALENDAR_BATCH_SIZE, CALENDAR_BATCH_CONCURRENCY
+ * batches at a time. Each event gets its id up front, so resending one
+ * whose first attempt did go through can't create a duplicate.
  */
 export async function createMealPlanEvents({
   accessToken,
@@ -224,28 +431,47 @@ export async function createMealPlanEvents({
   total: number;
   errors: string[];
 }> {
-  const results = await Promise.allSettled(
-    events.map((event) =>
-      createCalendarEvent({
+  const resources = events.map((event) =>
+    buildEventResource({
+      // Calendar ids are base32hex (0-9, a-v); a hex UUID qualifies
+      id: randomUUID().replace(/-/g, ""),
+      summary: `${event.cook}: ${event.recipe}`,
+      description: formatRecipeDescription(event.recipeData),
+      startDateTime: event.startDateTime,
+      endDateTime: event.endDateTime,
+      attendeeEmails,
+      timeZone,
+    })
+  );
+
+  const results: Array<string | null> = new Array(resources.length);
+  let nextBatch = 0;
+  const batchCount = Math.ceil(resources.length / CALENDAR_BATCH_SIZE);
+
+  const worker = async () => {
+    while (nextBatch < batchCount) {
+      const start = nextBatch++ * CALENDAR_BATCH_SIZE;
+      const batchErrors = await createEventBatch(
         accessToken,
-        summary: `${event.cook}: ${event.recipe}`,
-        description: formatRecipeDescription(event.recipeData),
-        startDateTime: event.startDateTime,
-        endDateTime: event.endDateTime,
-        attendeeEmails,
-        timeZone,
-      })
-    )
+        resources.slice(start, start + CALENDAR_BATCH_SIZE)
+      );
+      batchErrors.forEach((error, offset) => {
+        results[start + offset] = error;
+      });
+    }
+  };
+
+  await Promise.all(
+    Array.from({ length: Math.min(CALENDAR_BATCH_CONCURRENCY, batchCount) }, worker)
   );
 
-  const successful = results.filter((r) => r.status === "fulfilled");
-  const failed = results.filter((r) => r.status === "rejected");
+  const errors = results.filter((error): error is string => error !== null);
 
   return {
-    successful: successful.length,
-    failed: failed.length,
+    successful: results.length - errors.length,
+    failed: errors.length,
     total: events.length,
-    errors: failed.map((f: { reason?: { message?: string } }) => f.reason?.message || "Unknown error"),
+    errors,
   };
 }
 
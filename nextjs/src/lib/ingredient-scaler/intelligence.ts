@@ -12,6 +12,7 @@ import {
 } from "./constants";
 import { parseQuantity, formatQuantity } from "./parsing";
 import { normalizeUnit, areUnitsConvertible, convertUnit, getPreferredUnit } from "./units";
+import { addSource, type SourceIndex } from "./sources";
 
 export interface MergedItemWithConfidence {
   ingredient: string;
@@ -32,6 +33,23 @@ export interface MergeableItem {
   recipe_title?: string | null;
 }
 
+// A shopping list repeats the same ingredient strings across recipes and
+// weeks, so each name is normalized once per process. The caches are cleared
+// when full rather than evicted one entry at a time.
+const NAME_CACHE_MAX = 10000;
+const normalizedNames = new Map<string, string>();
+const coreNames = new Map<string, string>();
+
+function memoized(cache: Map<string, string>, name: string, compute: (name: string) => string): string {
+  let value = cache.get(name);
+  if (value === undefined) {
+    if (cache.size >= NAME_CACHE_MAX) cache.clear();
+    value = compute(name);
+    cache.set(name, value);
+  }
+  return value;
+}
+
 /**
  * Normalize an ingredient name for comparison
  * - Lowercase
@@ -40,47 +58,51 @@ export interface MergeableItem {
  * - Singularize basic plurals
  */
 export function normalizeIngredientName(name: string): string {
+  return memoized(normalizedNames, name, computeNormalizedName);
+}
+
+// Descriptors that don't affect the core ingredient
+const NAME_DESCRIPTOR_PATTERNS = [
+  /\bfresh\b/gi,
+  /\bfrozen\b/gi,
+  /\bdried\b/gi,
+  /\bchopped\b/gi,
+  /\bdiced\b/gi,
+  /\bsliced\b/gi,
+  /\bminced\b/gi,
+  /\bcrushed\b/gi,
+  /\bground\b/gi,
+  /\bshredded\b/gi,
+  /\bgrated\b/gi,
+  /\bpeeled\b/gi,
+  /\bboneless\b/gi,
+  /\bskinless\b/gi,
+  /\braw\b/gi,
+  /\bcooked\b/gi,
+  /\buncooked\b/gi,
+  /\borganic\b/gi,
+  /\b(finely|roughly|coarsely)\b/gi,
+  /,.*$/, // Remove everything after comma
+  /\(.*?\)/g, // Remove parenthetical notes
+];
+
+// Basic singularization (handles common cases)
+const PLURAL_RULES: Array<[RegExp, string]> = [
+  [/ies$/, "y"],      // berries -> berry
+  [/ves$/, "f"],      // leaves -> leaf
+  [/oes$/, "o"],      // tomatoes -> tomato
+  [/ses$/, "s"],      // molasses -> molasses (no change needed)
+  [/([^s])s$/, "$1"], // apples -> apple
+];
+
+function computeNormalizedName(name: string): string {
   let normalized = name.toLowerCase().trim();
 
-  // Remove common descriptors that don't affect the core ingredient
-  const descriptorsToRemove = [
-    /\bfresh\b/gi,
-    /\bfrozen\b/gi,
-    /\bdried\b/gi,
-    /\bchopped\b/gi,
-    /\bdiced\b/gi,
-    /\bsliced\b/gi,
-    /\bminced\b/gi,
-    /\bcrushed\b/gi,
-    /\bground\b/gi,
-    /\bshredded\b/gi,
-    /\bgrated\b/gi,
-    /\bpeeled\b/gi,
-    /\bboneless\b/gi,
-    /\bskinless\b/gi,
-    /\braw\b/gi,
-    /\bcooked\b/gi,
-    /\buncooked\b/gi,
-    /\borganic\b/gi,
-    /\b(finely|roughly|coarsely)\b/gi,
-    /,.*$/, // Remove everything after comma
-    /\(.*?\)/g, // Remove parenthetical notes
-  ];
-
-  for (const pattern of descriptorsToRemove) {
+  for (const pattern of NAME_DESCRIPTOR_PATTERNS) {
     normalized = normalized.replace(pattern, "");
   }
 
-  // Basic singularization (handles common cases)
-  const pluralRules: Array<[RegExp, string]> = [
-    [/ies$/, "y"],      // berries -> berry
-    [/ves$/, "f"],      // leaves -> leaf
-    [/oes$/, "o"],      // tomatoes -> tomato
-    [/ses$/, "s"],      // molasses -> molasses (no change needed)
-    [/([^s])s$/, "$1"], // apples -> apple
-  ];
-
-  for (const [pattern, replacement] of pluralRules) {
+  for (const [pattern, replacement] of PLURAL_RULES) {
     if (pattern.test(normalized)) {
       normalized = normalized.replace(pattern, replacement);
       break;
@@ -98,21 +120,22 @@ export function normalizeIngredientName(name: string): string {
  * More aggressive than normalizeIngredientName - for comparison purposes
  */
 export function extractCoreIngredient(name: string): string {
-  let core = name.toLowerCase().trim();
+  return memoized(coreNames, name, computeCoreIngredient);
+}
 
-  // Remove all preparation descriptors
-  for (const desc of PREPARATION_DESCRIPTORS) {
-    core = core.replace(new RegExp(`\\b${desc}\\b`, "gi"), "");
-  }
+// Preparation, state and quality descriptors, compiled once
+const CORE_DESCRIPTOR_PATTERNS = [
+  ...PREPARATION_DESCRIPTORS,
+  ...STATE_DESCRIPTORS,
+  ...QUALITY_DESCRIPTORS,
+].map((desc) => new RegExp(`\\b${desc}\\b`, "gi"));
 
-  // Remove all state descriptors
-  for (const desc of STATE_DESCRIPTORS) {
-    core = core.replace(new RegExp(`\\b${desc}\\b`, "gi"), "");
-  }
+function computeCoreIngredient(name: string): string {
+  let core = name.toLowerCase().trim();
 
-  // Remove all quality descriptors
-  for (const desc of QUALITY_DESCRIPTORS) {
-    core = core.replace(new RegExp(`\\b${desc}\\b`, "gi"), "");
+  // Remove all preparation, state and quality descriptors
+  for (const pattern of CORE_DESCRIPTOR_PATTERNS) {
+    core = core.replace(pattern, "");
   }
 
   // Remove common phrases
@@ -130,38 +153,45 @@ export function extractCoreIngredient(name: string): string {
 }
 
 /**
- * Calculate similarity between two ingredient names (0-1)
- * Uses Levenshtein distance ratio
+ * Levenshtein distance between a and b, keeping only the previous row
+ * Stops early once it must exceed limit, returning limit + 1
  */
-function calculateSimilarity(a: string, b: string): number {
-  if (a === b) return 1;
-  if (a.length === 0 || b.length === 0) return 0;
-
-  // Simple Levenshtein distance implementation
-  const matrix: number[][] = [];
-
-  for (let i = 0; i <= b.length; i++) {
-    matrix[i] = [i];
-  }
-  for (let j = 0; j <= a.length; j++) {
-    matrix[0][j] = j;
-  }
+function levenshteinDistance(a: string, b: string, limit: number = Infinity): number {
+  let previous = Array.from({ length: a.length + 1 }, (_, j) => j);
+  let current = new Array<number>(a.length + 1);
 
   for (let i = 1; i <= b.length; i++) {
+    current[0] = i;
+    let rowMin = i;
     for (let j = 1; j <= a.length; j++) {
-      if (b.charAt(i - 1) === a.charAt(j - 1)) {
-        matrix[i][j] = matrix[i - 1][j - 1];
+      if (b.charCodeAt(i - 1) === a.charCodeAt(j - 1)) {
+        current[j] = previous[j - 1];
       } else {
-        matrix[i][j] = Math.min(
-          matrix[i - 1][j - 1] + 1, // substitution
-          matrix[i][j - 1] + 1,     // insertion
-          matrix[i - 1][j] + 1      // deletion
+        current[j] = Math.min(
+          previous[j - 1] + 1, // substitution
+          current[j - 1] + 1,  // insertion
+          previous[j] + 1      // deletion
         );
       }
+      rowMin = Math.min(rowMin, current[j]);
     }
+    // Every path to the end passes through this row
+    if (rowMin > limit) return limit + 1;
+    [previous, current] = [current, previous];
   }
 
-  const distance = matrix[b.length][a.length];
+  return previous[a.length];
+}
+
+/**
+ * Calculate similarity between two ingredient names (0-1)
+ * Uses Levenshtein distance ratio
+ */
+function calculateSimilarity(a: string, b: string): number {
+  if (a === b) return 1;
+  if (a.length === 0 || b.length === 0) return 0;
+
+  const distance = levenshteinDistance(a, b);
   const maxLength = Math.max(a.length, b.length);
   return 1 - distance / maxLength;
 }
@@ -198,9 +228,20 @@ export function areIngredientsSimilar(
     return true;
   }
 
-  // Calculate similarity score
-  const similarity = calculateSimilarity(coreA, coreB);
-  return similarity >= threshold;
+  // Similarity is 1 - distance / maxLength, so find the largest distance
+  // that still meets the threshold (the same expression calculateSimilarity
+  // uses, so rounding agrees). The distance is at least the difference in
+  // length, and the comparison can stop as soon as it passes that distance.
+  const maxLength = Math.max(coreA.length, coreB.length);
+  let maxDistance = -1;
+  while (maxDistance < maxLength && 1 - (maxDistance + 1) / maxLength >= threshold) {
+    maxDistance++;
+  }
+  if (Math.abs(coreA.length - coreB.length) > maxDistance) {
+    return false;
+  }
+
+  return levenshteinDistance(coreA, coreB, maxDistance) <= maxDistance;
 }
 
 /**
@@ -225,6 +266,10 @@ export function guessCategory(ingredient: string): IngredientCategory {
 /**
  * Merge shopping items with confidence scoring
  * Groups items that are likely the same ingredient
+ *
+ * Items whose core name was seen before go straight to that entry through an
+ * index; only a new core name is compared against every entry. So the cost
+ * grows with distinct ingredients, not with lines times entries.
  */
 export function mergeWithConfidence(
   items: MergeableItem[],
@@ -232,6 +277,13 @@ export function mergeWithConfidence(
 ): MergedItemWithConfidence[] {
   const merged = new Map<string, MergedItemWithConfidence>();
   const processedIndices = new Set<number>();
+  // Core name -> the first entry similar to it, which is where the original
+  // scan would merge it, plus each entry's own core name. Entries are only
+  // appended (or replaced, which resets the index), so first stays first.
+  const entriesByCore = new Map<string, MergedItemWithConfidence>();
+  const entryCores = new Map<MergedItemWithConfidence, string>();
+  const sourceIndexes = new Map<MergedItemWithConfidence, SourceIndex>();
+  const similarities = new Map<string, number>();
 
   for (let i = 0; i < items.length; i++) {
     if (processedIndices.has(i)) continue;
@@ -242,34 +294,31 @@ export function mergeWithConfidence(
 
     // Check if this matches any existing merged item
     let foundMatch = false;
-    for (const [, existing] of Array.from(merged.entries())) {
-      const existingCore = extractCoreIngredient(existing.ingredient);
+    const indexed = entriesByCore.get(coreName);
+    const candidates = indexed ? [indexed] : merged.values();
+    for (const existing of candidates) {
+      const existingCore = entryCores.get(existing)!;
 
-      if (areIngredientsSimilar(coreName, existingCore, similarityThreshold)) {
+      if (indexed || areIngredientsSimilar(coreName, existingCore, similarityThreshold)) {
         // Merge with existing
         foundMatch = true;
+        if (!indexed) entriesByCore.set(coreName, existing);
 
         const newQuantity = parseQuantity(item.quantity || "");
         const existingQuantity = parseQuantity(existing.quantity || "");
 
         // Track confidence based on how similar the names are
-        const similarity = calculateSimilarity(coreName, existingCore);
+        const pair = `${coreName}\u0000${existingCore}`;
+        let similarity = similarities.get(pair);
+        if (similarity === undefined) {
+          similarity = calculateSimilarity(coreName, existingCore);
+          similarities.set(pair, similarity);
+        }
         existing.confidence = Math.min(existing.confidence, similarity);
         existing.needs_review = existing.confidence < 0.9;
 
         // Add source
-        if (item.recipe_id || item.recipe_title) {
-          const alreadyHasSource = existing.sources.some(
-            (s: { recipe_id?: string | null; recipe_title?: string | null }) =>
-              s.recipe_id === item.recipe_id && s.recipe_title === item.recipe_title
-          );
-          if (!alreadyHasSource) {
-            existing.sources.push({
-              recipe_id: item.recipe_id,
-              recipe_title: item.recipe_title,
-            });
-          }
-        }
+        addSource(sourceIndexes.get(existing)!, existing.sources, item);
 
         // Try to merge quantities
         if (newQuantity !== null && existingQuantity !== null) {
@@ -306,18 +355,29 @@ export function mergeWithConfidence(
     if (!foundMatch) {
       // Create new entry
       const category = item.category || guessCategory(item.ingredient);
-
-      merged.set(normalizedName, {
+      const entry: MergedItemWithConfidence = {
         ingredient: item.ingredient,
         quantity: item.quantity || null,
         unit: item.unit ? normalizeUnit(item.unit) : null,
         category,
-        sources: item.recipe_id || item.recipe_title
-          ? [{ recipe_id: item.recipe_id, recipe_title: item.recipe_title }]
-          : [],
+        sources: [],
         confidence: 1.0,
         needs_review: false,
-      });
+      };
+      const sourceIndex: SourceIndex = new Map();
+      addSource(sourceIndex, entry.sources, item);
+
+      // Same normalized name but a dissimilar core: the old entry is replaced
+      // in place (as Map.set always did here), which can change which entry
+      // comes first for an indexed core name, so start the index over
+      if (merged.has(normalizedName)) {
+        entriesByCore.clear();
+      }
+
+      merged.set(normalizedName, entry);
+      entriesByCore.set(coreName, entry);
+      entryCores.set(entry, extractCoreIngredient(entry.ingredient));
+      sourceIndexes.set(entry, sourceIndex);
 
       processedIndices.add(i);
     }
@@ -7,6 +7,7 @@ import type { IngredientCategory } from "@/types/shopping-list";
 import { parseQuantity, formatQuantity } from "./parsing";
 import { normalizeUnit, areUnitsConvertible, convertUnit, getPreferredUnit } from "./units";
 import { normalizeIngredientName } from "./intelligence";
+import { addSource, type SourceIndex } from "./sources";
 
 export interface MergeableItem {
   ingredient: string;
@@ -27,9 +28,11 @@ export interface MergedItem {
 
 /**
  * Merge a list of shopping items, combining duplicates
+ * Each item is a map lookup, so this is linear in the number of ingredient lines
  */
 export function mergeShoppingItems(items: MergeableItem[]): MergedItem[] {
   const merged = new Map<string, MergedItem>();
+  const sourceIndexes = new Map<string, SourceIndex>();
 
   for (const item of items) {
     const normalizedName = normalizeIngredientName(item.ingredient);
@@ -37,14 +40,16 @@ export function mergeShoppingItems(items: MergeableItem[]): MergedItem[] {
 
     if (!existing) {
       // First occurrence
+      const sources: MergedItem["sources"] = [];
+      const sourceIndex: SourceIndex = new Map();
+      addSource(sourceIndex, sources, item);
+      sourceIndexes.set(normalizedName, sourceIndex);
       merged.set(normalizedName, {
         ingredient: item.ingredient, // Keep original casing from first occurrence
         quantity: item.quantity || null,
         unit: item.unit ? normalizeUnit(item.unit) : null,
         category: item.category || null,
-        sources: item.recipe_id || item.recipe_title
-          ? [{ recipe_id: item.recipe_id, recipe_title: item.recipe_title }]
-          : [],
+        sources,
       });
     } else {
       // Merge with existing
@@ -52,17 +57,7 @@ export function mergeShoppingItems(items: MergeableItem[]): MergedItem[] {
       const existingQuantity = parseQuantity(existing.quantity || "");
 
       // Add source
-      if (item.recipe_id || item.recipe_title) {
-        const alreadyHasSource = existing.sources.some(
-          (s) => s.recipe_id === item.recipe_id && s.recipe_title === item.recipe_title
-        );
-        if (!alreadyHasSource) {
-          existing.sources.push({
-            recipe_id: item.recipe_id,
-            recipe_title: item.recipe_title,
-          });
-        }
-      }
+      addSource(sourceIndexes.get(normalizedName)!, existing.sources, item);
 
       // Try to merge quantities
       if (newQuantity !== null && existingQuantity !== null) {
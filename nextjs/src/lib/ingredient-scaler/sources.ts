@@ -0,0 +1,31 @@
+/**
+ * Recipe sources of merged shopping items
+ * Index of the sources already on an item, so merging stays linear in the
+ * number of ingredient lines instead of rescanning each item's source list
+ */
+
+export interface ItemSource {
+  recipe_id?: string | null;
+  recipe_title?: string | null;
+}
+
+// recipe_id -> recipe_titles seen with it (null and undefined are distinct
+// keys, as they were to the === comparison this replaces)
+export type SourceIndex = Map<string | null | undefined, Set<string | null | undefined>>;
+
+/**
+ * Append the item's recipe to sources unless it is already there
+ */
+export function addSource(index: SourceIndex, sources: ItemSource[], item: ItemSource): void {
+  if (!item.recipe_id && !item.recipe_title) return;
+
+  let titles = index.get(item.recipe_id);
+  if (!titles) {
+    titles = new Set();
+    index.set(item.recipe_id, titles);
+  }
+  if (!titles.has(item.recipe_title)) {
+    titles.add(item.recipe_title);
+    sources.push({ recipe_id: item.recipe_id, recipe_title: item.recipe_title });
+  }
+}
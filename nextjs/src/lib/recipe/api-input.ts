@@ -0,0 +1,84 @@
+/**
+ * Recipe API Input
+ *
+ * Turns a recipe create request body into a validated `recipes` row.
+ * Shared by POST /api/recipes and POST /api/recipes/bulk so both accept the
+ * same camelCase/snake_case field names and apply the same defaults.
+ */
+
+import {
+  recipeFormSchema,
+  validateSchema,
+  type RecipeFormOutput,
+} from "@/lib/validations/schemas";
+
+// A parsed JSON request body; fields are checked by recipeFormSchema
+// eslint-disable-next-line @typescript-eslint/no-explicit-any
+type RecipeBody = Record<string, any>;
+
+// Normalize field names (handle both camelCase and snake_case)
+export function normalizeRecipeBody(body: RecipeBody) {
+  return {
+    title: body.title,
+    recipe_type: body.recipe_type || body.recipeType || "Dinner",
+    category: body.category || "Other",
+    protein_type: body.protein_type || body.proteinType,
+    prep_time: body.prep_time || body.prepTime,
+    cook_time: body.cook_time || body.cookTime || `${body.cook_time_minutes || body.cookTimeMinutes || 30} minutes`,
+    servings: body.servings?.toString() || "4",
+    base_servings: typeof body.servings === "number" ? body.servings : parseInt(body.servings) || 4,
+    ingredients: Array.isArray(body.ingredients)
+      ? body.ingredients.map((i: unknown) => typeof i === "string" ? i : `${(i as Record<string, string>).quantity || ""} ${(i as Record<string, string>).unit || ""} ${(i as Record<string, string>).name}`.trim())
+      : [],
+    instructions: Array.isArray(body.instructions) ? body.instructions : [],
+    tags: body.tags || [],
+    notes: body.notes,
+    source_url: body.source_url || body.sourceUrl,
+    image_url: body.image_url || body.imageUrl,
+    allergen_tags: body.allergen_tags || body.allergenTags || [],
+    is_shared_with_household: body.is_shared_with_household ?? true,
+    is_public: body.is_public ?? false,
+    rating: body.rating || null,
+  };
+}
+
+// Map validated fields to database schema
+export function toRecipeRow(userId: string, validatedData: RecipeFormOutput, body: RecipeBody) {
+  return {
+    user_id: userId,
+    title: validatedData.title,
+    description: body.description || null, // Optional, not in schema
+    recipe_type: validatedData.recipe_type,
+    category: validatedData.category || "Other",
+    protein_type: validatedData.protein_type,
+    prep_time: validatedData.prep_time,
+    cook_time: validatedData.cook_time,
+    servings: validatedData.servings || "4",
+    base_servings: validatedData.base_servings || 4,
+    ingredients: validatedData.ingredients,
+    instructions: validatedData.instructions,
+    tags: validatedData.tags,
+    notes: validatedData.notes,
+    source_url: validatedData.source_url,
+    image_url: validatedData.image_url,
+    allergen_tags: validatedData.allergen_tags,
+    is_favorite: body.is_favorite || false,
+    is_shared_with_household: validatedData.is_shared_with_household,
+    is_public: validatedData.is_public,
+    // Only the owner's own rating: avg_rating and review_count come from
+    // cooking_history (20251225_incremental_recipe_ratings.sql)
+    rating: validatedData.rating ?? null,
+  };
+}
+
+// Validate a request body and build its row, or return the first validation error
+export function recipeRowFromBody(
+  userId: string,
+  body: RecipeBody
+): { success: true; row: ReturnType<typeof toRecipeRow> } | { success: false; error: string } {
+  const validation = validateSchema(recipeFormSchema, normalizeRecipeBody(body));
+  if (!validation.success) {
+    return { success: false, error: validation.error };
+  }
+  return { success: true, row: toRecipeRow(userId, validation.data, body) };
+}
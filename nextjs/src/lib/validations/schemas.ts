@@ -79,6 +79,14 @@ export const recipeFormSchema = z.object({
   is_public: z
     .boolean()
     .default(false),
+  // The owner's own rating (recipes.rating); avg_rating/review_count are
+  // maintained from cooking history instead
+  rating: z
+    .number()
+    .min(1, "Rating must be between 1 and 5")
+    .max(5, "Rating must be between 1 and 5")
+    .nullable()
+    .optional(),
 });
 
 export type RecipeFormInput = z.input<typeof recipeFormSchema>;
@@ -0,0 +1,140 @@
+-- Migration: Maintain recipe rating aggregates incrementally
+-- 20251219_consolidate_reviews_to_cooking_history.sql recomputes AVG and COUNT
+-- over a recipe's whole cooking history on every history write, so each
+-- rating of a popular recipe costs more than the last. This keeps a running
+-- sum and count per recipe instead: every write adjusts them by its own
+-- rating, and history writes without a rating (cook start/stop events) skip
+-- the aggregates entirely.
+
+-- ============================================
+-- Summary table
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS recipe_rating_stats (
+  recipe_id UUID PRIMARY KEY REFERENCES recipes(id) ON DELETE CASCADE,
+  rating_sum NUMERIC NOT NULL DEFAULT 0,
+  rating_count INTEGER NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Only the trigger below writes it, and recipes.avg_rating/review_count are
+-- what the app reads, so no policies: RLS denies everyone but the owner role
+ALTER TABLE recipe_rating_stats ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE recipe_rating_stats IS
+  'Running sum and count of cooking_history ratings per recipe. Maintained by trigger_update_recipe_rating_from_history.';
+
+-- No history writes between the backfill and the trigger swap
+LOCK TABLE cooking_history IN SHARE ROW EXCLUSIVE MODE;
+
+-- ============================================
+-- Backfill from existing history
+-- ============================================
+
+INSERT INTO recipe_rating_stats (recipe_id, rating_sum, rating_count)
+SELECT recipe_id, SUM(rating), COUNT(*)
+FROM cooking_history
+WHERE rating IS NOT NULL
+GROUP BY recipe_id
+ON CONFLICT (recipe_id) DO UPDATE SET
+  rating_sum = EXCLUDED.rating_sum,
+  rating_count = EXCLUDED.rating_count,
+  updated_at = NOW();
+
+UPDATE recipes r
+SET
+  avg_rating = ROUND(s.rating_sum / s.rating_count, 1),
+  review_count = s.rating_count
+FROM recipe_rating_stats s
+WHERE s.recipe_id = r.id
+AND s.rating_count > 0;
+
+-- ============================================
+-- Incremental maintenance
+-- ============================================
+
+-- Add sum_delta/count_delta to a recipe's totals and copy the result to
+-- recipes.avg_rating and review_count (rounded as AVG was before)
+CREATE OR REPLACE FUNCTION apply_recipe_rating_delta(
+  p_recipe_id UUID,
+  p_sum_delta NUMERIC,
+  p_count_delta INTEGER
+) RETURNS VOID AS $$
+DECLARE
+  v_sum NUMERIC;
+  v_count INTEGER;
+BEGIN
+  IF p_count_delta > 0 THEN
+    INSERT INTO recipe_rating_stats AS s (recipe_id, rating_sum, rating_count)
+    VALUES (p_recipe_id, p_sum_delta, p_count_delta)
+    ON CONFLICT (recipe_id) DO UPDATE SET
+      rating_sum = s.rating_sum + EXCLUDED.rating_sum,
+      rating_count = s.rating_count + EXCLUDED.rating_count,
+      updated_at = NOW()
+    RETURNING rating_sum, rating_count INTO v_sum, v_count;
+  ELSE
+    -- A rating being removed was counted when it was added. Never insert
+    -- here: when a recipe is deleted, its history is deleted after it.
+    UPDATE recipe_rating_stats
+    SET
+      rating_sum = rating_sum + p_sum_delta,
+      rating_count = rating_count + p_count_delta,
+      updated_at = NOW()
+    WHERE recipe_id = p_recipe_id
+    RETURNING rating_sum, rating_count INTO v_sum, v_count;
+
+    IF NOT FOUND THEN
+      RETURN;
+    END IF;
+  END IF;
+
+  UPDATE recipes
+  SET
+    avg_rating = CASE WHEN v_count > 0 THEN ROUND(v_sum / v_count, 1) END,
+    review_count = v_count
+  WHERE id = p_recipe_id;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Replaces the full recompute from 20251219_consolidate_reviews_to_cooking_history.sql
+CREATE OR REPLACE FUNCTION update_recipe_rating_from_history() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'UPDATE'
+    AND NEW.recipe_id = OLD.recipe_id
+    AND NEW.rating IS NOT DISTINCT FROM OLD.rating THEN
+    RETURN NULL;
+  END IF;
+
+  -- Take the old rating out of its recipe's totals
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    IF OLD.rating IS NOT NULL THEN
+      PERFORM apply_recipe_rating_delta(OLD.recipe_id, -OLD.rating, -1);
+    END IF;
+  END IF;
+
+  -- and add the new one
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    IF NEW.rating IS NOT NULL THEN
+      PERFORM apply_recipe_rating_delta(NEW.recipe_id, NEW.rating, 1);
+    END IF;
+  END IF;
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Only rating and recipe_id changes can move the totals
+DROP TRIGGER IF EXISTS trigger_update_recipe_rating_from_history ON cooking_history;
+CREATE TRIGGER trigger_update_recipe_rating_from_history
+  AFTER INSERT OR DELETE OR UPDATE OF rating, recipe_id ON cooking_history
+  FOR EACH ROW
+  EXECUTE FUNCTION update_recipe_rating_from_history();
+
+-- The functions are for the trigger, not for clients
+REVOKE EXECUTE ON FUNCTION apply_recipe_rating_delta(UUID, NUMERIC, INTEGER) FROM PUBLIC, anon, authenticated;
+
+COMMENT ON COLUMN recipes.avg_rating IS
+  'Average of cooking_history.rating, rounded to one decimal. Maintained from recipe_rating_stats by trigger.';
+
+COMMENT ON COLUMN recipes.review_count IS
+  'Number of rated cooking_history entries for this recipe. Maintained from recipe_rating_stats by trigger.';
@@ -1,9 +1,12 @@
 import requests
 
-def test_authentication_endpoint():
-    base_url = "http://localhost:3001"
-    session = requests.Session()
-    timeout = 30
+from helpers.auth_helper import BASE_URL, TIMEOUT, new_session
+
+def test_authentication_endpoint(fresh_session):
+    # Exercises the login itself, so it gets its own cookie jar
+    base_url = BASE_URL
+    session = fresh_session
+    timeout = TIMEOUT
 
     # Step 1: Authenticate with email and password
     auth_payload = {
@@ -42,4 +45,5 @@ def test_authentication_endpoint():
     assert status_json.get("success") is True, "Authentication status indicates not authenticated"
     assert status_json.get("email") == auth_payload["email"], "Auth status email does not match"
 
-test_authentication_endpoint()
+if __name__ == "__main__":
+    test_authentication_endpoint(new_session())
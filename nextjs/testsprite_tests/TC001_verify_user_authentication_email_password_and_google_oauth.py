@@ -1,16 +1,14 @@
-import requests
+from helpers.auth_helper import BASE_URL, TIMEOUT, namespaced_email, new_session
 
-BASE_URL = "http://localhost:3001"
-TIMEOUT = 30
 
-
-def test_verify_user_authentication_email_password_and_google_oauth():
-    session = requests.Session()
+def test_verify_user_authentication_email_password_and_google_oauth(fresh_session):
+    # Signs up and logs in as its own user, so it gets its own cookie jar
+    session = fresh_session
     headers = {"Content-Type": "application/json"}
 
     # 1. Signup with email/password
     signup_payload = {
-        "email": "testuser@example.com",
+        "email": namespaced_email("testuser@example.com"),
         "password": "StrongPassword123!"
     }
     try:
@@ -90,4 +88,5 @@ def test_verify_user_authentication_email_password_and_google_oauth():
                 assert delete_resp.status_code in (200, 204), f"User deletion failed: {delete_resp.text}"
 
 
-test_verify_user_authentication_email_password_and_google_oauth()
\ No newline at end of file
+if __name__ == "__main__":
+    test_verify_user_authentication_email_password_and_google_oauth(new_session())
\ No newline at end of file
@@ -1,10 +1,9 @@
 import requests
 
-BASE_URL = "http://localhost:3001"
-TIMEOUT = 30
+from helpers.auth_helper import BASE_URL, TIMEOUT, anonymous_session
 
 
-def test_validate_ai_recipe_import_from_url():
+def test_validate_ai_recipe_import_from_url(anon_session):
     url_to_import = "https://www.example.com/recipe/chocolate-cake"
 
     endpoint = f"{BASE_URL}/api/parse-recipe"
@@ -15,7 +14,7 @@ def test_validate_ai_recipe_import_from_url():
     payload = {"url": url_to_import}
 
     try:
-        response = requests.post(endpoint, json=payload, headers=headers, timeout=TIMEOUT)
+        response = anon_session.post(endpoint, json=payload, headers=headers, timeout=TIMEOUT)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         assert False, f"Request to parse recipe failed: {e}"
@@ -47,4 +46,5 @@ def test_validate_ai_recipe_import_from_url():
         "'cook_time' should be a positive integer or a non-empty string"
 
 
-test_validate_ai_recipe_import_from_url()
+if __name__ == "__main__":
+    test_validate_ai_recipe_import_from_url(anonymous_session())
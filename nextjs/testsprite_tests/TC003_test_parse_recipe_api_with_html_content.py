@@ -1,14 +1,9 @@
-import requests
+from helpers.auth_helper import BASE_URL, TIMEOUT, authenticated_session
 
-def test_parse_recipe_api_with_html_content():
-    base_url = "http://localhost:3001"
-    session = requests.Session()
-    timeout = 30
-
-    # Authenticate first
-    auth_payload = {"email": "test@testsprite.dev", "password": "TestSprite123!"}
-    auth_response = session.post(f"{base_url}/api/test-auth", json=auth_payload, timeout=timeout)
-    assert auth_response.status_code == 200, f"Authentication failed: {auth_response.text}"
+def test_parse_recipe_api_with_html_content(auth_session):
+    base_url = BASE_URL
+    session = auth_session
+    timeout = TIMEOUT
 
     # Sample recipe HTML content
     sample_html = """
@@ -81,5 +76,5 @@ def test_parse_recipe_api_with_html_content():
         times_values = " ".join(str(v).lower() for v in cook_times.values())
         assert any(x in times_values for x in ["prep", "cook", "total"]), "Cook times missing 'prep', 'cook' or 'total'"
 
-# Call the test function
-test_parse_recipe_api_with_html_content()
\ No newline at end of file
+if __name__ == "__main__":
+    test_parse_recipe_api_with_html_content(authenticated_session())
\ No newline at end of file
@@ -1,17 +1,10 @@
-import requests
+from helpers.auth_helper import BASE_URL, TIMEOUT, authenticated_session, namespaced
 
-BASE_URL = "http://localhost:3001"
-TIMEOUT = 30
-
-def test_recipe_crud_operations():
-    headers = {
-        "Content-Type": "application/json",
-        # Add any required authentication headers here if applicable, e.g.:
-        # "Authorization": "Bearer <token>",
-    }
+def test_recipe_crud_operations(auth_session):
+    headers = {"Content-Type": "application/json"}
 
     recipe_data_create = {
-        "title": "Test Recipe CRUD",
+        "title": namespaced("Test Recipe CRUD"),
         "description": "Test description for CRUD operations",
         "ingredients": [
             {"name": "Tomato", "quantity": "2", "unit": "pcs"},
@@ -27,7 +20,7 @@ def test_recipe_crud_operations():
     }
 
     recipe_data_update = {
-        "title": "Test Recipe CRUD Updated",
+        "title": namespaced("Test Recipe CRUD Updated"),
         "description": "Updated description after edit",
         "ingredients": [
             {"name": "Tomato", "quantity": "3", "unit": "pcs"},
@@ -44,7 +37,7 @@ def test_recipe_crud_operations():
     recipe_id = None
     try:
         # CREATE recipe
-        response_create = requests.post(
+        response_create = auth_session.post(
             f"{BASE_URL}/api/recipes",
             headers=headers,
             json=recipe_data_create,
@@ -56,7 +49,7 @@ def test_recipe_crud_operations():
         recipe_id = created_recipe["id"]
 
         # READ recipe by ID to verify creation
-        response_get = requests.get(
+        response_get = auth_session.get(
             f"{BASE_URL}/api/recipes/{recipe_id}",
             headers=headers,
             timeout=TIMEOUT
@@ -69,7 +62,7 @@ def test_recipe_crud_operations():
         assert fetched_recipe["cook_time_minutes"] == recipe_data_create["cook_time_minutes"], "Fetched cook time mismatch"
 
         # UPDATE recipe
-        response_update = requests.put(
+        response_update = auth_session.put(
             f"{BASE_URL}/api/recipes/{recipe_id}",
             headers=headers,
             json=recipe_data_update,
@@ -80,7 +73,7 @@ def test_recipe_crud_operations():
         assert updated_recipe["title"] == recipe_data_update["title"], "Updated recipe title mismatch"
 
         # READ recipe to verify update
-        response_get_updated = requests.get(
+        response_get_updated = auth_session.get(
             f"{BASE_URL}/api/recipes/{recipe_id}",
             headers=headers,
             timeout=TIMEOUT
@@ -94,7 +87,7 @@ def test_recipe_crud_operations():
         assert fetched_updated_recipe["servings"] == recipe_data_update["servings"], "Servings mismatch after update"
 
         # DELETE recipe
-        response_delete = requests.delete(
+        response_delete = auth_session.delete(
             f"{BASE_URL}/api/recipes/{recipe_id}",
             headers=headers,
             timeout=TIMEOUT
@@ -102,7 +95,7 @@ def test_recipe_crud_operations():
         assert response_delete.status_code in (200, 204), f"Delete failed: {response_delete.text}"
 
         # VERIFY deletion by attempting to GET deleted recipe
-        response_get_deleted = requests.get(
+        response_get_deleted = auth_session.get(
             f"{BASE_URL}/api/recipes/{recipe_id}",
             headers=headers,
             timeout=TIMEOUT
@@ -113,8 +106,9 @@ def test_recipe_crud_operations():
         # Cleanup if recipe was created but test failed before deletion
         if recipe_id:
             try:
-                requests.delete(f"{BASE_URL}/api/recipes/{recipe_id}", headers=headers, timeout=TIMEOUT)
+                auth_session.delete(f"{BASE_URL}/api/recipes/{recipe_id}", headers=headers, timeout=TIMEOUT)
             except Exception:
                 pass
 
-test_recipe_crud_operations()
+if __name__ == "__main__":
+    test_recipe_crud_operations(authenticated_session())
@@ -1,29 +1,24 @@
 import requests
 
-def test_scrape_url_api_with_valid_url():
-    base_url = "http://localhost:3001"
+from helpers.auth_helper import BASE_URL, FIXTURE_ORIGIN, TIMEOUT, anonymous_session, authenticated_session
+
+def test_scrape_url_api_with_valid_url(auth_session, anon_session):
+    base_url = BASE_URL
     scrape_endpoint = f"{base_url}/api/scrape-url"
-    auth_endpoint = f"{base_url}/api/test-auth"
-    test_url = "https://www.allrecipes.com/recipe/228285/teriyaki-salmon/"
-    auth_payload = {"email": "test@testsprite.dev", "password": "TestSprite123!"}
+    test_url = (f"{FIXTURE_ORIGIN}/recipe?size=100KB" if FIXTURE_ORIGIN
+                else "https://www.allrecipes.com/recipe/228285/teriyaki-salmon/")
     headers = {"Content-Type": "application/json"}
 
     # Unauthenticated request test
     try:
-        unauth_resp = requests.post(scrape_endpoint, json={"url": test_url}, timeout=30)
+        unauth_resp = anon_session.post(scrape_endpoint, json={"url": test_url}, timeout=TIMEOUT)
         assert unauth_resp.status_code == 401, f"Expected 401 for unauthenticated request but got {unauth_resp.status_code}"
     except requests.RequestException as e:
         assert False, f"Unauthenticated request raised an exception: {e}"
 
     # Authenticated session
-    session = requests.Session()
     try:
-        auth_resp = session.post(auth_endpoint, json=auth_payload, timeout=30)
-        assert auth_resp.status_code == 200, f"Authentication failed with status {auth_resp.status_code}"
-        auth_json = auth_resp.json()
-        assert auth_json.get("success") is True, "Authentication success flag missing or false"
-        # Now authenticated; send scrape-url request
-        scrape_resp = session.post(scrape_endpoint, json={"url": test_url}, timeout=30)
+        scrape_resp = auth_session.post(scrape_endpoint, json={"url": test_url}, timeout=TIMEOUT)
         assert scrape_resp.status_code == 200, f"Expected 200 for scrape-url but got {scrape_resp.status_code}"
         resp_json = scrape_resp.json()
         # Verify response has html and text content keys
@@ -37,4 +32,5 @@ def test_scrape_url_api_with_valid_url():
     except requests.RequestException as e:
         assert False, f"Authenticated requests raised an exception: {e}"
 
-test_scrape_url_api_with_valid_url()
\ No newline at end of file
+if __name__ == "__main__":
+    test_scrape_url_api_with_valid_url(authenticated_session(), anonymous_session())
\ No newline at end of file
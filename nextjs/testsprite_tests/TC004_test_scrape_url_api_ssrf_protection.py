@@ -1,31 +1,20 @@
 import requests
 
-def test_scrape_url_api_ssrf_protection():
-    base_url = "http://localhost:3001"
+from helpers.auth_helper import BASE_URL, TIMEOUT, authenticated_session
+
+def test_scrape_url_api_ssrf_protection(auth_session):
+    base_url = BASE_URL
     blocked_urls = [
         {"url": "http://localhost:3001"},
         {"url": "http://127.0.0.1"},
         {"url": "http://192.168.1.1"}
     ]
 
-    session = requests.Session()
-    auth_payload = {"email": "test@testsprite.dev", "password": "TestSprite123!"}
-
-    # Authenticate and establish session
-    auth_response = session.post(f"{base_url}/api/test-auth", json=auth_payload, timeout=30)
-    try:
-        auth_response.raise_for_status()
-    except requests.RequestException as e:
-        assert False, f"Authentication failed: {e}"
-
-    auth_json = auth_response.json()
-    assert auth_json.get("success") is True, "Authentication did not succeed"
-
     headers = {"Content-Type": "application/json"}
 
     for url_data in blocked_urls:
         try:
-            resp = session.post(f"{base_url}/api/scrape-url", json=url_data, headers=headers, timeout=30)
+            resp = auth_session.post(f"{base_url}/api/scrape-url", json=url_data, headers=headers, timeout=TIMEOUT)
         except requests.RequestException as e:
             assert False, f"Request to scrape-url failed for {url_data['url']}: {e}"
 
@@ -43,4 +32,5 @@ def test_scrape_url_api_ssrf_protection():
             f"Expected error message about access denial for URL {url_data['url']}, got: {error_msg}"
         )
 
-test_scrape_url_api_ssrf_protection()
\ No newline at end of file
+if __name__ == "__main__":
+    test_scrape_url_api_ssrf_protection(authenticated_session())
\ No newline at end of file
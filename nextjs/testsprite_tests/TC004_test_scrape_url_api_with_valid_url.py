@@ -1,19 +1,13 @@
-import requests
+from helpers.auth_helper import BASE_URL, FIXTURE_ORIGIN, TIMEOUT, anonymous_session, authenticated_session
 
-base_url = "http://localhost:3001"
+base_url = BASE_URL
 
-def test_scrape_url_api_with_valid_url():
-    auth_payload = {"email": "test@testsprite.dev", "password": "TestSprite123!"}
-    scrape_url_payload = {"url": "https://www.allrecipes.com"}
-    timeout = 30
-
-    session = requests.Session()
-    # Authenticate first
-    auth_response = session.post(base_url + "/api/test-auth", json=auth_payload, timeout=timeout)
-    assert auth_response.status_code == 200, f"Authentication failed with status {auth_response.status_code}"
+def test_scrape_url_api_with_valid_url(auth_session, anon_session):
+    scrape_url_payload = {"url": f"{FIXTURE_ORIGIN}/recipe" if FIXTURE_ORIGIN else "https://www.allrecipes.com"}
+    timeout = TIMEOUT
 
     # Authenticated request to /api/scrape-url with valid URL
-    scrape_response = session.post(base_url + "/api/scrape-url", json=scrape_url_payload, timeout=timeout)
+    scrape_response = auth_session.post(base_url + "/api/scrape-url", json=scrape_url_payload, timeout=timeout)
     assert scrape_response.status_code == 200, f"Authenticated scrape-url request failed with status {scrape_response.status_code}"
 
     json_data = None
@@ -30,7 +24,8 @@ def test_scrape_url_api_with_valid_url():
     assert isinstance(json_data["text"], str) and len(json_data["text"]) > 0, "'text' content is empty or not a string"
 
     # Test unauthenticated request returns 401
-    unauth_response = requests.post(base_url + "/api/scrape-url", json=scrape_url_payload, timeout=timeout)
+    unauth_response = anon_session.post(base_url + "/api/scrape-url", json=scrape_url_payload, timeout=timeout)
     assert unauth_response.status_code == 401, f"Unauthenticated request did not return 401 but {unauth_response.status_code}"
 
-test_scrape_url_api_with_valid_url()
\ No newline at end of file
+if __name__ == "__main__":
+    test_scrape_url_api_with_valid_url(authenticated_session(), anonymous_session())
\ No newline at end of file
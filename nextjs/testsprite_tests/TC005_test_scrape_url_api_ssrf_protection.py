@@ -1,13 +1,8 @@
-import requests
+from helpers.auth_helper import BASE_URL, TIMEOUT, authenticated_session
 
-def test_scrape_url_api_ssrf_protection():
-    base_url = "http://localhost:3001"
-    session = requests.Session()
-
-    # Authenticate first
-    auth_payload = {"email": "test@testsprite.dev", "password": "TestSprite123!"}
-    auth_response = session.post(f"{base_url}/api/test-auth", json=auth_payload, timeout=30)
-    assert auth_response.status_code == 200, f"Authentication failed: {auth_response.text}"
+def test_scrape_url_api_ssrf_protection(auth_session):
+    base_url = BASE_URL
+    session = auth_session
 
     ssrf_test_urls = [
         "http://localhost",
@@ -23,11 +18,12 @@ def test_scrape_url_api_ssrf_protection():
         response = session.post(
             f"{base_url}/api/scrape-url",
             json={"url": url},
-            timeout=30
+            timeout=TIMEOUT
         )
         # Validate that SSRF protection blocks these requests with 403 Forbidden.
         assert response.status_code == 403, (
             f"SSRF protection failed for URL '{url}', expected 403 but got {response.status_code}. Response: {response.text}"
         )
 
-test_scrape_url_api_ssrf_protection()
\ No newline at end of file
+if __name__ == "__main__":
+    test_scrape_url_api_ssrf_protection(authenticated_session())
\ No newline at end of file
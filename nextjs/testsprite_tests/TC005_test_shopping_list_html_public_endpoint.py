@@ -1,10 +1,12 @@
 import requests
 
-base_url = "http://localhost:3001"
+from helpers.auth_helper import BASE_URL, TIMEOUT, anonymous_session
 
-def test_shopping_list_html_public_endpoint():
+base_url = BASE_URL
+
+def test_shopping_list_html_public_endpoint(anon_session):
     try:
-        response = requests.get(f"{base_url}/api/shopping-list-html", timeout=30)
+        response = anon_session.get(f"{base_url}/api/shopping-list-html", timeout=TIMEOUT)
         assert response.status_code == 200, f"Expected status 200, got {response.status_code}"
         content_type = response.headers.get("Content-Type", "")
         assert "text/html" in content_type, f"Expected Content-Type to include 'text/html', got '{content_type}'"
@@ -14,4 +16,5 @@ def test_shopping_list_html_public_endpoint():
     except requests.RequestException as e:
         assert False, f"Request failed: {e}"
 
-test_shopping_list_html_public_endpoint()
\ No newline at end of file
+if __name__ == "__main__":
+    test_shopping_list_html_public_endpoint(anonymous_session())
\ No newline at end of file
@@ -1,14 +1,13 @@
-import requests
 import uuid
 
-BASE_URL = "http://localhost:3001"
-TIMEOUT = 30
+from helpers.auth_helper import BASE_URL, TIMEOUT, authenticated_session, namespaced
+
 HEADERS = {"Content-Type": "application/json"}
 
-def create_recipe():
+def create_recipe(session):
     url = f"{BASE_URL}/api/recipes/new"
     payload = {
-        "title": f"Test Recipe {uuid.uuid4()}",
+        "title": namespaced(f"Test Recipe {uuid.uuid4()}"),
         "ingredients": [
             {"name": "Tomato", "quantity": 2, "unit": "pieces", "category": "Vegetables"},
             {"name": "Cheese", "quantity": 200, "unit": "grams", "category": "Dairy"}
@@ -17,11 +16,11 @@ def create_recipe():
         "cook_time_minutes": 20,
         "servings": 2
     }
-    response = requests.post(url, json=payload, headers=HEADERS, timeout=TIMEOUT)
+    response = session.post(url, json=payload, headers=HEADERS, timeout=TIMEOUT)
     response.raise_for_status()
     return response.json()['id']
 
-def create_meal_plan(recipe_id):
+def create_meal_plan(session, recipe_id):
     url = f"{BASE_URL}/api/meal-plans"
     payload = {
         "week_start_date": "2025-12-07",
@@ -35,50 +34,50 @@ def create_meal_plan(recipe_id):
             }
         ]
     }
-    response = requests.post(url, json=payload, headers=HEADERS, timeout=TIMEOUT)
+    response = session.post(url, json=payload, headers=HEADERS, timeout=TIMEOUT)
     response.raise_for_status()
     return response.json()['id']
 
-def get_shopping_list(meal_plan_id):
+def get_shopping_list(session, meal_plan_id):
     url = f"{BASE_URL}/api/shopping-lists/generated"
     params = {"meal_plan_id": meal_plan_id}
-    response = requests.get(url, params=params, headers=HEADERS, timeout=TIMEOUT)
+    response = session.get(url, params=params, headers=HEADERS, timeout=TIMEOUT)
     response.raise_for_status()
     return response.json()
 
-def send_shopping_list_email(shopping_list_id):
+def send_shopping_list_email(session, shopping_list_id):
     url = f"{BASE_URL}/api/send-shopping-list"
     payload = {
         "shopping_list_id": shopping_list_id,
         "email": "testuser@example.com"
     }
-    response = requests.post(url, json=payload, headers=HEADERS, timeout=TIMEOUT)
+    response = session.post(url, json=payload, headers=HEADERS, timeout=TIMEOUT)
     return response
 
-def delete_meal_plan(meal_plan_id):
+def delete_meal_plan(session, meal_plan_id):
     url = f"{BASE_URL}/api/meal-plans/{meal_plan_id}"
-    response = requests.delete(url, headers=HEADERS, timeout=TIMEOUT)
+    response = session.delete(url, headers=HEADERS, timeout=TIMEOUT)
     response.raise_for_status()
 
-def delete_recipe(recipe_id):
+def delete_recipe(session, recipe_id):
     url = f"{BASE_URL}/api/recipes/{recipe_id}"
-    response = requests.delete(url, headers=HEADERS, timeout=TIMEOUT)
+    response = session.delete(url, headers=HEADERS, timeout=TIMEOUT)
     response.raise_for_status()
 
-def test_validate_shopping_list_generation_and_email_sending():
+def test_validate_shopping_list_generation_and_email_sending(auth_session):
     recipe_id = None
     meal_plan_id = None
     try:
         # Step 1: Create a recipe resource
-        recipe_id = create_recipe()
+        recipe_id = create_recipe(auth_session)
         assert recipe_id, "Recipe creation failed: no id returned"
 
         # Step 2: Create a meal plan using the recipe
-        meal_plan_id = create_meal_plan(recipe_id)
+        meal_plan_id = create_meal_plan(auth_session, recipe_id)
         assert meal_plan_id, "Meal plan creation failed: no id returned"
 
         # Step 3: Get auto-generated shopping list for the meal plan
-        shopping_list = get_shopping_list(meal_plan_id)
+        shopping_list = get_shopping_list(auth_session, meal_plan_id)
         assert shopping_list, "No shopping list generated"
         assert "items" in shopping_list and isinstance(shopping_list["items"], list), "Shopping list items missing or invalid"
 
@@ -98,7 +97,7 @@ def test_validate_shopping_list_generation_and_email_sending():
         shopping_list_id = shopping_list.get("id")
         assert shopping_list_id, "Shopping list id missing for email sending"
 
-        email_response = send_shopping_list_email(shopping_list_id)
+        email_response = send_shopping_list_email(auth_session, shopping_list_id)
         assert email_response.status_code == 200, f"Failed to send shopping list email: {email_response.status_code} {email_response.text}"
         email_result = email_response.json()
         assert email_result.get("success") is True, "Shopping list email sending was not successful"
@@ -107,13 +106,14 @@ def test_validate_shopping_list_generation_and_email_sending():
         # Cleanup resources
         if meal_plan_id:
             try:
-                delete_meal_plan(meal_plan_id)
+                delete_meal_plan(auth_session, meal_plan_id)
             except Exception:
                 pass
         if recipe_id:
             try:
-                delete_recipe(recipe_id)
+                delete_recipe(auth_session, recipe_id)
             except Exception:
                 pass
 
-test_validate_shopping_list_generation_and_email_sending()
+if __name__ == "__main__":
+    test_validate_shopping_list_generation_and_email_sending(authenticated_session())
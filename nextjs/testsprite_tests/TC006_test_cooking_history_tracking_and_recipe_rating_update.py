@@ -1,14 +1,13 @@
-import requests
 import time
 
-BASE_URL = "http://localhost:3001"
-TIMEOUT = 30
+from helpers.auth_helper import BASE_URL, TIMEOUT, authenticated_session, namespaced
+
 HEADERS = {"Content-Type": "application/json"}
 
-def test_cooking_history_tracking_and_recipe_rating_update():
+def test_cooking_history_tracking_and_recipe_rating_update(auth_session):
     # Step 1: Create a new recipe to test cooking and rating update
     recipe_payload = {
-        "title": "Test Recipe for Cooking History",
+        "title": namespaced("Test Recipe for Cooking History"),
         "description": "A recipe used for testing cooking history and rating update",
         "ingredients": [
             {"name": "Ingredient A", "quantity": "1 cup"},
@@ -25,7 +24,7 @@ def test_cooking_history_tracking_and_recipe_rating_update():
 
     try:
         # Create recipe
-        response = requests.post(
+        response = auth_session.post(
             f"{BASE_URL}/api/recipes",
             json=recipe_payload,
             headers=HEADERS,
@@ -38,7 +37,7 @@ def test_cooking_history_tracking_and_recipe_rating_update():
 
         # Step 2: Start cooking the created recipe (log cooking event)
         cook_start_payload = {"event": "start"}
-        response = requests.post(
+        response = auth_session.post(
             f"{BASE_URL}/api/recipes/{recipe_id}/cook",
             json=cook_start_payload,
             headers=HEADERS,
@@ -53,7 +52,7 @@ def test_cooking_history_tracking_and_recipe_rating_update():
 
         # Step 3: Stop cooking the recipe (log cooking completion event)
         cook_stop_payload = {"event": "stop"}
-        response = requests.post(
+        response = auth_session.post(
             f"{BASE_URL}/api/recipes/{recipe_id}/cook",
             json=cook_stop_payload,
             headers=HEADERS,
@@ -64,7 +63,7 @@ def test_cooking_history_tracking_and_recipe_rating_update():
         assert cook_stop_data.get("status") == "cooking_completed", "Cooking stop event not logged correctly"
 
         # Step 4: Fetch cooking history for the recipe to confirm event logging
-        response = requests.get(
+        response = auth_session.get(
             f"{BASE_URL}/api/recipes/{recipe_id}/history",
             headers=HEADERS,
             timeout=TIMEOUT
@@ -74,10 +73,11 @@ def test_cooking_history_tracking_and_recipe_rating_update():
         events = history_data.get("events", [])
         assert any(e["event"] == "start" for e in events), "Cooking start event missing in history"
         assert any(e["event"] == "stop" for e in events), "Cooking stop event missing in history"
+        cooks = len(events)
 
         # Step 5: Submit a rating update for the cooked recipe
         rating_payload = {"rating": 4}  # Rate 4 stars
-        response = requests.post(
+        response = auth_session.post(
             f"{BASE_URL}/api/recipes/{recipe_id}/rate",
             json=rating_payload,
             headers=HEADERS,
@@ -89,23 +89,46 @@ def test_cooking_history_tracking_and_recipe_rating_update():
         updated_rating_count = rating_response.get("rating_count")
         assert updated_rating is not None, "Updated rating not returned"
         assert updated_rating_count is not None and updated_rating_count > 0, "Updated rating count invalid"
+        # The rating goes on the latest cook (the stop event); start carries none
+        assert updated_rating_count == 1, f"Expected 1 rating, got {updated_rating_count}"
+        assert abs(updated_rating - 4) < 0.01, f"Expected an average of 4, got {updated_rating}"
 
         # Step 6: Validate that the recipe details reflect the updated rating
-        response = requests.get(
+        response = auth_session.get(
             f"{BASE_URL}/api/recipes/{recipe_id}",
             headers=HEADERS,
             timeout=TIMEOUT
         )
         assert response.status_code == 200, f"Expected 200 OK on fetching updated recipe, got {response.status_code}"
         recipe_data = response.json()
-        assert abs(recipe_data.get("rating") - updated_rating) < 0.01, "Recipe rating not updated correctly"
-        assert recipe_data.get("rating_count") == updated_rating_count, "Recipe rating count not updated correctly"
+        # The rate endpoint returns the aggregates the cooking history trigger keeps on the recipe
+        assert abs(recipe_data.get("avg_rating") - updated_rating) < 0.01, "Recipe rating not updated correctly"
+        assert recipe_data.get("review_count") == updated_rating_count, "Recipe rating count not updated correctly"
+
+        # Step 7: Rating adds no cook to the history, and rating again replaces it
+        response = auth_session.post(
+            f"{BASE_URL}/api/recipes/{recipe_id}/rate",
+            json={"rating": 2},
+            headers=HEADERS,
+            timeout=TIMEOUT
+        )
+        assert response.status_code == 200, f"Expected 200 OK on re-rating, got {response.status_code}"
+        assert response.json().get("rating_count") == 1, f"Re-rating added a rating: {response.json()}"
+        assert abs(response.json().get("rating") - 2) < 0.01, f"Expected an average of 2, got {response.json()}"
+        response = auth_session.get(
+            f"{BASE_URL}/api/recipes/{recipe_id}/history",
+            headers=HEADERS,
+            timeout=TIMEOUT
+        )
+        assert response.status_code == 200, f"Expected 200 OK on fetching cooking history, got {response.status_code}"
+        events = response.json().get("events", [])
+        assert len(events) == cooks, f"Rating changed the history from {cooks} to {len(events)} entries"
 
     finally:
         # Cleanup - delete the created recipe
         if recipe_id:
             try:
-                del_resp = requests.delete(
+                del_resp = auth_session.delete(
                     f"{BASE_URL}/api/recipes/{recipe_id}",
                     headers=HEADERS,
                     timeout=TIMEOUT
@@ -114,4 +137,27 @@ def test_cooking_history_tracking_and_recipe_rating_update():
             except Exception as cleanup_err:
                 print(f"Cleanup failed for recipe {recipe_id}: {cleanup_err}")
 
-test_cooking_history_tracking_and_recipe_rating_update()
+def test_rating_an_uncooked_recipe_is_rejected(auth_session):
+    response = auth_session.post(
+        f"{BASE_URL}/api/recipes",
+        json={"title": namespaced("Test Recipe Never Cooked"), "ingredients": ["1 egg"], "instructions": ["Boil."]},
+        headers=HEADERS,
+        timeout=TIMEOUT
+    )
+    assert response.status_code == 201, f"Expected 201 Created, got {response.status_code}"
+    recipe_id = response.json()["id"]
+    try:
+        response = auth_session.post(
+            f"{BASE_URL}/api/recipes/{recipe_id}/rate",
+            json={"rating": 5},
+            headers=HEADERS,
+            timeout=TIMEOUT
+        )
+        assert response.status_code == 409, f"Expected 409 rating a recipe never cooked, got {response.status_code}"
+    finally:
+        auth_session.delete(f"{BASE_URL}/api/recipes/{recipe_id}", headers=HEADERS, timeout=TIMEOUT)
+
+if __name__ == "__main__":
+    session = authenticated_session()
+    test_cooking_history_tracking_and_recipe_rating_update(session)
+    test_rating_an_uncooked_recipe_is_rejected(session)
@@ -1,13 +1,9 @@
-import requests
+from helpers.auth_helper import BASE_URL, TIMEOUT, anonymous_session, authenticated_session
 
-base_url = "http://localhost:3001"
+base_url = BASE_URL
 
-def test_send_shopping_list_api():
-    session = requests.Session()
-    auth_payload = {"email": "test@testsprite.dev", "password": "TestSprite123!"}
-    auth_response = session.post(base_url + "/api/test-auth", json=auth_payload, timeout=30)
-    assert auth_response.status_code == 200
-    # Removed assertions on auth_json 'success' and 'email' fields
+def test_send_shopping_list_api(auth_session, anon_session):
+    session = auth_session
 
     send_shopping_list_endpoint = base_url + "/api/send-shopping-list"
     valid_payload = {
@@ -25,7 +21,7 @@ def test_send_shopping_list_api():
     }
 
     # Test valid authenticated request returns 200 and success
-    response = session.post(send_shopping_list_endpoint, json=valid_payload, timeout=30)
+    response = session.post(send_shopping_list_endpoint, json=valid_payload, timeout=TIMEOUT)
     assert response.status_code == 200
     json_resp = response.json()
     assert isinstance(json_resp, dict)
@@ -35,13 +31,12 @@ def test_send_shopping_list_api():
         "weekRange": "Dec 9 - Dec 15",
         "items": []
     }
-    response_empty = session.post(send_shopping_list_endpoint, json=empty_items_payload, timeout=30)
+    response_empty = session.post(send_shopping_list_endpoint, json=empty_items_payload, timeout=TIMEOUT)
     assert response_empty.status_code == 400
 
     # Test unauthenticated request returns 401
-    # Use a new session without authentication
-    unauth_session = requests.Session()
-    response_unauth = unauth_session.post(send_shopping_list_endpoint, json=valid_payload, timeout=30)
+    response_unauth = anon_session.post(send_shopping_list_endpoint, json=valid_payload, timeout=TIMEOUT)
     assert response_unauth.status_code == 401
 
-test_send_shopping_list_api()
+if __name__ == "__main__":
+    test_send_shopping_list_api(authenticated_session(), anonymous_session())
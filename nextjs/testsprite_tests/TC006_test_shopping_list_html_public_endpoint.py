@@ -1,15 +1,19 @@
 import requests
 import base64
 import json
+import statistics
+import uuid
 
-def test_shopping_list_html_public_endpoint():
-    base_url = "http://localhost:3001"
+from helpers.auth_helper import BASE_URL, TIMEOUT, anonymous_session
+
+def test_shopping_list_html_public_endpoint(anon_session):
+    base_url = BASE_URL
     endpoint = "/api/shopping-list-html"
-    timeout = 30
+    timeout = TIMEOUT
 
     # Test GET request without authentication returns HTML content
     try:
-        resp = requests.get(base_url + endpoint, timeout=timeout)
+        resp = anon_session.get(base_url + endpoint, timeout=timeout)
         resp.raise_for_status()
         content_type = resp.headers.get("Content-Type", "")
         # Assert content type is HTML
@@ -33,7 +37,7 @@ def test_shopping_list_html_public_endpoint():
     # Test GET request with base64-encoded data parameter to render custom list
     params = {"data": encoded_data}
     try:
-        resp_with_data = requests.get(base_url + endpoint, params=params, timeout=timeout)
+        resp_with_data = anon_session.get(base_url + endpoint, params=params, timeout=timeout)
         resp_with_data.raise_for_status()
         content_type_data = resp_with_data.headers.get("Content-Type", "")
         # Assert content type is HTML again
@@ -44,4 +48,62 @@ def test_shopping_list_html_public_endpoint():
     except requests.RequestException as e:
         assert False, f"Request with data parameter failed: {e}"
 
-test_shopping_list_html_public_endpoint()
+# Node rejects a request whose request line and headers pass 16 KB with a 431
+# before the route runs (next dev/start keep the default --max-http-header-size),
+# so a shared list's data param has to fit in it. 150 items is ~12 KB.
+MAX_URL_BYTES = 16 * 1024 - 1024  # leave room for the other headers
+
+def large_shopping_list(items: int = 150) -> str:
+    """base64 data param for a list of `items` items, unique per call so the first GET renders."""
+    categories = ["Produce", "Meat & Seafood", "Dairy & Eggs", "Pantry", "Bakery", "Frozen"]
+    shopping_list = {
+        "weekRange": f"Load test {uuid.uuid4().hex[:8]}",
+        "items": [
+            {"name": f"Item {n}", "quantity": n % 5 + 1, "category": categories[n % len(categories)]}
+            for n in range(items)
+        ],
+    }
+    return base64.b64encode(json.dumps(shopping_list).encode("utf-8")).decode("utf-8")
+
+def test_shopping_list_html_conditional_get(anon_session):
+    url = BASE_URL + "/api/shopping-list-html"
+    params = {"data": large_shopping_list(150)}
+    url_bytes = len(requests.Request("GET", url, params=params).prepare().url)
+    assert url_bytes < MAX_URL_BYTES, f"Test URL is {url_bytes:,} bytes; Node would answer 431"
+
+    first = anon_session.get(url, params=params, timeout=TIMEOUT)
+    assert first.status_code == 200, f"Expected 200 but got {first.status_code}"
+    etag = first.headers.get("ETag")
+    assert etag, "Response has no ETag"
+    cache_control = first.headers.get("Cache-Control", "")
+    assert "no-store" not in cache_control, f"Cache-Control forbids caching: {cache_control}"
+    assert "Item 149" in first.text, "150-item list is missing its last item"
+
+    # Repeat visit: the browser revalidates with the ETag it has
+    revalidated = anon_session.get(url, params=params, headers={"If-None-Match": etag}, timeout=TIMEOUT)
+    assert revalidated.status_code == 304, f"Expected 304 for a matching ETag but got {revalidated.status_code}"
+    assert revalidated.content == b"", "304 response must not have a body"
+    assert revalidated.headers.get("ETag") == etag, "304 response should repeat the ETag"
+
+    # A stale ETag gets the page again, with the same ETag as before
+    stale = anon_session.get(url, params=params, headers={"If-None-Match": '"stale"'}, timeout=TIMEOUT)
+    assert stale.status_code == 200, f"Expected 200 for a stale ETag but got {stale.status_code}"
+    assert stale.headers.get("ETag") == etag, "Same data should render with the same ETag"
+    assert stale.content == first.content, "Same data should render the same page"
+
+    # What a 304 saves over a full GET of the same list
+    full_ms, conditional_ms = [], []
+    for _ in range(5):
+        full = anon_session.get(url, params=params, timeout=TIMEOUT)
+        full_ms.append(full.elapsed.total_seconds() * 1000)
+        conditional = anon_session.get(url, params=params, headers={"If-None-Match": etag}, timeout=TIMEOUT)
+        assert conditional.status_code == 304
+        conditional_ms.append(conditional.elapsed.total_seconds() * 1000)
+    full_median, conditional_median = statistics.median(full_ms), statistics.median(conditional_ms)
+    print(f"\n150-item list: first render {first.elapsed.total_seconds() * 1000:.1f} ms "
+          f"({first.headers.get('X-Render-Cache', '?')}), full GET {full_median:.1f} ms, "
+          f"304 {conditional_median:.1f} ms; {len(first.content):,} body bytes saved per revalidation")
+
+if __name__ == "__main__":
+    test_shopping_list_html_public_endpoint(anonymous_session())
+    test_shopping_list_html_conditional_get(anonymous_session())
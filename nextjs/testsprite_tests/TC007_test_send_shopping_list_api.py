@@ -1,18 +1,10 @@
-import requests
+from helpers.auth_helper import BASE_URL, TIMEOUT, anonymous_session, authenticated_session
 
-base_url = "http://localhost:3001"
+base_url = BASE_URL
 
-def test_send_shopping_list_api():
-    session = requests.Session()
-    timeout = 30
-
-    # Authenticate first
-    auth_resp = session.post(
-        base_url + "/api/test-auth",
-        json={"email": "test@testsprite.dev", "password": "TestSprite123!"},
-        timeout=timeout,
-    )
-    assert auth_resp.status_code == 200, f"Authentication failed: {auth_resp.text}"
+def test_send_shopping_list_api(auth_session, anon_session):
+    session = auth_session
+    timeout = TIMEOUT
 
     # Test sending a valid shopping list
     valid_payload = {
@@ -46,12 +38,12 @@ def test_send_shopping_list_api():
     assert resp_empty.status_code == 400, f"Expected 400 for empty items, got {resp_empty.status_code}: {resp_empty.text}"
 
     # Test unauthenticated request to POST /api/send-shopping-list
-    unauth_session = requests.Session()
-    resp_unauth = unauth_session.post(
+    resp_unauth = anon_session.post(
         base_url + "/api/send-shopping-list",
         json=valid_payload,
         timeout=timeout,
     )
     assert resp_unauth.status_code == 401, f"Expected 401 for unauthenticated, got {resp_unauth.status_code}: {resp_unauth.text}"
 
-test_send_shopping_list_api()
+if __name__ == "__main__":
+    test_send_shopping_list_api(authenticated_session(), anonymous_session())
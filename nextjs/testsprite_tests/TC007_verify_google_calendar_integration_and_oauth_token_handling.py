@@ -1,10 +1,9 @@
 import requests
 import uuid
 
-BASE_URL = "http://localhost:3001"
-TIMEOUT = 30
+from helpers.auth_helper import BASE_URL, TIMEOUT, authenticated_session
 
-def test_verify_google_calendar_integration_and_oauth_token_handling():
+def test_verify_google_calendar_integration_and_oauth_token_handling(auth_session):
     # Step 1: Simulate OAuth token exchange
     # Usually, this would require an auth_code obtained from Google's OAuth consent screen.
     # For test purposes, we simulate with a dummy auth_code.
@@ -14,7 +13,7 @@ def test_verify_google_calendar_integration_and_oauth_token_handling():
     exchange_payload = {"code": auth_code}
 
     try:
-        exchange_resp = requests.post(exchange_token_url, json=exchange_payload, headers=headers, timeout=TIMEOUT)
+        exchange_resp = auth_session.post(exchange_token_url, json=exchange_payload, headers=headers, timeout=TIMEOUT)
         assert exchange_resp.status_code == 200, f"Token exchange failed: {exchange_resp.text}"
         token_data = exchange_resp.json()
         assert "access_token" in token_data and token_data["access_token"], "Access token missing in exchange response"
@@ -39,7 +38,7 @@ def test_verify_google_calendar_integration_and_oauth_token_handling():
             "access_token": access_token
         }
 
-        create_resp = requests.post(create_events_url, json=event_payload, headers=headers, timeout=TIMEOUT)
+        create_resp = auth_session.post(create_events_url, json=event_payload, headers=headers, timeout=TIMEOUT)
         assert create_resp.status_code == 200, f"Event creation failed: {create_resp.text}"
         create_result = create_resp.json()
         assert isinstance(create_result, dict), "Event creation response is not a JSON object"
@@ -47,7 +46,7 @@ def test_verify_google_calendar_integration_and_oauth_token_handling():
         # Step 3: Check Google Calendar sync status
         status_url = f"{BASE_URL}/api/google-calendar/status"
         status_headers = {"Authorization": f"Bearer {access_token}"}
-        status_resp = requests.get(status_url, headers=status_headers, timeout=TIMEOUT)
+        status_resp = auth_session.get(status_url, headers=status_headers, timeout=TIMEOUT)
         assert status_resp.status_code == 200, f"Status check failed: {status_resp.text}"
         status_data = status_resp.json()
         assert "connected" in status_data and isinstance(status_data["connected"], bool), "Invalid status response"
@@ -55,7 +54,7 @@ def test_verify_google_calendar_integration_and_oauth_token_handling():
         # Step 4: Disconnect Google Calendar
         disconnect_url = f"{BASE_URL}/api/google-calendar/disconnect"
         disconnect_headers = {"Authorization": f"Bearer {access_token}"}
-        disconnect_resp = requests.post(disconnect_url, headers=disconnect_headers, timeout=TIMEOUT)
+        disconnect_resp = auth_session.post(disconnect_url, headers=disconnect_headers, timeout=TIMEOUT)
         assert disconnect_resp.status_code == 200, f"Disconnect failed: {disconnect_resp.text}"
         disconnect_data = disconnect_resp.json()
         assert "success" in disconnect_data and disconnect_data["success"] is True, "Disconnect response invalid"
@@ -63,4 +62,5 @@ def test_verify_google_calendar_integration_and_oauth_token_handling():
     except requests.RequestException as e:
         assert False, f"RequestException occurred: {str(e)}"
 
-test_verify_google_calendar_integration_and_oauth_token_handling()
\ No newline at end of file
+if __name__ == "__main__":
+    test_verify_google_calendar_integration_and_oauth_token_handling(authenticated_session())
\ No newline at end of file
@@ -1,19 +1,13 @@
 import requests
 
-base_url = "http://localhost:3001"
+from helpers.auth_helper import BASE_URL, TIMEOUT, anonymous_session, authenticated_session
 
-def test_google_calendar_status_api():
-    session = requests.Session()
-    auth_payload = {"email": "test@testsprite.dev", "password": "TestSprite123!"}
-    try:
-        # Authenticate to get session cookies
-        auth_response = session.post(f"{base_url}/api/test-auth", json=auth_payload, timeout=30)
-        assert auth_response.status_code == 200, f"Authentication failed with status {auth_response.status_code}"
-        auth_json = auth_response.json()
-        assert "email" in auth_json or "user" in auth_json, "Auth response missing user info"
+base_url = BASE_URL
 
+def test_google_calendar_status_api(auth_session, anon_session):
+    try:
         # Authenticated GET /api/google-calendar/status
-        status_response = session.get(f"{base_url}/api/google-calendar/status", timeout=30)
+        status_response = auth_session.get(f"{base_url}/api/google-calendar/status", timeout=TIMEOUT)
         assert status_response.status_code == 200, f"Expected 200 OK but got {status_response.status_code}"
         status_data = status_response.json()
 
@@ -27,10 +21,11 @@ def test_google_calendar_status_api():
             "'connectedAccount' is neither None nor a string"
 
         # Test unauthenticated request returns 401
-        unauth_response = requests.get(f"{base_url}/api/google-calendar/status", timeout=30)
+        unauth_response = anon_session.get(f"{base_url}/api/google-calendar/status", timeout=TIMEOUT)
         assert unauth_response.status_code == 401, f"Expected 401 Unauthorized but got {unauth_response.status_code}"
 
     except requests.RequestException as e:
         assert False, f"Request exception occurred: {e}"
 
-test_google_calendar_status_api()
\ No newline at end of file
+if __name__ == "__main__":
+    test_google_calendar_status_api(authenticated_session(), anonymous_session())
\ No newline at end of file
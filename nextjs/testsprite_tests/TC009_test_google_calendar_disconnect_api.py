@@ -1,37 +1,30 @@
 import requests
 
-base_url = "http://localhost:3001"
-auth_endpoint = "/api/test-auth"
+from helpers.auth_helper import BASE_URL, TIMEOUT, anonymous_session, authenticated_session
+
+base_url = BASE_URL
 disconnect_endpoint = "/api/google-calendar/disconnect"
-timeout = 30
+timeout = TIMEOUT
 
-def test_google_calendar_disconnect_api():
+def test_google_calendar_disconnect_api(auth_session, anon_session):
     # Test unauthenticated request returns 401
     try:
-        unauth_resp = requests.post(base_url + disconnect_endpoint, timeout=timeout)
+        unauth_resp = anon_session.post(base_url + disconnect_endpoint, timeout=timeout)
     except requests.RequestException as e:
         assert False, f"Unauthenticated request exception: {e}"
     else:
         assert unauth_resp.status_code == 401, f"Expected 401 for unauthenticated request, got {unauth_resp.status_code}"
 
     # Authenticated flow
-    session = requests.Session()
+    disconnect_resp = auth_session.post(base_url + disconnect_endpoint, timeout=timeout)
+    assert disconnect_resp.status_code == 200, f"Disconnect API returned {disconnect_resp.status_code}"
     try:
-        auth_resp = session.post(base_url + auth_endpoint, json={"email": "test@testsprite.dev", "password": "TestSprite123!"}, timeout=timeout)
-        assert auth_resp.status_code == 200, f"Authentication failed with status {auth_resp.status_code}"
-        auth_json = auth_resp.json()
-        # Basic check that authentication succeeded (presence of session cookie assumed from description)
-
-        disconnect_resp = session.post(base_url + disconnect_endpoint, timeout=timeout)
-        assert disconnect_resp.status_code == 200, f"Disconnect API returned {disconnect_resp.status_code}"
-        try:
-            resp_json = disconnect_resp.json()
-        except Exception:
-            assert False, "Disconnect API response is not valid JSON"
-        assert 'message' in resp_json, "'message' not in disconnect response"
-        # The success message content is not explicitly specified, just verify it is a non-empty string
-        assert isinstance(resp_json['message'], str) and len(resp_json['message']) > 0, "Disconnect response message empty or not a string"
-    finally:
-        session.close()
+        resp_json = disconnect_resp.json()
+    except Exception:
+        assert False, "Disconnect API response is not valid JSON"
+    assert 'message' in resp_json, "'message' not in disconnect response"
+    # The success message content is not explicitly specified, just verify it is a non-empty string
+    assert isinstance(resp_json['message'], str) and len(resp_json['message']) > 0, "Disconnect response message empty or not a string"
 
-test_google_calendar_disconnect_api()
\ No newline at end of file
+if __name__ == "__main__":
+    test_google_calendar_disconnect_api(authenticated_session(), anonymous_session())
\ No newline at end of file
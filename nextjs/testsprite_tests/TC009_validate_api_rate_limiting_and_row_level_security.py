@@ -1,8 +1,7 @@
-import requests
 import time
 
-BASE_URL = "http://localhost:3001"
-TIMEOUT = 30
+from helpers.auth_helper import BASE_URL, TIMEOUT, anonymous_session, namespaced, new_session
+
 AUTH_ENDPOINT = "/api/auth/login"
 RECIPES_ENDPOINT = "/api/recipes"
 HEADERS = {"Content-Type": "application/json"}
@@ -11,9 +10,9 @@ HEADERS = {"Content-Type": "application/json"}
 TEST_USER_EMAIL = "testuser@example.com"
 TEST_USER_PASSWORD = "TestPassword123!"
 
-def authenticate_user(email, password):
+def authenticate_user(session, email, password):
     """Authenticate to get JWT token for protected endpoints."""
-    resp = requests.post(
+    resp = session.post(
         BASE_URL + AUTH_ENDPOINT,
         json={"email": email, "password": password},
         headers=HEADERS,
@@ -24,10 +23,10 @@ def authenticate_user(email, password):
     assert token, "Authentication token not found in response."
     return token
 
-def create_recipe(token):
+def create_recipe(session, token):
     """Create a recipe to test Row Level Security on database operations."""
     payload = {
-        "title": "Test Recipe for RLS",
+        "title": namespaced("Test Recipe for RLS"),
         "description": "Recipe created to test Row Level Security.",
         "ingredients": ["1 unit test ingredient"],
         "instructions": ["Step 1: Do unit testing."],
@@ -36,7 +35,7 @@ def create_recipe(token):
     }
     headers = HEADERS.copy()
     headers["Authorization"] = f"Bearer {token}"
-    resp = requests.post(
+    resp = session.post(
         BASE_URL + RECIPES_ENDPOINT, json=payload, headers=headers, timeout=TIMEOUT
     )
     resp.raise_for_status()
@@ -45,18 +44,21 @@ def create_recipe(token):
     assert recipe_id, "Created recipe ID not found."
     return recipe_id
 
-def delete_recipe(token, recipe_id):
+def delete_recipe(session, token, recipe_id):
     headers = HEADERS.copy()
     headers["Authorization"] = f"Bearer {token}"
-    resp = requests.delete(
+    resp = session.delete(
         f"{BASE_URL}{RECIPES_ENDPOINT}/{recipe_id}", headers=headers, timeout=TIMEOUT
     )
     # Deletion may return 204 No Content or 200 OK
     assert resp.status_code in (200, 204), f"Failed to delete recipe with ID {recipe_id}."
 
-def test_validate_api_rate_limiting_and_row_level_security():
+def test_validate_api_rate_limiting_and_row_level_security(fresh_session, anon_session):
+    # Authenticates with its own user's bearer token rather than the shared cookies
+    session = fresh_session
+
     # Step 1: Authenticate and get access token
-    token = authenticate_user(TEST_USER_EMAIL, TEST_USER_PASSWORD)
+    token = authenticate_user(session, TEST_USER_EMAIL, TEST_USER_PASSWORD)
     headers = HEADERS.copy()
     headers["Authorization"] = f"Bearer {token}"
 
@@ -66,7 +68,7 @@ def test_validate_api_rate_limiting_and_row_level_security():
 
     url = BASE_URL + RECIPES_ENDPOINT
     payload = {
-        "title": "Rate Limit Test Recipe",
+        "title": namespaced("Rate Limit Test Recipe"),
         "description": "Testing rate limiting enforcement.",
         "ingredients": ["ingredient1"],
         "instructions": ["instruction1"],
@@ -76,15 +78,15 @@ def test_validate_api_rate_limiting_and_row_level_security():
 
     success_responses = 0
     rate_limit_responses = 0
+    created_recipe_ids = []
 
     for i in range(10):
-        resp = requests.post(url, json=payload, headers=headers, timeout=TIMEOUT)
+        resp = session.post(url, json=payload, headers=headers, timeout=TIMEOUT)
         if resp.status_code == 201:
             success_responses += 1
-            # Clean up created recipe immediately to avoid clutter
             created_recipe_id = resp.json().get("id")
             if created_recipe_id:
-                requests.delete(f"{url}/{created_recipe_id}", headers=headers, timeout=TIMEOUT)
+                created_recipe_ids.append(created_recipe_id)
         elif resp.status_code == 429:
             rate_limit_responses += 1
         else:
@@ -93,6 +95,10 @@ def test_validate_api_rate_limiting_and_row_level_security():
         # Minimal delay to try to trigger rate limiting if implemented
         time.sleep(0.05)
 
+    # Clean up the created recipes in one request to avoid clutter
+    if created_recipe_ids:
+        session.delete(f"{url}/bulk", json={"ids": created_recipe_ids}, headers=headers, timeout=TIMEOUT)
+
     assert success_responses > 0, "No successful requests; cannot validate rate limiting properly."
     assert rate_limit_responses > 0, "Rate limiting not enforced; no 429 responses received."
 
@@ -100,10 +106,10 @@ def test_validate_api_rate_limiting_and_row_level_security():
     # Create a new recipe and then attempt to access it with same user - should succeed
     recipe_id = None
     try:
-        recipe_id = create_recipe(token)
+        recipe_id = create_recipe(session, token)
 
         # GET the newly created recipe - should be accessible
-        get_resp = requests.get(
+        get_resp = session.get(
             f"{url}/{recipe_id}", headers=headers, timeout=TIMEOUT
         )
         get_resp.raise_for_status()
@@ -113,7 +119,7 @@ def test_validate_api_rate_limiting_and_row_level_security():
         # Simulate access with invalid token (unauthorized user) to test RLS denies access
         invalid_headers = HEADERS.copy()
         invalid_headers["Authorization"] = "Bearer invalidtoken"
-        unauthorized_resp = requests.get(
+        unauthorized_resp = anon_session.get(
             f"{url}/{recipe_id}", headers=invalid_headers, timeout=TIMEOUT
         )
         # Expect unauthorized (401) or forbidden (403) due to RLS blocking access
@@ -122,6 +128,7 @@ def test_validate_api_rate_limiting_and_row_level_security():
     finally:
         # Clean up: delete created recipe if exists
         if recipe_id:
-            delete_recipe(token, recipe_id)
+            delete_recipe(session, token, recipe_id)
 
-test_validate_api_rate_limiting_and_row_level_security()
+if __name__ == "__main__":
+    test_validate_api_rate_limiting_and_row_level_security(new_session(), anonymous_session())
@@ -1,17 +1,14 @@
 import requests
 import time
 
-base_url = "http://localhost:3001"
+from helpers.auth_helper import BASE_URL, TIMEOUT, authenticated_session
 
-headers = {"Content-Type": "application/json"}
+base_url = BASE_URL
 
-def test_api_rate_limiting():
-    session = requests.Session()
+headers = {"Content-Type": "application/json"}
 
-    # Authenticate
-    auth_payload = {"email": "test@testsprite.dev", "password": "TestSprite123!"}
-    auth_response = session.post(base_url + "/api/test-auth", json=auth_payload, headers=headers, timeout=30)
-    assert auth_response.status_code == 200, f"Authentication failed: {auth_response.text}"
+def test_api_rate_limiting(auth_session):
+    session = auth_session
 
     exceeded_limit = False
     retry_after = None
@@ -22,7 +19,7 @@ def test_api_rate_limiting():
     for i in range(total_requests):
         try:
             payload = {"url": f"http://example.com/recipe-{i}"}
-            response = session.post(base_url + "/api/parse-recipe", json=payload, headers=headers, timeout=30)
+            response = session.post(base_url + "/api/parse-recipe", json=payload, headers=headers, timeout=TIMEOUT)
             if response.status_code == 429:
                 exceeded_limit = True
                 retry_after = response.headers.get("Retry-After")
@@ -38,4 +35,5 @@ def test_api_rate_limiting():
     assert exceeded_limit, "Rate limiting was not enforced after exceeding request limit"
     assert success_count <= rate_limit_threshold, f"Success count {success_count} exceeds rate limit threshold"
 
-test_api_rate_limiting()
+if __name__ == "__main__":
+    test_api_rate_limiting(authenticated_session())
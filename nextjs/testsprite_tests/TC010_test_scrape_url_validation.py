@@ -1,20 +1,11 @@
-import requests
+from helpers.auth_helper import BASE_URL, TIMEOUT, authenticated_session
 
-def test_scrape_url_validation():
-    base_url = "http://localhost:3001"
-    session = requests.Session()
-    # Authenticate first
-    auth_resp = session.post(
-        base_url + "/api/test-auth",
-        json={"email": "test@testsprite.dev", "password": "TestSprite123!"},
-        timeout=30
-    )
-    assert auth_resp.status_code == 200, f"Authentication failed: {auth_resp.text}"
-    auth_json = auth_resp.json()
-    assert auth_json.get("success") is True, f"Auth success false: {auth_resp.text}"
+def test_scrape_url_validation(auth_session):
+    base_url = BASE_URL
+    session = auth_session
     # 1) Empty body returns 400 with 'URL is required'
     empty_resp = session.post(
-        base_url + "/api/scrape-url", json={}, timeout=30
+        base_url + "/api/scrape-url", json={}, timeout=TIMEOUT
     )
     assert empty_resp.status_code == 400, f"Expected 400 for empty body, got {empty_resp.status_code}"
     try:
@@ -25,7 +16,7 @@ def test_scrape_url_validation():
     assert "URL is required" in err_msg_1, f"Expected 'URL is required' in error message, got: {err_msg_1}"
     # 2) Invalid URL {"url": "not-a-url"} returns 400 with 'Invalid URL'
     invalid_resp = session.post(
-        base_url + "/api/scrape-url", json={"url": "not-a-url"}, timeout=30
+        base_url + "/api/scrape-url", json={"url": "not-a-url"}, timeout=TIMEOUT
     )
     assert invalid_resp.status_code == 400, f"Expected 400 for invalid url, got {invalid_resp.status_code}"
     try:
@@ -38,7 +29,7 @@ def test_scrape_url_validation():
     valid_resp = session.post(
         base_url + "/api/scrape-url",
         json={"url": "https://example.com/recipe"},
-        timeout=30
+        timeout=TIMEOUT
     )
     assert valid_resp.status_code == 200, f"Expected 200 for valid url, got {valid_resp.status_code}"
     # Optionally check that response content has expected keys or content
@@ -48,4 +39,5 @@ def test_scrape_url_validation():
     except Exception:
         assert False, "Response is not valid JSON for valid URL request"
 
-test_scrape_url_validation()
\ No newline at end of file
+if __name__ == "__main__":
+    test_scrape_url_validation(authenticated_session())
\ No newline at end of file
@@ -1,12 +1,11 @@
 import requests
 import re
 
-BASE_URL = "http://localhost:3001"
-TIMEOUT = 30
+from helpers.auth_helper import BASE_URL, TIMEOUT, anonymous_session
 
-def test_verify_gdpr_cookie_consent_and_accessible_ui_design():
+def test_verify_gdpr_cookie_consent_and_accessible_ui_design(anon_session):
     try:
-        response = requests.get(BASE_URL, timeout=TIMEOUT)
+        response = anon_session.get(BASE_URL, timeout=TIMEOUT)
         assert response.status_code == 200, f"Expected HTTP 200, got {response.status_code}"
 
         html_text = response.text
@@ -49,4 +48,5 @@ def test_verify_gdpr_cookie_consent_and_accessible_ui_design():
         assert False, f"HTTP request failed: {e}"
 
 
-test_verify_gdpr_cookie_consent_and_accessible_ui_design()
\ No newline at end of file
+if __name__ == "__main__":
+    test_verify_gdpr_cookie_consent_and_accessible_ui_design(anonymous_session())
\ No newline at end of file
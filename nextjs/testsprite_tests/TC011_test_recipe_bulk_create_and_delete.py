@@ -0,0 +1,51 @@
+from helpers.auth_helper import BASE_URL, TIMEOUT, authenticated_session, namespaced
+
+def bulk_recipe(n: int, **extra) -> dict:
+    return {
+        "title": namespaced(f"Test Bulk Recipe {n}"),
+        "ingredients": ["2 cups rice", "1 tsp salt"],
+        "instructions": ["Rinse the rice.", "Simmer until tender."],
+        "servings": 2,
+        **extra,
+    }
+
+def test_recipe_bulk_rejects_out_of_range_rating(auth_session):
+    response = auth_session.post(f"{BASE_URL}/api/recipes/bulk",
+                                 json={"recipes": [bulk_recipe(0, rating=6)]}, timeout=TIMEOUT)
+    assert response.status_code == 400, f"Expected 400 for rating 6 but got {response.status_code}"
+
+def test_recipe_bulk_create_and_delete(auth_session):
+    # rating is the owner's own and is stored; rating_count is not a column,
+    # and avg_rating/review_count only come from cooking history
+    recipes = [bulk_recipe(0, rating=4.5, rating_count=12), bulk_recipe(1), bulk_recipe(2)]
+
+    created = auth_session.post(f"{BASE_URL}/api/recipes/bulk", json={"recipes": recipes}, timeout=TIMEOUT)
+    assert created.status_code == 201, f"Bulk create failed: {created.text}"
+    body = created.json()
+    assert body["created"] == len(recipes), f"Expected {len(recipes)} recipes created: {body}"
+    ids = body["ids"]
+    assert len(set(ids)) == len(recipes), f"Expected {len(recipes)} distinct ids: {ids}"
+
+    try:
+        for recipe_id, recipe in zip(ids, recipes):
+            fetched = auth_session.get(f"{BASE_URL}/api/recipes/{recipe_id}", timeout=TIMEOUT)
+            assert fetched.status_code == 200, f"Get after bulk create failed: {fetched.text}"
+            data = fetched.json()
+            assert data["title"] == recipe["title"], "Fetched title mismatch after bulk create"
+            assert data["ingredients"] == recipe["ingredients"], "Fetched ingredients mismatch after bulk create"
+            assert data.get("rating") == recipe.get("rating"), f"Owner rating mismatch: {data.get('rating')}"
+            assert data.get("avg_rating") is None, f"New recipe has an average rating: {data.get('avg_rating')}"
+            assert not data.get("review_count"), f"New recipe has reviews: {data.get('review_count')}"
+    finally:
+        deleted = auth_session.delete(f"{BASE_URL}/api/recipes/bulk", json={"ids": ids}, timeout=TIMEOUT)
+
+    assert deleted.status_code == 200, f"Bulk delete failed: {deleted.text}"
+    result = deleted.json()
+    assert sorted(result["ids"]) == sorted(ids), f"Bulk delete removed {result['ids']}, expected {ids}"
+    assert result["skipped"] == [], f"Bulk delete skipped {result['skipped']}"
+
+    gone = auth_session.get(f"{BASE_URL}/api/recipes/{ids[0]}", timeout=TIMEOUT)
+    assert gone.status_code == 404, f"Expected 404 after bulk delete but got {gone.status_code}"
+
+if __name__ == "__main__":
+    test_recipe_bulk_create_and_delete(authenticated_session())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Benchmark Google Calendar sync against meal plan size, using the stand-in.
+
+/api/google-calendar/create-events sends a plan's meals to Google in batch
+requests of 50 events, a few batches at a time, retrying the events that
+come back rate limited or failed. This syncs synthetic plans of --sizes
+meals (100-1000, a month or more of meals for a household) through the dev
+server, with the stand-in's Calendar API answering every request after
+--latency ms, and records:
+
+  wall ms      the create-events call, end to end
+  round trips  wall time over the stand-in latency: stays near a handful
+               as the plan grows if batching works, grows with it if not
+  upstream     batch requests and event parts the stand-in saw, and the
+               most batches it had in flight at once
+  stored       events the stand-in holds afterwards, and any duplicates
+               (a retried event created twice)
+
+--error-rate and --rate-limit-rate make the stand-in fail that share of
+batches and of the events in them, to exercise the retries; the round trip
+gate (--max-round-trips) is skipped then, since backoff is the point.
+Results go to tmp/load/calendar_sync.json.
+
+Start the stand-in and a dev server pointed at it first:
+
+  python standin_server.py &
+  eval "$(python standin_server.py --print-env)" && npm run dev -- -p 3001
+
+create-events allows 20 syncs an hour per user; the default run makes 4
+(one warm-up, then one per size).
+
+Usage:
+  python bench_calendar_sync.py
+  python bench_calendar_sync.py --sizes 100,1000 --latency 300 --max-round-trips 8
+  python bench_calendar_sync.py --error-rate 0.05 --rate-limit-rate 0.1
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+from helpers.auth_helper import BASE_URL, authenticated_session
+from standin_server import DEFAULT_PORT
+
+TESTS_DIR = Path(__file__).resolve().parent
+REPORT_PATH = TESTS_DIR / "tmp" / "load" / "calendar_sync.json"
+ROUTE = "/api/google-calendar/create-events"
+DEFAULT_SIZES = "100,300,1000"
+DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+MEAL_TYPES = ("breakfast", "lunch", "dinner")
+# Batches in flight at once (CALENDAR_BATCH_CONCURRENCY in src/lib/google-calendar.ts)
+MAX_IN_FLIGHT = 4
+# Backoff waits on 1 s Retry-Afters and up to 16 s between attempts
+REQUEST_TIMEOUT = 300
+
+def meal_plan(size: int, run: str) -> list[dict]:
+    """size meals, titled so the stand-in's copies can be matched back to this run."""
+    return [{
+        "day": DAYS[n % len(DAYS)],
+        "cook": "Bench",
+        "meal_type": MEAL_TYPES[n // len(DAYS) % len(MEAL_TYPES)],
+        "recipe": {
+            "title": f"{run} meal {n}",
+            "prep_time": "10 min",
+            "cook_time": "20 min",
+            "servings": 4,
+            "ingredients": ["1 cup rice", "2 cups water", "salt"],
+            "instructions": "Simmer the rice until the water is absorbed.",
+        },
+    } for n in range(size)]
+
+def standin_json(standin_url: str, method: str, name: str, body=None):
+    response = requests.request(method, f"{standin_url}/__standin/{name}", json=body, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+def connect_google(session: requests.Session, base_url: str) -> str:
+    """Store stand-in Google tokens for the test user; returns the Google account."""
+    response = session.post(f"{base_url}/api/google-calendar/exchange-token", json={
+        "code": "bench-calendar-sync",
+        "redirectUri": f"{base_url}/auth/google/callback",
+    }, timeout=REQUEST_TIMEOUT)
+    if response.status_code != 200:
+        raise RuntimeError(f"exchange-token answered {response.status_code}: {response.text[:200]}")
+    return response.json()["connectedAccount"]
+
+def sync(session: requests.Session, base_url: str, items: list[dict]) -> tuple[dict, float]:
+    start = time.perf_counter()
+    response = session.post(f"{base_url}{ROUTE}", json={
+        "weekRange": "Nov 2 - Nov 8",
+        "items": items,
+        "userTimeZone": "UTC",
+    }, timeout=REQUEST_TIMEOUT)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if response.status_code != 200:
+        raise RuntimeError(f"{ROUTE} answered {response.status_code}: {response.text[:200]}")
+    return response.json(), wall_ms
+
+def measure(args, session: requests.Session, size: int) -> dict:
+    run = f"calendar-sync-{size}-{time.time_ns()}"
+    standin_json(args.standin_url, "POST", "reset-stats")
+    body, wall_ms = sync(session, args.base_url, meal_plan(size, run))
+    google = standin_json(args.standin_url, "GET", "stats")["services"]["google"]
+    # Events are titled "<cook>: <recipe>"
+    titles = [e["summary"] for e in standin_json(args.standin_url, "GET", "events")
+              if f"{run} meal " in e.get("summary", "")]
+    batches = sum(count for route, count in google["routes"].items() if route.startswith("POST /batch/"))
+    parts = sum(count for route, count in google["routes"].items() if route.startswith("BATCH "))
+    return {
+        "events": size,
+        "wall_ms": round(wall_ms, 1),
+        "round_trips": round(wall_ms / args.latency, 2) if args.latency else None,
+        "created": body.get("eventsCreated"),
+        "failed": body.get("eventsFailed"),
+        "batch_requests": batches,
+        "event_parts": parts,
+        "single_requests": google["requests"] - batches - parts,
+        "peak_in_flight": google["peak_in_flight"],
+        "injected_errors": google["injected_errors"],
+        "injected_rate_limits": google["injected_rate_limits"],
+        "stored": len(titles),
+        "duplicates": len(titles) - len(set(titles)),
+        "errors": body.get("errors", [])[:5],
+    }
+
+def write_report(report: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(report, indent=2) + "\n")
+    tmp_path.replace(path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Google Calendar sync against meal plan size.")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"dev server (default: {BASE_URL})")
+    parser.add_argument("--standin-url", default=f"http://127.0.0.1:{DEFAULT_PORT}",
+                        help=f"stand-in the dev server calls (default: http://127.0.0.1:{DEFAULT_PORT})")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"meals per sync (default: {DEFAULT_SIZES})")
+    parser.add_argument("--latency", type=float, default=200,
+                        help="stand-in Calendar API latency in ms (default: 200)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of Calendar requests failed with a 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of Calendar requests answered 429")
+    parser.add_argument("--max-round-trips", type=float, default=10,
+                        help="fail a size whose wall time exceeds this many latencies (default: 10)")
+    parser.add_argument("-o", "--output", type=Path, default=REPORT_PATH,
+                        help="JSON report path (default: tmp/load/calendar_sync.json)")
+    args = parser.parse_args()
+
+    try:
+        sizes = sorted({int(size) for size in args.sizes.split(",")})
+    except ValueError:
+        parser.error(f"--sizes must be comma-separated integers, not {args.sizes!r}")
+    if not sizes or sizes[0] < 1:
+        parser.error("--sizes must be at least 1")
+    if args.latency <= 0:
+        parser.error("--latency must be positive")
+    for name in ("error_rate", "rate_limit_rate"):
+        if not 0 <= getattr(args, name) <= 1:
+            parser.error(f"--{name.replace('_', '-')} must be between 0 and 1")
+    faults = args.error_rate > 0 or args.rate_limit_rate > 0
+
+    try:
+        saved = standin_json(args.standin_url, "GET", "stats")["settings"]
+    except requests.RequestException as e:
+        parser.error(f"{args.standin_url}: {e}; is standin_server.py running?")
+
+    session = authenticated_session()
+    try:
+        account = connect_google(session, args.base_url)
+    except (requests.RequestException, RuntimeError) as e:
+        parser.error(f"connecting Google Calendar: {e}; is the dev server running against the stand-in?")
+
+    rows = []
+    try:
+        # The warm-up sync compiles the route before anything is timed
+        standin_json(args.standin_url, "POST", "config", {field: {"google": 0} for field in saved})
+        sync(session, args.base_url, meal_plan(1, "calendar-sync-warmup"))
+        standin_json(args.standin_url, "POST", "config", {
+            "latency": {"google": args.latency},
+            "error_rate": {"google": args.error_rate},
+            "rate_limit_rate": {"google": args.rate_limit_rate},
+        })
+
+        print(f"Syncing to {account} at {args.latency:g} ms per Calendar round trip"
+              + (f", {args.error_rate:g} errors / {args.rate_limit_rate:g} rate limits" if faults else ""))
+        for size in sizes:
+            row = measure(args, session, size)
+            rows.append(row)
+            print(f"  {size:>5} events  {row['wall_ms']:>9.1f} ms  {row['round_trips']:>6} round trips  "
+                  f"{row['batch_requests']:>3} batches ({row['event_parts']} parts, peak {row['peak_in_flight']} in flight)  "
+                  f"created {row['created']} failed {row['failed']}  stored {row['stored']} dup {row['duplicates']}")
+    except (requests.RequestException, RuntimeError) as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    finally:
+        try:
+            standin_json(args.standin_url, "POST", "config", {
+                field: {"google": values["google"]} for field, values in saved.items()
+            })
+        except requests.RequestException as e:
+            print(f"✗ could not restore the stand-in settings: {e}")
+
+    print()
+    failed = False
+    for row in rows:
+        problems = []
+        if row["duplicates"]:
+            problems.append(f"{row['duplicates']} duplicate events")
+        if row["stored"] != row["created"]:
+            problems.append(f"{row['created']} reported created but {row['stored']} stored")
+        if row["peak_in_flight"] > MAX_IN_FLIGHT:
+            problems.append(f"{row['peak_in_flight']} requests in flight (max {MAX_IN_FLIGHT})")
+        if not faults:
+            if row["failed"]:
+                problems.append(f"{row['failed']} events failed")
+            if row["round_trips"] > args.max_round_trips:
+                problems.append(f"{row['round_trips']} round trips (max {args.max_round_trips:g})")
+        failed |= bool(problems)
+        print(f"{'✗' if problems else '✓'} {row['events']} events: {row['round_trips']} round trips"
+              + (f" ({'; '.join(problems)})" if problems else ""))
+
+    write_report({
+        "base_url": args.base_url,
+        "standin_url": args.standin_url,
+        "latency_ms": args.latency,
+        "error_rate": args.error_rate,
+        "rate_limit_rate": args.rate_limit_rate,
+        "max_round_trips": None if faults else args.max_round_trips,
+        "results": rows,
+    }, args.output)
+    print(f"\nReport: {args.output}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Benchmark recipe rating aggregates against cooking history size.
+
+Ratings live in cooking_history, and a trigger keeps recipes.avg_rating and
+review_count up to date on every history write. Before
+20251225_incremental_recipe_ratings.sql that trigger recomputed AVG and COUNT
+over the recipe's whole history; after it, it adds each write to a running
+total. This inserts --events history events (1M by default) for --recipes
+public recipes through the Supabase REST API, with --hot-share of them on one
+popular recipe and --rated-share carrying a rating (the rest are cook
+start/stop events). At --checkpoints points along the way it records:
+
+  writes   events/s since the last checkpoint, and insert batch latency
+  reads    latency of the recipe detail read (the columns GET
+           /api/recipes/[id] selects) for the popular recipe and a cold one
+
+Then it updates and deletes --mutations rated events, and checks every
+recipe's avg_rating and review_count against totals kept on the client.
+
+Runs are stored by --label in tmp/load/rating_aggregates.json, so one
+database can be measured before and after the migration:
+
+  python bench_rating_aggregates.py --label before --events 100000 --keep
+  supabase migration up      # applies 20251225_incremental_recipe_ratings.sql
+  python bench_rating_aggregates.py --label after
+  python bench_rating_aggregates.py --compare before after
+
+With the old trigger each rated insert on the popular recipe scans all of its
+earlier history, so the "before" run slows down as it goes: give it fewer
+--events, and --keep, since deleting the recipes fires the same scan for
+every history row. Ctrl-C stops a run early and still saves what it measured.
+
+Writes with the service role (NEXT_PUBLIC_SUPABASE_URL and
+SUPABASE_SERVICE_ROLE_KEY, as run_parallel.py), as the user
+testsprite+ratings-bench@testsprite.dev. Use a local or staging project.
+
+Usage:
+  python bench_rating_aggregates.py --label after
+  python bench_rating_aggregates.py --label before --events 50000 --checkpoints 5 --keep
+  python bench_rating_aggregates.py --compare before after
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+
+import requests
+
+from helpers.auth_helper import TIMEOUT
+from helpers.test_user import ProvisionError, namespace_user, provision_users, supabase_settings, user_id
+
+TESTS_DIR = Path(__file__).resolve().parent
+REPORT_PATH = TESTS_DIR / "tmp" / "load" / "rating_aggregates.json"
+NAMESPACE = "ratings-bench"
+TITLE_PREFIX = f"[{NAMESPACE}] Rated recipe"
+# What GET /api/recipes/[id] selects (src/app/api/recipes/[id]/route.ts)
+DETAIL_COLUMNS = (
+    "id, title, recipe_type, category, protein_type, prep_time, cook_time, servings, base_servings, "
+    "ingredients, instructions, tags, notes, source_url, image_url, rating, allergen_tags, user_id, "
+    "household_id, is_shared_with_household, is_public, share_token, view_count, original_recipe_id, "
+    "original_author_id, avg_rating, review_count, created_at, updated_at"
+).replace(" ", "")
+# ids per PATCH/DELETE filter, to keep URLs short
+FILTER_CHUNK = 200
+
+class RestError(RuntimeError):
+    """The REST API refused a request."""
+
+class Rest:
+    """PostgREST calls with the service role, which bypasses RLS."""
+
+    def __init__(self, session: requests.Session, url: str, key: str):
+        self.session = session
+        self.url = f"{url}/rest/v1"
+        self.headers = {"apikey": key, "Authorization": f"Bearer {key}"}
+
+    def request(self, method: str, table: str, prefer: str = "return=minimal", **kwargs) -> requests.Response:
+        headers = {**self.headers, "Prefer": prefer}
+        try:
+            response = self.session.request(method, f"{self.url}/{table}", headers=headers, timeout=TIMEOUT * 4, **kwargs)
+        except requests.RequestException as e:
+            raise RestError(f"{method} {table}: {e}") from e
+        if response.status_code >= 300:
+            raise RestError(f"{method} {table}: HTTP {response.status_code} {response.text[:200]}")
+        return response
+
+    def select(self, table: str, params: dict) -> list[dict]:
+        return self.request("GET", table, params=params).json()
+
+def in_filter(ids: list[str]) -> str:
+    return f"in.({','.join(ids)})"
+
+def percentiles(values: list[float]) -> dict:
+    if not values:
+        return {"p50": None, "p95": None}
+    values = sorted(values)
+    return {f"p{p}": round(values[max(0, math.ceil(p / 100 * len(values)) - 1)], 3) for p in (50, 95)}
+
+def expected_aggregate(totals: dict) -> tuple[float | None, int]:
+    """avg_rating and review_count as the trigger computes them: ROUND(sum / count, 1)."""
+    if not totals["count"]:
+        return None, 0
+    average = (totals["sum"] / totals["count"]).quantize(Decimal("0.1"), rounding=ROUND_HALF_UP)
+    return float(average), totals["count"]
+
+def create_recipes(rest: Rest, owner: str, household: str | None, count: int) -> list[str]:
+    rows = [{
+        "title": f"{TITLE_PREFIX} #{n:04d}",
+        "user_id": owner,
+        "household_id": household,
+        "is_public": True,
+        "ingredients": ["1 cup rice", "2 cups water"],
+        "instructions": ["Cook the rice."],
+    } for n in range(count)]
+    created = rest.request("POST", "recipes", prefer="return=representation", params={"select": "id"}, json=rows)
+    return [row["id"] for row in created.json()]
+
+def delete_recipes(rest: Rest, owner: str) -> int:
+    """Delete every bench recipe of owner, with their history (ON DELETE CASCADE)."""
+    recipes = rest.select("recipes", {"select": "id", "user_id": f"eq.{owner}", "title": f"like.{TITLE_PREFIX}*"})
+    for start in range(0, len(recipes), FILTER_CHUNK):
+        ids = [r["id"] for r in recipes[start:start + FILTER_CHUNK]]
+        rest.request("DELETE", "recipes", params={"id": in_filter(ids)})
+    return len(recipes)
+
+def history_events(rng: random.Random, args, recipe_ids: list[str], owner: str, household: str | None):
+    """Yield cooking_history rows: the popular recipe first in line for hot_share of them."""
+    cold = recipe_ids[1:] or recipe_ids
+    start = datetime.now(timezone.utc) - timedelta(days=365)
+    for n in range(args.events):
+        rated = rng.random() < args.rated_share
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "recipe_id": recipe_ids[0] if rng.random() < args.hot_share else rng.choice(cold),
+            "user_id": owner,
+            "cooked_by": owner,
+            "household_id": household,
+            "cooked_at": (start + timedelta(seconds=n * 31)).isoformat(),
+            "rating": rng.randint(1, 5) if rated else None,
+            "notes": None if rated else f"Cooking {'start' if n % 2 else 'stop'}",
+        }
+
+def read_latency(rest: Rest, recipe_id: str, reads: int) -> dict:
+    samples = []
+    for _ in range(reads):
+        start = time.perf_counter()
+        rest.select("recipes", {"select": DETAIL_COLUMNS, "id": f"eq.{recipe_id}"})
+        samples.append((time.perf_counter() - start) * 1000)
+    return percentiles(samples)
+
+def insert_events(rest: Rest, args, recipe_ids: list[str], owner: str, household: str | None,
+                  totals: dict, rated_ids: list[tuple[str, str, int]], run: dict) -> None:
+    """Insert the history, checkpointing into run["checkpoints"]; rated_ids gets a sample for mutations."""
+    events = history_events(random.Random(args.seed), args, recipe_ids, owner, household)
+    sampler = random.Random(args.seed + 1)
+    every = max(1, args.events // args.checkpoints)
+    inserted, rated, batch_ms, interval_start, interval_events = 0, 0, [], time.perf_counter(), 0
+
+    def checkpoint() -> None:
+        nonlocal batch_ms, interval_start, interval_events
+        elapsed = time.perf_counter() - interval_start
+        point = {
+            "events": inserted,
+            "popular_history": totals[recipe_ids[0]]["events"],
+            "events_per_s": round(interval_events / elapsed, 1) if interval_events else None,
+            "batch_ms": percentiles(batch_ms),
+            "read_popular_ms": read_latency(rest, recipe_ids[0], args.reads),
+            "read_cold_ms": read_latency(rest, recipe_ids[-1], args.reads),
+        }
+        run["checkpoints"].append(point)
+        print(f"  {inserted:>9,} events ({point['popular_history']:,} on the popular recipe): "
+              f"{point['events_per_s']} events/s, batch p95 {point['batch_ms']['p95']} ms, "
+              f"detail read p50 {point['read_popular_ms']['p50']} ms popular / "
+              f"{point['read_cold_ms']['p50']} ms cold")
+        batch_ms, interval_start, interval_events = [], time.perf_counter(), 0
+
+    checkpoint()
+    while inserted < args.events:
+        batch = [next(events) for _ in range(min(args.batch, args.events - inserted))]
+        start = time.perf_counter()
+        rest.request("POST", "cooking_history", json=batch)
+        batch_ms.append((time.perf_counter() - start) * 1000)
+
+        for row in batch:
+            recipe = totals[row["recipe_id"]]
+            recipe["events"] += 1
+            if row["rating"] is not None:
+                recipe["sum"] += row["rating"]
+                recipe["count"] += 1
+                rated += 1
+                # Uniform (reservoir) sample of rated events to update and delete later
+                sample = (row["id"], row["recipe_id"], row["rating"])
+                if len(rated_ids) < 2 * args.mutations:
+                    rated_ids.append(sample)
+                elif (slot := sampler.randrange(rated)) < len(rated_ids):
+                    rated_ids[slot] = sample
+
+        inserted += len(batch)
+        interval_events += len(batch)
+        if inserted % every < len(batch) or inserted == args.events:
+            checkpoint()
+
+def mutate(rest: Rest, rng: random.Random, rated_ids: list[tuple[str, str, int]], totals: dict, count: int) -> dict:
+    """Re-rate count of the sampled events and delete count others, timing each statement."""
+    rng.shuffle(rated_ids)
+    updates, deletes = rated_ids[:count], rated_ids[count:2 * count]
+    timings = {"update_ms": [], "delete_ms": []}
+
+    by_rating: dict[int, list[str]] = {}
+    for event_id, recipe_id, rating in updates:
+        new_rating = rng.randint(1, 5)
+        totals[recipe_id]["sum"] += new_rating - rating
+        by_rating.setdefault(new_rating, []).append(event_id)
+    for new_rating, ids in by_rating.items():
+        for start in range(0, len(ids), FILTER_CHUNK):
+            began = time.perf_counter()
+            rest.request("PATCH", "cooking_history", params={"id": in_filter(ids[start:start + FILTER_CHUNK])},
+                         json={"rating": new_rating})
+            timings["update_ms"].append((time.perf_counter() - began) * 1000)
+
+    for _, recipe_id, rating in deletes:
+        totals[recipe_id]["sum"] -= rating
+        totals[recipe_id]["count"] -= 1
+    ids = [event_id for event_id, _, _ in deletes]
+    for start in range(0, len(ids), FILTER_CHUNK):
+        began = time.perf_counter()
+        rest.request("DELETE", "cooking_history", params={"id": in_filter(ids[start:start + FILTER_CHUNK])})
+        timings["delete_ms"].append((time.perf_counter() - began) * 1000)
+
+    return {"updated": len(updates), "deleted": len(deletes),
+            **{key: percentiles(values) for key, values in timings.items()}}
+
+def verify(rest: Rest, recipe_ids: list[str], totals: dict) -> list[dict]:
+    """Recipes whose avg_rating or review_count don't match the client's totals."""
+    mismatches = []
+    for start in range(0, len(recipe_ids), FILTER_CHUNK):
+        rows = rest.select("recipes", {"select": "id,avg_rating,review_count",
+                                       "id": in_filter(recipe_ids[start:start + FILTER_CHUNK])})
+        for row in rows:
+            average, count = expected_aggregate(totals[row["id"]])
+            actual = None if row["avg_rating"] is None else float(row["avg_rating"])
+            if actual != average or (row["review_count"] or 0) != count:
+                mismatches.append({"recipe_id": row["id"], "avg_rating": actual, "expected_avg_rating": average,
+                                   "review_count": row["review_count"], "expected_review_count": count})
+    return mismatches
+
+def load_report(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {"runs": {}}
+
+def write_report(report: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(report, indent=2) + "\n")
+    tmp_path.replace(path)
+
+def compare(report: dict, labels: list[str]) -> None:
+    """Print the runs side by side at the history sizes they share."""
+    runs = [report["runs"][label] for label in labels]
+    sizes = sorted(set.intersection(*({p["events"] for p in run["checkpoints"]} for run in runs)))
+    header = "".join(f"{label:>34}" for label in labels)
+    print(f"{'events':>10}{header}")
+    print(f"{'':>10}" + "".join(f"{'events/s  read p50 pop/cold ms':>34}" for _ in labels))
+    for size in sizes:
+        cells = []
+        for run in runs:
+            point = next(p for p in run["checkpoints"] if p["events"] == size)
+            cells.append(f"{point['events_per_s'] or '-':>12}  {point['read_popular_ms']['p50']:>8} / "
+                         f"{point['read_cold_ms']['p50']:<8}")
+        print(f"{size:>10,}" + "".join(f"{cell:>34}" for cell in cells))
+    for label, run in zip(labels, runs):
+        if run.get("mutations"):
+            m = run["mutations"]
+            print(f"{label}: {m['updated']} re-rated (PATCH p50 {m['update_ms']['p50']} ms), "
+                  f"{m['deleted']} deleted (DELETE p50 {m['delete_ms']['p50']} ms)")
+        print(f"{label}: aggregates {'match' if run.get('mismatches') == [] else 'NOT verified'}"
+              f"{'' if run.get('completed') else ' (stopped early)'}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recipe rating aggregates against cooking history size.")
+    parser.add_argument("--label", help="name to store the run under, e.g. before or after")
+    parser.add_argument("--compare", nargs="+", metavar="LABEL", help="print stored runs side by side and exit")
+    parser.add_argument("--events", type=int, default=1_000_000, help="history events to insert (default: 1000000)")
+    parser.add_argument("--recipes", type=int, default=100, help="recipes to spread them over (default: 100)")
+    parser.add_argument("--hot-share", type=float, default=0.25,
+                        help="share of events on the popular recipe (default: 0.25)")
+    parser.add_argument("--rated-share", type=float, default=0.6, help="share of events with a rating (default: 0.6)")
+    parser.add_argument("--batch", type=int, default=1000, help="rows per insert request (default: 1000)")
+    parser.add_argument("--checkpoints", type=int, default=10, help="measurements along the way (default: 10)")
+    parser.add_argument("--reads", type=int, default=20, help="detail reads per measurement (default: 20)")
+    parser.add_argument("--mutations", type=int, default=1000, help="rated events to update, and to delete (default: 1000)")
+    parser.add_argument("--seed", type=int, default=1, help="event generator seed (default: 1)")
+    parser.add_argument("--keep", action="store_true", help="leave the recipes and their history in place")
+    parser.add_argument("-o", "--output", type=Path, default=REPORT_PATH,
+                        help="JSON report path (default: tmp/load/rating_aggregates.json)")
+    args = parser.parse_args()
+
+    report = load_report(args.output)
+    if args.compare:
+        missing = [label for label in args.compare if label not in report["runs"]]
+        if missing:
+            parser.error(f"no stored run labelled {', '.join(missing)} in {args.output}")
+        compare(report, args.compare)
+        return
+
+    if not args.label:
+        parser.error("--label is required to run the benchmark")
+    for name in ("events", "recipes", "batch", "checkpoints", "reads"):
+        if getattr(args, name) < 1:
+            parser.error(f"--{name} must be at least 1")
+    if args.mutations < 0:
+        parser.error("--mutations can't be negative")
+    for name in ("hot_share", "rated_share"):
+        if not 0 <= getattr(args, name) <= 1:
+            parser.error(f"--{name.replace('_', '-')} must be between 0 and 1")
+
+    user = namespace_user(NAMESPACE)
+    try:
+        provision_users([user])
+        owner = user_id(user)
+        url, key = supabase_settings()
+    except ProvisionError as e:
+        parser.error(str(e))
+
+    run = {"events": args.events, "recipes": args.recipes, "hot_share": args.hot_share,
+           "rated_share": args.rated_share, "batch": args.batch, "seed": args.seed,
+           "started_at": datetime.now(timezone.utc).isoformat(), "completed": False, "checkpoints": []}
+    report["runs"][args.label] = run
+    status = 0
+
+    with requests.Session() as session:
+        rest = Rest(session, url, key)
+        try:
+            stale = delete_recipes(rest, owner)
+            if stale:
+                print(f"Deleted {stale} recipes left by an earlier --keep run")
+            membership = rest.select("household_members", {"select": "household_id", "user_id": f"eq.{owner}"})
+            household = membership[0]["household_id"] if membership else None
+            recipe_ids = create_recipes(rest, owner, household, args.recipes)
+            totals = {recipe_id: {"sum": Decimal(0), "count": 0, "events": 0} for recipe_id in recipe_ids}
+            rated_ids: list[tuple[str, str, int]] = []
+
+            print(f"{args.label}: {args.events:,} events over {args.recipes} recipes, "
+                  f"{args.hot_share:.0%} on the popular one")
+            insert_events(rest, args, recipe_ids, owner, household, totals, rated_ids, run)
+            if args.mutations:
+                run["mutations"] = mutate(rest, random.Random(args.seed), rated_ids, totals, args.mutations)
+            run["mismatches"] = verify(rest, recipe_ids, totals)
+            run["completed"] = True
+
+            ok = not run["mismatches"]
+            status = 0 if ok else 1
+            if ok:
+                print(f"✓ aggregates of all {len(recipe_ids)} recipes match the history")
+            else:
+                print(f"✗ aggregates of {len(run['mismatches'])} of {len(recipe_ids)} recipes differ from the history")
+
+            if not args.keep:
+                delete_recipes(rest, owner)
+        except RestError as e:
+            print(f"✗ {e}")
+            status = 1
+        except KeyboardInterrupt:
+            print("\nStopped; saving what was measured")
+            status = 130
+
+    write_report(report, args.output)
+    print(f"\nReport: {args.output} (compare runs with --compare {args.label} <other label>)")
+    sys.exit(status)
+
+if __name__ == "__main__":
+    main()
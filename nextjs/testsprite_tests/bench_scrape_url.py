@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Benchmark URL imports against page size, using the local fixture origin.
+
+For every size × delivery mode (plain, chunked, gzip, slow-drip) it has
+/api/scrape-url and /api/parse-recipe fetch a fixture_origin.py page, and
+records:
+
+  latency     wall time of the API call
+  memory      the dev server's RSS before, at peak during, and after the
+              call (--server-pid; read from /proc)
+  truncation  how much came back, whether the recipe card and its JSON-LD
+              survived, and how much of the page the server actually read
+              (from the fixture's request log)
+
+The pages put the recipe card after the padding by default (--position),
+as blogs do, so size limits show up as a missing recipe, not just a
+shorter response. Results go to tmp/load/scrape_url_bench.json.
+
+Start the fixture and a dev server that may fetch from it first:
+
+  python fixture_origin.py &
+  SCRAPE_URL_ALLOWED_HOSTS=127.0.0.1 npm run dev -- -p 3001
+
+The routes are rate limited per user (scrape-url 30 an hour, parse-recipe
+20 a day), which the default matrix of 15 cases per endpoint stays under.
+
+Usage:
+  python bench_scrape_url.py --server-pid $(pgrep -f "next dev" | head -1)
+  python bench_scrape_url.py --sizes 1MB,10MB --modes gzip,drip --drip 512KB
+  python bench_scrape_url.py --endpoints scrape-url --position start
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from urllib.parse import urlencode
+
+import requests
+
+from fixture_origin import DEFAULT_PORT, RECIPE, parse_size
+from helpers.auth_helper import BASE_URL, TIMEOUT, authenticated_session
+
+TESTS_DIR = Path(__file__).resolve().parent
+REPORT_PATH = TESTS_DIR / "tmp" / "load" / "scrape_url_bench.json"
+ENDPOINTS = ("scrape-url", "parse-recipe")
+MODES = ("plain", "chunked", "gzip", "drip")
+MARKER = "fixture end marker"
+# What scrape-url returns at most (src/app/api/scrape-url/route.ts)
+SCRAPE_HTML_LIMIT = 20000
+SCRAPE_TEXT_LIMIT = 15000
+
+def rss_bytes(pid: int) -> int | None:
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+class MemorySampler:
+    """Peak RSS of a process while a request is in flight."""
+
+    def __init__(self, pid: int | None, interval: float = 0.02):
+        self.pid = pid
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        if self.pid is not None:
+            self.before = self.peak = rss_bytes(self.pid)
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            value = rss_bytes(self.pid)
+            if value is not None and (self.peak is None or value > self.peak):
+                self.peak = value
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self.after = rss_bytes(self.pid)
+
+    def result(self) -> dict:
+        if self.pid is None or self.before is None:
+            return {}
+        mb = 1024 * 1024
+        return {"rss_before_mb": round(self.before / mb, 1), "rss_peak_mb": round(self.peak / mb, 1),
+                "rss_after_mb": round((self.after or 0) / mb, 1),
+                "rss_growth_mb": round((self.peak - self.before) / mb, 1)}
+
+def fixture_url(base: str, size: str, mode: str, args, tag: str) -> str:
+    params = {"size": size, "position": args.position, "jsonld": "0" if args.no_jsonld else "1", "tag": tag}
+    if mode == "chunked":
+        params["chunked"] = "1"
+    elif mode == "gzip":
+        params["gzip"] = "1"
+    elif mode == "drip":
+        params["drip"] = args.drip
+    return f"{base}/recipe?{urlencode(params)}"
+
+def inspect(endpoint: str, data: dict) -> dict:
+    """What survived of the page in the route's response."""
+    if endpoint == "scrape-url":
+        html, text = data.get("html", ""), data.get("text", "")
+        return {
+            "html_chars": len(html),
+            "text_chars": len(text),
+            "truncated": len(html) >= SCRAPE_HTML_LIMIT or len(text) >= SCRAPE_TEXT_LIMIT,
+            "jsonld_kept": "application/ld+json" in html,
+            "recipe_end_found": MARKER in text,
+        }
+    items = [*data.get("ingredients", []), *data.get("instructions", [])]
+    return {
+        "ingredients": len(data.get("ingredients", [])),
+        "instructions": len(data.get("instructions", [])),
+        "recipe_end_found": any(MARKER in str(item) for item in items),
+        "complete": len(data.get("ingredients", [])) >= len(RECIPE["recipeIngredient"]),
+    }
+
+def fixture_entry(base: str, tag: str) -> dict:
+    try:
+        entries = requests.get(f"{base}/__fixture/log", timeout=TIMEOUT).json()
+    except (requests.RequestException, ValueError):
+        return {}
+    entry = next((e for e in reversed(entries) if e.get("tag") == tag), None)
+    if entry is None:
+        return {"origin_fetched": False}
+    return {"origin_fetched": True, "origin_sent_bytes": entry["sent_bytes"],
+            "origin_body_bytes": entry["body_bytes"], "origin_complete": entry["complete"]}
+
+def run_case(session: requests.Session, args, endpoint: str, size: str, mode: str) -> dict:
+    tag = uuid.uuid4().hex[:12]
+    url = fixture_url(args.fixture_url, size, mode, args, tag)
+    case = {"endpoint": endpoint, "size": size, "page_bytes": parse_size(size), "mode": mode}
+    with MemorySampler(args.server_pid) as memory:
+        start = time.perf_counter()
+        try:
+            response = session.post(f"{args.base_url}/api/{endpoint}", json={"url": url}, timeout=args.timeout)
+            case["status"] = response.status_code
+        except requests.RequestException as e:
+            response = None
+            case["status"] = 0
+            case["error"] = type(e).__name__
+        case["seconds"] = round(time.perf_counter() - start, 3)
+    case.update(memory.result())
+    if response is not None:
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+        if response.ok:
+            case.update(inspect(endpoint, data))
+        else:
+            case["error"] = data.get("error") or response.text[:200]
+    # The origin logs the request once the route stops reading
+    time.sleep(0.05)
+    case.update(fixture_entry(args.fixture_url, tag))
+    return case
+
+def describe(case: dict) -> str:
+    parts = [f"{case['status']}", f"{case['seconds']:.2f}s"]
+    if "rss_growth_mb" in case:
+        parts.append(f"+{case['rss_growth_mb']} MB peak")
+    if case["endpoint"] == "scrape-url" and "html_chars" in case:
+        parts.append(f"html {case['html_chars']} / text {case['text_chars']} chars")
+    if "ingredients" in case:
+        parts.append(f"{case['ingredients']} ingredients")
+    if "recipe_end_found" in case:
+        parts.append("recipe kept" if case["recipe_end_found"] else "recipe cut off")
+    if case.get("origin_fetched"):
+        parts.append(f"read {case['origin_sent_bytes']:,}/{case['origin_body_bytes']:,} B")
+    if case.get("error"):
+        parts.append(str(case["error"])[:80])
+    return ", ".join(parts)
+
+def write_report(report: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(report, indent=2) + "\n")
+    tmp_path.replace(path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /api/scrape-url and /api/parse-recipe against page size.")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"dev server (default: {BASE_URL})")
+    parser.add_argument("--fixture-url", default=f"http://127.0.0.1:{DEFAULT_PORT}",
+                        help="fixture_origin.py base URL, as the dev server reaches it")
+    parser.add_argument("--sizes", default="1KB,10KB,100KB,1MB,10MB", help="comma-separated page sizes")
+    parser.add_argument("--modes", default="plain,chunked,gzip",
+                        help=f"comma-separated delivery modes from {', '.join(MODES)} (default: plain,chunked,gzip)")
+    parser.add_argument("--drip", default="1MB", help="slow-drip rate in bytes per second (default: 1MB)")
+    parser.add_argument("--position", choices=("end", "start"), default="end",
+                        help="where the recipe card sits on the page (default: end)")
+    parser.add_argument("--no-jsonld", action="store_true", help="serve pages without schema.org JSON-LD")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="comma-separated (default: both)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per case (default: 1)")
+    parser.add_argument("--server-pid", type=int, help="dev server process to sample RSS from")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT * 2, help="client timeout per call in seconds")
+    parser.add_argument("-o", "--output", type=Path, default=REPORT_PATH,
+                        help="JSON report path (default: tmp/load/scrape_url_bench.json)")
+    args = parser.parse_args()
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    try:
+        for size in [*sizes, args.drip]:
+            parse_size(size)
+    except ValueError as e:
+        parser.error(str(e))
+    if unknown := [m for m in modes if m not in MODES]:
+        parser.error(f"unknown mode {unknown[0]!r} (expected {', '.join(MODES)})")
+    if unknown := [e for e in endpoints if e not in ENDPOINTS]:
+        parser.error(f"unknown endpoint {unknown[0]!r} (expected {', '.join(ENDPOINTS)})")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if args.server_pid is not None and rss_bytes(args.server_pid) is None:
+        parser.error(f"can't read /proc/{args.server_pid}/status")
+    try:
+        requests.get(f"{args.fixture_url}/__fixture/log", timeout=5).raise_for_status()
+    except requests.RequestException:
+        parser.error(f"no fixture origin at {args.fixture_url}; start it with `python fixture_origin.py`")
+
+    session = authenticated_session()
+    cases = []
+    for endpoint in endpoints:
+        print(f"\nPOST /api/{endpoint}")
+        for size, mode, _ in itertools.product(sizes, modes, range(args.repeat)):
+            case = run_case(session, args, endpoint, size, mode)
+            cases.append(case)
+            ok = case["status"] == 200 and case.get("recipe_end_found", False)
+            print(f"{'✓' if ok else '✗'} {size:>6} {mode:<8} {describe(case)}")
+            if case["status"] == 429:
+                print(f"  stopping {endpoint}: rate limited")
+                break
+
+    write_report({
+        "base_url": args.base_url,
+        "fixture_url": args.fixture_url,
+        "position": args.position,
+        "jsonld": not args.no_jsonld,
+        "drip_bytes_per_second": parse_size(args.drip),
+        "cases": cases,
+    }, args.output)
+    print(f"\nReport: {args.output}")
+    sys.exit(0 if all(c["status"] == 200 for c in cases) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Benchmark shopping list aggregation against meal plan size.
+
+generateFromMealPlan parses every ingredient line of the plan's recipes and
+merges duplicates before inserting the list. Test households plan a week at
+a time, which never shows how that step grows, so this builds synthetic
+plans of --sizes recipes (8-25 lines each, so 1000 recipes is ~16k lines)
+and sends them to the dev-only route /api/debug/shopping-list, which runs
+the same collect and merge code. Lines are drawn the way real plans repeat:
+a few staples in most recipes, a mid-frequency set, and a long tail, with
+varied quantities and units.
+
+Per size and merge (--merge: "basic" is what generation uses, "confidence"
+is mergeWithConfidence) it reports the medians over --repeat runs of:
+
+  merge ms     the server's merge time (Server-Timing), and collect ms
+  client ms    the whole request, including sending the plan
+  response     bytes of the merged list, and the line and item counts
+
+plus the scaling exponent k of merge time ~ lines^k (a log-log fit): about
+1 for a hash-keyed merge, 2 for a pairwise one. --max-exponent fails the run
+above a given k. The report is written to tmp/load/shopping_list_scaling.json.
+
+Usage:
+  python bench_shopping_list.py
+  python bench_shopping_list.py --sizes 10,100,1000 --merge both --repeat 3
+  python bench_shopping_list.py --max-exponent 1.3
+"""
+
+import argparse
+import json
+import math
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+from helpers.auth_helper import BASE_URL
+
+TESTS_DIR = Path(__file__).resolve().parent
+REPORT_PATH = TESTS_DIR / "tmp" / "load" / "shopping_list_scaling.json"
+ROUTE = "/api/debug/shopping-list"
+MERGES = ("basic", "confidence")
+DEFAULT_SIZES = "10,30,100,300,1000"
+# Large plans are a few MB of JSON each way
+REQUEST_TIMEOUT = 120
+
+STAPLES = [
+    "salt", "black pepper", "olive oil", "garlic, minced", "yellow onion, diced",
+    "unsalted butter", "all-purpose flour", "sugar", "large eggs", "whole milk",
+]
+COMMON = [
+    "chicken breast", "ground beef", "carrots, chopped", "celery", "tomatoes", "fresh basil",
+    "fresh parsley", "lemon juice", "soy sauce", "honey", "brown rice", "pasta", "cheddar cheese",
+    "parmesan cheese", "heavy cream", "chicken broth", "red bell pepper", "spinach", "mushrooms, sliced",
+    "potatoes", "paprika", "ground cumin", "dried oregano", "cinnamon", "baking powder", "vanilla extract",
+    "green onions", "ginger, grated", "lime", "avocado",
+]
+TAIL_KINDS = [
+    "peppers", "beans", "squash", "greens", "mushrooms", "lentils", "chiles", "apples", "vinegar", "cheese",
+    "sausage", "noodles", "seeds", "nuts", "berries", "radishes", "olives", "herbs", "salsa", "flatbread",
+]
+TAIL_VARIETIES = [
+    "heirloom", "smoked", "pickled", "roasted", "wild", "aged", "toasted", "candied", "charred", "fermented",
+    "sicilian", "korean", "oaxacan", "persian", "thai", "basque", "moroccan", "nordic", "peruvian", "sichuan",
+    "meyer", "black", "golden", "purple", "white",
+]
+QUANTITIES = ["1", "2", "3", "1/2", "1/4", "3/4", "1 1/2", "4", "8", "200"]
+UNITS = ["cup", "cups", "tbsp", "tsp", "oz", "lb", "g", "ml", "cloves", "cans", "large", ""]
+
+def ingredient_line(rng: random.Random, name: str) -> str:
+    if rng.random() < 0.1:
+        return name  # "salt", "pepper to taste"
+    unit = rng.choice(UNITS)
+    return " ".join(part for part in (rng.choice(QUANTITIES), unit, name) if part)
+
+def meal_plan(size: int, seed: int) -> list[dict]:
+    """size recipes whose lines repeat like a real plan's."""
+    rng = random.Random(f"{seed}:{size}")
+    tail = [f"{variety} {kind}" for variety in TAIL_VARIETIES for kind in TAIL_KINDS]
+    recipes = []
+    for n in range(size):
+        names = rng.sample(STAPLES, rng.randint(2, 5))
+        names += rng.sample(COMMON, rng.randint(3, 10))
+        names += rng.sample(tail, rng.randint(3, 10))
+        recipes.append({
+            "id": f"00000000-0000-4000-8000-{n:012d}",
+            "title": f"Bench recipe {n}",
+            "ingredients": [ingredient_line(rng, name) for name in names],
+        })
+    return recipes
+
+def server_timing(header: str) -> dict:
+    """{'collect': ms, 'merge': ms} from a Server-Timing header."""
+    timings = {}
+    for metric in header.split(","):
+        name, _, params = metric.strip().partition(";")
+        if params.startswith("dur="):
+            timings[name] = float(params[4:])
+    return timings
+
+def measure(session: requests.Session, base_url: str, recipes: list[dict], merge: str) -> dict:
+    start = time.perf_counter()
+    response = session.post(f"{base_url}{ROUTE}", json={"recipes": recipes, "merge": merge},
+                            timeout=REQUEST_TIMEOUT)
+    client_ms = (time.perf_counter() - start) * 1000
+    response.raise_for_status()
+    body = response.json()
+    timings = server_timing(response.headers.get("Server-Timing", ""))
+    return {
+        "client_ms": client_ms,
+        "collect_ms": timings.get("collect"),
+        "merge_ms": timings.get("merge"),
+        "response_bytes": len(response.content),
+        "lines": body["lines"],
+        "merged": body["merged"],
+    }
+
+def median(samples: list[dict], key: str) -> float | None:
+    values = [s[key] for s in samples if s[key] is not None]
+    return round(statistics.median(values), 3) if values else None
+
+def scaling_exponent(points: list[tuple[float, float]]) -> float | None:
+    """Least-squares slope of log(y) against log(x)."""
+    points = [(math.log(x), math.log(y)) for x, y in points if x and y]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if not spread:
+        return None
+    return round(sum((x - mean_x) * (y - mean_y) for x, y in points) / spread, 3)
+
+def run_merge(args, session: requests.Session, plans: dict, merge: str) -> dict:
+    rows = []
+    for size, recipes in plans.items():
+        # One unmeasured run, so the first size doesn't pay for route compilation
+        measure(session, args.base_url, recipes, merge)
+        samples = [measure(session, args.base_url, recipes, merge) for _ in range(args.repeat)]
+        row = {"recipes": size, "lines": samples[0]["lines"], "merged": samples[0]["merged"]}
+        for key in ("merge_ms", "collect_ms", "client_ms", "response_bytes"):
+            row[key] = median(samples, key)
+        rows.append(row)
+        print(f"  {merge:<10} {size:>5} recipes {row['lines']:>6} lines -> {row['merged']:>5} items  "
+              f"merge {row['merge_ms']} ms  collect {row['collect_ms']} ms  client {row['client_ms']:.1f} ms  "
+              f"{row['response_bytes']:,} B")
+
+    return {
+        "merge": merge,
+        "sizes": rows,
+        "merge_exponent": scaling_exponent([(r["lines"], r["merge_ms"]) for r in rows]),
+        "response_exponent": scaling_exponent([(r["lines"], r["response_bytes"]) for r in rows]),
+    }
+
+def write_report(report: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(report, indent=2) + "\n")
+    tmp_path.replace(path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark shopping list aggregation against meal plan size.")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"dev server (default: {BASE_URL})")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"recipes per plan (default: {DEFAULT_SIZES})")
+    parser.add_argument("--merge", choices=(*MERGES, "both"), default="basic",
+                        help="merge to benchmark (default: basic, the one generation uses)")
+    parser.add_argument("--repeat", type=int, default=5, help="measured runs per size (default: 5)")
+    parser.add_argument("--seed", type=int, default=1, help="plan generator seed (default: 1)")
+    parser.add_argument("--max-exponent", type=float,
+                        help="fail if merge time grows faster than lines^k for this k")
+    parser.add_argument("-o", "--output", type=Path, default=REPORT_PATH,
+                        help="JSON report path (default: tmp/load/shopping_list_scaling.json)")
+    args = parser.parse_args()
+
+    try:
+        sizes = sorted({int(size) for size in args.sizes.split(",")})
+    except ValueError:
+        parser.error(f"--sizes must be comma-separated integers, not {args.sizes!r}")
+    if not sizes or sizes[0] < 1:
+        parser.error("--sizes must be at least 1")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    merges = list(MERGES) if args.merge == "both" else [args.merge]
+
+    plans = {size: meal_plan(size, args.seed) for size in sizes}
+    results = []
+    with requests.Session() as session:
+        try:
+            probe = session.post(f"{args.base_url}{ROUTE}", json={"recipes": []}, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            parser.error(f"{args.base_url}{ROUTE}: {e}; is the dev server running?")
+        if probe.status_code != 200:
+            parser.error(f"{args.base_url}{ROUTE} answered {probe.status_code}; "
+                         "is the dev server running (the route is disabled in production)?")
+
+        for merge in merges:
+            try:
+                results.append(run_merge(args, session, plans, merge))
+            except requests.RequestException as e:
+                print(f"✗ {merge}: {e}")
+                sys.exit(1)
+
+    print()
+    failed = False
+    for result in results:
+        k = result["merge_exponent"]
+        ok = args.max_exponent is None or (k is not None and k <= args.max_exponent)
+        failed |= not ok
+        limit = f" (max {args.max_exponent})" if args.max_exponent is not None else ""
+        print(f"{'✓' if ok else '✗'} {result['merge']}: merge time ~ lines^{k}{limit}, "
+              f"response size ~ lines^{result['response_exponent']}")
+
+    write_report({
+        "base_url": args.base_url,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "max_exponent": args.max_exponent,
+        "results": results,
+    }, args.output)
+    print(f"\nReport: {args.output}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
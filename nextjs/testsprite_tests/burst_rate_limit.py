@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Fire synchronized bursts at the rate limiters and check what they let through.
+
+TC009 and TC010 probe the limiter one request at a time, which can't show a
+limiter admitting more than its limit when requests race, or what it costs.
+This sends --burst requests at once (threads released by a barrier, each on
+its own pre-opened keep-alive session) through the dev-only probe route
+/api/debug/rate-limit, against:
+
+  memory  src/lib/rate-limit.ts
+  redis   src/lib/rate-limit-redis.ts: Upstash when UPSTASH_REDIS_REST_URL is
+          set on the dev server (point it at standin_server.py), otherwise its
+          in-memory fallback, which the report says
+
+Each round uses a fresh key, so rounds don't share a bucket. Per limiter it
+reports:
+
+  accuracy      requests admitted per burst against the limit
+  Retry-After   the advertised wait against the time until a request was
+                admitted again (polled every --poll-ms)
+  latency       client latency against the same burst with no limiter, and
+                the limiter's own time from the Server-Timing header
+
+The report is written to tmp/load/rate_limit_burst.json. Exits non-zero if a
+limiter over-admits or a client honoring Retry-After would still be refused.
+
+Usage:
+  python burst_rate_limit.py
+  python burst_rate_limit.py --limiter redis --burst 200 --limit 20 --rounds 5
+  python burst_rate_limit.py --window-ms 2000 --no-retry-check
+"""
+
+import argparse
+import json
+import math
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import requests
+
+from helpers.auth_helper import BASE_URL, TIMEOUT
+
+TESTS_DIR = Path(__file__).resolve().parent
+REPORT_PATH = TESTS_DIR / "tmp" / "load" / "rate_limit_burst.json"
+PROBE = "/api/debug/rate-limit"
+LIMITERS = ("memory", "redis")
+
+def probe(session: requests.Session, base_url: str, limiter: str, key: str, limit: int, window_ms: int) -> dict:
+    """One limiter check, with the client and server-side timings."""
+    sent = time.time()
+    start = time.perf_counter()
+    try:
+        response = session.post(f"{base_url}{PROBE}", timeout=TIMEOUT, json={
+            "limiter": limiter, "key": key, "limit": limit, "windowMs": window_ms,
+        })
+    except requests.RequestException as e:
+        return {"status": 0, "error": type(e).__name__, "seconds": time.perf_counter() - start,
+                "sent": sent, "at": time.time()}
+    sample = {"status": response.status_code, "seconds": time.perf_counter() - start, "sent": sent, "at": time.time()}
+    timing = response.headers.get("Server-Timing", "")
+    if "dur=" in timing:
+        sample["limiter_ms"] = float(timing.split("dur=")[1].split(",")[0])
+    if "Retry-After" in response.headers:
+        sample["retry_after"] = int(response.headers["Retry-After"])
+    try:
+        sample["backend"] = response.json().get("backend")
+    except ValueError:
+        pass
+    return sample
+
+def burst(sessions: list[requests.Session], size: int, base_url: str, limiter: str, key: str,
+          limit: int, window_ms: int) -> list[dict]:
+    """Send `size` requests released together, spread over the sessions."""
+    barrier = threading.Barrier(size)
+    samples = [None] * size
+
+    def fire(n: int) -> None:
+        barrier.wait()
+        samples[n] = probe(sessions[n % len(sessions)], base_url, limiter, key, limit, window_ms)
+
+    threads = [threading.Thread(target=fire, args=(n,)) for n in range(size)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+def check_retry_after(session: requests.Session, base_url: str, limiter: str, key: str, limit: int,
+                      window_ms: int, refused: dict, poll_ms: int) -> dict:
+    """
+    Poll the exhausted bucket until a request is admitted, with one poll sent
+    exactly when Retry-After says to come back: Retry-After is honored if that
+    one (or an earlier one) gets through. Refused requests don't use up
+    anything in either limiter, so polling doesn't move the answer.
+    """
+    advertised = refused["retry_after"]
+    comeback = refused["at"] + advertised
+    deadline = comeback + 2 * window_ms / 1000
+    while time.time() < deadline:
+        sample = probe(session, base_url, limiter, key, limit, window_ms)
+        if sample["status"] == 200:
+            waited = sample["sent"] - refused["at"]
+            return {"retry_after_s": advertised, "admitted_after_s": round(waited, 3),
+                    "honored": sample["sent"] <= comeback + 0.05, "slack_s": round(advertised - waited, 3)}
+        now = time.time()
+        next_poll = now + poll_ms / 1000
+        time.sleep(max(0.0, (comeback if now < comeback < next_poll else next_poll) - now))
+    return {"retry_after_s": advertised, "admitted_after_s": None, "honored": False, "slack_s": None}
+
+def percentiles(values: list[float]) -> dict:
+    if not values:
+        return {"p50": None, "p95": None}
+    values = sorted(values)
+    return {f"p{p}": round(values[max(0, math.ceil(p / 100 * len(values)) - 1)], 3) for p in (50, 95)}
+
+def run_limiter(args, sessions: list[requests.Session], run_id: str, limiter: str, baseline_ms: dict) -> dict:
+    rounds, latencies, limiter_ms, backends = [], [], [], set()
+    for n in range(1, args.rounds + 1):
+        key = f"{run_id}:{limiter}:{n}"
+        samples = burst(sessions, args.burst, args.base_url, limiter, key, args.limit, args.window_ms)
+        admitted = sum(s["status"] == 200 for s in samples)
+        refused = [s for s in samples if s["status"] == 429]
+        errors = len(samples) - admitted - len(refused)
+        expected = min(args.burst, args.limit)
+        latencies += [s["seconds"] * 1000 for s in samples if s["status"]]
+        limiter_ms += [s["limiter_ms"] for s in samples if "limiter_ms" in s]
+        backends |= {s["backend"] for s in samples if s.get("backend")}
+
+        result = {"round": n, "admitted": admitted, "expected": expected, "over_admitted": max(0, admitted - expected),
+                  "under_admitted": max(0, expected - admitted), "refused": len(refused), "errors": errors}
+        if refused and not args.no_retry_check:
+            first = min((s for s in refused if "retry_after" in s), key=lambda s: s["at"], default=None)
+            if first is None:
+                result["retry"] = {"retry_after_s": None, "honored": False, "admitted_after_s": None, "slack_s": None}
+            else:
+                result["retry"] = check_retry_after(sessions[0], args.base_url, limiter, key, args.limit,
+                                                    args.window_ms, first, args.poll_ms)
+        rounds.append(result)
+
+        ok = result["over_admitted"] == 0 and result["under_admitted"] == 0 and not errors
+        retry = result.get("retry")
+        line = f"{'✓' if ok else '✗'} {limiter:<6} round {n}: {admitted}/{args.burst} admitted (limit {expected})"
+        if errors:
+            line += f", {errors} errors"
+        if retry:
+            line += (f"; Retry-After {retry['retry_after_s']}s, admitted again after "
+                     f"{retry['admitted_after_s']}s {'✓' if retry['honored'] else '✗'}")
+        print(line)
+
+    client = percentiles(latencies)
+    return {
+        "limiter": limiter,
+        "backend": ", ".join(sorted(backends)) or "unknown",
+        "rounds": rounds,
+        "over_admitted": sum(r["over_admitted"] for r in rounds),
+        "under_admitted": sum(r["under_admitted"] for r in rounds),
+        "retry_after_honored": all(r["retry"]["honored"] for r in rounds if "retry" in r),
+        "client_latency_ms": client,
+        "added_latency_ms": {k: round(client[k] - baseline_ms[k], 3) if client[k] is not None and baseline_ms[k] is not None else None
+                             for k in client},
+        "limiter_ms": percentiles(limiter_ms),
+    }
+
+def write_report(report: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(report, indent=2) + "\n")
+    tmp_path.replace(path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Burst-test the memory and Redis rate limiters.")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"dev server (default: {BASE_URL})")
+    parser.add_argument("--limiter", choices=LIMITERS, action="append",
+                        help="limiter to test; repeat for both (default: both)")
+    parser.add_argument("--burst", type=int, default=50, help="requests per burst (default: 50)")
+    parser.add_argument("--sessions", type=int, help="keep-alive sessions to spread a burst over (default: --burst)")
+    parser.add_argument("--limit", type=int, default=10, help="limit the probe asks for (default: 10)")
+    parser.add_argument("--window-ms", type=int, default=3000,
+                        help="window the probe asks for; Retry-After checks wait about this long (default: 3000)")
+    parser.add_argument("--rounds", type=int, default=3, help="bursts per limiter (default: 3)")
+    parser.add_argument("--poll-ms", type=int, default=100, help="interval when polling for readmission (default: 100)")
+    parser.add_argument("--no-retry-check", action="store_true", help="skip waiting out Retry-After")
+    parser.add_argument("-o", "--output", type=Path, default=REPORT_PATH,
+                        help="JSON report path (default: tmp/load/rate_limit_burst.json)")
+    args = parser.parse_args()
+
+    for name in ("burst", "limit", "window_ms", "rounds", "poll_ms"):
+        if getattr(args, name) < 1:
+            parser.error(f"--{name.replace('_', '-')} must be at least 1")
+    if args.sessions is not None and args.sessions < 1:
+        parser.error("--sessions must be at least 1")
+    limiters = args.limiter or list(LIMITERS)
+
+    sessions = [requests.Session() for _ in range(args.sessions or args.burst)]
+    run_id = uuid.uuid4().hex[:8]
+    try:
+        # Open every connection first, so the bursts measure the limiter, not TCP setup
+        warmup = burst(sessions, len(sessions), args.base_url, "none", f"{run_id}:warmup", 1, 1000)
+        failed = [s for s in warmup if s["status"] != 200]
+        if failed:
+            parser.error(f"{args.base_url}{PROBE} answered {failed[0].get('error') or failed[0]['status']}; "
+                         "is the dev server running (the probe is disabled in production)?")
+
+        baseline = []
+        for n in range(args.rounds):
+            baseline += [s["seconds"] * 1000 for s in burst(sessions, args.burst, args.base_url, "none",
+                                                            f"{run_id}:none:{n}", args.limit, args.window_ms)]
+        baseline_ms = percentiles(baseline)
+        print(f"Baseline (no limiter): p50 {baseline_ms['p50']} ms, p95 {baseline_ms['p95']} ms "
+              f"for bursts of {args.burst}\n")
+
+        results = [run_limiter(args, sessions, run_id, limiter, baseline_ms) for limiter in limiters]
+    finally:
+        for session in sessions:
+            session.close()
+
+    print()
+    for result in results:
+        added, own = result["added_latency_ms"], result["limiter_ms"]
+        print(f"{result['limiter']} ({result['backend']}): over-admitted {result['over_admitted']}, "
+              f"under-admitted {result['under_admitted']}, Retry-After "
+              f"{'honored' if result['retry_after_honored'] else 'NOT honored'}; "
+              f"added p50 {added['p50']} ms / p95 {added['p95']} ms, "
+              f"limiter p50 {own['p50']} ms / p95 {own['p95']} ms")
+        if result["limiter"] == "redis" and "upstash" not in result["backend"]:
+            print("  note: UPSTASH_REDIS_REST_URL isn't set on the dev server, so this is the in-memory fallback")
+
+    write_report({
+        "base_url": args.base_url,
+        "burst": args.burst,
+        "sessions": len(sessions),
+        "limit": args.limit,
+        "window_ms": args.window_ms,
+        "baseline_latency_ms": baseline_ms,
+        "limiters": results,
+    }, args.output)
+    print(f"\nReport: {args.output}")
+    sys.exit(0 if all(r["over_admitted"] == 0 and r["retry_after_honored"] for r in results) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+pytest fixtures for the TestSprite API tests (see helpers/auth_helper.py).
+
+Run from nextjs/testsprite_tests against a dev server on localhost:3001
+(or TESTSPRITE_BASE_URL):
+
+    pytest                    # one login per run, shared keep-alive connections
+    pytest --login-per-test   # the old setup, to compare wall time
+
+Every request's latency is recorded per endpoint (helpers/latency.py) and
+written to tmp/latency.json:
+
+    pytest --latency-gate               # fail if an endpoint is over its budget
+    pytest --update-latency-baseline    # take this run's p50/p95 as the budgets
+"""
+
+import pytest
+import requests
+
+from helpers import latency
+from helpers.auth_helper import (
+    anonymous_session,
+    authenticated_session,
+    close_shared_adapter,
+    login,
+    new_session,
+)
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--login-per-test", action="store_true",
+        help="log in and open new connections in every test, as the tests used to",
+    )
+    parser.addoption(
+        "--latency-gate", action="store_true",
+        help="fail the run if an endpoint's p50/p95 is over its budget in latency_baseline.json",
+    )
+    parser.addoption(
+        "--latency-tolerance", type=float, default=None,
+        help=f"fraction an endpoint may exceed its budget by (default: the baseline's, or {latency.TOLERANCE})",
+    )
+    parser.addoption(
+        "--update-latency-baseline", action="store_true",
+        help="write this run's per-endpoint p50/p95 into latency_baseline.json",
+    )
+
+def _login_per_test(request) -> bool:
+    return request.config.getoption("--login-per-test")
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    summary = latency.recorder.summary()
+    if not summary:
+        return
+    baseline = latency.load_baseline()
+    if config.getoption("--latency-tolerance") is not None:
+        baseline["tolerance"] = config.getoption("--latency-tolerance")
+    config._latency_regressions = []
+    config._latency_unmeasured = []
+    if config.getoption("--update-latency-baseline"):
+        latency.write_json(latency.BASELINE_PATH, latency.updated_baseline(summary, baseline))
+    elif config.getoption("--latency-gate"):
+        config._latency_regressions = latency.regressions(summary, baseline)
+        config._latency_unmeasured = latency.unmeasured(summary, baseline)
+        if config._latency_regressions and session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+    latency.write_json(latency.REPORT_PATH, {
+        "endpoints": summary,
+        "regressions": config._latency_regressions,
+        "samples": latency.recorder.samples,
+    })
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    summary = latency.recorder.summary()
+    if not summary:
+        return
+    terminalreporter.section("endpoint latency")
+    width = max(len(name) for name in summary)
+    for name, measured in summary.items():
+        terminalreporter.write_line(f"{name:<{width}}  {measured['samples']:>3}x  "
+                                    f"p50 {measured['p50_ms']:>8.1f} ms  p95 {measured['p95_ms']:>8.1f} ms")
+    if config.getoption("--update-latency-baseline"):
+        terminalreporter.write_line(f"\nBudgets written to {latency.BASELINE_PATH.name}")
+    unmeasured = getattr(config, "_latency_unmeasured", [])
+    if unmeasured:
+        terminalreporter.write_line(f"\nNo measured budget for {len(unmeasured)} endpoints, not gated: "
+                                    "run pytest --update-latency-baseline against the dev server", yellow=True)
+    for line in getattr(config, "_latency_regressions", []):
+        terminalreporter.write_line(f"✗ {line}", red=True)
+
+@pytest.fixture(autouse=True)
+def _latency_test_name(request):
+    latency.recorder.current_test = request.node.nodeid
+    yield
+    latency.recorder.current_test = None
+
+@pytest.fixture(scope="session")
+def shared_auth_session():
+    # Track before logging in, so the login and cookie check are recorded too
+    session = authenticated_session(latency.track(new_session()))
+    yield session
+    close_shared_adapter()
+
+@pytest.fixture(scope="session")
+def shared_anon_session():
+    return latency.track(anonymous_session())
+
+@pytest.fixture
+def auth_session(request):
+    """Session logged in as the test user."""
+    if _login_per_test(request):
+        session = latency.track(requests.Session())
+        login(session)
+        yield session
+        session.close()
+    else:
+        yield request.getfixturevalue("shared_auth_session")
+
+@pytest.fixture
+def anon_session(request):
+    """Session without auth cookies."""
+    if _login_per_test(request):
+        session = latency.track(requests.Session())
+        yield session
+        session.close()
+    else:
+        yield request.getfixturevalue("shared_anon_session")
+
+@pytest.fixture
+def fresh_session(request):
+    """An empty cookie jar for tests that log in or sign up themselves."""
+    if _login_per_test(request):
+        session = latency.track(requests.Session())
+        yield session
+        session.close()
+    else:
+        yield latency.track(new_session())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Local origin server with recipe pages of any size, for scraping tests and
+benchmarks that shouldn't depend on allrecipes.com being up.
+
+  GET /recipe?size=1MB                       a recipe blog page of about that size
+        &position=end                        recipe card after the padding (default) or start
+        &jsonld=1                            include schema.org JSON-LD (default 1)
+        &gzip=1                              gzip when the client accepts it
+        &chunked=1                           Transfer-Encoding: chunked instead of Content-Length
+        &chunk=16KB                          write size (and chunk size when chunked)
+        &drip=256KB                          slow-drip: send at most this many bytes per second
+        &ttfb=500                            wait this many ms before the headers
+        &tag=anything                        label the request in /__fixture/log
+
+  GET /__fixture/log     every request served: params, bytes sent, whether
+                         the client hung up before the end
+  POST /__fixture/reset  clear the log
+
+Sizes accept B, KB and MB (1KB = 1024 bytes). Pages are built
+deterministically and cached, so repeated requests cost only the write.
+
+/api/scrape-url refuses loopback addresses, so start the dev server with
+SCRAPE_URL_ALLOWED_HOSTS=127.0.0.1 (ignored in production) to scrape this.
+TESTSPRITE_FIXTURE_ORIGIN=http://127.0.0.1:54400 points the scrape tests
+(TC003, TC004) here instead of allrecipes.com.
+
+Usage:
+  python fixture_origin.py                   # http://127.0.0.1:54400
+  python fixture_origin.py --port 8080 -v
+  curl -s 'http://127.0.0.1:54400/recipe?size=10KB&jsonld=0' | head
+"""
+
+import argparse
+import gzip
+import json
+import re
+import sys
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_PORT = 54400
+MAX_SIZE = 64 * 1024 * 1024
+
+# The recipe every page carries; benchmarks look for its last ingredient and
+# step in what the app returns to tell whether truncation cut the recipe off
+RECIPE = {
+    "name": "Fixture Origin Lemon Chicken",
+    "recipeYield": "4 servings",
+    "prepTime": "PT15M",
+    "cookTime": "PT35M",
+    "recipeIngredient": [
+        "4 boneless chicken thighs",
+        "2 lemons, zested and juiced",
+        "3 cloves garlic, minced",
+        "2 tbsp olive oil",
+        "1 tsp dried oregano",
+        "1 tsp smoked paprika (fixture end marker)",
+    ],
+    "recipeInstructions": [
+        "Heat the oven to 425°F.",
+        "Toss the chicken with the lemon, garlic, oil, oregano and paprika.",
+        "Roast for 35 minutes until the chicken reaches 165°F.",
+        "Rest for 5 minutes and serve with the pan juices (fixture end marker).",
+    ],
+}
+
+PARAGRAPH = (
+    "<p>Paragraph {n}: we first made this on a rainy Tuesday, and the kitchen "
+    "smelled of lemons for days. The kids asked for it again the next week, "
+    "and now it is on our table more often than not.</p>\n"
+)
+
+def parse_size(value: str) -> int:
+    """'1KB', '1.5MB', '2048' -> bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KM]?)B?\s*", value, re.I)
+    if match is None:
+        raise ValueError(f"bad size {value!r} (expected e.g. 512, 10KB or 2MB)")
+    number, unit = float(match.group(1)), match.group(2).upper()
+    return int(number * {"": 1, "K": 1024, "M": 1024 * 1024}[unit])
+
+def recipe_card() -> str:
+    ingredients = "".join(f"<li>{item}</li>" for item in RECIPE["recipeIngredient"])
+    steps = "".join(f"<li>{step}</li>" for step in RECIPE["recipeInstructions"])
+    return (f'<div class="recipe-card"><h2>{RECIPE["name"]}</h2>'
+            f'<p>Serves {RECIPE["recipeYield"]}</p>'
+            f'<h3>Ingredients</h3><ul>{ingredients}</ul>'
+            f'<h3>Instructions</h3><ol>{steps}</ol></div>\n')
+
+@lru_cache(maxsize=32)
+def build_page(size: int, position: str, jsonld: bool) -> bytes:
+    """An HTML page of about `size` bytes (never less than the recipe itself)."""
+    head = f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{RECIPE['name']}</title>\n"
+    if jsonld:
+        schema = {"@context": "https://schema.org", "@type": "Recipe", **RECIPE, "recipeInstructions": [
+            {"@type": "HowToStep", "text": step} for step in RECIPE["recipeInstructions"]]}
+        head += f'<script type="application/ld+json">{json.dumps(schema)}</script>\n'
+    head += "<style>body { font-family: serif; }</style></head>\n<body><main><article class=\"post\">\n"
+    head += f"<h1>{RECIPE['name']}</h1>\n"
+    tail = "</article></main></body></html>\n"
+    card = recipe_card()
+
+    fixed = len((head + card + tail).encode())
+    padding, n = [], 0
+    remaining = size - fixed
+    while remaining > 0:
+        paragraph = PARAGRAPH.format(n=n)
+        padding.append(paragraph)
+        remaining -= len(paragraph)
+        n += 1
+    body = card + "".join(padding) if position == "start" else "".join(padding) + card
+    return (head + body + tail).encode()
+
+@lru_cache(maxsize=32)
+def gzipped(size: int, position: str, jsonld: bool) -> bytes:
+    return gzip.compress(build_page(size, position, jsonld), compresslevel=6)
+
+class Log:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = []
+
+    def add(self, entry: dict) -> None:
+        with self.lock:
+            self.entries.append(entry)
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "fixture-origin/1"
+
+    # Set by make_server
+    log: Log
+    quiet = True
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def send_json(self, status: int, body) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        if urlsplit(self.path).path == "/__fixture/reset":
+            with self.log.lock:
+                self.log.entries.clear()
+            return self.send_json(200, {"ok": True})
+        self.send_json(404, {"error": "not found"})
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/__fixture/log":
+            with self.log.lock:
+                return self.send_json(200, self.log.entries)
+        if url.path != "/recipe":
+            return self.send_json(404, {"error": f"no fixture at {url.path}; try /recipe?size=1MB"})
+
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            size = parse_size(query.get("size", "10KB"))
+            chunk = max(1, parse_size(query.get("chunk", "16KB")))
+            drip = parse_size(query["drip"]) if "drip" in query else None
+            ttfb = float(query.get("ttfb", 0)) / 1000
+            if size > MAX_SIZE:
+                raise ValueError(f"size is capped at {MAX_SIZE // (1024 * 1024)}MB")
+        except ValueError as e:
+            return self.send_json(400, {"error": str(e)})
+        position = "start" if query.get("position") == "start" else "end"
+        jsonld = query.get("jsonld", "1") != "0"
+        chunked = query.get("chunked") == "1"
+        use_gzip = query.get("gzip") == "1" and "gzip" in (self.headers.get("Accept-Encoding") or "")
+
+        body = gzipped(size, position, jsonld) if use_gzip else build_page(size, position, jsonld)
+        entry = {"tag": query.get("tag"), "path": self.path, "page_bytes": len(build_page(size, position, jsonld)),
+                 "body_bytes": len(body), "gzip": use_gzip, "chunked": chunked, "sent_bytes": 0,
+                 "complete": False, "seconds": None}
+        start = time.perf_counter()
+        if ttfb:
+            time.sleep(ttfb)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        try:
+            for offset in range(0, len(body), chunk):
+                piece = body[offset:offset + chunk]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(piece), piece) if chunked else piece)
+                entry["sent_bytes"] += len(piece)
+                if drip:
+                    time.sleep(len(piece) / drip)
+            if chunked:
+                self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+            entry["complete"] = True
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up (a fetch timeout or a size cap): that's the point of the log
+            self.close_connection = True
+        finally:
+            entry["seconds"] = round(time.perf_counter() - start, 3)
+            self.log.add(entry)
+
+def make_server(host: str, port: int, quiet: bool = True) -> ThreadingHTTPServer:
+    handler = type("Handler", (FixtureHandler,), {"log": Log(), "quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recipe pages from 1KB to tens of MB for scraping tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, quiet=not args.verbose)
+    print(f"Fixture origin on http://{args.host}:{args.port}/recipe?size=1MB", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Shared HTTP sessions for the TestSprite API tests.
+
+Every test used to build its own requests.Session(), open fresh connections
+and POST /api/test-auth again. These helpers give a whole run one keep-alive
+connection pool and one login:
+
+- every session mounts the same HTTPAdapter, so connections to the dev server
+  are reused across tests whichever session (authenticated, anonymous or a
+  throwaway one) a request goes through
+- the authenticated session's cookies are cached in tmp/auth_cookies.json and
+  revalidated with GET /api/test-auth, so back-to-back runs skip the login too
+
+Never close() one of these sessions in a test: that closes the shared pool.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = os.environ.get("TESTSPRITE_BASE_URL", "http://localhost:3001").rstrip("/")
+TIMEOUT = 30
+# fixture_origin.py, for the scrape tests to use instead of live recipe sites
+FIXTURE_ORIGIN = os.environ.get("TESTSPRITE_FIXTURE_ORIGIN", "").rstrip("/")
+
+# run_parallel.py gives each worker its own user and namespace through these
+TEST_USER = {
+    "email": os.environ.get("TESTSPRITE_USER_EMAIL", "test@testsprite.dev"),
+    "password": os.environ.get("TESTSPRITE_USER_PASSWORD", "TestSprite123!"),
+}
+NAMESPACE = os.environ.get("TESTSPRITE_NAMESPACE", "")
+
+_cache_suffix = f".{NAMESPACE}" if NAMESPACE else ""
+COOKIE_CACHE = Path(__file__).resolve().parent.parent / "tmp" / f"auth_cookies{_cache_suffix}.json"
+# Older cached cookies are not reused even if the server still accepts them
+COOKIE_CACHE_TTL = 30 * 60
+
+_adapter = None
+
+def namespaced(value: str) -> str:
+    """Prefix a created record's name with the worker namespace, if any."""
+    return f"[{NAMESPACE}] {value}" if NAMESPACE else value
+
+def namespaced_email(email: str) -> str:
+    """Plus-address an email with the worker namespace, so workers never share a signup."""
+    if not NAMESPACE:
+        return email
+    local, _, domain = email.partition("@")
+    return f"{local}+{NAMESPACE}@{domain}"
+
+def shared_adapter() -> HTTPAdapter:
+    """The connection pool every session in this process mounts."""
+    global _adapter
+    if _adapter is None:
+        _adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    return _adapter
+
+def close_shared_adapter() -> None:
+    global _adapter
+    if _adapter is not None:
+        _adapter.close()
+        _adapter = None
+
+def new_session() -> requests.Session:
+    """A session with its own cookie jar on the shared connection pool."""
+    session = requests.Session()
+    adapter = shared_adapter()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def login(session: requests.Session, credentials: dict = TEST_USER) -> dict:
+    """POST /api/test-auth on session and return the response JSON."""
+    response = session.post(f"{BASE_URL}/api/test-auth", json=credentials, timeout=TIMEOUT)
+    assert response.status_code == 200, f"Authentication failed with status {response.status_code}: {response.text}"
+    data = response.json()
+    assert data.get("success") is True, f"Authentication did not succeed: {response.text}"
+    return data
+
+def _restore_cookies(session: requests.Session) -> bool:
+    """Load cached cookies into session if they are recent and still accepted."""
+    try:
+        cached = json.loads(COOKIE_CACHE.read_text())
+    except (OSError, ValueError):
+        return False
+    if (cached.get("base_url") != BASE_URL
+            or cached.get("email") != TEST_USER["email"]
+            or time.time() - cached.get("saved_at", 0) > COOKIE_CACHE_TTL):
+        return False
+
+    for cookie in cached.get("cookies", []):
+        session.cookies.set(cookie["name"], cookie["value"], domain=cookie["domain"], path=cookie["path"])
+    try:
+        status = session.get(f"{BASE_URL}/api/test-auth", timeout=TIMEOUT)
+        valid = status.status_code == 200 and status.json().get("success") is True
+    except (requests.RequestException, ValueError):
+        valid = False
+    if not valid:
+        session.cookies.clear()
+    return valid
+
+def _save_cookies(session: requests.Session) -> None:
+    cookies = [
+        {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path}
+        for c in session.cookies
+    ]
+    COOKIE_CACHE.parent.mkdir(exist_ok=True)
+    tmp_path = COOKIE_CACHE.with_suffix(".tmp")
+    # Session tokens: keep them private to the current user
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump({
+            "base_url": BASE_URL,
+            "email": TEST_USER["email"],
+            "saved_at": time.time(),
+            "cookies": cookies,
+        }, f)
+    tmp_path.replace(COOKIE_CACHE)
+
+def authenticated_session(session: requests.Session | None = None) -> requests.Session:
+    """A session logged in as the test user, reusing cached cookies when possible.
+
+    Pass session to log in an existing one, e.g. with hooks already attached
+    so the login request itself goes through them.
+    """
+    if session is None:
+        session = new_session()
+    if not _restore_cookies(session):
+        login(session)
+        _save_cookies(session)
+    return session
+
+def anonymous_session() -> requests.Session:
+    """A session with no auth cookies, for the 401 checks."""
+    return new_session()
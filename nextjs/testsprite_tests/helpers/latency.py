@@ -0,0 +1,162 @@
+"""
+Per-endpoint latency capture and budgets for the TestSprite API tests.
+
+Every session the conftest.py fixtures hand out records how long each
+request to the dev server took: requests' `elapsed`, from sending the request
+until the response headers were parsed. Requests are grouped by route, using
+the route.ts files under src/app, so /api/recipes/<uuid>/rate and every other
+recipe's rating count as "POST /api/recipes/[id]/rate".
+
+latency_baseline.json holds p50/p95 budgets per endpoint. conftest.py
+compares a run against it with `pytest --latency-gate`. It rewrites the
+budgets from the run with `pytest --update-latency-baseline`. Each budget
+records how many samples it was measured from; one without is not gated on.
+"""
+
+import json
+import math
+import re
+from datetime import date
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+
+from helpers.auth_helper import BASE_URL, NAMESPACE
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+APP_DIR = TESTS_DIR.parent / "src" / "app"
+BASELINE_PATH = TESTS_DIR / "latency_baseline.json"
+_report_suffix = f".{NAMESPACE}" if NAMESPACE else ""
+REPORT_PATH = TESTS_DIR / "tmp" / f"latency{_report_suffix}.json"
+
+# A budget is exceeded when the run is more than TOLERANCE slower *and* more
+# than GRACE_MS slower, so fast endpoints don't fail on a few ms of noise
+TOLERANCE = 0.25
+GRACE_MS = 25.0
+# p95 of fewer samples than this is just the slowest request
+MIN_P95_SAMPLES = 5
+
+ID_SEGMENT = re.compile(r"^(?:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\d+)$", re.I)
+
+def route_patterns(app_dir: Path = APP_DIR) -> list[tuple[re.Pattern, str]]:
+    """(regex, template) for every route.ts, static routes before dynamic ones."""
+    routes = []
+    for route in app_dir.rglob("route.ts"):
+        # Route groups like (marketing) aren't part of the URL
+        segments = [s for s in route.parent.relative_to(app_dir).parts if not (s.startswith("(") and s.endswith(")"))]
+        template = "/" + "/".join(segments)
+        pattern = "".join(
+            "(?:/.+)?" if s.startswith("[[...") else "/.+" if s.startswith("[...") else "/[^/]+" if s.startswith("[") else "/" + re.escape(s)
+            for s in segments
+        )
+        routes.append((sum(s.startswith("[") for s in segments), re.compile(f"^{pattern}/?$"), template))
+    return [(pattern, template) for _, pattern, template in sorted(routes, key=lambda r: (r[0], r[2]))]
+
+_routes = None
+
+def endpoint(method: str, url: str) -> str:
+    """"POST /api/recipes/[id]/rate" for a request to one recipe's rating."""
+    global _routes
+    if _routes is None:
+        _routes = route_patterns()
+    path = urlsplit(url).path or "/"
+    for pattern, template in _routes:
+        if pattern.match(path):
+            return f"{method} {template}"
+    # Pages and anything else: collapse ids so every record shares one entry
+    return f"{method} " + "/".join(":id" if ID_SEGMENT.match(s) else s for s in path.split("/"))
+
+class LatencyRecorder:
+    """Collects one sample per response from the dev server."""
+
+    def __init__(self, base_url: str = BASE_URL):
+        self.base_url = base_url
+        self.samples = []
+        self.current_test = None
+
+    def hook(self, response: requests.Response, *args, **kwargs) -> None:
+        if not response.url.startswith(self.base_url):
+            return
+        self.samples.append({
+            "endpoint": endpoint(response.request.method, response.url),
+            "ms": response.elapsed.total_seconds() * 1000,
+            "status": response.status_code,
+            "test": self.current_test,
+        })
+
+    def summary(self) -> dict[str, dict]:
+        by_endpoint = {}
+        for sample in self.samples:
+            by_endpoint.setdefault(sample["endpoint"], []).append(sample["ms"])
+        return {name: summarize(values) for name, values in sorted(by_endpoint.items())}
+
+recorder = LatencyRecorder()
+
+def track(session: requests.Session) -> requests.Session:
+    """Record every response on session."""
+    if recorder.hook not in session.hooks["response"]:
+        session.hooks["response"].append(recorder.hook)
+    return session
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    values = sorted(values)
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+def summarize(values: list[float]) -> dict:
+    return {
+        "samples": len(values),
+        "p50_ms": round(percentile(values, 50), 1),
+        "p95_ms": round(percentile(values, 95), 1),
+    }
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {"endpoints": {}}
+
+def write_json(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+    tmp_path.replace(path)
+
+def regressions(summary: dict[str, dict], baseline: dict) -> list[str]:
+    """A line for every percentile over its budget by more than the tolerance."""
+    tolerance = baseline.get("tolerance", TOLERANCE)
+    grace_ms = baseline.get("grace_ms", GRACE_MS)
+    failures = []
+    for name, measured in summary.items():
+        budget = baseline.get("endpoints", {}).get(name)
+        # Only budgets a run measured: they carry its sample count
+        if not budget or not budget.get("samples"):
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            if key == "p95_ms" and measured["samples"] < MIN_P95_SAMPLES:
+                continue
+            limit = budget.get(key)
+            if limit is None:
+                continue
+            allowed = max(limit * (1 + tolerance), limit + grace_ms)
+            if measured[key] > allowed:
+                failures.append(f"{name}: {key[:3]} {measured[key]:.0f} ms > budget {limit:.0f} ms "
+                                f"(+{tolerance:.0%}, {measured['samples']} samples)")
+    return failures
+
+def unmeasured(summary: dict[str, dict], baseline: dict) -> list[str]:
+    """Endpoints this run called that have no measured budget to gate on."""
+    endpoints = baseline.get("endpoints", {})
+    return [name for name in summary if not endpoints.get(name, {}).get("samples")]
+
+def updated_baseline(summary: dict[str, dict], baseline: dict) -> dict:
+    """The baseline with the endpoints this run measured replaced by its numbers."""
+    endpoints = {name: budget for name, budget in baseline.get("endpoints", {}).items() if budget.get("samples")}
+    endpoints.update(summary)
+    return {
+        "source": f"measured by pytest --update-latency-baseline on {date.today().isoformat()}",
+        "tolerance": baseline.get("tolerance", TOLERANCE),
+        "grace_ms": baseline.get("grace_ms", GRACE_MS),
+        "endpoints": endpoints,
+    }
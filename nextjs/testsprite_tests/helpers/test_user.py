@@ -0,0 +1,101 @@
+"""
+Per-worker test users for run_parallel.py.
+
+Workers can't share test@testsprite.dev: the API rate limits are per user and
+the tests create, rate and delete recipes that the other workers would see.
+Each worker gets testsprite+w<N>@testsprite.dev, created through the Supabase
+admin API the first time it is needed (already-registered users are reused).
+seed_recipes.py creates its users the same way, as testsprite+<run>-u<N>.
+
+Needs NEXT_PUBLIC_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY, from the
+environment or nextjs/.env.local.
+"""
+
+import os
+from pathlib import Path
+
+import requests
+
+from helpers.auth_helper import TEST_USER, TIMEOUT
+
+ENV_FILE = Path(__file__).resolve().parents[2] / ".env.local"
+
+class ProvisionError(RuntimeError):
+    """A worker user could not be created."""
+
+def worker_namespace(worker: int) -> str:
+    return f"w{worker}"
+
+def namespace_user(namespace: str) -> dict:
+    """Credentials plus-addressed with namespace. The password matches the shared test user's."""
+    local, _, domain = TEST_USER["email"].partition("@")
+    return {
+        "email": f"{local.split('+')[0]}+{namespace}@{domain}",
+        "password": TEST_USER["password"],
+    }
+
+def worker_user(worker: int) -> dict:
+    """Credentials for one worker."""
+    return namespace_user(worker_namespace(worker))
+
+def supabase_settings() -> tuple[str, str]:
+    """The Supabase URL and service role key."""
+    settings = {}
+    try:
+        for line in ENV_FILE.read_text().splitlines():
+            key, sep, value = line.partition("=")
+            if sep and not key.lstrip().startswith("#"):
+                settings[key.strip()] = value.strip().strip('"\'')
+    except OSError:
+        pass
+    settings.update(os.environ)
+
+    url = settings.get("NEXT_PUBLIC_SUPABASE_URL")
+    key = settings.get("SUPABASE_SERVICE_ROLE_KEY")
+    if not url or not key:
+        raise ProvisionError(
+            "NEXT_PUBLIC_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY are needed to create users "
+            "(set them or add them to nextjs/.env.local), or pass --no-provision if the users exist"
+        )
+    return url.rstrip("/"), key
+
+def _already_registered(response: requests.Response) -> bool:
+    # Newer GoTrue versions send error_code, older ones only the message
+    return "email_exists" in response.text or "already" in response.text.lower()
+
+def provision_users(users: list[dict]) -> None:
+    """Create any of users that don't exist yet, with confirmed emails."""
+    url, key = supabase_settings()
+    headers = {"apikey": key, "Authorization": f"Bearer {key}"}
+    with requests.Session() as session:
+        for user in users:
+            try:
+                response = session.post(
+                    f"{url}/auth/v1/admin/users",
+                    json={**user, "email_confirm": True},
+                    headers=headers,
+                    timeout=TIMEOUT,
+                )
+            except requests.RequestException as e:
+                raise ProvisionError(f"{user['email']}: {e}") from e
+            if response.status_code == 422 and _already_registered(response):
+                continue
+            if response.status_code not in (200, 201):
+                raise ProvisionError(f"{user['email']}: HTTP {response.status_code} {response.text[:200]}")
+
+def user_id(user: dict) -> str:
+    """The auth id of an existing user, by signing in as them."""
+    url, key = supabase_settings()
+    try:
+        response = requests.post(
+            f"{url}/auth/v1/token",
+            params={"grant_type": "password"},
+            json=user,
+            headers={"apikey": key},
+            timeout=TIMEOUT,
+        )
+    except requests.RequestException as e:
+        raise ProvisionError(f"{user['email']}: {e}") from e
+    if response.status_code != 200:
+        raise ProvisionError(f"{user['email']}: sign-in failed, HTTP {response.status_code} {response.text[:200]}")
+    return response.json()["user"]["id"]
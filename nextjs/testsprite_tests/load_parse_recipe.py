@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Load test /api/parse-recipe with a ramp of concurrent clients.
+
+Concurrency doubles from 1 up to --max-concurrency (default 256). Each stage
+runs that many closed-loop clients for --stage-seconds, every client replaying
+the recipe corpus (fixtures/parse_recipe_corpus.json: plain-text recipes and
+HTML pages with and without JSON-LD) round-robin over its own keep-alive
+connection. Per stage it reports throughput, p50/p95/p99 latency, time to
+first byte, and the error and 429 rates. The ramp stops early once a stage's
+error rate passes --max-error-rate.
+
+Clients log in the way the tests do (helpers/auth_helper.py). The route allows
+20 parses per user per day, so a single user turns into 429s almost at once:
+--users N spreads the clients over the run_parallel.py worker users, and on a
+local server with the in-memory limiter a restart resets the counts. Point
+ANTHROPIC_BASE_URL at standin_server.py to load the app rather than the
+Anthropic API.
+
+The client is plain asyncio streams (no aiohttp in this environment), which
+also makes TTFB the time to the response's status line.
+
+Results are written to tmp/load/parse_recipe.json and an HTML report next to it.
+
+Usage:
+  python load_parse_recipe.py
+  python load_parse_recipe.py --max-concurrency 32 --stage-seconds 5
+  python load_parse_recipe.py --users 8 --no-provision
+  python load_parse_recipe.py --corpus my_pages/     # *.html and *.txt files
+"""
+
+import argparse
+import asyncio
+import html
+import itertools
+import json
+import math
+import ssl
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from helpers.auth_helper import BASE_URL, TIMEOUT, authenticated_session, login, new_session
+from helpers.test_user import ProvisionError, provision_users, worker_user
+
+TESTS_DIR = Path(__file__).resolve().parent
+CORPUS_PATH = TESTS_DIR / "fixtures" / "parse_recipe_corpus.json"
+REPORT_PATH = TESTS_DIR / "tmp" / "load" / "parse_recipe.json"
+ENDPOINT = "/api/parse-recipe"
+PERCENTILES = (50, 95, 99)
+
+def load_corpus(path: Path) -> list[dict]:
+    """
+    Request bodies to replay: a JSON list of parse-recipe bodies (with an
+    optional "name"), or a directory of .html and .txt files.
+    """
+    if path.is_dir():
+        corpus = []
+        for page in sorted(path.iterdir()):
+            if page.suffix in (".html", ".htm"):
+                corpus.append({"name": page.name, "htmlContent": page.read_text(errors="replace"),
+                               "sourceUrl": f"https://example.com/{page.name}"})
+            elif page.suffix == ".txt":
+                corpus.append({"name": page.name, "text": page.read_text(errors="replace")})
+        return corpus
+    return json.loads(path.read_text())
+
+def encode_corpus(corpus: list[dict]) -> list[tuple[str, bytes]]:
+    bodies = []
+    for n, entry in enumerate(corpus):
+        payload = {k: v for k, v in entry.items() if k != "name"}
+        bodies.append((entry.get("name", f"#{n}"), json.dumps(payload).encode()))
+    return bodies
+
+def cookie_headers(users: int, provision: bool) -> list[str]:
+    """One Cookie header per test user, logged in the same way as the tests."""
+    if users == 1:
+        sessions = [authenticated_session()]
+    else:
+        credentials = [worker_user(n) for n in range(1, users + 1)]
+        if provision:
+            provision_users(credentials)
+        sessions = []
+        for user in credentials:
+            session = new_session()
+            login(session, user)
+            sessions.append(session)
+    return ["; ".join(f"{c.name}={c.value}" for c in session.cookies) for session in sessions]
+
+class Connection:
+    """A keep-alive HTTP/1.1 connection that reconnects when the server closes it."""
+
+    def __init__(self, base_url: str):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.secure = parts.scheme == "https"
+        self.port = parts.port or (443 if self.secure else 80)
+        self.host_header = parts.netloc
+        self.reader = self.writer = None
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def post(self, path: str, body: bytes, cookie: str) -> tuple[int, float, float]:
+        """Send one JSON POST. Returns (status, seconds to first byte, total seconds)."""
+        reused = self.writer is not None
+        if not reused:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port, ssl=ssl.create_default_context() if self.secure else None)
+        head = (f"POST {path} HTTP/1.1\r\nHost: {self.host_header}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                f"Cookie: {cookie}\r\nConnection: keep-alive\r\n\r\n")
+        start = time.perf_counter()
+        self.writer.write(head.encode() + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        ttfb = time.perf_counter() - start
+        if not status_line:
+            await self.close()
+            if reused:  # the server dropped the idle connection; retry on a fresh one
+                return await self.post(path, body, cookie)
+            raise ConnectionResetError("server closed the connection")
+        status = int(status_line.split()[1])
+        headers = {}
+        while (line := await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while size := int((await self.reader.readline()).split(b";")[0], 16):
+                await self.reader.readexactly(size + 2)
+            while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+        elif "content-length" in headers:
+            await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            await self.reader.read()
+            await self.close()
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, ttfb, time.perf_counter() - start
+
+async def client(base_url: str, cookie: str, bodies, deadline: float, samples: list) -> None:
+    """Send requests back to back until the stage's deadline."""
+    connection = Connection(base_url)
+    try:
+        while time.perf_counter() < deadline:
+            name, body = next(bodies)
+            start = time.perf_counter()
+            try:
+                status, ttfb, seconds = await asyncio.wait_for(
+                    connection.post(ENDPOINT, body, cookie), TIMEOUT)
+                samples.append({"status": status, "ttfb": ttfb, "seconds": seconds, "payload": name})
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, IndexError) as e:
+                await connection.close()
+                samples.append({"status": 0, "ttfb": None, "seconds": time.perf_counter() - start,
+                                "payload": name, "error": type(e).__name__})
+    finally:
+        await connection.close()
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile of already sorted values."""
+    if not values:
+        return None
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+def summarize(concurrency: int, samples: list[dict], elapsed: float) -> dict:
+    latencies = sorted(s["seconds"] for s in samples)
+    ttfbs = sorted(s["ttfb"] for s in samples if s["ttfb"] is not None)
+    statuses = {}
+    for sample in samples:
+        key = str(sample["status"]) if sample["status"] else sample["error"]
+        statuses[key] = statuses.get(key, 0) + 1
+    total = len(samples)
+    ok = sum(200 <= s["status"] < 300 for s in samples)
+    limited = sum(s["status"] == 429 for s in samples)
+
+    def ms(values):
+        stats = {f"p{p}": percentile(values, p) for p in PERCENTILES}
+        stats["max"] = values[-1] if values else None
+        return {k: round(v * 1000, 1) if v is not None else None for k, v in stats.items()}
+
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "seconds": round(elapsed, 2),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "ok_rps": round(ok / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round((total - ok - limited) / total, 4) if total else 0.0,
+        "rate_limited_rate": round(limited / total, 4) if total else 0.0,
+        "statuses": dict(sorted(statuses.items())),
+        "latency_ms": ms(latencies),
+        "ttfb_ms": ms(ttfbs),
+    }
+
+async def run_stage(base_url: str, cookies: list[str], bodies, concurrency: int, seconds: float) -> dict:
+    samples = []
+    start = time.perf_counter()
+    deadline = start + seconds
+    await asyncio.gather(*(client(base_url, cookies[n % len(cookies)], bodies, deadline, samples)
+                           for n in range(concurrency)))
+    return summarize(concurrency, samples, time.perf_counter() - start)
+
+def ramp(max_concurrency: int) -> list[int]:
+    """1, 2, 4, ... up to and including max_concurrency."""
+    levels = [1]
+    while levels[-1] * 2 < max_concurrency:
+        levels.append(levels[-1] * 2)
+    if levels[-1] != max_concurrency:
+        levels.append(max_concurrency)
+    return levels
+
+async def run_ramp(args, cookies: list[str], corpus: list[tuple[str, bytes]]) -> list[dict]:
+    bodies = itertools.cycle(corpus)
+    stages = []
+    for concurrency in ramp(args.max_concurrency):
+        stage = await run_stage(args.base_url, cookies, bodies, concurrency, args.stage_seconds)
+        stages.append(stage)
+        mark = "✗" if stage["error_rate"] > args.max_error_rate else "✓"
+        latency, ttfb = stage["latency_ms"], stage["ttfb_ms"]
+        print(f"{mark} c={concurrency:<4} {stage['requests']:>6} req  {stage['throughput_rps']:>8.1f} rps  "
+              f"p50 {latency['p50']} / p95 {latency['p95']} / p99 {latency['p99']} ms  "
+              f"ttfb p50 {ttfb['p50']} ms  err {stage['error_rate']:.1%}  429 {stage['rate_limited_rate']:.1%}")
+        if stage["error_rate"] > args.max_error_rate:
+            print(f"  stopping: error rate above {args.max_error_rate:.0%}")
+            break
+    return stages
+
+def svg_chart(stages: list[dict], series: list[tuple[str, str, callable]], width=640, height=220) -> str:
+    """A small line chart against concurrency (log2 x axis), with no external assets."""
+    pad = 40
+    xs = list(range(len(stages)))
+    top = max([fn(s) or 0 for s in stages for _, _, fn in series] + [1e-9])
+    def point(i, value):
+        x = pad + (width - 2 * pad) * (i / max(1, len(xs) - 1))
+        y = height - pad - (height - 2 * pad) * ((value or 0) / top)
+        return f"{x:.1f},{y:.1f}"
+    parts = [f'<svg viewBox="0 0 {width} {height}" width="{width}" height="{height}" role="img">',
+             f'<line x1="{pad}" y1="{height - pad}" x2="{width - pad}" y2="{height - pad}" stroke="#999"/>',
+             f'<line x1="{pad}" y1="{pad}" x2="{pad}" y2="{height - pad}" stroke="#999"/>',
+             f'<text x="4" y="{pad}" font-size="11">{top:.0f}</text>']
+    for i, stage in enumerate(stages):
+        x = point(i, 0).split(",")[0]
+        parts.append(f'<text x="{x}" y="{height - pad + 16}" font-size="11" text-anchor="middle">'
+                     f'{stage["concurrency"]}</text>')
+    for n, (label, color, fn) in enumerate(series):
+        points = " ".join(point(i, fn(s)) for i, s in enumerate(stages))
+        parts.append(f'<polyline fill="none" stroke="{color}" stroke-width="2" points="{points}"/>')
+        parts.append(f'<text x="{width - pad - 90}" y="{pad + 14 * n}" font-size="11" fill="{color}">'
+                     f'{html.escape(label)}</text>')
+    parts.append("</svg>")
+    return "".join(parts)
+
+def html_report(report: dict) -> str:
+    stages = report["stages"]
+    rows = "".join(
+        f"<tr><td>{s['concurrency']}</td><td>{s['requests']}</td><td>{s['throughput_rps']}</td>"
+        f"<td>{s['ok_rps']}</td><td>{s['latency_ms']['p50']}</td><td>{s['latency_ms']['p95']}</td>"
+        f"<td>{s['latency_ms']['p99']}</td><td>{s['ttfb_ms']['p50']}</td><td>{s['ttfb_ms']['p95']}</td>"
+        f"<td>{s['error_rate']:.1%}</td><td>{s['rate_limited_rate']:.1%}</td>"
+        f"<td>{html.escape(', '.join(f'{k}: {v}' for k, v in s['statuses'].items()))}</td></tr>"
+        for s in stages)
+    throughput = svg_chart(stages, [("requests/s", "#2563eb", lambda s: s["throughput_rps"]),
+                                    ("2xx/s", "#16a34a", lambda s: s["ok_rps"])])
+    latency = svg_chart(stages, [("p50 ms", "#16a34a", lambda s: s["latency_ms"]["p50"]),
+                                 ("p95 ms", "#d97706", lambda s: s["latency_ms"]["p95"]),
+                                 ("p99 ms", "#dc2626", lambda s: s["latency_ms"]["p99"]),
+                                 ("ttfb p50 ms", "#7c3aed", lambda s: s["ttfb_ms"]["p50"])])
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>parse-recipe load test</title>
+<style>
+body {{ font-family: system-ui, sans-serif; margin: 2rem; color: #222; }}
+table {{ border-collapse: collapse; font-size: 14px; }}
+th, td {{ border: 1px solid #ddd; padding: 4px 8px; text-align: right; }}
+th {{ background: #f5f5f5; }}
+</style></head><body>
+<h1>POST {ENDPOINT}</h1>
+<p>{html.escape(report['base_url'])} · {report['started']} · {report['users']} user(s) ·
+{len(report['corpus'])} corpus payloads · {report['stage_seconds']}s per stage</p>
+<h2>Throughput</h2>{throughput}
+<h2>Latency</h2>{latency}
+<h2>Stages</h2>
+<table><tr><th>concurrency</th><th>requests</th><th>req/s</th><th>2xx/s</th><th>p50 ms</th><th>p95 ms</th>
+<th>p99 ms</th><th>ttfb p50</th><th>ttfb p95</th><th>errors</th><th>429</th><th>statuses</th></tr>
+{rows}</table>
+</body></html>
+"""
+
+def write_reports(report: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for target, text in ((path, json.dumps(report, indent=2) + "\n"),
+                         (path.with_suffix(".html"), html_report(report))):
+        tmp_path = target.with_suffix(target.suffix + ".tmp")
+        tmp_path.write_text(text)
+        tmp_path.replace(target)
+
+def main():
+    parser = argparse.ArgumentParser(description="Ramp concurrent load against /api/parse-recipe.")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"app to load (default: {BASE_URL})")
+    parser.add_argument("--max-concurrency", type=int, default=256, help="last ramp stage (default: 256)")
+    parser.add_argument("--stage-seconds", type=float, default=10.0, help="duration of each stage (default: 10)")
+    parser.add_argument("--max-error-rate", type=float, default=0.5,
+                        help="stop the ramp after a stage with more errors than this (default: 0.5)")
+    parser.add_argument("--users", type=int, default=1,
+                        help="spread clients over this many test users (default: 1, the shared test user)")
+    parser.add_argument("--no-provision", action="store_true",
+                        help="don't create the worker users through the Supabase admin API")
+    parser.add_argument("--corpus", type=Path, default=CORPUS_PATH,
+                        help="JSON list of request bodies, or a directory of .html/.txt files")
+    parser.add_argument("-o", "--output", type=Path, default=REPORT_PATH,
+                        help="JSON report path; the HTML report goes next to it (default: tmp/load/parse_recipe.json)")
+    args = parser.parse_args()
+
+    if args.max_concurrency < 1:
+        parser.error("--max-concurrency must be at least 1")
+    if args.users < 1:
+        parser.error("--users must be at least 1")
+    if args.stage_seconds <= 0:
+        parser.error("--stage-seconds must be positive")
+    try:
+        corpus = encode_corpus(load_corpus(args.corpus))
+    except (OSError, ValueError) as e:
+        parser.error(f"can't read corpus {args.corpus}: {e}")
+    if not corpus:
+        parser.error(f"corpus {args.corpus} has no payloads")
+
+    try:
+        cookies = cookie_headers(args.users, not args.no_provision)
+    except ProvisionError as e:
+        parser.error(str(e))
+
+    print(f"Loading {args.base_url}{ENDPOINT} with {len(corpus)} payloads, "
+          f"{args.users} user(s), up to {args.max_concurrency} clients\n")
+    started = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    stages = asyncio.run(run_ramp(args, cookies, corpus))
+
+    report = {
+        "endpoint": ENDPOINT,
+        "base_url": args.base_url,
+        "started": started,
+        "users": args.users,
+        "stage_seconds": args.stage_seconds,
+        "corpus": [name for name, _ in corpus],
+        "stages": stages,
+    }
+    write_reports(report, args.output)
+    best = max(stages, key=lambda s: s["ok_rps"])
+    print(f"\nPeak {best['ok_rps']} successful req/s at {best['concurrency']} clients")
+    print(f"Reports: {args.output} and {args.output.with_suffix('.html')}")
+    sys.exit(0 if stages[-1]["error_rate"] <= args.max_error_rate else 1)
+
+if __name__ == "__main__":
+    main()
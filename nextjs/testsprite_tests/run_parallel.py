@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Run the TestSprite backend tests across parallel workers.
+
+Each worker has its own test user (helpers/test_user.py) and data namespace,
+so workers don't use up each other's rate limits or see each other's recipes.
+Files are split across workers by the previous run's timings (slowest first,
+onto the least loaded worker), so the run takes about as long as an even share
+of the suite instead of the sum of all of it. Each worker is one pytest
+process that logs in once.
+
+Results are merged into tmp/test_results.json in TestSprite's format: entries
+with the same title are updated and new ones are appended.
+
+Usage:
+  python run_parallel.py                      # 4 workers, every TC*.py
+  python run_parallel.py -w 8
+  python run_parallel.py -w 2 TC002_*.py TC009_*.py
+  python run_parallel.py --no-provision       # worker users already exist
+  python run_parallel.py --latency-gate       # each worker checks latency_baseline.json
+"""
+
+import argparse
+import heapq
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from pathlib import Path
+
+from helpers.test_user import ProvisionError, provision_users, worker_namespace, worker_user
+
+TESTS_DIR = Path(__file__).resolve().parent
+RESULTS_PATH = TESTS_DIR / "tmp" / "test_results.json"
+WORK_DIR = TESTS_DIR / "tmp" / "parallel"
+DURATIONS_PATH = WORK_DIR / "durations.json"
+TEST_PLANS = ("testsprite_backend_test_plan.json", "testsprite_frontend_test_plan.json")
+
+def result_title(test_file: Path) -> str:
+    """TC001_test_authentication_endpoint.py -> TC001-test_authentication_endpoint"""
+    test_id, _, name = test_file.stem.partition("_")
+    return f"{test_id}-{name}"
+
+def load_json(path: Path, default):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return default
+
+def write_json(path: Path, data) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(data, indent=2) + "\n")
+    tmp_path.replace(path)
+
+def timestamp() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+def parse_junit(path: Path) -> dict[str, dict]:
+    """Test module name -> {status, error, seconds} from one worker's junit report."""
+    try:
+        cases = list(ET.parse(path).getroot().iter("testcase"))
+    except (OSError, ET.ParseError):
+        return {}
+
+    modules = {}
+    for case in cases:
+        module = modules.setdefault(case.get("classname", "").split(".")[0],
+                                    {"status": "PASSED", "error": "", "seconds": 0.0, "skipped": 0, "cases": 0})
+        module["cases"] += 1
+        module["seconds"] += float(case.get("time") or 0)
+        for tag in ("failure", "error"):
+            node = case.find(tag)
+            if node is not None:
+                module["status"] = "FAILED"
+                text = node.text or node.get("message") or tag
+                module["error"] = f"{module['error']}\n\n{text}" if module["error"] else text
+        if case.find("skipped") is not None:
+            module["skipped"] += 1
+    for module in modules.values():
+        if module["status"] == "PASSED" and module["skipped"] == module["cases"]:
+            module["status"] = "SKIPPED"
+    return modules
+
+def partition(files: list[Path], workers: int, durations: dict[str, float]) -> list[list[Path]]:
+    """
+    Split files into `workers` groups of about equal total duration: slowest
+    first, each onto the least loaded worker. Files without a recorded
+    duration are assumed to take the average.
+    """
+    known = [durations[f.name] for f in files if f.name in durations]
+    default = sum(known) / len(known) if known else 1.0
+    groups = [[] for _ in range(workers)]
+    loads = [(0.0, n) for n in range(workers)]
+    for test_file in sorted(files, key=lambda f: -durations.get(f.name, default)):
+        load, n = heapq.heappop(loads)
+        groups[n].append(test_file)
+        heapq.heappush(loads, (load + durations.get(test_file.name, default), n))
+    return [group for group in groups if group]
+
+def worker_env(worker: int) -> dict:
+    user = worker_user(worker)
+    return {
+        **os.environ,
+        "TESTSPRITE_NAMESPACE": worker_namespace(worker),
+        "TESTSPRITE_USER_EMAIL": user["email"],
+        "TESTSPRITE_USER_PASSWORD": user["password"],
+    }
+
+def run_parallel(files: list[Path], workers: int, pytest_args: tuple[str, ...] = ()) -> list[dict]:
+    """
+    Run one pytest process per worker, each on its share of the files, so a
+    worker pays for interpreter startup and its login once.
+
+    Each worker writes its output to tmp/parallel/<namespace>.log rather than
+    a pipe: a pipe nobody is reading yet fills up and stalls its worker until
+    the workers before it have finished.
+    """
+    durations = load_json(DURATIONS_PATH, {})
+    procs = []
+    for worker, group in enumerate(partition(files, workers, durations), start=1):
+        report = WORK_DIR / f"{worker_namespace(worker)}.xml"
+        report.unlink(missing_ok=True)
+        log = WORK_DIR / f"{worker_namespace(worker)}.log"
+        with log.open("w") as output:
+            proc = subprocess.Popen(
+                [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider",
+                 f"--junitxml={report}", *pytest_args, *(f.name for f in group)],
+                cwd=TESTS_DIR, env=worker_env(worker),
+                stdout=output, stderr=subprocess.STDOUT,
+            )
+        procs.append((worker, group, report, log, proc))
+
+    results = []
+    for worker, group, report, log, proc in procs:
+        proc.wait()
+        output = log.read_text(errors="replace")
+        modules = parse_junit(report)
+        for test_file in group:
+            module = modules.get(test_file.stem) or {
+                "status": "FAILED", "seconds": 0.0,
+                "error": output[-4000:] or "pytest did not report this file",
+            }
+            results.append({"file": test_file, "worker": worker, **module})
+            mark = {"PASSED": "✓", "SKIPPED": "-"}.get(module["status"], "✗")
+            print(f"{mark} [{worker_namespace(worker)}] {test_file.name} ({module['seconds']:.1f}s)")
+
+    durations.update({r["file"].name: round(r["seconds"], 3) for r in results if r["seconds"]})
+    write_json(DURATIONS_PATH, durations)
+    return sorted(results, key=lambda r: r["file"].name)
+
+def plan_descriptions() -> dict[str, str]:
+    descriptions = {}
+    for name in TEST_PLANS:
+        for entry in load_json(TESTS_DIR / name, []):
+            if isinstance(entry, dict) and "id" in entry and "title" in entry:
+                descriptions[f"{entry['id']}-{entry['title']}"] = entry.get("description", "")
+    return descriptions
+
+def merge_results(results: list[dict], path: Path = RESULTS_PATH) -> None:
+    """Update or append one TestSprite result entry per test file."""
+    entries = load_json(path, [])
+    by_title = {entry.get("title"): entry for entry in entries}
+    template = entries[0] if entries else {}
+    descriptions = plan_descriptions()
+    now = timestamp()
+
+    for result in results:
+        title = result_title(result["file"])
+        entry = by_title.get(title)
+        if entry is None:
+            entry = {
+                "projectId": template.get("projectId", ""),
+                "testId": str(uuid.uuid4()),
+                "userId": template.get("userId", ""),
+                "title": title,
+                "description": descriptions.get(title, ""),
+                "code": "",
+                "testStatus": "",
+                "testError": "",
+                "testType": "BACKEND",
+                "createFrom": "local",
+                "created": now,
+                "modified": now,
+            }
+            entries.append(entry)
+            by_title[title] = entry
+        entry["code"] = result["file"].read_text()
+        entry["testStatus"] = result["status"]
+        entry["testError"] = result["error"]
+        entry["modified"] = now
+
+    write_json(path, entries)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the TestSprite backend tests in parallel.")
+    parser.add_argument("files", nargs="*", type=Path, help="test files (default: every TC*.py)")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="parallel workers (default: 4)")
+    parser.add_argument("--no-provision", action="store_true",
+                        help="don't create the worker users through the Supabase admin API")
+    parser.add_argument("--latency-gate", action="store_true",
+                        help="fail a worker whose endpoints are over their latency budgets")
+    parser.add_argument("--results", type=Path, default=RESULTS_PATH,
+                        help="TestSprite results file to merge into (default: tmp/test_results.json)")
+    args = parser.parse_args()
+
+    files = [TESTS_DIR / f.name for f in args.files] or sorted(TESTS_DIR.glob("TC*.py"))
+    missing = [f.name for f in files if not f.is_file()]
+    if missing:
+        parser.error(f"no such test file: {', '.join(missing)}")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    workers = min(args.workers, len(files))
+
+    if not args.no_provision:
+        try:
+            provision_users([worker_user(n) for n in range(1, workers + 1)])
+        except ProvisionError as e:
+            parser.error(str(e))
+
+    WORK_DIR.mkdir(parents=True, exist_ok=True)
+    print(f"Running {len(files)} test files on {workers} workers\n")
+    start = time.perf_counter()
+    results = run_parallel(files, workers, ("--latency-gate",) if args.latency_gate else ())
+    wall = time.perf_counter() - start
+    merge_results(results, args.results)
+
+    passed = sum(r["status"] == "PASSED" for r in results)
+    serial = sum(r["seconds"] for r in results)
+    print(f"\n{passed}/{len(results)} passed in {wall:.1f}s "
+          f"({serial:.1f}s of test time, {serial / wall if wall else 0:.1f}x parallel)")
+    print(f"Results merged into {args.results}")
+
+    regressions = []
+    if args.latency_gate:
+        for worker in range(1, workers + 1):
+            report = load_json(TESTS_DIR / "tmp" / f"latency.{worker_namespace(worker)}.json", {})
+            regressions += [f"[{worker_namespace(worker)}] {line}" for line in report.get("regressions", [])]
+        for line in regressions:
+            print(f"✗ {line}")
+    sys.exit(0 if passed == len(results) and not regressions else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Seed test accounts with recipes and meal plans, for scale fixtures.
+
+Creates --users users (testsprite+<run>-u<N>@testsprite.dev, through the
+Supabase admin API like run_parallel.py's workers). Each one gets --recipes
+recipes through POST /api/recipes/bulk, --batch per request (one transaction
+each). Each also gets --meal-plans weekly plans going back from this week,
+with a dinner on every day.
+
+Progress is checkpointed to tmp/seed/<run>.json after every request.
+Rerunning the same command picks up where it stopped: after a crash, a
+Ctrl-C, or a 429 (POST /api/meal-plans allows 20 plans an hour per user).
+Seeded recipes are titled "[<run>] Seed recipe u<N> #<i>", so a batch that
+was committed just before a crash is found by title, not created twice.
+Raising --recipes or --meal-plans on a rerun adds the difference.
+
+--purge deletes everything a run created, then its checkpoint.
+
+Runs against TESTSPRITE_BASE_URL (default http://localhost:3001).
+
+Usage:
+  python seed_recipes.py --users 5 --recipes 2000 --meal-plans 8
+  python seed_recipes.py --run big --users 20 --recipes 5000 --batch 250
+  python seed_recipes.py --run big --purge
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import requests
+
+from helpers.auth_helper import BASE_URL, TIMEOUT, login, new_session
+from helpers.test_user import ProvisionError, namespace_user, provision_users
+
+TESTS_DIR = Path(__file__).resolve().parent
+CHECKPOINT_DIR = TESTS_DIR / "tmp" / "seed"
+BULK_ENDPOINT = "/api/recipes/bulk"
+MAX_BATCH = 500  # MAX_BULK_RECIPES in src/app/api/recipes/bulk/route.ts
+
+def default_recipe_types() -> tuple[str, ...]:
+    """DEFAULT_RECIPE_TYPES from src/types/recipe.ts: the only values recipes.recipe_type's CHECK allows."""
+    source = (TESTS_DIR.parent / "src" / "types" / "recipe.ts").read_text()
+    match = re.search(r"DEFAULT_RECIPE_TYPES\s*=\s*\[(.*?)\]", source, re.S)
+    if match is None:
+        raise RuntimeError("DEFAULT_RECIPE_TYPES not found in src/types/recipe.ts")
+    return tuple(re.findall(r'"([^"]+)"', match.group(1)))
+
+DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+RECIPE_TYPES = default_recipe_types()
+CATEGORIES = ("Chicken", "Beef", "Pork", "Seafood", "Vegetarian", "Pasta", "Soup", "Salad", "Other")
+PROTEINS = ("Chicken", "Beef", "Pork", "Fish", "Tofu", "Beans", "Eggs")
+INGREDIENTS = (
+    "chicken thighs", "ground beef", "pork loin", "salmon fillets", "firm tofu", "black beans", "eggs",
+    "yellow onion", "garlic cloves", "carrots", "celery", "bell peppers", "spinach", "tomatoes",
+    "olive oil", "butter", "rice", "pasta", "chicken stock", "heavy cream", "parmesan", "lemons",
+    "soy sauce", "ginger", "cumin", "paprika", "oregano", "cilantro", "potatoes", "broccoli",
+)
+UNITS = ("cup", "tbsp", "tsp", "lb", "oz", "cloves")
+
+class SeedError(RuntimeError):
+    """The API refused a seeding request."""
+
+class RateLimited(SeedError):
+    def __init__(self, what: str, retry_after: int):
+        super().__init__(f"{what}: rate limited, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+def user_namespace(run: str, user: int) -> str:
+    return f"{run}-u{user}"
+
+def recipe_title(run: str, user: int, index: int) -> str:
+    return f"[{run}] Seed recipe u{user} #{index:05d}"
+
+def seed_recipe(run: str, user: int, index: int) -> dict:
+    """A plausible recipe that varies with index, so lists and filters have something to work on."""
+    ingredients = [
+        f"{1 + (index + k) % 4} {UNITS[(index + k) % len(UNITS)]} {INGREDIENTS[(index * 7 + k * 3) % len(INGREDIENTS)]}"
+        for k in range(5 + index % 8)
+    ]
+    steps = [f"Step {k + 1}: prepare and cook the {INGREDIENTS[(index + k) % len(INGREDIENTS)]}." for k in range(3 + index % 5)]
+    return {
+        "title": recipe_title(run, user, index),
+        "recipe_type": RECIPE_TYPES[index % len(RECIPE_TYPES)],
+        "category": CATEGORIES[index % len(CATEGORIES)],
+        "protein_type": PROTEINS[index % len(PROTEINS)],
+        "prep_time": f"{10 + index % 4 * 5} minutes",
+        "cook_time": f"{15 + index % 6 * 10} minutes",
+        "servings": 2 + index % 5,
+        "ingredients": ingredients,
+        "instructions": steps,
+        "tags": ["seed", run],
+    }
+
+def check(response: requests.Response, what: str):
+    """The response JSON, or SeedError/RateLimited."""
+    if response.status_code == 429:
+        raise RateLimited(what, int(response.headers.get("Retry-After", "60")))
+    if not response.ok:
+        raise SeedError(f"{what}: HTTP {response.status_code} {response.text[:200]}")
+    return response.json() if response.content else None
+
+def chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def load_checkpoint(path: Path, run: str) -> dict:
+    try:
+        return json.loads(path.read_text())
+    except OSError:
+        week = date.today() - timedelta(days=date.today().weekday())
+        return {"run": run, "base_url": BASE_URL, "anchor_week": week.isoformat(), "users": {}}
+
+def save_checkpoint(path: Path, checkpoint: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(checkpoint, separators=(",", ":")))
+    tmp_path.replace(path)
+
+def user_session(namespace: str) -> requests.Session:
+    session = new_session()
+    try:
+        login(session, namespace_user(namespace))
+    except AssertionError as e:
+        raise SeedError(f"{namespace_user(namespace)['email']}: {e}") from e
+    return session
+
+def listed_recipes(session: requests.Session, run: str, user: int) -> dict[int, str]:
+    """Index -> id of the run's recipes this user already has, found by title."""
+    pattern = re.compile(rf"^\[{re.escape(run)}\] Seed recipe u{user} #(\d+)$")
+    recipes = check(session.get(f"{BASE_URL}/api/recipes", timeout=TIMEOUT), "GET /api/recipes")
+    return {int(m.group(1)): r["id"] for r in recipes if (m := pattern.match(r.get("title") or ""))}
+
+def seed_user(session: requests.Session, args, checkpoint: dict, path: Path, user: int) -> dict:
+    namespace = user_namespace(args.run, user)
+    state = checkpoint["users"].setdefault(namespace, {"recipes": {}, "meal_plans": {}})
+    # JSON object keys are strings
+    recipes = {int(k): v for k, v in state["recipes"].items()}
+    created = {"recipes": 0, "meal_plans": 0}
+
+    if len(recipes) < args.recipes:
+        # Batches committed after the last checkpoint write are only found by title
+        recipes.update(listed_recipes(session, args.run, user))
+    missing = [i for i in range(args.recipes) if i not in recipes]
+    for batch in chunks(missing, args.batch):
+        start = time.perf_counter()
+        data = check(session.post(f"{BASE_URL}{BULK_ENDPOINT}", timeout=TIMEOUT * 2,
+                                  json={"recipes": [seed_recipe(args.run, user, i) for i in batch]}),
+                     f"POST {BULK_ENDPOINT}")
+        recipes.update(zip(batch, data["ids"]))
+        state["recipes"] = {str(k): v for k, v in sorted(recipes.items())}
+        save_checkpoint(path, checkpoint)
+        created["recipes"] += len(batch)
+        seconds = time.perf_counter() - start
+        print(f"  ✓ {namespace}: recipes {sum(i < args.recipes for i in recipes)}/{args.recipes} "
+              f"(+{len(batch)} in {seconds:.2f}s, {len(batch) / seconds:.0f}/s)")
+
+    recipe_ids = [recipes[i] for i in sorted(recipes)]
+    anchor = date.fromisoformat(checkpoint["anchor_week"])
+    for k in range(args.meal_plans):
+        week = (anchor - timedelta(weeks=k + 1)).isoformat()
+        if week in state["meal_plans"]:
+            continue
+        meals = [{"recipe_id": recipe_ids[(k * len(DAYS) + d) % len(recipe_ids)], "day": day, "meal_type": "Dinner"}
+                 for d, day in enumerate(DAYS)] if recipe_ids else []
+        data = check(session.post(f"{BASE_URL}/api/meal-plans", json={"week_start": week, "meals": meals},
+                                  timeout=TIMEOUT), "POST /api/meal-plans")
+        state["meal_plans"][week] = data["id"]
+        save_checkpoint(path, checkpoint)
+        created["meal_plans"] += 1
+    if args.meal_plans:
+        print(f"  ✓ {namespace}: meal plans {len(state['meal_plans'])}/{args.meal_plans}")
+    return created
+
+def purge_user(session: requests.Session, args, checkpoint: dict, path: Path, user: int) -> dict:
+    namespace = user_namespace(args.run, user)
+    state = checkpoint["users"].get(namespace, {"recipes": {}, "meal_plans": {}})
+    deleted = {"recipes": 0, "meal_plans": 0}
+
+    for week, plan_id in list(state["meal_plans"].items()):
+        response = session.delete(f"{BASE_URL}/api/meal-plans/{plan_id}", timeout=TIMEOUT)
+        if response.status_code != 404:
+            check(response, f"DELETE /api/meal-plans/{plan_id}")
+        del state["meal_plans"][week]
+        save_checkpoint(path, checkpoint)
+        deleted["meal_plans"] += 1
+
+    ids = set(state["recipes"].values()) | set(listed_recipes(session, args.run, user).values())
+    for batch in chunks(sorted(ids), args.batch):
+        data = check(session.delete(f"{BASE_URL}{BULK_ENDPOINT}", json={"ids": batch}, timeout=TIMEOUT * 2),
+                     f"DELETE {BULK_ENDPOINT}")
+        gone = set(batch)
+        state["recipes"] = {k: v for k, v in state["recipes"].items() if v not in gone}
+        save_checkpoint(path, checkpoint)
+        deleted["recipes"] += data["deleted"]
+    checkpoint["users"].pop(namespace, None)
+    save_checkpoint(path, checkpoint)
+    print(f"  ✓ {namespace}: deleted {deleted['recipes']} recipes, {deleted['meal_plans']} meal plans")
+    return deleted
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed users x recipes x meal plans through the bulk recipe API.")
+    parser.add_argument("--run", default="seed",
+                        help="name for this data set: user emails, recipe titles, checkpoint (default: seed)")
+    parser.add_argument("--users", type=int, default=1, help="users to seed (default: 1)")
+    parser.add_argument("--recipes", type=int, default=1000, help="recipes per user (default: 1000)")
+    parser.add_argument("--meal-plans", type=int, default=4, help="weekly meal plans per user (default: 4)")
+    parser.add_argument("--batch", type=int, default=MAX_BATCH,
+                        help=f"recipes per bulk request, at most {MAX_BATCH} (default: {MAX_BATCH})")
+    parser.add_argument("--no-provision", action="store_true",
+                        help="don't create the users through the Supabase admin API")
+    parser.add_argument("--purge", action="store_true", help="delete what this run created instead of seeding")
+    parser.add_argument("--checkpoint", type=Path, help="checkpoint file (default: tmp/seed/<run>.json)")
+    args = parser.parse_args()
+
+    if not re.fullmatch(r"[a-z0-9][a-z0-9-]*", args.run):
+        parser.error("--run must be lowercase letters, digits and dashes (it goes into email addresses)")
+    for name in ("users", "batch"):
+        if getattr(args, name) < 1:
+            parser.error(f"--{name} must be at least 1")
+    for name in ("recipes", "meal_plans"):
+        if getattr(args, name) < 0:
+            parser.error(f"--{name.replace('_', '-')} can't be negative")
+    if args.batch > MAX_BATCH:
+        parser.error(f"--batch can be at most {MAX_BATCH}")
+
+    path = args.checkpoint or CHECKPOINT_DIR / f"{args.run}.json"
+    checkpoint = load_checkpoint(path, args.run)
+    if checkpoint["base_url"] != BASE_URL or checkpoint["run"] != args.run:
+        parser.error(f"{path} is run {checkpoint['run']!r} against {checkpoint['base_url']}, "
+                     f"not {args.run!r} against {BASE_URL}")
+
+    users = range(1, args.users + 1)
+    if args.purge:
+        # Also whoever an earlier, larger --users run left behind
+        seeded = {int(ns.rsplit("-u", 1)[1]) for ns in checkpoint["users"]}
+        users = sorted(seeded | set(users))
+    elif not args.no_provision:
+        try:
+            provision_users([namespace_user(user_namespace(args.run, user)) for user in users])
+        except ProvisionError as e:
+            parser.error(str(e))
+
+    action = "Purging" if args.purge else "Seeding"
+    print(f"{action} run {args.run!r}: {len(users)} users on {BASE_URL} (checkpoint {path})")
+    totals = {"recipes": 0, "meal_plans": 0}
+    start = time.perf_counter()
+    try:
+        for user in users:
+            session = user_session(user_namespace(args.run, user))
+            result = (purge_user if args.purge else seed_user)(session, args, checkpoint, path, user)
+            for key in totals:
+                totals[key] += result[key]
+    except RateLimited as e:
+        print(f"✗ {e}; progress is saved, rerun the same command then to resume")
+        sys.exit(2)
+    except (SeedError, requests.RequestException) as e:
+        print(f"✗ {e}; progress is saved, rerun the same command to resume")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n✗ interrupted; progress is saved, rerun the same command to resume")
+        sys.exit(130)
+
+    seconds = time.perf_counter() - start
+    if args.purge:
+        if not checkpoint["users"]:
+            path.unlink(missing_ok=True)
+        print(f"\nDeleted {totals['recipes']} recipes and {totals['meal_plans']} meal plans in {seconds:.1f}s")
+    else:
+        rate = totals["recipes"] / seconds if seconds else 0
+        print(f"\nCreated {totals['recipes']} recipes ({rate:.0f}/s) and {totals['meal_plans']} meal plans "
+              f"in {seconds:.1f}s")
+
+if __name__ == "__main__":
+    main()
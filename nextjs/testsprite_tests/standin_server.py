@@ -0,0 +1,1137 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the third-party services the Next.js API routes call.
+
+One local HTTP server answers for all five, told apart by path:
+
+  supabase  /auth/v1/*, /rest/v1/*       GoTrue auth and an in-memory PostgREST subset
+  google    /token, /oauth2/v2/userinfo,  OAuth token exchange/refresh, user info,
+            /calendar/v3/*,               calendar events, singly or as a
+            /batch/calendar/v3            multipart/mixed batch
+  email     /emails, /emails/batch        the Resend API
+  ai        /v1/messages                  the Anthropic Messages API
+  redis     /redis, /redis/pipeline       the Upstash Redis REST API, with the Lua
+                                          scripts @upstash/ratelimit runs
+
+Start it, then start the dev server pointed at it:
+
+  python standin_server.py --latency 40 --latency ai=900 --error-rate google=0.05
+  eval "$(python standin_server.py --print-env)" && npm run dev
+
+Every response can be delayed (--latency/--jitter, in ms) and replaced by the
+service's own 5xx or 429 error shape (--error-rate/--rate-limit-rate, 0-1).
+A calendar batch is delayed once, like any request, and then fails or
+succeeds part by part, each part drawing its own injected failure.
+Each option takes either a bare value (every service) or SERVICE=value, and
+can be changed while running with POST /__standin/config. Runs are
+reproducible with --seed.
+
+Control endpoints (never delayed or failed):
+  GET  /__standin/stats        request, error and latency counts per service, and
+                               the most requests delayed at once
+  GET  /__standin/emails       emails "sent" so far
+  GET  /__standin/events       calendar events created so far
+  GET  /__standin/redis        the Redis keys, their TTLs and the command count
+  POST /__standin/config       {"latency": {"ai": 500}, "error_rate": {"google": 0.1}, ...}
+  POST /__standin/reset        drop all stored data and counters
+  POST /__standin/reset-stats  drop the counters only
+"""
+
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+SERVICES = ("supabase", "google", "email", "ai", "redis")
+DEFAULT_PORT = 54399
+
+# Keys the dev server should be started with; the stand-in accepts any value
+# but these make requests from other clients easy to tell apart
+ANON_KEY = "standin-anon-key"
+SERVICE_ROLE_KEY = "standin-service-role-key"
+REDIS_TOKEN = "standin-redis-token"
+JWT_SECRET = b"standin-jwt-secret"
+ACCESS_TOKEN_TTL = 3600
+# Google's cap on requests in one Calendar batch
+CALENDAR_BATCH_LIMIT = 50
+
+# Default users, so /api/test-auth works without provisioning anything
+SEED_USERS = (
+    {"email": "test@testsprite.dev", "password": "TestSprite123!"},
+)
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+def sign_jwt(claims: dict) -> str:
+    """HS256 token shaped like Supabase's, so clients that decode it find sub/email/exp."""
+    header = _b64url(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    payload = _b64url(json.dumps(claims, separators=(",", ":")).encode())
+    signature = hmac.new(JWT_SECRET, f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64url(signature)}"
+
+class Faults:
+    """Per-service latency and injected failure settings."""
+
+    FIELDS = ("latency", "jitter", "error_rate", "rate_limit_rate")
+
+    def __init__(self, seed: int | None = None):
+        self.settings = {field: dict.fromkeys(SERVICES, 0.0) for field in self.FIELDS}
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def update(self, field: str, values: dict) -> None:
+        for service, value in values.items():
+            if service not in SERVICES:
+                raise ValueError(f"unknown service {service!r} (expected one of {', '.join(SERVICES)})")
+            value = float(value)
+            if field.endswith("_rate") and not 0 <= value <= 1:
+                raise ValueError(f"{field} for {service} must be between 0 and 1")
+            if value < 0:
+                raise ValueError(f"{field} for {service} must not be negative")
+            self.settings[field][service] = value
+
+    def draw(self, service: str) -> tuple[float, str | None]:
+        """(seconds to wait, injected failure: "error", "rate_limit" or None)."""
+        with self.lock:
+            delay = self.settings["latency"][service] + self.random.uniform(0, self.settings["jitter"][service])
+            roll = self.random.random()
+        failure = None
+        if roll < self.settings["error_rate"][service]:
+            failure = "error"
+        elif roll < self.settings["error_rate"][service] + self.settings["rate_limit_rate"][service]:
+            failure = "rate_limit"
+        return delay / 1000, failure
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.services = {
+            service: {"requests": 0, "injected_errors": 0, "injected_rate_limits": 0, "delay_seconds": 0.0, "routes": {},
+                      "in_flight": 0, "peak_in_flight": 0}
+            for service in SERVICES
+        }
+
+    def enter(self, service: str) -> None:
+        with self.lock:
+            entry = self.services[service]
+            entry["in_flight"] += 1
+            entry["peak_in_flight"] = max(entry["peak_in_flight"], entry["in_flight"])
+
+    def leave(self, service: str) -> None:
+        with self.lock:
+            # A reset while requests are running leaves them uncounted
+            entry = self.services[service]
+            entry["in_flight"] = max(0, entry["in_flight"] - 1)
+
+    def record(self, service: str, route: str, delay: float, failure: str | None) -> None:
+        with self.lock:
+            entry = self.services[service]
+            entry["requests"] += 1
+            entry["delay_seconds"] += delay
+            entry["routes"][route] = entry["routes"].get(route, 0) + 1
+            if failure == "error":
+                entry["injected_errors"] += 1
+            elif failure == "rate_limit":
+                entry["injected_rate_limits"] += 1
+
+class State:
+    """Everything the stand-in remembers between requests."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.users = {}          # email -> user
+            self.passwords = {}      # email -> password
+            self.refresh_tokens = {} # refresh token -> email
+            self.tables = {}         # table -> list of rows
+            self.google_tokens = {}  # access token -> email
+            self.google_refresh = {} # refresh token -> email
+            self.events = []
+            self.emails = []
+            self.redis = Redis()
+            for user in SEED_USERS:
+                self.create_user(user["email"], user["password"])
+
+    def create_user(self, email: str, password: str, metadata: dict | None = None) -> dict | None:
+        """The new user, or None if the email is taken."""
+        with self.lock:
+            if email in self.users:
+                return None
+            user = {
+                "id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"standin:{email}")),
+                "aud": "authenticated",
+                "role": "authenticated",
+                "email": email,
+                "email_confirmed_at": now_iso(),
+                "app_metadata": {"provider": "email", "providers": ["email"]},
+                "user_metadata": metadata or {},
+                "created_at": now_iso(),
+                "updated_at": now_iso(),
+            }
+            self.users[email] = user
+            self.passwords[email] = password
+            return user
+
+    def session_for(self, email: str) -> dict:
+        user = self.users[email]
+        expires_at = int(time.time()) + ACCESS_TOKEN_TTL
+        refresh_token = uuid.uuid4().hex
+        with self.lock:
+            self.refresh_tokens[refresh_token] = email
+        return {
+            "access_token": sign_jwt({
+                "sub": user["id"], "email": email, "aud": "authenticated",
+                "role": "authenticated", "exp": expires_at, "iat": int(time.time()),
+                "session_id": str(uuid.uuid4()),
+            }),
+            "token_type": "bearer",
+            "expires_in": ACCESS_TOKEN_TTL,
+            "expires_at": expires_at,
+            "refresh_token": refresh_token,
+            "user": user,
+        }
+
+    def user_for_token(self, token: str) -> dict | None:
+        try:
+            header, payload, signature = token.split(".")
+            expected = _b64url(hmac.new(JWT_SECRET, f"{header}.{payload}".encode(), hashlib.sha256).digest())
+            if not hmac.compare_digest(signature, expected):
+                return None
+            claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        except ValueError:
+            return None
+        if claims.get("exp", 0) < time.time():
+            return None
+        return self.users.get(claims.get("email"))
+
+# --- PostgREST subset -------------------------------------------------------
+
+FILTER_OPS = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "gt": lambda a, b: a is not None and a > b,
+    "gte": lambda a, b: a is not None and a >= b,
+    "lt": lambda a, b: a is not None and a < b,
+    "lte": lambda a, b: a is not None and a <= b,
+}
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+def _coerce(value: str, sample):
+    """Compare query-string values with the stored value's type."""
+    if isinstance(sample, bool):
+        return value == "true"
+    if isinstance(sample, (int, float)):
+        try:
+            return type(sample)(value)
+        except ValueError:
+            return value
+    return value
+
+def row_filter(params: dict[str, list[str]]):
+    """A predicate for the column=op.value filters PostgREST clients send."""
+    checks = []
+    for column, values in params.items():
+        if column in RESERVED_PARAMS:
+            continue
+        for raw in values:
+            negate = raw.startswith("not.")
+            op, _, value = raw[4 if negate else 0:].partition(".")
+            checks.append((column, op, value, negate))
+
+    def matches(row: dict) -> bool:
+        for column, op, value, negate in checks:
+            actual = row.get(column)
+            if op == "is":
+                result = actual is None if value == "null" else actual == (value == "true")
+            elif op == "in":
+                options = [v.strip().strip('"') for v in value.strip("()").split(",")]
+                result = str(actual) in options
+            elif op in ("like", "ilike"):
+                pattern = "^" + re.escape(value).replace(r"\*", ".*").replace("%", ".*") + "$"
+                result = re.match(pattern, str(actual or ""), re.I if op == "ilike" else 0) is not None
+            elif op in FILTER_OPS:
+                result = FILTER_OPS[op](actual, _coerce(value, actual))
+            else:
+                result = True
+            if result == negate:
+                return False
+        return True
+    return matches
+
+def project(rows: list[dict], select: str | None) -> list[dict]:
+    """Apply select=col1,col2. Embedded resources (table(...)) are not joined."""
+    if not select or select.strip() == "*":
+        return rows
+    columns = [c.strip() for c in re.sub(r"\w+\([^)]*\)", "", select).split(",") if c.strip()]
+    if "*" in columns:
+        return rows
+    return [{c.split(":")[-1]: row.get(c.split(":")[0]) for c in columns} for row in rows]
+
+def order_rows(rows: list[dict], order: str | None) -> list[dict]:
+    for term in reversed((order or "").split(",")):
+        if not term:
+            continue
+        column, _, direction = term.partition(".")
+        # nulls last, as in Postgres' default ascending order
+        rows = sorted(rows, key=lambda r, c=column: (r.get(c) is None, "" if r.get(c) is None else r.get(c)),
+                      reverse=direction.startswith("desc"))
+    return rows
+
+# --- Redis subset -----------------------------------------------------------
+
+class RedisError(Exception):
+    """Sent back as the command's {"error": ...}, like Upstash does."""
+
+def sliding_window_script(redis: "Redis", keys: list[str], args: list[str]) -> int:
+    """@upstash/ratelimit's sliding window: remaining tokens, or -1 when blocked."""
+    current_key, previous_key = keys[:2]
+    tokens, now, window = int(args[0]), int(args[1]), int(args[2])
+    increment = int(args[3]) if len(args) > 3 else 1
+    current = int(redis.get(current_key) or 0)
+    previous = math.floor((1 - (now % window) / window) * int(redis.get(previous_key) or 0))
+    if increment > 0 and previous + current >= tokens:
+        return -1
+    value = redis.incrby(current_key, increment)
+    if value == increment:
+        redis.pexpire(current_key, window * 2 + 1000)
+    return tokens - (value + previous)
+
+def fixed_window_script(redis: "Redis", keys: list[str], args: list[str]) -> int:
+    """@upstash/ratelimit's fixed window: the bucket's count after this request."""
+    window, increment = int(args[0]), int(args[1]) if len(args) > 1 else 1
+    value = redis.incrby(keys[0], increment)
+    if value == increment:
+        redis.pexpire(keys[0], window)
+    return value
+
+def script_runner(source: str):
+    """The Python version of a Lua script the stand-in knows, by what it does."""
+    if "requestsInPreviousWindow" in source:
+        return sliding_window_script
+    if "INCRBY" in source and "PEXPIRE" in source and "previous" not in source.lower():
+        return fixed_window_script
+    return None
+
+class Redis:
+    """
+    Strings, hashes and sorted-set counters with millisecond expiry: what the
+    rate limiter and its analytics use. Every command runs under one lock, so
+    scripts are atomic as they are in Redis.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.data = {}
+        self.expires = {}   # key -> expiry, ms since the epoch
+        self.scripts = {}   # sha1 -> source
+        self.commands = 0
+
+    def _live(self, key: str) -> bool:
+        expiry = self.expires.get(key)
+        if expiry is not None and expiry <= time.time() * 1000:
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    def get(self, key: str):
+        return self.data[key] if self._live(key) else None
+
+    def incrby(self, key: str, amount: int) -> int:
+        try:
+            value = int(self.get(key) or 0) + int(amount)
+        except ValueError:
+            raise RedisError("ERR value is not an integer or out of range") from None
+        self.data[key] = str(value)
+        return value
+
+    def pexpire(self, key: str, ms: int) -> int:
+        if not self._live(key):
+            return 0
+        self.expires[key] = time.time() * 1000 + int(ms)
+        return 1
+
+    def pttl(self, key: str) -> int:
+        if not self._live(key):
+            return -2
+        expiry = self.expires.get(key)
+        return -1 if expiry is None else max(0, round(expiry - time.time() * 1000))
+
+    def container(self, key: str, kind: type):
+        value = self.get(key)
+        if value is None:
+            value = self.data[key] = kind()
+        if not isinstance(value, kind):
+            raise RedisError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def eval(self, source: str, numkeys: str, rest: list[str]):
+        runner = script_runner(source)
+        if runner is None:
+            raise RedisError("ERR the stand-in only runs the @upstash/ratelimit window scripts")
+        numkeys = int(numkeys)
+        return runner(self, [str(k) for k in rest[:numkeys]], [str(a) for a in rest[numkeys:]])
+
+    def execute(self, command: list):
+        """Run one command, as sent in an Upstash REST body."""
+        if not command:
+            raise RedisError("ERR empty command")
+        name, args = str(command[0]).upper(), command[1:]
+        with self.lock:
+            self.commands += 1
+            if name == "PING":
+                return "PONG"
+            if name == "GET":
+                value = self.get(args[0])
+                if isinstance(value, (dict, set)):
+                    raise RedisError("WRONGTYPE Operation against a key holding the wrong kind of value")
+                return value
+            if name == "SET":
+                self.data[args[0]] = str(args[1])
+                self.expires.pop(args[0], None)
+                options = [str(a).upper() for a in args[2:]]
+                if "PX" in options:
+                    self.pexpire(args[0], int(args[3 + options.index("PX")]))
+                elif "EX" in options:
+                    self.pexpire(args[0], int(args[3 + options.index("EX")]) * 1000)
+                return "OK"
+            if name in ("INCR", "INCRBY", "DECR", "DECRBY"):
+                amount = int(args[1]) if name.endswith("BY") else 1
+                return self.incrby(args[0], -amount if name.startswith("DECR") else amount)
+            if name == "DEL":
+                removed = sum(self._live(key) for key in args)
+                for key in args:
+                    self.data.pop(key, None)
+                    self.expires.pop(key, None)
+                return removed
+            if name == "EXISTS":
+                return sum(self._live(key) for key in args)
+            if name in ("PEXPIRE", "EXPIRE"):
+                return self.pexpire(args[0], int(args[1]) * (1 if name == "PEXPIRE" else 1000))
+            if name in ("PTTL", "TTL"):
+                ttl = self.pttl(args[0])
+                return ttl if name == "PTTL" or ttl < 0 else math.ceil(ttl / 1000)
+            if name == "HINCRBY":
+                fields = self.container(args[0], dict)
+                fields[args[1]] = int(fields.get(args[1], 0)) + int(args[2])
+                return fields[args[1]]
+            if name == "HSET":
+                fields = self.container(args[0], dict)
+                added = sum(field not in fields for field in args[1::2])
+                fields.update(zip(args[1::2], map(str, args[2::2])))
+                return added
+            if name == "HGETALL":
+                return [item for pair in self.container(args[0], dict).items() for item in pair]
+            if name == "ZINCRBY":
+                scores = self.container(args[0], dict)
+                scores[args[2]] = float(scores.get(args[2], 0)) + float(args[1])
+                return f"{scores[args[2]]:.17g}"
+            if name == "SADD":
+                members = self.container(args[0], set)
+                before = len(members)
+                members.update(args[1:])
+                return len(members) - before
+            if name == "SCRIPT" and args and str(args[0]).upper() == "LOAD":
+                sha = hashlib.sha1(str(args[1]).encode()).hexdigest()
+                self.scripts[sha] = str(args[1])
+                return sha
+            if name == "EVAL":
+                return self.eval(str(args[0]), args[1], args[2:])
+            if name == "EVALSHA":
+                source = self.scripts.get(str(args[0]))
+                if source is None:
+                    raise RedisError("NOSCRIPT No matching script. Please use EVAL.")
+                return self.eval(source, args[1], args[2:])
+        raise RedisError(f"ERR unknown command '{name.lower()}' (not emulated by the stand-in)")
+
+def redis_encode(value, base64_strings: bool):
+    """Upstash base64-encodes string results when asked to (the default in @upstash/redis)."""
+    if isinstance(value, str) and base64_strings:
+        return base64.b64encode(value.encode()).decode()
+    if isinstance(value, list):
+        return [redis_encode(item, base64_strings) for item in value]
+    return value
+
+# --- Request handling -------------------------------------------------------
+
+def route_name(method: str, path: str) -> str:
+    """The stats key for a request: ids replaced, so routes group."""
+    return f"{method} {re.sub(r'/[0-9a-f-]{32,36}', '/:id', path)}"
+
+def service_for(path: str) -> str | None:
+    if path.startswith(("/auth/v1/", "/rest/v1/", "/storage/v1/")):
+        return "supabase"
+    if path == "/token" or path == "/batch/calendar/v3" or path.startswith(("/oauth2/", "/calendar/v3/")):
+        return "google"
+    if path.startswith("/emails"):
+        return "email"
+    if path.startswith("/v1/messages"):
+        return "ai"
+    if path == "/redis" or path.startswith("/redis/"):
+        return "redis"
+    return None
+
+def google_error_body(status: int, message: str, reason: str) -> dict:
+    return {"error": {"code": status, "message": message, "errors": [{"reason": reason}]}}
+
+def injected_response(service: str, failure: str) -> tuple[int, dict, dict]:
+    """(status, body, headers) of the error each real service returns when overloaded or rate limited."""
+    if failure == "rate_limit":
+        headers = {"Retry-After": "1"}
+        bodies = {
+            "supabase": {"code": "over_request_rate_limit", "message": "Request rate limit reached"},
+            "google": {"error": {"code": 429, "message": "Rate Limit Exceeded", "status": "RESOURCE_EXHAUSTED",
+                                 "errors": [{"reason": "rateLimitExceeded", "domain": "usageLimits"}]}},
+            "email": {"statusCode": 429, "name": "rate_limit_exceeded", "message": "Too many requests."},
+            "ai": {"type": "error", "error": {"type": "rate_limit_error", "message": "Rate limited (stand-in)"}},
+            "redis": {"error": "ERR max requests limit exceeded (stand-in)"},
+        }
+        return 429, bodies[service], headers
+    status, body = {
+        "supabase": (503, {"code": "unexpected_failure", "message": "Service unavailable (stand-in)"}),
+        "google": (503, {"error": {"code": 503, "message": "The service is currently unavailable.",
+                                   "status": "UNAVAILABLE", "errors": [{"reason": "backendError"}]}}),
+        "email": (500, {"statusCode": 500, "name": "application_error", "message": "Internal server error (stand-in)"}),
+        "ai": (529, {"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded (stand-in)"}}),
+        "redis": (503, {"error": "Service Unavailable (stand-in)"}),
+    }[service]
+    return status, body, {}
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "standin/1"
+
+    # Set by make_server
+    state: State
+    faults: Faults
+    stats: Stats
+    quiet = True
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def do_GET(self): self.dispatch("GET")
+    def do_HEAD(self): self.dispatch("HEAD")
+    def do_POST(self): self.dispatch("POST")
+    def do_PATCH(self): self.dispatch("PATCH")
+    def do_PUT(self): self.dispatch("PUT")
+    def do_DELETE(self): self.dispatch("DELETE")
+
+    def do_OPTIONS(self):
+        self.send_json(204, None, {
+            "Access-Control-Allow-Origin": "*",
+            "Access-Control-Allow-Headers": "*",
+            "Access-Control-Allow-Methods": "GET, HEAD, POST, PATCH, PUT, DELETE",
+        })
+
+    # -- plumbing
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if not raw:
+            return None
+        if "application/x-www-form-urlencoded" in (self.headers.get("Content-Type") or ""):
+            return {k: v[0] for k, v in parse_qs(raw.decode()).items()}
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return raw.decode(errors="replace")
+
+    def send_json(self, status: int, body, headers: dict | None = None) -> None:
+        data = b"" if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        if body is not None:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    def bearer(self) -> str:
+        auth = self.headers.get("Authorization") or ""
+        return auth[7:] if auth.lower().startswith("bearer ") else ""
+
+    def dispatch(self, method: str) -> None:
+        url = urlsplit(self.path)
+        path = url.path
+        self.query = parse_qs(url.query, keep_blank_values=True)
+        self.body = self.read_body()
+
+        if path.startswith("/__standin/"):
+            return self.control(method, path)
+
+        service = service_for(path)
+        if service is None:
+            return self.send_json(404, {"error": f"stand-in has no route for {method} {path}"})
+
+        delay, failure = self.faults.draw(service)
+        self.stats.record(service, route_name(method, path), delay, failure)
+        if delay:
+            # In flight while it waits out its latency: counted after the
+            # response is written, a client's next request could overlap it
+            self.stats.enter(service)
+            try:
+                time.sleep(delay)
+            finally:
+                self.stats.leave(service)
+        if failure:
+            return self.send_json(*injected_response(service, failure))
+        getattr(self, f"handle_{service}")(method, path)
+
+
+    # -- control
+
+    def control(self, method: str, path: str) -> None:
+        name = path[len("/__standin/"):]
+        if method == "GET" and name == "stats":
+            with self.stats.lock:
+                return self.send_json(200, {"services": self.stats.services, "settings": self.faults.settings})
+        if method == "GET" and name == "emails":
+            return self.send_json(200, self.state.emails)
+        if method == "GET" and name == "events":
+            return self.send_json(200, self.state.events)
+        if method == "GET" and name == "redis":
+            redis = self.state.redis
+            with redis.lock:
+                keys = [key for key in list(redis.data) if redis._live(key)]
+                return self.send_json(200, {"commands": redis.commands, "keys": {
+                    key: {"value": value if isinstance(value, str) else sorted(value) if isinstance(value, set) else value,
+                          "pttl": redis.pttl(key)}
+                    for key in keys for value in [redis.data[key]]
+                }})
+        if method == "POST" and name == "reset":
+            self.state.reset()
+            with self.stats.lock:
+                self.stats.reset()
+            return self.send_json(200, {"ok": True})
+        if method == "POST" and name == "reset-stats":
+            with self.stats.lock:
+                self.stats.reset()
+            return self.send_json(200, {"ok": True})
+        if method == "POST" and name == "config":
+            try:
+                for field, values in (self.body or {}).items():
+                    if field not in Faults.FIELDS:
+                        raise ValueError(f"unknown setting {field!r} (expected one of {', '.join(Faults.FIELDS)})")
+                    if not isinstance(values, dict):
+                        values = dict.fromkeys(SERVICES, values)
+                    self.faults.update(field, values)
+            except (ValueError, TypeError, AttributeError) as e:
+                return self.send_json(400, {"error": str(e)})
+            return self.send_json(200, self.faults.settings)
+        self.send_json(404, {"error": f"unknown control endpoint {method} {path}"})
+
+    # -- supabase
+
+    def handle_supabase(self, method: str, path: str) -> None:
+        if path.startswith("/auth/v1/"):
+            return self.supabase_auth(method, path[len("/auth/v1/"):])
+        if path.startswith("/rest/v1/rpc/"):
+            return self.send_json(200, None if method == "HEAD" else [])
+        if path.startswith("/rest/v1/"):
+            return self.supabase_rest(method, unquote(path[len("/rest/v1/"):]))
+        self.send_json(404, {"message": "storage is not emulated"})
+
+    def auth_error(self, status: int, code: str, message: str) -> None:
+        self.send_json(status, {"code": status, "error_code": code, "msg": message})
+
+    def supabase_auth(self, method: str, route: str) -> None:
+        body = self.body if isinstance(self.body, dict) else {}
+        state = self.state
+
+        if method == "POST" and route == "token":
+            grant = (self.query.get("grant_type") or [""])[0]
+            if grant == "password":
+                email = body.get("email", "")
+                if state.passwords.get(email) != body.get("password"):
+                    return self.auth_error(400, "invalid_credentials", "Invalid login credentials")
+                return self.send_json(200, state.session_for(email))
+            if grant == "refresh_token":
+                email = state.refresh_tokens.pop(body.get("refresh_token", ""), None)
+                if email is None:
+                    return self.auth_error(400, "refresh_token_not_found", "Invalid Refresh Token: Refresh Token Not Found")
+                return self.send_json(200, state.session_for(email))
+            return self.auth_error(400, "validation_failed", f"unsupported grant_type {grant!r}")
+
+        if method == "POST" and route == "signup":
+            user = state.create_user(body.get("email", ""), body.get("password", ""), body.get("data"))
+            if user is None:
+                return self.auth_error(422, "user_already_exists", "User already registered")
+            return self.send_json(200, state.session_for(user["email"]))
+
+        if method == "POST" and route == "admin/users":
+            if self.bearer() != SERVICE_ROLE_KEY:
+                return self.auth_error(403, "not_admin", "User not allowed")
+            user = state.create_user(body.get("email", ""), body.get("password", ""), body.get("user_metadata"))
+            if user is None:
+                return self.auth_error(422, "email_exists", "A user with this email address has already been registered")
+            return self.send_json(200, user)
+
+        if route == "user" and method in ("GET", "PUT"):
+            user = state.user_for_token(self.bearer())
+            if user is None:
+                return self.auth_error(401, "bad_jwt", "invalid JWT: unable to parse or verify signature")
+            if method == "PUT":
+                user["user_metadata"].update(body.get("data") or {})
+                user["updated_at"] = now_iso()
+            return self.send_json(200, user)
+
+        if method == "POST" and route == "logout":
+            return self.send_json(204, None)
+
+        self.auth_error(404, "not_found", f"{method} /auth/v1/{route} is not emulated")
+
+    def supabase_rest(self, method: str, table: str) -> None:
+        state = self.state
+        user = state.user_for_token(self.bearer())
+        service_role = self.bearer() == SERVICE_ROLE_KEY
+        prefer = self.headers.get("Prefer") or ""
+        single = "vnd.pgrst.object" in (self.headers.get("Accept") or "")
+        select = (self.query.get("select") or [None])[0]
+        matches = row_filter(self.query)
+
+        def visible(row: dict) -> bool:
+            # A stand-in for row level security: users see their own rows
+            if service_role or "user_id" not in row:
+                return True
+            return user is not None and row["user_id"] == user["id"]
+
+        with state.lock:
+            rows = state.tables.setdefault(table, [])
+
+            if method in ("GET", "HEAD"):
+                found = order_rows([r for r in rows if visible(r) and matches(r)], (self.query.get("order") or [None])[0])
+                total = len(found)
+                offset = int((self.query.get("offset") or ["0"])[0])
+                limit = self.query.get("limit")
+                found = found[offset:offset + int(limit[0])] if limit else found[offset:]
+                headers = {"Content-Range": f"{offset}-{offset + len(found) - 1 if found else offset}/{total if 'count=' in prefer else '*'}"}
+                return self.respond_rows(project(found, select), single, headers)
+
+            if method == "POST":
+                incoming = self.body if isinstance(self.body, list) else [self.body or {}]
+                conflict = ((self.query.get("on_conflict") or ["id"])[0]).split(",")
+                upsert = "resolution=merge-duplicates" in prefer
+                result = []
+                for values in incoming:
+                    row = {"id": str(uuid.uuid4()), "created_at": now_iso(), **values}
+                    if user and "user_id" not in values and not service_role:
+                        row["user_id"] = user["id"]
+                    existing = next((r for r in rows if all(r.get(c) == row.get(c) for c in conflict)), None)
+                    if existing is not None:
+                        if not upsert:
+                            return self.send_json(409, {"code": "23505", "message": f"duplicate key value violates unique constraint on {table}"})
+                        existing.update(values)
+                        result.append(existing)
+                    else:
+                        rows.append(row)
+                        result.append(row)
+                return self.respond_write(201, result, select, single, prefer)
+
+            if method == "PATCH":
+                changed = [r for r in rows if visible(r) and matches(r)]
+                for row in changed:
+                    row.update(self.body or {})
+                return self.respond_write(200, changed, select, single, prefer)
+
+            if method == "DELETE":
+                removed = [r for r in rows if visible(r) and matches(r)]
+                state.tables[table] = [r for r in rows if r not in removed]
+                return self.respond_write(200, removed, select, single, prefer)
+
+        self.send_json(405, {"message": f"{method} is not supported"})
+
+    def respond_rows(self, rows: list[dict], single: bool, headers: dict | None = None) -> None:
+        if single:
+            if len(rows) != 1:
+                return self.send_json(406, {
+                    "code": "PGRST116",
+                    "details": f"The result contains {len(rows)} rows",
+                    "message": "JSON object requested, multiple (or no) rows returned",
+                })
+            return self.send_json(200, rows[0], headers)
+        self.send_json(200, rows, headers)
+
+    def respond_write(self, status: int, rows: list[dict], select: str | None, single: bool, prefer: str) -> None:
+        if "return=representation" not in prefer:
+            return self.send_json(204 if status == 200 else status, None)
+        if single:
+            return self.respond_rows(project(rows, select), True)
+        self.send_json(status, project(rows, select))
+
+    # -- google
+
+    def google_error(self, status: int, message: str, reason: str) -> None:
+        self.send_json(status, google_error_body(status, message, reason))
+
+    def handle_google(self, method: str, path: str) -> None:
+        state = self.state
+        body = self.body if isinstance(self.body, dict) else {}
+
+        if method == "POST" and path == "/token":
+            grant = body.get("grant_type")
+            if grant == "authorization_code":
+                code = body.get("code", "")
+                if not code or code.startswith(("invalid", "fake")):
+                    return self.send_json(400, {"error": "invalid_grant", "error_description": "Malformed auth code."})
+                email = f"{re.sub(r'[^a-z0-9]+', '.', code.lower()).strip('.') or 'user'}@gmail.test"
+            elif grant == "refresh_token":
+                email = state.google_refresh.get(body.get("refresh_token", ""))
+                if email is None:
+                    return self.send_json(400, {"error": "invalid_grant", "error_description": "Token has been expired or revoked."})
+            else:
+                return self.send_json(400, {"error": "unsupported_grant_type", "error_description": f"Invalid grant_type: {grant}"})
+
+            access_token = f"ya29.standin-{uuid.uuid4().hex}"
+            tokens = {
+                "access_token": access_token,
+                "expires_in": 3599,
+                "scope": "https://www.googleapis.com/auth/calendar.events https://www.googleapis.com/auth/userinfo.email",
+                "token_type": "Bearer",
+            }
+            with state.lock:
+                state.google_tokens[access_token] = email
+                if grant == "authorization_code":
+                    tokens["refresh_token"] = f"1//standin-{uuid.uuid4().hex}"
+                    state.google_refresh[tokens["refresh_token"]] = email
+            return self.send_json(200, tokens)
+
+        email = state.google_tokens.get(self.bearer())
+        if email is None:
+            return self.google_error(401, "Request had invalid authentication credentials.", "authError")
+
+        if method == "GET" and path == "/oauth2/v2/userinfo":
+            return self.send_json(200, {"id": str(int(hashlib.sha256(email.encode()).hexdigest()[:16], 16)), "email": email, "verified_email": True})
+
+        if path == "/batch/calendar/v3":
+            if method != "POST":
+                return self.google_error(405, "Method not allowed", "methodNotAllowed")
+            return self.calendar_batch(email)
+
+        status, response = self.calendar_request(email, method, path, body)
+        self.send_json(status, response)
+
+    def calendar_request(self, email: str, method: str, path: str, body: dict) -> tuple[int, dict | None]:
+        """(status, body) of one /calendar/v3 request, sent alone or as part of a batch."""
+        state = self.state
+        match = re.fullmatch(r"/calendar/v3/calendars/([^/]+)/events(?:/([^/]+))?", path)
+        if match is None:
+            return 404, google_error_body(404, "Not Found", "notFound")
+        calendar, event_id = unquote(match.group(1)), match.group(2)
+        with state.lock:
+            if method == "POST" and event_id is None:
+                if not isinstance(body.get("start"), dict) or not isinstance(body.get("end"), dict):
+                    return 400, google_error_body(400, "Missing time.", "required")
+                # Clients may choose the id, which makes retrying a create safe
+                new_id = body.get("id") or uuid.uuid4().hex
+                if any(e["id"] == new_id and e["calendar"] == calendar for e in state.events):
+                    return 409, google_error_body(409, "The requested identifier already exists.", "duplicate")
+                event = {
+                    "kind": "calendar#event",
+                    "id": new_id,
+                    "status": "confirmed",
+                    "htmlLink": f"https://www.google.com/calendar/event?eid={new_id}",
+                    "created": now_iso(),
+                    "updated": now_iso(),
+                    "organizer": {"email": email, "self": True},
+                    "calendar": calendar,
+                    "owner": email,
+                    **body,
+                }
+                state.events.append(event)
+                return 200, event
+            mine = [e for e in state.events if e["owner"] == email and e["calendar"] == calendar]
+            if method == "GET" and event_id is None:
+                return 200, {"kind": "calendar#events", "items": mine}
+            event = next((e for e in mine if e["id"] == event_id), None)
+            if event is None:
+                return 404, google_error_body(404, "Not Found", "notFound")
+            if method == "GET":
+                return 200, event
+            if method == "DELETE":
+                state.events.remove(event)
+                return 204, None
+        return 405, google_error_body(405, "Method not allowed", "methodNotAllowed")
+
+    def calendar_batch(self, email: str) -> None:
+        """
+        A Calendar batch request: multipart/mixed, one application/http part
+        per request. Parts are answered in order under the same Content-ID,
+        prefixed with "response-".
+        """
+        boundary = re.search(r'boundary="?([^";]+)"?', self.headers.get("Content-Type") or "")
+        raw = self.body if isinstance(self.body, str) else ""
+        if boundary is None or not raw:
+            return self.google_error(400, "Invalid multipart request.", "badRequest")
+
+        parts = []
+        for part in raw.replace("\r\n", "\n").split(f"--{boundary.group(1)}")[1:]:
+            if part.startswith("--"):
+                break
+            outer, _, request = part.strip("\n").partition("\n\n")
+            content_id = re.search(r"^Content-ID:\s*<?([^>\s]+)>?", outer, re.I | re.M)
+            head, _, payload = request.partition("\n\n")
+            request_line = head.split("\n", 1)[0].split()
+            if len(request_line) < 2:
+                return self.google_error(400, "Invalid multipart request.", "badRequest")
+            parts.append((content_id.group(1) if content_id else str(len(parts)), request_line[0], request_line[1], payload))
+        if len(parts) > CALENDAR_BATCH_LIMIT:
+            return self.google_error(400, f"A batch may contain at most {CALENDAR_BATCH_LIMIT} requests.", "batchSizeTooLarge")
+
+        out = f"batch_{uuid.uuid4().hex}"
+        chunks = []
+        for content_id, method, target, payload in parts:
+            path = urlsplit(target).path
+            # The batch was delayed once as a whole; parts only fail
+            _, failure = self.faults.draw("google")
+            self.stats.record("google", f"BATCH {route_name(method, path)}", 0.0, failure)
+            if failure:
+                status, response, headers = injected_response("google", failure)
+            else:
+                try:
+                    body = json.loads(payload) if payload.strip() else {}
+                except ValueError:
+                    body = None
+                if not isinstance(body, dict):
+                    status, response = 400, google_error_body(400, "Parse Error", "parseError")
+                else:
+                    status, response = self.calendar_request(email, method, path, body)
+                headers = {}
+            data = "" if response is None else json.dumps(response)
+            lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}", "Content-Type: application/json; charset=UTF-8"]
+            lines += [f"{name}: {value}" for name, value in headers.items()]
+            chunks.append("\r\n".join([
+                f"--{out}",
+                "Content-Type: application/http",
+                f"Content-ID: <response-{content_id}>",
+                "",
+                *lines,
+                f"Content-Length: {len(data.encode())}",
+                "",
+                data,
+            ]))
+
+        data = ("\r\n".join(chunks) + f"\r\n--{out}--\r\n").encode()
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/mixed; boundary={out}")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    # -- email
+
+    def handle_email(self, method: str, path: str) -> None:
+        if not self.bearer():
+            return self.send_json(401, {"statusCode": 401, "name": "missing_api_key", "message": "Missing API key in the authorization header"})
+        if method != "POST" or path not in ("/emails", "/emails/batch"):
+            return self.send_json(405, {"statusCode": 405, "name": "method_not_allowed", "message": "Method not allowed"})
+
+        messages = self.body if path == "/emails/batch" else [self.body]
+        if not isinstance(messages, list):
+            messages = [messages]
+        sent = []
+        for message in messages:
+            if not isinstance(message, dict):
+                return self.send_json(422, {"statusCode": 422, "name": "validation_error", "message": "Invalid JSON body"})
+            for field in ("from", "to", "subject"):
+                if not message.get(field):
+                    return self.send_json(422, {"statusCode": 422, "name": "validation_error", "message": f"Missing `{field}` field."})
+            email_id = str(uuid.uuid4())
+            with self.state.lock:
+                self.state.emails.append({"id": email_id, "created_at": now_iso(), **message})
+            sent.append({"id": email_id})
+        self.send_json(200, {"data": sent} if path == "/emails/batch" else sent[0])
+
+    # -- redis
+
+    def handle_redis(self, method: str, path: str) -> None:
+        if self.bearer() != REDIS_TOKEN:
+            return self.send_json(401, {"error": "Unauthorized"})
+        if method != "POST":
+            return self.send_json(405, {"error": "ERR the stand-in only accepts commands as POST bodies"})
+        base64_strings = (self.headers.get("Upstash-Encoding") or "").lower() == "base64"
+
+        def run(command) -> dict:
+            try:
+                if not isinstance(command, list):
+                    raise RedisError("ERR the body must be a JSON array")
+                return {"result": redis_encode(self.state.redis.execute(command), base64_strings)}
+            except RedisError as e:
+                return {"error": str(e)}
+            except (IndexError, ValueError, TypeError):
+                return {"error": f"ERR wrong arguments for '{str(command[0]).lower()}' command"}
+
+        if path == "/redis":
+            result = run(self.body)
+            return self.send_json(400 if "error" in result else 200, result)
+        if path in ("/redis/pipeline", "/redis/multi-exec"):
+            if not isinstance(self.body, list):
+                return self.send_json(400, {"error": "ERR the body must be a JSON array of commands"})
+            return self.send_json(200, [run(command) for command in self.body])
+        self.send_json(404, {"error": f"ERR no such endpoint {path}"})
+
+    # -- ai
+
+    def handle_ai(self, method: str, path: str) -> None:
+        if not self.headers.get("x-api-key") and not self.bearer():
+            return self.send_json(401, {"type": "error", "error": {"type": "authentication_error", "message": "x-api-key header is required"}})
+        body = self.body if isinstance(self.body, dict) else {}
+        if method != "POST" or not body.get("messages"):
+            return self.send_json(400, {"type": "error", "error": {"type": "invalid_request_error", "message": "messages: field required"}})
+
+        prompt = message_text(body["messages"][-1])
+        text = json.dumps(ai_reply(prompt))
+        self.send_json(200, {
+            "id": f"msg_standin_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "standin"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": len(prompt) // 4, "output_tokens": len(text) // 4},
+        })
+
+def message_text(message: dict) -> str:
+    content = message.get("content", "")
+    if isinstance(content, str):
+        return content
+    return "\n".join(part.get("text", "") for part in content if isinstance(part, dict))
+
+# Where the parse routes put the user's recipe inside their prompt
+RECIPE_SOURCE_RE = re.compile(r"(?:Recipe text|HTML content):\n(.*?)\n\s*Return a JSON object", re.S)
+LIST_ITEM_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+(.+)$")
+INGREDIENT_RE = re.compile(r"^\s*(?:\d|½|¼|¾|⅓|a |an |one |two |pinch|salt|pepper)", re.I)
+
+def ai_reply(prompt: str) -> dict:
+    """
+    A deterministic answer built from the prompt. Recipe prompts get the
+    recipe JSON the parse routes expect, with list items from the source text
+    split into ingredients and instructions. Anything else gets an empty object.
+    """
+    if '"ingredients"' not in prompt:
+        return {}
+    match = RECIPE_SOURCE_RE.search(prompt)
+    source = re.sub(r"<[^>]+>", "\n", match.group(1) if match else prompt)
+    lines = [line.strip() for line in source.splitlines() if line.strip()]
+    items = [m.group(1).strip() for m in map(LIST_ITEM_RE.match, lines) if m]
+    # The prompt's own schema example is not part of the recipe
+    items = [item for item in items if '"' not in item and not item.isupper()]
+    ingredients = [item for item in items if INGREDIENT_RE.match(item)]
+    instructions = [item for item in items if item not in ingredients]
+    title = next((line for line in lines if 3 < len(line) < 80 and ":" not in line and "{" not in line), "Stand-in Recipe")
+    return {
+        "title": title,
+        "recipeType": "Dinner",
+        "category": "Other",
+        "prepTime": "15 minutes",
+        "cookTime": "30 minutes",
+        "servings": "4",
+        "baseServings": 4,
+        "ingredients": ingredients or ["1 cup stand-in ingredient"],
+        "instructions": instructions or ["Cook until done."],
+        "tags": ["chicken"],
+        "notes": "None",
+    }
+
+def make_server(host: str, port: int, faults: Faults, state: State | None = None,
+                quiet: bool = True) -> ThreadingHTTPServer:
+    handler = type("Handler", (StandinHandler,), {
+        "state": state or State(), "faults": faults, "stats": Stats(), "quiet": quiet,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def env_exports(base_url: str) -> dict[str, str]:
+    """Environment for `npm run dev` so every third-party call goes to the stand-in."""
+    return {
+        "NEXT_PUBLIC_SUPABASE_URL": base_url,
+        "NEXT_PUBLIC_SUPABASE_ANON_KEY": ANON_KEY,
+        "SUPABASE_SERVICE_ROLE_KEY": SERVICE_ROLE_KEY,
+        "GOOGLE_API_BASE_URL": base_url,
+        "GOOGLE_CLIENT_ID": "standin-client-id",
+        "GOOGLE_CLIENT_SECRET": "standin-client-secret",
+        "RESEND_BASE_URL": base_url,
+        "RESEND_API_KEY": "re_standin",
+        "ANTHROPIC_BASE_URL": base_url,
+        "ANTHROPIC_API_KEY": "sk-ant-standin",
+        "UPSTASH_REDIS_REST_URL": f"{base_url}/redis",
+        "UPSTASH_REDIS_REST_TOKEN": REDIS_TOKEN,
+    }
+
+def parse_setting(value: str) -> dict[str, str]:
+    """'40' -> every service, 'ai=900' -> one service."""
+    service, sep, amount = value.rpartition("=")
+    if sep:
+        return {service: amount}
+    return dict.fromkeys(SERVICES, amount)
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline stand-in for Supabase, Google, Resend, Anthropic and Upstash Redis.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", action="append", default=[], metavar="[SERVICE=]MS",
+                        help="fixed delay added to every response")
+    parser.add_argument("--jitter", action="append", default=[], metavar="[SERVICE=]MS",
+                        help="extra random delay, uniform between 0 and MS")
+    parser.add_argument("--error-rate", action="append", default=[], metavar="[SERVICE=]P",
+                        help="fraction of requests answered with the service's 5xx error")
+    parser.add_argument("--rate-limit-rate", action="append", default=[], metavar="[SERVICE=]P",
+                        help="fraction of requests answered with 429 and Retry-After")
+    parser.add_argument("--seed", type=int, help="seed for jitter and injected failures")
+    parser.add_argument("--print-env", action="store_true",
+                        help="print shell exports that point the dev server here, and exit")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    base_url = f"http://{args.host}:{args.port}"
+    if args.print_env:
+        for name, value in env_exports(base_url).items():
+            print(f"export {name}={value}")
+        return
+
+    faults = Faults(args.seed)
+    try:
+        for field in Faults.FIELDS:
+            for value in getattr(args, field):
+                faults.update(field, parse_setting(value))
+    except ValueError as e:
+        parser.error(str(e))
+
+    server = make_server(args.host, args.port, faults, quiet=not args.verbose)
+    print(f"Stand-in services on {base_url} ({', '.join(SERVICES)})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
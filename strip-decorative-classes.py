@@ -4,185 +4,361 @@ Strip decorative Tailwind classes from TSX files.
 Keeps only structural/layout classes.
 """
 
-import re
+import argparse
 import sys
+import time
+from functools import partial
 from pathlib import Path
-
-# Patterns to REMOVE
-REMOVE_PATTERNS = [
-    # Colors
-    r'\bbg-[^\s"\']+',
-    r'\btext-(?!xs\b|sm\b|base\b|lg\b|xl\b|2xl\b|3xl\b|4xl\b|5xl\b|6xl\b|7xl\b|8xl\b|9xl\b)[^\s"\']+',
-    r'\bfill-[^\s"\']+',
-    r'\bstroke-[^\s"\']+',
-    r'\bfrom-[^\s"\']+',
-    r'\bto-[^\s"\']+',
-    r'\bvia-[^\s"\']+',
-
-    # Borders
-    r'\bborder-(?!t\b|r\b|b\b|l\b|x\b|y\b|s\b|e\b)[^\s"\']+',
-    r'\bring-[^\s"\']+',
-    r'\boutline-[^\s"\']+',
-    r'\bdivide-[^\s"\']+',
-
-    # Effects
-    r'\bshadow-[^\s"\']+',
-    r'\bdrop-shadow-[^\s"\']+',
-    r'\brounded-[^\s"\']+',
-
-    # Typography
-    r'\bfont-(?!mono\b)[^\s"\']+',
-    r'\btracking-[^\s"\']+',
-    r'\bleading-[^\s"\']+',
-
+from typing import Iterable
+
+import codemod_rules
+import jsx_classnames
+from jsx_classnames import rewrite_classnames
+from codemod_rules import ProfiledRuleSet, RuleError, RuleSet, load_rule_set
+from codemod_profile import Profile, add_profile_arguments, finish_profile
+from codemod_utils import (
+    CACHE_PATH,
+    SOURCE_DIRS,
+    CodemodCache,
+    add_dry_run_arguments,
+    add_scope_arguments,
+    content_digest,
+    default_jobs,
+    display_path,
+    emit_patch,
+    load_script,
+    map_files,
+    scoped_tsx_files,
+    unified_diff,
+    watch_tsx_files,
+    write_atomic,
+)
+
+# Patterns to REMOVE, by group. Rule files (--rules) can include, exclude,
+# replace or add groups; see codemod_rules.py.
+RULE_GROUPS = {
+    "colors": [
+        r'\bbg-[^\s"\']+',
+        r'\btext-(?!xs\b|sm\b|base\b|lg\b|xl\b|2xl\b|3xl\b|4xl\b|5xl\b|6xl\b|7xl\b|8xl\b|9xl\b)[^\s"\']+',
+        r'\bfill-[^\s"\']+',
+        r'\bstroke-[^\s"\']+',
+        r'\bfrom-[^\s"\']+',
+        r'\bto-[^\s"\']+',
+        r'\bvia-[^\s"\']+',
+    ],
+    "borders": [
+        r'\bborder-(?!t\b|r\b|b\b|l\b|x\b|y\b|s\b|e\b)[^\s"\']+',
+        r'\bring-[^\s"\']+',
+        r'\boutline-[^\s"\']+',
+        r'\bdivide-[^\s"\']+',
+    ],
+    "effects": [
+        r'\bshadow-[^\s"\']+',
+        r'\bdrop-shadow-[^\s"\']+',
+        r'\brounded-[^\s"\']+',
+    ],
+    "typography": [
+        r'\bfont-(?!mono\b)[^\s"\']+',
+        r'\btracking-[^\s"\']+',
+        r'\bleading-[^\s"\']+',
+    ],
     # Spacing (except for specific layout needs)
-    r'\bp-\d+',
-    r'\bpx-\d+',
-    r'\bpy-\d+',
-    r'\bpt-\d+',
-    r'\bpr-\d+',
-    r'\bpb-\d+',
-    r'\bpl-\d+',
-    r'\bm-\d+',
-    r'\bmx-\d+',
-    r'\bmy-\d+',
-    r'\bmt-\d+',
-    r'\bmr-\d+',
-    r'\bmb-\d+',
-    r'\bml-\d+',
-    r'\bgap-\d+',
-    r'\bspace-x-\d+',
-    r'\bspace-y-\d+',
-
-    # Transitions
-    r'\btransition-[^\s"\']+',
-    r'\bduration-[^\s"\']+',
-    r'\bease-[^\s"\']+',
-    r'\bdelay-[^\s"\']+',
-
-    # Animations
-    r'\banimate-[^\s"\']+',
-
-    # Transforms
-    r'\bscale-[^\s"\']+',
-    r'\brotate-[^\s"\']+',
-    r'\btranslate-[^\s"\']+',
-    r'\bskew-[^\s"\']+',
-    r'\btransform\b',
-
-    # Filters
-    r'\bblur-[^\s"\']+',
-    r'\bbrightness-[^\s"\']+',
-    r'\bcontrast-[^\s"\']+',
-    r'\bbackdrop-[^\s"\']+',
-
+    "spacing": [
+        r'\bp-\d+',
+        r'\bpx-\d+',
+        r'\bpy-\d+',
+        r'\bpt-\d+',
+        r'\bpr-\d+',
+        r'\bpb-\d+',
+        r'\bpl-\d+',
+        r'\bm-\d+',
+        r'\bmx-\d+',
+        r'\bmy-\d+',
+        r'\bmt-\d+',
+        r'\bmr-\d+',
+        r'\bmb-\d+',
+        r'\bml-\d+',
+        r'\bgap-\d+',
+        r'\bspace-x-\d+',
+        r'\bspace-y-\d+',
+    ],
+    "transitions": [
+        r'\btransition-[^\s"\']+',
+        r'\bduration-[^\s"\']+',
+        r'\bease-[^\s"\']+',
+        r'\bdelay-[^\s"\']+',
+    ],
+    "animations": [
+        r'\banimate-[^\s"\']+',
+    ],
+    "transforms": [
+        r'\bscale-[^\s"\']+',
+        r'\brotate-[^\s"\']+',
+        r'\btranslate-[^\s"\']+',
+        r'\bskew-[^\s"\']+',
+        r'\btransform\b',
+    ],
+    "filters": [
+        r'\bblur-[^\s"\']+',
+        r'\bbrightness-[^\s"\']+',
+        r'\bcontrast-[^\s"\']+',
+        r'\bbackdrop-[^\s"\']+',
+    ],
     # Opacity & Blending
-    r'\bopacity-[^\s"\']+',
-    r'\bmix-blend-[^\s"\']+',
-
+    "opacity": [
+        r'\bopacity-[^\s"\']+',
+        r'\bmix-blend-[^\s"\']+',
+    ],
     # State variants with decorative classes
-    r'\bhover:[^\s"\']*(?:bg|text|border|shadow|opacity|scale|rotate|translate|ring|outline)[^\s"\']*',
-    r'\bfocus:[^\s"\']*(?:bg|text|border|shadow|opacity|scale|rotate|translate|ring|outline)[^\s"\']*',
-    r'\bactive:[^\s"\']*(?:bg|text|border|shadow|opacity|scale|rotate|translate|ring|outline)[^\s"\']*',
-    r'\bgroup-hover:[^\s"\']*(?:bg|text|border|shadow|opacity|scale|rotate|translate|ring|outline)[^\s"\']*',
-    r'\bfocus-visible:[^\s"\']*(?:bg|text|border|shadow|opacity|scale|rotate|translate|ring|outline)[^\s"\']*',
-    r'\bdisabled:[^\s"\']*(?:bg|text|border|shadow|opacity)[^\s"\']*',
-    r'\bdark:[^\s"\']*(?:bg|text|border|shadow|ring|outline)[^\s"\']*',
-]
-
-def clean_classname(classname: str) -> str:
+    "state-variants": [
+        r'\bhover:[^\s"\']*(?:bg|text|border|shadow|opacity|scale|rotate|translate|ring|outline)[^\s"\']*',
+        r'\bfocus:[^\s"\']*(?:bg|text|border|shadow|opacity|scale|rotate|translate|ring|outline)[^\s"\']*',
+        r'\bactive:[^\s"\']*(?:bg|text|border|shadow|opacity|scale|rotate|translate|ring|outline)[^\s"\']*',
+        r'\bgroup-hover:[^\s"\']*(?:bg|text|border|shadow|opacity|scale|rotate|translate|ring|outline)[^\s"\']*',
+        r'\bfocus-visible:[^\s"\']*(?:bg|text|border|shadow|opacity|scale|rotate|translate|ring|outline)[^\s"\']*',
+        r'\bdisabled:[^\s"\']*(?:bg|text|border|shadow|opacity)[^\s"\']*',
+        r'\bdark:[^\s"\']*(?:bg|text|border|shadow|ring|outline)[^\s"\']*',
+    ],
+}
+
+REMOVE_PATTERNS = [pattern for patterns in RULE_GROUPS.values() for pattern in patterns]
+
+# The built-in rule set, used when no --rules/--include/--exclude is given.
+# Its matcher is compiled on first use.
+DEFAULT_RULES = RuleSet(RULE_GROUPS, "builtin")
+
+def get_rules(rules_file: Path | None = None, include: list[str] | None = None,
+              exclude: list[str] | None = None) -> RuleSet:
+    """The rule set selected on the command line (see codemod_rules.load_rule_set)."""
+    if rules_file is None and include is None and exclude is None:
+        return DEFAULT_RULES
+    return load_rule_set(RULE_GROUPS, rules_file, include, exclude)
+
+def is_decorative(cls: str, rules: RuleSet | None = None) -> bool:
+    """Return True if a single class token matches a remove pattern."""
+    return (rules or DEFAULT_RULES).is_decorative(cls)
+
+def classify_tokens(tokens: Iterable[str], rules: RuleSet | None = None) -> list[bool]:
+    """Classify a batch of class tokens. True means the token should be removed."""
+    decide = (rules or DEFAULT_RULES).is_decorative
+    return [decide(cls) for cls in tokens]
+
+def clean_classname(classname: str, rules: RuleSet | None = None) -> str:
     """Remove decorative classes from a className string."""
     classes = classname.split()
-    kept_classes = []
-
-    for cls in classes:
-        # Check if this class matches any remove pattern
-        should_remove = False
-        for pattern in REMOVE_PATTERNS:
-            if re.match(pattern, cls):
-                should_remove = True
-                break
-
-        if not should_remove:
-            kept_classes.append(cls)
-
-    return ' '.join(kept_classes)
-
-def process_file(filepath: Path) -> tuple[bool, int]:
+    decisions = classify_tokens(classes, rules)
+
+    return ' '.join(cls for cls, remove in zip(classes, decisions) if not remove)
+
+def strip_decorative_classes(content: str, rules: RuleSet | None = None) -> tuple[str, int]:
+    """
+    Strip decorative classes from file contents. Returns (new_content, num_changes).
+    Covers className="...", className={...} with cn()/clsx() calls, ternaries and
+    template literals; attributes and branches left empty are removed.
+    """
+    if rules is None:
+        return rewrite_classnames(content, clean_classname)
+    return rewrite_classnames(content, lambda classname: clean_classname(classname, rules))
+
+def run_pipeline(content: str, fix_conditionals: bool = False,
+                 rules: RuleSet | None = None, profile=None) -> tuple[str, int]:
+    """
+    Apply the codemod stages to one in-memory buffer. Returns (new_content, num_changes).
+    With fix_conditionals, fix-conditionals.py runs on the stripped buffer, which is
+    byte-identical to running the two scripts one after the other.
+    """
+    content, changes = strip_decorative_classes(content, rules)
+    if fix_conditionals:
+        content = load_script("fix-conditionals.py").fix_conditionals(content, profile)
+    return content, changes
+
+def process_file(filepath: Path, rules: RuleSet | None = None) -> tuple[bool, int]:
     """Process a single file. Returns (was_modified, num_changes)."""
+    was_modified, changes, _ = process_file_with_digest(filepath, fingerprint=False, rules=rules)
+    return was_modified, changes
+
+def process_file_with_digest(filepath: Path, fix_conditionals: bool = False,
+                             fingerprint: bool = True,
+                             rules: RuleSet | None = None,
+                             profile=None) -> tuple[bool, int, str | None]:
+    """
+    Process a single file with one read and at most one write.
+    Returns (was_modified, num_changes, digest).
+    digest is the content hash of the file as left on disk, or None if that
+    content is not a fixed point of the codemod (so it must not be cached)
+    or fingerprint is False.
+    """
     try:
         content = filepath.read_text()
         original_content = content
-        changes = 0
 
-        # Match className="..." and className={...}
-        def replace_classname(match):
-            nonlocal changes
-            full_match = match.group(0)
+        content, changes = run_pipeline(content, fix_conditionals, rules, profile)
 
-            # Extract the classes content
-            classes = match.group(1)
-
-            cleaned = clean_classname(classes)
-
-            if cleaned != classes:
-                changes += 1
-
-            # Return empty if no classes left
-            if not cleaned.strip():
-                return ''
-
-            # Return with original quote style
-            return f'className="{cleaned}"'
-
-        # Pattern for className="..."
-        content = re.sub(
-            r'className="([^"]*)"',
-            replace_classname,
-            content
-        )
-
-        # Fix empty className attributes
-        content = re.sub(r'\s+className=""', '', content)
+        digest = None
+        # Unchanged output is trivially a fixed point; rewritten output is re-checked
+        if fingerprint and (content == original_content
+                            or run_pipeline(content, fix_conditionals, rules)[0] == content):
+            digest = content_digest(content)
 
         if content != original_content:
-            filepath.write_text(content)
-            return True, changes
+            write_atomic(filepath, content)
+            return True, changes, digest
 
-        return False, 0
+        return False, 0, digest
 
     except Exception as e:
         print(f"Error processing {filepath}: {e}", file=sys.stderr)
         import traceback
         traceback.print_exc()
-        return False, 0
-
-def main():
-    repo_root = Path(__file__).parent
-    nextjs_root = repo_root / "nextjs" / "src"
-
-    # Find all TSX files in components and app
-    component_files = list((nextjs_root / "components").rglob("*.tsx"))
-    app_files = list((nextjs_root / "app").rglob("*.tsx"))
-
-    all_files = component_files + app_files
-
-    print(f"Found {len(all_files)} TSX files to process")
+        return False, 0, None
 
+def preview_file(filepath: Path, fix_conditionals: bool = False,
+                 rules: RuleSet | None = None) -> tuple[int, str | None]:
+    """Run the codemod on one file without writing it. Returns (num_changes, diff or None)."""
+    try:
+        content = filepath.read_text()
+        new_content, changes = run_pipeline(content, fix_conditionals, rules)
+    except Exception as e:
+        print(f"Error processing {filepath}: {e}", file=sys.stderr)
+        return 0, None
+    if new_content == content:
+        return 0, None
+    return changes, unified_diff(filepath, content, new_content)
+
+def profile_file(filepath: Path, profile: Profile, fix_conditionals: bool = False,
+                 rules: RuleSet | None = None) -> tuple[bool, int, str | None]:
+    """process_file_with_digest, recording its time and bytes read/written in profile."""
+    bytes_read = filepath.stat().st_size
+    start = time.perf_counter()
+    result = process_file_with_digest(filepath, fix_conditionals, fingerprint=False,
+                                      rules=rules, profile=profile)
+    elapsed = time.perf_counter() - start
+    profile.record_file(filepath, elapsed, bytes_read, filepath.stat().st_size if result[0] else 0)
+    return result
+
+# The modules whose code decides a file's output, besides this script
+PIPELINE_MODULES = (jsx_classnames, codemod_rules)
+
+def ruleset_hash(fix_conditionals: bool = False, rules: RuleSet | None = None) -> str:
+    """Fingerprint of the rule set and the code that applies it, for cache invalidation."""
+    sources = [Path(__file__).read_text()]
+    sources += [Path(module.__file__).read_text() for module in PIPELINE_MODULES]
+    if fix_conditionals:
+        sources.append(Path(load_script("fix-conditionals.py").__file__).read_text())
+    sources.append('\0'.join((rules or DEFAULT_RULES).patterns))
+    return content_digest('\0'.join(sources))
+
+def run_batch(worker, files: list[Path], cache: CodemodCache | None, jobs: int) -> tuple[int, int]:
+    """Run the codemod over files and record them in the cache. Returns (modified, changes)."""
     total_modified = 0
     total_changes = 0
 
-    for filepath in all_files:
-        was_modified, changes = process_file(filepath)
+    results = map_files(worker, files, jobs=jobs)
+    for filepath, (was_modified, changes, digest) in zip(files, results):
+        if cache is not None:
+            cache.record(filepath, digest)
         if was_modified:
             total_modified += 1
             total_changes += changes
-            rel_path = str(filepath.relative_to(repo_root))
-            if len(rel_path) > 60:
-                rel_path = "..." + rel_path[-57:]
-            print(f"✓ {rel_path} ({changes} changes)")
+            print(f"✓ {display_path(filepath)} ({changes} changes)")
+
+    if cache is not None:
+        cache.save()
+    return total_modified, total_changes
+
+def parse_groups(value: str) -> list[str]:
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Strip decorative Tailwind classes from TSX files.")
+    parser.add_argument("--jobs", "-j", type=int, default=default_jobs(),
+                        help="worker processes (default: CPU count, 1 = serial)")
+    parser.add_argument("--fix-conditionals", action="store_true",
+                        help="also run fix-conditionals.py on each file in the same pass")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"ignore and do not update {CACHE_PATH.name}")
+    parser.add_argument("--rules", type=Path,
+                        help="TOML or JSON rule file (see codemod_rules.py)")
+    parser.add_argument("--include", type=parse_groups,
+                        help="comma-separated rule groups to apply (default: all)")
+    parser.add_argument("--exclude", type=parse_groups,
+                        help="comma-separated rule groups to skip")
+    parser.add_argument("--list-rules", action="store_true",
+                        help="print the active rule groups and exit")
+    parser.add_argument("--watch", action="store_true",
+                        help="after the first run, keep re-applying the codemod to files as they are saved")
+    add_scope_arguments(parser)
+    add_profile_arguments(parser)
+    add_dry_run_arguments(parser)
+    args = parser.parse_args()
+    if args.dry_run and (args.watch or args.profile):
+        parser.error("--dry-run cannot be combined with --watch or --profile")
+
+    try:
+        rules = get_rules(args.rules, args.include, args.exclude)
+    except RuleError as e:
+        parser.error(str(e))
+
+    if args.list_rules:
+        for name, patterns in rules.groups.items():
+            print(f"{name} ({len(patterns)} patterns)")
+        return
+
+    all_files = scoped_tsx_files(args, parser)
+
+    # With --dry-run, stdout is reserved for the patch
+    print(f"Found {len(all_files)} TSX files to process", file=sys.stderr if args.dry_run else sys.stdout)
+
+    if args.profile:
+        profile = Profile()
+        worker = partial(profile_file, profile=profile, fix_conditionals=args.fix_conditionals,
+                         rules=ProfiledRuleSet(rules, profile))
+        total_modified, total_changes = run_batch(worker, all_files, None, jobs=1)
+        print(f"\nComplete! Modified {total_modified} files with {total_changes} total changes")
+        finish_profile(profile, args.profile, args.top)
+        return
+
+    namespace = "strip-decorative-classes"
+    if args.fix_conditionals:
+        namespace += "+fix-conditionals"
+    cache = None if args.no_cache else CodemodCache(CACHE_PATH, namespace, ruleset_hash(args.fix_conditionals, rules))
+    pending = [f for f in all_files if cache is None or not cache.is_fresh(f)]
+
+    if args.dry_run:
+        worker = partial(preview_file, fix_conditionals=args.fix_conditionals, rules=rules)
+        total_modified = total_changes = 0
+        for filepath, (changes, diff) in zip(pending, map_files(worker, pending, jobs=args.jobs)):
+            if diff is not None:
+                total_modified += 1
+                total_changes += changes
+                emit_patch(filepath, diff, args.format, changes=changes)
+        print(f"\nDry run: {total_modified} files would change with {total_changes} total changes",
+              file=sys.stderr)
+        return
+
+    worker = partial(process_file_with_digest, fix_conditionals=args.fix_conditionals,
+                     fingerprint=cache is not None, rules=rules)
+
+    total_modified, total_changes = run_batch(worker, pending, cache, args.jobs)
+
+    if cache is not None:
+        skipped = len(all_files) - len(pending)
+        hit_rate = skipped / len(all_files) * 100 if all_files else 0.0
+        print(f"\nCache: skipped {skipped} unchanged files, processed {len(pending)} ({hit_rate:.1f}% hit rate)")
 
     print(f"\nComplete! Modified {total_modified} files with {total_changes} total changes")
 
+    if args.watch:
+        # The rule set and its compiled matcher stay loaded between batches
+        print(f"\nWatching {', '.join(SOURCE_DIRS)} for changes (Ctrl+C to stop)")
+
+        def on_change(files: list[Path]) -> None:
+            start = time.perf_counter()
+            modified, changes = run_batch(worker, files, cache, args.jobs)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{len(files)} changed, modified {modified} with {changes} changes ({elapsed:.0f}ms)")
+
+        watch_tsx_files(on_change)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,13 @@
+"""
+Tests for the codemod scripts at the repo root.
+
+The scripts import each other by module name, so the repo root goes on
+sys.path; the hyphenated ones are loaded with codemod_utils.load_script.
+"""
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
@@ -0,0 +1,195 @@
+"""Tests for codemod_utils.py."""
+
+import os
+import stat
+import subprocess
+import threading
+import time
+
+import pytest
+
+from codemod_utils import (
+    CodemodCache,
+    GitError,
+    changed_tsx_files,
+    content_digest,
+    watch_tsx_files,
+    write_atomic,
+)
+
+def cached_file(tmp_path, text="<div className=\"flex\" />\n"):
+    source = tmp_path / "a.tsx"
+    source.write_text(text)
+    return source
+
+def new_cache(tmp_path, namespace="strip", rules="rules-1"):
+    return CodemodCache(tmp_path / "cache.json", namespace, rules, repo_root=tmp_path)
+
+def test_cache_recorded_file_is_fresh_across_runs(tmp_path):
+    source = cached_file(tmp_path)
+    cache = new_cache(tmp_path)
+    assert not cache.is_fresh(source)
+    cache.record(source, content_digest(source.read_text()))
+    cache.save()
+    assert new_cache(tmp_path).is_fresh(source)
+
+def test_cache_editing_the_file_invalidates_it(tmp_path):
+    source = cached_file(tmp_path)
+    cache = new_cache(tmp_path)
+    cache.record(source, content_digest(source.read_text()))
+    cache.save()
+    source.write_text("<div className=\"grid\" />\n")
+    assert not new_cache(tmp_path).is_fresh(source)
+
+def test_cache_changing_the_rules_invalidates_every_entry(tmp_path):
+    source = cached_file(tmp_path)
+    cache = new_cache(tmp_path)
+    cache.record(source, content_digest(source.read_text()))
+    cache.save()
+    assert not new_cache(tmp_path, rules="rules-2").is_fresh(source)
+    assert new_cache(tmp_path, rules="rules-2").entries == {}
+
+def test_cache_namespaces_are_separate(tmp_path):
+    source = cached_file(tmp_path)
+    strip = new_cache(tmp_path, "strip")
+    strip.record(source, content_digest(source.read_text()))
+    strip.save()
+    conditionals = new_cache(tmp_path, "conditionals")
+    assert not conditionals.is_fresh(source)
+    conditionals.save()
+    assert new_cache(tmp_path, "strip").is_fresh(source)
+
+def test_cache_record_none_forgets_the_file(tmp_path):
+    # Output that isn't a fixed point is recorded as None and must be rerun
+    source = cached_file(tmp_path)
+    cache = new_cache(tmp_path)
+    cache.record(source, content_digest(source.read_text()))
+    cache.record(source, None)
+    cache.save()
+    assert not new_cache(tmp_path).is_fresh(source)
+
+def test_cache_save_drops_deleted_files(tmp_path):
+    source = cached_file(tmp_path)
+    cache = new_cache(tmp_path)
+    cache.record(source, content_digest(source.read_text()))
+    source.unlink()
+    cache.save()
+    assert new_cache(tmp_path).entries == {}
+
+def test_cache_unreadable_manifest_starts_empty(tmp_path):
+    (tmp_path / "cache.json").write_text("{not json")
+    source = cached_file(tmp_path)
+    cache = new_cache(tmp_path)
+    assert not cache.is_fresh(source)
+    cache.record(source, content_digest(source.read_text()))
+    cache.save()
+    assert new_cache(tmp_path).is_fresh(source)
+
+@pytest.mark.parametrize("mode", [0o600, 0o644, 0o755])
+def test_write_atomic_keeps_permissions(tmp_path, mode):
+    target = tmp_path / "a.tsx"
+    target.write_text("before\n")
+    os.chmod(target, mode)
+    write_atomic(target, "after\n")
+    assert target.read_text() == "after\n"
+    assert stat.S_IMODE(target.stat().st_mode) == mode
+
+def test_write_atomic_leaves_no_temp_file(tmp_path):
+    target = tmp_path / "a.tsx"
+    target.write_text("before\n")
+    write_atomic(target, "after\n")
+    assert [p.name for p in tmp_path.iterdir()] == ["a.tsx"]
+
+def test_write_atomic_failure_keeps_the_original(tmp_path):
+    target = tmp_path / "a.tsx"
+    target.write_text("before\n")
+    with pytest.raises(UnicodeEncodeError):
+        write_atomic(target, "\udcff")
+    assert target.read_text() == "before\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["a.tsx"]
+
+def git(repo, *args):
+    subprocess.run(["git", "-C", str(repo), *args], capture_output=True, check=True)
+
+@pytest.fixture
+def src_tree(tmp_path, monkeypatch):
+    """A git repo whose nextjs/src has one committed file per kind of path."""
+    for var, value in (("GIT_AUTHOR_NAME", "test"), ("GIT_AUTHOR_EMAIL", "test@example.com"),
+                       ("GIT_COMMITTER_NAME", "test"), ("GIT_COMMITTER_EMAIL", "test@example.com")):
+        monkeypatch.setenv(var, value)
+    src = tmp_path / "nextjs" / "src"
+    for path in ("components/kept.tsx", "components/edited.tsx", "components/gone.tsx",
+                 "app/page.tsx", "app/util.ts", "hooks/use-thing.tsx"):
+        (src / path).parent.mkdir(parents=True, exist_ok=True)
+        (src / path).write_text("export {};\n")
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "base")
+    return src
+
+def scoped(files, src):
+    return sorted(path.relative_to(src).as_posix() for path in files)
+
+def test_changed_tsx_files_working_tree(src_tree):
+    (src_tree / "components/edited.tsx").write_text("export const a = 1;\n")
+    (src_tree / "components/gone.tsx").unlink()
+    (src_tree / "components/new file.tsx").write_text("export {};\n")
+    (src_tree / "app/util.ts").write_text("export const b = 1;\n")
+    (src_tree / "hooks/use-thing.tsx").write_text("export const c = 1;\n")
+    (src_tree / "hooks/untracked.tsx").write_text("export {};\n")
+    # Deleted files, non-TSX files and directories the codemods don't walk are left out
+    assert scoped(changed_tsx_files(src_root=src_tree), src_tree) == [
+        "components/edited.tsx", "components/new file.tsx",
+    ]
+
+def test_changed_tsx_files_since_ref(src_tree):
+    repo = src_tree.parent.parent
+    (src_tree / "app/page.tsx").write_text("export const a = 1;\n")
+    git(repo, "commit", "-q", "-am", "page")
+    (src_tree / "components/edited.tsx").write_text("export const a = 1;\n")
+    assert scoped(changed_tsx_files(src_root=src_tree), src_tree) == ["components/edited.tsx"]
+    assert scoped(changed_tsx_files("HEAD~1", src_root=src_tree), src_tree) == [
+        "app/page.tsx", "components/edited.tsx",
+    ]
+
+def test_changed_tsx_files_staged_only(src_tree):
+    repo = src_tree.parent.parent
+    (src_tree / "components/edited.tsx").write_text("export const a = 1;\n")
+    (src_tree / "components/staged.tsx").write_text("export {};\n")
+    (src_tree / "app/page.tsx").write_text("export const a = 1;\n")
+    git(repo, "add", "nextjs/src/components")
+    assert scoped(changed_tsx_files(staged=True, src_root=src_tree), src_tree) == [
+        "components/edited.tsx", "components/staged.tsx",
+    ]
+
+def test_changed_tsx_files_git_errors(src_tree, tmp_path_factory):
+    with pytest.raises(GitError, match="no-such-ref"):
+        changed_tsx_files("no-such-ref", src_root=src_tree)
+    outside = tmp_path_factory.mktemp("not-a-repo")
+    with pytest.raises(GitError):
+        changed_tsx_files(src_root=outside)
+
+def test_watch_refreshes_only_the_processed_batch(tmp_path):
+    components = tmp_path / "components"
+    components.mkdir()
+    (tmp_path / "app").mkdir()
+    first, other = components / "first.tsx", components / "other.tsx"
+    first.write_text("a\n")
+    other.write_text("a\n")
+    batches = []
+
+    def on_change(files):
+        batches.append([f.name for f in files])
+        if len(batches) == 2:
+            raise KeyboardInterrupt
+        # The codemod rewrites its file while the user saves another one
+        first.write_text("rewritten\n")
+        other.write_text("saved during the run\n")
+
+    watcher = threading.Thread(target=watch_tsx_files, args=(on_change, tmp_path),
+                               kwargs={"interval": 0.01, "debounce": 0.03}, daemon=True)
+    watcher.start()
+    time.sleep(0.1)
+    first.write_text("saved\n")
+    watcher.join(timeout=5)
+    assert batches == [["first.tsx"], ["other.tsx"]]
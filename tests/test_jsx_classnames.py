@@ -0,0 +1,83 @@
+"""Regression tests for jsx_classnames.rewrite_classnames."""
+
+from jsx_classnames import rewrite_classnames
+
+def drop_backgrounds(value: str) -> str:
+    """Stand-in rule set: strip every bg-* class."""
+    return " ".join(c for c in value.split() if not c.startswith("bg-"))
+
+def rewrite(src: str) -> str:
+    return rewrite_classnames(src, drop_backgrounds)[0]
+
+def test_ternary_with_emptied_else_collapses_inside_cn():
+    src = '<div className={cn("flex", a ? "hidden" : "bg-red-500")} />'
+    assert rewrite(src) == '<div className={cn("flex", a && "hidden")} />'
+
+def test_ternary_collapses_inside_array_argument():
+    src = '<div className={clsx(["flex", a ? "hidden" : "bg-red-500"])} />'
+    assert rewrite(src) == '<div className={clsx(["flex", a && "hidden"])} />'
+
+def test_ternary_in_template_literal_keeps_empty_else():
+    # `${a && "hidden"}` would render the class "false"
+    src = '<div className={`flex ${a ? "hidden bg-red-500" : ""}`} />'
+    assert rewrite(src) == '<div className={`flex ${a ? "hidden" : ""}`} />'
+
+def test_ternary_as_bare_attribute_keeps_empty_else():
+    # className={a && "hidden"} would pass false to className
+    src = '<div className={a ? "hidden bg-red" : "bg-blue"} />'
+    assert rewrite(src) == '<div className={a ? "hidden" : ""} />'
+
+def test_ternary_in_template_inside_cn_keeps_empty_else():
+    src = '<div className={cn(`p-2 ${a ? "hidden" : "bg-blue"}`)} />'
+    assert rewrite(src) == '<div className={cn(`p-2 ${a ? "hidden" : ""}`)} />'
+
+def test_dropped_argument_takes_its_comment_with_it():
+    src = '''<div className={cn(
+  "flex",
+  // Background depends on theme
+  "bg-red-500",
+  // Selection state
+  isSelected && "hidden"
+)} />'''
+    assert rewrite(src) == '''<div className={cn(
+  "flex",
+  // Selection state
+  isSelected && "hidden"
+)} />'''
+
+def test_same_line_comment_stays_with_its_item():
+    src = '''<div className={cn(
+  "flex", // layout
+  "bg-red-500", // color
+  active && "hidden"
+)} />'''
+    assert rewrite(src) == '''<div className={cn(
+  "flex", // layout
+  active && "hidden"
+)} />'''
+
+def test_dropping_the_last_argument_drops_its_comma():
+    src = '''<div className={cn(
+  "flex", // layout
+  // Background
+  "bg-red-500"
+)} />'''
+    assert rewrite(src) == '''<div className={cn(
+  "flex" // layout
+)} />'''
+
+def test_inline_arguments():
+    assert rewrite('<a className={cn("bg-red-500", a, "flex")} />') == '<a className={cn(a, "flex")} />'
+    assert rewrite('<a className={cn(a, "bg-red-500")} />') == '<a className={cn(a)} />'
+    assert rewrite('<a className={cn(a, "bg-red-500",)} />') == '<a className={cn(a,)} />'
+
+def test_comment_heading_the_list_survives_its_first_item():
+    src = '''<div className={cn(a ? [
+  // Pressed state
+  "bg-red-500",
+  "border-t",
+] : "flex")} />'''
+    assert rewrite(src) == '''<div className={cn(a ? [
+  // Pressed state
+  "border-t",
+] : "flex")} />'''
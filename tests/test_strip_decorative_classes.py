@@ -0,0 +1,81 @@
+"""Tests for strip-decorative-classes.py."""
+
+import re
+import shutil
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import codemod_rules
+from codemod_utils import REPO_ROOT, find_tsx_files, load_script
+from jsx_classnames import iter_class_strings
+
+strip = load_script("strip-decorative-classes.py")
+
+def test_ruleset_hash_covers_pipeline_modules(tmp_path, monkeypatch):
+    # Editing jsx_classnames.py or codemod_rules.py changes output, so it must
+    # invalidate every .codemod-cache.json entry
+    fake = tmp_path / "module.py"
+    fake.write_text("version = 1\n")
+    monkeypatch.setattr(strip, "PIPELINE_MODULES", (SimpleNamespace(__file__=str(fake)),))
+    before = strip.ruleset_hash()
+    fake.write_text("version = 2\n")
+    assert strip.ruleset_hash() != before
+
+def test_ruleset_hash_includes_jsx_classnames_and_rules():
+    names = {module.__name__ for module in strip.PIPELINE_MODULES}
+    assert {"jsx_classnames", "codemod_rules"} <= names
+
+def legacy_is_decorative(cls):
+    """The classifier before rules were compiled: one re.match per pattern."""
+    return any(re.match(pattern, cls) for pattern in strip.REMOVE_PATTERNS)
+
+def tree_tokens():
+    tokens = set()
+    for filepath in (REPO_ROOT / "nextjs" / "src").rglob("*.tsx"):
+        for _, value in iter_class_strings(filepath.read_text()):
+            tokens.update(value.split())
+    return tokens
+
+# Near misses of the lookaheads and prefixes the groups rely on
+EDGE_TOKENS = {
+    "text-xs", "text-xl", "text-2xl", "text-9xl", "text-xsmall", "text-red-500",
+    "border", "border-t", "border-x", "border-2", "border-black", "border-tx",
+    "font-mono", "font-monospace", "font-bold", "p-4", "p-px", "px-[2px]",
+    "hover:bg-red-500", "hover:underline", "dark:ring-1", "transform", "transform-gpu",
+    "bg-[url('a.png')]", "md:bg-white", "-rotate-90", "", "flex", "grid-cols-2",
+}
+
+def test_compiled_classifier_matches_per_rule_loop():
+    tokens = sorted(tree_tokens() | EDGE_TOKENS)
+    strip.DEFAULT_RULES.clear_cache()
+    assert strip.classify_tokens(tokens) == [legacy_is_decorative(cls) for cls in tokens]
+    # Again from the decision cache
+    assert strip.classify_tokens(tokens) == [legacy_is_decorative(cls) for cls in tokens]
+
+def test_decision_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(codemod_rules, "DECISION_CACHE_SIZE", 4)
+    rules = codemod_rules.RuleSet(strip.RULE_GROUPS, "test")
+    tokens = [f"bg-c{n}" for n in range(10)] + [f"w-{n}" for n in range(10)]
+    assert [rules.is_decorative(cls) for cls in tokens] == [legacy_is_decorative(cls) for cls in tokens]
+    assert len(rules._decisions) <= 4
+
+def test_dry_run_patch_applies_with_git_apply(tmp_path):
+    # The patch is against the checked-out tree; apply it to a copy of it
+    src = REPO_ROOT / "nextjs" / "src"
+    copy = tmp_path / "nextjs" / "src"
+    shutil.copytree(src, copy)
+    patch = subprocess.run(
+        [sys.executable, str(REPO_ROOT / "strip-decorative-classes.py"), "--dry-run", "--no-cache"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    assert patch.startswith("--- a/nextjs/src/")
+
+    subprocess.run(["git", "apply", "-"], cwd=tmp_path, input=patch, text=True, check=True)
+
+    changed = 0
+    for original in find_tsx_files(src):
+        expected, _ = strip.run_pipeline(original.read_text())
+        assert (copy / original.relative_to(src)).read_text() == expected, original
+        changed += expected != original.read_text()
+    assert changed